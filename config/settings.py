@@ -100,6 +100,20 @@ TEST_SETTINGS = {
     'log_all_measurements': True
 }
 
+# Raw Serial Capture (opt-in, for replaying intermittent protocol issues)
+SERIAL_CAPTURE = {
+    'enabled': False,           # Or set DIODE_TESTER_SERIAL_CAPTURE=1
+    'directory': None           # None = logs dir / 'captures'
+}
+
+# Result Journal (write-ahead log replayed into the results store on startup)
+RESULT_JOURNAL = {
+    'enabled': True,
+    'filename': 'results.journal',
+    'fsync_every': 1,           # fsync after N appends (1 = every result, 0 = never force)
+    'fsync_interval_s': 0.0     # also fsync when this many seconds passed since last sync (0 = off)
+}
+
 # GUI Settings
 GUI_SETTINGS = {
     'window_title': 'Diode Dynamics Production Test',
@@ -137,6 +151,62 @@ PROGRAMMING_SETTINGS = {
     }
 }
 
+# Hex File Staging (validated local copies so programmers never read from the shared drive)
+HEX_CACHE = {
+    'enabled': True,
+    'directory': None,              # None = local data dir / 'hex_cache'
+    'revalidate_after_s': 8 * 3600  # re-hash the source once per shift even if its mtime is unchanged
+}
+
+# SMT Fixtures driven by one station (src/services/fixture_manager.py)
+FIXTURES = {
+    'fixtures': [],          # e.g. [{'id': 'Nest 1', 'port': 'COM3'}, {'id': 'Nest 2', 'port': 'COM4'}]
+                             # optional per fixture: 'programmers': {'STM8': {'path': ...}} (own programmer;
+                             # fixtures sharing a programmer executable program one board at a time)
+    'max_concurrent': 0      # tests running at once across fixtures, 0 = one per fixture
+}
+
+# Local Mirror of the shared config directory (src/utils/config_mirror.py)
+CONFIG_MIRROR = {
+    'enabled': True,
+    'directory': None,       # None = local data dir / 'config_mirror'
+    'patterns': ['*.json', 'sku_cache.bin'],  # files mirrored from the shared config directory
+    'sync_interval_s': 60    # background sync from the share
+}
+
+# SKU Configuration Database (src/data/sku_database.py); disabled = JSON files in config/skus
+SKU_DATABASE = {
+    'enabled': False,
+    'path': None,            # shared database, e.g. r'\\server\share\tester\skus.db'; None = shared config dir / skus.db
+    'local_replica': None    # local copy the tester reads (WAL mode), e.g. r'%LOCALAPPDATA%\DiodeDynamics\skus.db';
+                             # None = read 'path' directly, with the rollback journal (no WAL on a share)
+}
+
+# Compiled SKU Cache (src/data/sku_cache.py): build with `python -m src.data.sku_cache build`
+SKU_CACHE = {
+    'enabled': True,
+    'path': None             # None = config dir / 'sku_cache.bin' (mirrored with the SKU files)
+}
+
+# Splash Video Frame Cache (src/gui/startup/splash_frames.py): build with `python -m src.gui.startup.splash_frames build`
+SPLASH_VIDEO = {
+    'frame_cache': True,
+    'unified_video': False,  # play the video in the unified splash's logo slot (default: static logo)
+    'directory': None,       # None = local data dir / 'splash_cache'
+    'fps': 12,               # cached frame rate
+    'sizes': {               # frame box per splash; frames keep the video's aspect ratio
+        'unified': (250, 120),
+        'classic': (1000, 400)
+    }
+}
+
+# SKU File Watching (src/services/sku_watcher.py)
+SKU_WATCH = {
+    'enabled': True,
+    'debounce_ms': 500,      # wait for a burst of file writes to settle before rescanning
+    'poll_interval_s': 0     # also rescan periodically (network shares without change notifications), 0 = off
+}
+
 # File Paths (using pathlib for cross-platform compatibility)
 PATHS = {
     'sku_directory': Path('config') / 'skus',
@@ -13,23 +13,33 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Opt-in startup profiling starts before any heavy import (see src/utils/startup_profiler.py)
+from src.utils.startup_profiler import (start_startup_profiling, profile_phase, mark_startup,
+                                        finish_startup_profiling)
+if "--profile-startup" in sys.argv:
+    start_startup_profiling()
+_gui_argv = [arg for arg in sys.argv[1:] if arg != "--profile-startup"]
+
 # Early splash screen initialization for GUI mode
-if len(sys.argv) == 1 or (len(sys.argv) > 1 and sys.argv[1] == "gui"):
+if len(_gui_argv) == 0 or _gui_argv[0] == "gui":
     # Only import minimal Qt requirements for splash
-    from PySide6.QtWidgets import QApplication
-    from PySide6.QtCore import Qt
-    
-    # Create QApplication early
-    app = QApplication(sys.argv)
-    app.setApplicationName("Diode Dynamics Tester")
-    app.setApplicationVersion("1.0.0")
-    app.setOrganizationName("Diode Dynamics")
+    with profile_phase("qt_init"):
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtCore import Qt
+        
+        # Create QApplication early
+        app = QApplication(sys.argv)
+        app.setApplicationName("Diode Dynamics Tester")
+        app.setApplicationVersion("1.0.0")
+        app.setOrganizationName("Diode Dynamics")
     
     # Import and show splash screen immediately
-    from src.gui.startup import UnifiedSplashScreen
-    splash = UnifiedSplashScreen()
-    splash.show_centered()
-    app.processEvents()  # Force immediate display
+    with profile_phase("splash"):
+        from src.gui.startup import UnifiedSplashScreen
+        splash = UnifiedSplashScreen(play_video="--no-video" not in _gui_argv)
+        splash.show_centered()
+        app.processEvents()  # Force immediate display
+    mark_startup("splash_shown")
     
     # Store references for later use
     _early_app = app
@@ -83,7 +93,8 @@ def setup_logging():
 
 
 def check_dependencies():
-    """Check if all required dependencies are available"""
+    """Check if all required dependencies are available (without importing them)"""
+    import importlib.util
     logger = logging.getLogger(__name__) # Get logger instance
     required_modules = [
         'PySide6',
@@ -93,9 +104,11 @@ def check_dependencies():
     missing_modules = []
     for module in required_modules:
         try:
-            __import__(module)
-        except ImportError as e:
-            logger.error(f"Missing dependency: {module}. Error: {e}")
+            found = module in sys.modules or importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
+            logger.error(f"Missing dependency: {module}")
             missing_modules.append(module)
 
     if missing_modules:
@@ -113,6 +126,20 @@ def check_dependencies():
     return True
 
 
+def on_main_window_shown(mode=None):
+    """First event loop pass after the main window was shown: the application is interactive"""
+    mark_startup("interactive")
+    finish_startup_profiling()
+    if mode:
+        # The test module (numpy, programming) is imported in the background, not during the splash
+        from src.gui.startup.preloader import warm_up_test_module
+        warm_up_test_module(mode)
+    if "--no-video" not in _gui_argv:
+        # Pre-transcode the startup video for the next launch's splash, if it plays the video and not done yet
+        from src.gui.startup.splash_frames import build_frame_caches_async
+        build_frame_caches_async()
+
+
 def run_unified_gui_mode(args=None):
     """Run the GUI application with unified splash/mode selection"""
     logger = logging.getLogger(__name__)
@@ -138,9 +165,10 @@ def run_unified_gui_mode(args=None):
 
     try:
         from PySide6.QtWidgets import QApplication
-        from PySide6.QtCore import Qt
+        from PySide6.QtCore import Qt, QTimer
         from src.gui.startup import UnifiedSplashScreen
-        from src.gui.main_window import MainWindow
+        with profile_phase("main_window_import"):
+            from src.gui.main_window import MainWindow
 
         logger.info("Using pre-initialized QApplication...")
         # Use the pre-created app and splash if available
@@ -154,7 +182,7 @@ def run_unified_gui_mode(args=None):
             app.setApplicationName("Diode Dynamics Tester")
             app.setApplicationVersion("1.0.0")
             app.setOrganizationName("Diode Dynamics")
-            splash = UnifiedSplashScreen()
+            splash = UnifiedSplashScreen(play_video=not getattr(args, 'no_video', False))
             splash.show_centered()
         
         # Variables to hold windows
@@ -176,14 +204,18 @@ def run_unified_gui_mode(args=None):
             
             # Create MainWindow with preloaded components
             logger.info("Creating MainWindow with preloaded components...")
-            main_window = MainWindow(preloaded_components=preloaded_components)
-            
-            # Set mode
-            main_window.set_mode(selected_mode)
+            mark_startup("mode_selected")
+            with profile_phase("main_window"):
+                main_window = MainWindow(preloaded_components=preloaded_components)
+                
+                # Set mode
+                main_window.set_mode(selected_mode)
             
             # Show maximized
-            main_window.setWindowState(Qt.WindowMaximized)
-            main_window.show()
+            with profile_phase("main_window_show"):
+                main_window.setWindowState(Qt.WindowMaximized)
+                main_window.show()
+            QTimer.singleShot(0, lambda: on_main_window_shown(selected_mode))
             
             logger.info("Main window created and shown")
         
@@ -387,16 +419,21 @@ def run_gui_mode():
         logger.warning(f"Could not use PathManager for SKU directory check: {e}. Skipping check.")
 
     try:
-        from src.gui.main_window import MainWindow
+        with profile_phase("main_window_import"):
+            from src.gui.main_window import MainWindow
         from PySide6.QtWidgets import QApplication
+        from PySide6.QtCore import QTimer
 
         logger.info("Initializing QApplication...")
         app = QApplication(sys.argv)
         
         logger.info("Creating MainWindow instance...")
-        window = MainWindow()
+        with profile_phase("main_window"):
+            window = MainWindow()
         logger.info("Showing MainWindow...")
-        window.show()
+        with profile_phase("main_window_show"):
+            window.show()
+        QTimer.singleShot(0, lambda: on_main_window_shown(getattr(window, 'current_mode', None)))
         
         logger.info("Starting GUI application event loop...")
         app.exec()
@@ -493,8 +530,8 @@ def run_smt_test(sku: str, port: str, programming_enabled: bool = True):
         # Load programming configuration if enabled
         programming_config = None
         if programming_enabled:
-            from src.data.sku_manager import SKUManager
-            sku_manager = SKUManager()
+            from src.data.sku_manager import get_sku_manager
+            sku_manager = get_sku_manager()
             sku_data = sku_manager.get_sku(sku)
             if sku_data:
                 smt_config = sku_data.get('smt_testing', {})
@@ -601,6 +638,9 @@ def main():
   
   # Run SMT setup utility
   python main.py smt-setup COM5
+  
+  # Record where startup time goes (JSON trace in logs/)
+  python main.py --profile-startup
         """
     )
     
@@ -660,6 +700,18 @@ def main():
         help="Disable professional startup (skip splash screen and mode selection)"
     )
     
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Record import and startup phase timings to logs/startup_profile_<timestamp>.json"
+    )
+    
+    parser.add_argument(
+        "--no-video",
+        action="store_true",
+        help="Do not play the startup video on the splash screen"
+    )
+
     parser.add_argument(
         "--unified",
         action="store_true",
@@ -688,8 +740,17 @@ def main():
         print(f"CRITICAL ERROR: Failed to create necessary directories: {e}. Application cannot continue.")
         return
 
+    # Recover results journaled by a previous run that did not shut down cleanly
+    with profile_phase("result_journal"):
+        from src.data.result_journal import replay_result_journal
+        recovered = replay_result_journal()
+    if recovered:
+        logger.warning(f"Recovered {recovered} test result(s) from the result journal")
+
     # Check dependencies
-    if not check_dependencies():
+    with profile_phase("check_dependencies"):
+        dependencies_ok = check_dependencies()
+    if not dependencies_ok:
         logger.critical("Dependency check failed. Application cannot continue.")
         # Message already printed by check_dependencies
         return
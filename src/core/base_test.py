@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 import logging
 
+from config.settings import RESULT_JOURNAL
+
 
 class TestResult:
     """Container for test results"""
@@ -29,10 +31,45 @@ class TestResult:
         if not passed:
             self.failures.append(f"{name}: {value}{unit} not in range [{min_val}-{max_val}]{unit}")
 
+    def add_measurements(self, names: List[str], values: List[float], min_vals: List[float],
+                         max_vals: List[float], units: List[str], passed: Optional[List[bool]] = None):
+        """Add many measurements at once; failure messages are only built for failed ones
+
+        Args:
+            passed: Precomputed pass/fail per measurement (e.g. from a LimitTable), evaluated here if None
+        """
+        if passed is None:
+            passed = [lo <= value <= hi for value, lo, hi in zip(values, min_vals, max_vals)]
+
+        for name, value, min_val, max_val, unit, ok in zip(names, values, min_vals, max_vals, units, passed):
+            self.measurements[name] = {
+                'value': value,
+                'min': min_val,
+                'max': max_val,
+                'unit': unit,
+                'passed': ok
+            }
+
+        self.failures.extend(
+            f"{name}: {value}{unit} not in range [{min_val}-{max_val}]{unit}"
+            for name, value, min_val, max_val, unit, ok in zip(names, values, min_vals, max_vals, units, passed)
+            if not ok
+        )
+
     def calculate_overall_result(self):
         """Determine if overall test passed"""
         self.passed = len(self.failures) == 0 and len(self.measurements) > 0
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable representation for the results store"""
+        return {
+            'passed': self.passed,
+            'measurements': self.measurements,
+            'failures': list(self.failures),
+            'timestamp': self.timestamp.isoformat(),
+            'test_duration': self.test_duration
+        }
+
 
 class BaseTest(ABC):
     """Abstract base class for all test modes"""
@@ -41,6 +78,7 @@ class BaseTest(ABC):
         self.sku = sku
         self.parameters = parameters
         self.result = TestResult()
+        self.fixture_id: Optional[str] = None  # Set when one station drives several fixtures
         self.logger = logging.getLogger(self.__class__.__name__)
         self.progress_callback: Optional[Callable[[str, int], None]] = None
 
@@ -98,10 +136,26 @@ class BaseTest(ABC):
             end_time = datetime.now()
             self.result.test_duration = (end_time - start_time).total_seconds()
             self.update_progress("Test complete", 0)
+            self._journal_result()  # also for hardware initialization failures
 
         self.logger.info(f"Test completed. Result: {'PASS' if self.result.passed else 'FAIL'}")
         return self.result
 
+    def _journal_result(self):
+        """Append the result to the write-ahead journal so it survives a crash"""
+        if not RESULT_JOURNAL.get('enabled', True):
+            return
+        try:
+            from src.data.result_journal import get_result_journal
+            get_result_journal().append({
+                'test_type': self.__class__.__name__,
+                'sku': self.sku,
+                'fixture': self.fixture_id,
+                'result': self.result.to_dict()
+            })
+        except Exception as e:
+            self.logger.error(f"Failed to journal test result: {e}")
+
     def validate_parameters(self, required_params: list) -> bool:
         """Validate that required parameters are present"""
         missing = []
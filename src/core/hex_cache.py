@@ -0,0 +1,273 @@
+"""
+Hex File Cache Module
+Validates firmware images once and stages them on local disk for the programmers
+
+Hex files usually live on the shared drive. Staging hashes the source,
+checks every record checksum, and copies it into a local cache directory
+keyed by content hash, so the programmer CLIs read a local file and the
+share is only touched when the source changes. A source is re-hashed when
+its mtime or size changes, or once per shift (HEX_CACHE['revalidate_after_s']);
+an unchanged hash keeps the existing local copy.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import HEX_CACHE
+from src.utils.path_manager import get_path_manager
+from src.utils.security_validators import InputValidator, SecurityValidationError
+
+HEX_EXTENSIONS = {'.hex', '.s19'}
+
+
+class HexFileError(Exception):
+    """Raised when a hex image cannot be validated or staged"""
+    pass
+
+
+def _check_intel_hex(data: bytes, name: str):
+    """Check Intel HEX record framing and checksums"""
+    saw_eof = False
+    for number, line in enumerate(data.splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if saw_eof:
+            raise HexFileError(f"{name}:{number}: data after end-of-file record")
+        if not line.startswith(b':'):
+            raise HexFileError(f"{name}:{number}: record does not start with ':'")
+        try:
+            record = bytes.fromhex(line[1:].decode('ascii'))
+        except ValueError:
+            raise HexFileError(f"{name}:{number}: invalid hex digits")
+        if len(record) < 5 or len(record) != record[0] + 5:
+            raise HexFileError(f"{name}:{number}: record length mismatch")
+        if sum(record) & 0xFF:
+            raise HexFileError(f"{name}:{number}: checksum error")
+        saw_eof = record[3] == 0x01
+    if not saw_eof:
+        raise HexFileError(f"{name}: missing end-of-file record")
+
+
+def _check_srecord(data: bytes, name: str):
+    """Check Motorola S-record framing and checksums"""
+    records = 0
+    for number, line in enumerate(data.splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) < 2 or line[:1] != b'S' or line[1:2] not in b'0123456789':
+            raise HexFileError(f"{name}:{number}: record does not start with 'S<type>'")
+        try:
+            record = bytes.fromhex(line[2:].decode('ascii'))
+        except ValueError:
+            raise HexFileError(f"{name}:{number}: invalid hex digits")
+        if not record or len(record) != record[0] + 1:
+            raise HexFileError(f"{name}:{number}: record length mismatch")
+        if (sum(record) & 0xFF) != 0xFF:
+            raise HexFileError(f"{name}:{number}: checksum error")
+        records += 1
+    if not records:
+        raise HexFileError(f"{name}: no records")
+
+
+def validate_hex_image(data: bytes, name: str = "image", suffix: str = ".hex"):
+    """
+    Validate a firmware image's record structure.
+
+    Args:
+        data: File contents
+        name: Name used in error messages
+        suffix: '.hex' for Intel HEX, '.s19' for Motorola S-records
+
+    Raises:
+        HexFileError: If a record is malformed or fails its checksum
+    """
+    if suffix.lower() == '.s19':
+        _check_srecord(data, name)
+    else:
+        _check_intel_hex(data, name)
+
+
+class HexFileCache:
+    """Validated, content-addressed local copies of firmware images"""
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, cache_dir: Optional[Path] = None, revalidate_after_s: Optional[float] = None):
+        """
+        Args:
+            cache_dir: Staging directory (default: HEX_CACHE['directory'] or local data dir / 'hex_cache')
+            revalidate_after_s: Re-hash unchanged sources after this many seconds, 0 disables
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if cache_dir is None:
+            cache_dir = HEX_CACHE.get('directory') or get_path_manager().get_local_data_dir() / "hex_cache"
+        self.cache_dir = Path(cache_dir)
+        self.revalidate_after_s = (HEX_CACHE['revalidate_after_s']
+                                   if revalidate_after_s is None else revalidate_after_s)
+        self.validator = InputValidator()
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"hits": 0, "rehashed": 0, "staged": 0}
+        self._load_manifest()
+
+    def _load_manifest(self):
+        path = self.cache_dir / self.MANIFEST
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable hex cache manifest: {e}")
+            self._entries = {}
+
+    def _save_manifest(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp, self.cache_dir / self.MANIFEST)
+
+    def stage(self, hex_file: str) -> str:
+        """
+        Return a validated local copy of a hex file, staging it if needed.
+
+        Args:
+            hex_file: Source hex file (typically on the shared drive)
+
+        Returns:
+            Path of the local copy to hand to the programmer
+
+        Raises:
+            HexFileError: If the source is missing, unsafe or corrupt
+        """
+        # The share is only stat'ed and read outside the lock, so parallel lanes don't queue behind SMB latency
+        with self._lock:
+            entry = self._entries.get(hex_file)
+        local = Path(entry["local_path"]) if entry else None
+        if entry and local.exists():
+            fresh = (not self.revalidate_after_s
+                     or time.time() - entry["validated_at"] < self.revalidate_after_s)
+            try:
+                stat = os.stat(hex_file)
+            except OSError as e:
+                if not fresh:
+                    raise HexFileError(f"Cannot read hex file {hex_file}: {e}")
+                # Share unreachable - the copy validated this shift is still good
+                self.logger.warning(f"Using staged copy of {hex_file}, source unavailable: {e}")
+                self._count("hits")
+                return str(local)
+            if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size and fresh:
+                self._count("hits")
+                return str(local)
+
+        try:
+            source = self.validator.validate_file_path(hex_file, HEX_EXTENSIONS)
+            stat = os.stat(source)
+            data = Path(source).read_bytes()
+        except SecurityValidationError as e:
+            raise HexFileError(str(e))
+        except OSError as e:
+            raise HexFileError(f"Cannot read hex file {hex_file}: {e}")
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            if entry and local.exists() and entry["sha256"] == digest:
+                # Touched or due for its shift check, but the content is unchanged
+                self.stats["rehashed"] += 1
+            else:
+                local = self._copy_in(source, data, digest)
+                self.stats["staged"] += 1
+                self.logger.info(f"Staged {Path(source).name} ({digest[:12]}) to {local}")
+
+            self._entries[hex_file] = {
+                "source": source,
+                "local_path": str(local),
+                "sha256": digest,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "validated_at": time.time()
+            }
+            self._save_manifest()
+            self._purge_unreferenced()
+            return str(local)
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def stage_all(self, hex_files: Dict[str, str]) -> Dict[str, str]:
+        """
+        Stage every hex file in a SKU's programming config up front.
+
+        Returns:
+            Board name -> local path for the files that staged successfully
+        """
+        staged = {}
+        for board, hex_file in hex_files.items():
+            if not hex_file:
+                continue
+            try:
+                staged[board] = self.stage(hex_file)
+            except HexFileError as e:
+                self.logger.error(f"Could not stage hex file for {board}: {e}")
+        return staged
+
+    def _copy_in(self, source: str, data: bytes, digest: str) -> Path:
+        path = Path(source)
+        validate_hex_image(data, path.name, path.suffix)
+
+        local = self.cache_dir / f"{path.stem}-{digest[:16]}{path.suffix.lower()}"
+        if local.exists() and hashlib.sha256(local.read_bytes()).hexdigest() == digest:
+            return local
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, local)
+        return local
+
+    def _purge_unreferenced(self):
+        """Remove local copies no longer referenced by any source"""
+        referenced = {Path(e["local_path"]).name for e in self._entries.values()}
+        for path in self.cache_dir.iterdir():
+            if path.suffix.lower() in HEX_EXTENSIONS and path.name not in referenced:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Drop all staged copies"""
+        with self._lock:
+            self._entries = {}
+            if self.cache_dir.exists():
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+# Global instance
+_hex_cache = None
+
+
+def get_hex_cache() -> Optional[HexFileCache]:
+    """Get global HexFileCache instance, or None when staging is disabled"""
+    global _hex_cache
+    if not HEX_CACHE.get('enabled', True):
+        return None
+    if _hex_cache is None:
+        _hex_cache = HexFileCache()
+    return _hex_cache
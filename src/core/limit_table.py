@@ -0,0 +1,133 @@
+"""
+Limit Table Module
+Precompiled SMT limits evaluated for every board and function in one pass
+
+The table is built once per SKU configuration (see test_plan.py) from
+test_sequence and relay_mapping: one row per (function, board, quantity)
+with its measurement name and limits, plus a (board, function) -> relay
+index. Evaluating a panel
+gathers the readings into an array and compares them against the limit
+arrays with NumPy; measurement records and failure strings are built
+afterwards from the readings as measured (ints stay ints), and failure
+strings only for rows that failed.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# (measurement key, limits key, unit) - checked in this order for each board
+QUANTITIES = (("current", "current_a", "A"), ("voltage", "voltage_v", "V"))
+
+
+class LimitTable:
+    """Per-SKU limit rows for all boards and functions of a panel"""
+
+    def __init__(self, test_sequence: List[Dict[str, Any]], relay_mapping: Dict[str, Any]):
+        """
+        Args:
+            test_sequence: SKU test_sequence (function + limits per entry)
+            relay_mapping: SKU relay_mapping (relay string -> board/function)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # First relay (in configuration order) driving each board/function
+        self.relays: Dict[Tuple[int, str], str] = {}
+        for relay_str, mapping in relay_mapping.items():
+            if mapping and mapping.get("board") and mapping.get("function"):
+                self.relays.setdefault((int(mapping["board"]), mapping["function"]), relay_str)
+        boards = sorted({board for board, _ in self.relays})
+
+        self.names: List[str] = []
+        self.functions: List[str] = []
+        self.board_keys: List[str] = []
+        self.quantities: List[str] = []
+        self.units: List[str] = []
+        self.min_values: List[float] = []
+        self.max_values: List[float] = []
+        for test_config in test_sequence:
+            function = test_config["function"]
+            limits = test_config.get("limits", {})
+            for board in boards:
+                if (board, function) not in self.relays:
+                    continue
+                for quantity, limit_key, unit in QUANTITIES:
+                    if limit_key not in limits:
+                        continue
+                    self.names.append(f"{function}_board_{board}_{quantity}")
+                    self.functions.append(function)
+                    self.board_keys.append(f"Board {board}")
+                    self.quantities.append(quantity)
+                    self.units.append(unit)
+                    self.min_values.append(limits[limit_key]["min"])
+                    self.max_values.append(limits[limit_key]["max"])
+
+        self._rows = list(zip(self.functions, self.board_keys, self.quantities))
+        self.mins = np.asarray(self.min_values, dtype=float)
+        self.maxs = np.asarray(self.max_values, dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def relay_for(self, board: int, function: str) -> Optional[str]:
+        """Relay string ("1" or "1,2,3") driving a board/function"""
+        return self.relays.get((int(board), function))
+
+    def gather(self, readings: Dict[str, Dict[str, Dict[str, Any]]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Collect the measured values for every row.
+
+        Args:
+            readings: function -> {"Board X": {voltage, current, ...}}
+
+        Returns:
+            (values, present) - values is NaN where a row has no measurement
+        """
+        return self._to_arrays(self._measured(readings))
+
+    def _measured(self, readings: Dict[str, Dict[str, Dict[str, Any]]]) -> List[Any]:
+        """Reading for every row as reported, None where missing"""
+        measured = []
+        for function, board_key, quantity in self._rows:
+            measurement = readings.get(function, {}).get(board_key)
+            measured.append(measurement.get(quantity) if measurement else None)
+        return measured
+
+    @staticmethod
+    def _to_arrays(measured: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        present = np.fromiter((value is not None for value in measured), dtype=bool, count=len(measured))
+        values = np.array([np.nan if value is None else value for value in measured], dtype=float)
+        return values, present
+
+    def evaluate(self, values: np.ndarray) -> np.ndarray:
+        """Pass/fail for every row"""
+        return (self.mins <= values) & (values <= self.maxs)
+
+    def apply(self, result, readings: Dict[str, Dict[str, Dict[str, Any]]]) -> int:
+        """
+        Evaluate a panel and record the measured rows on a TestResult.
+
+        Returns:
+            Number of failed rows
+        """
+        # The array is only used for the comparison; results report the readings as measured
+        measured = self._measured(readings)
+        values, present = self._to_arrays(measured)
+        passed = self.evaluate(values)
+        rows = np.flatnonzero(present).tolist()
+        if len(rows) == len(self.names):
+            # Complete panel - no per-row selection needed
+            result.add_measurements(self.names, measured, self.min_values, self.max_values,
+                                    self.units, passed=passed.tolist())
+            return int(np.count_nonzero(~passed))
+        result.add_measurements(
+            [self.names[i] for i in rows],
+            [measured[i] for i in rows],
+            [self.min_values[i] for i in rows],
+            [self.max_values[i] for i in rows],
+            [self.units[i] for i in rows],
+            passed=passed[rows].tolist()
+        )
+        return int(np.count_nonzero(present & ~passed))
+
@@ -0,0 +1,157 @@
+"""
+Offroad Phases Module
+Runs the offroad test phases from a dependency graph, overlapping them where the firmware allows
+
+The SKU's "phases" section declares which phases must finish before another
+starts:
+
+    "phases": {
+        "pressure": {"depends_on": []},
+        "function": {"depends_on": []},
+        "dual_backlight": {"depends_on": ["function"]},
+        "rgbw": {"depends_on": ["function"]}
+    }
+
+Phases missing from the section use DEFAULT_PHASE_GRAPH. The firmware runs one
+test at a time, except tests it reports as background capable (CAPS:BACKGROUND=...,
+e.g. the pressure decay hold): those are started on a worker thread and the
+next phases' TEST: commands are issued while they run. A phase that depends on
+a running background phase waits for it first. Without capability flags the
+phases run one after another in graph order, as before.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Phase name -> test type reported by the firmware (TEST_STARTED/TEST_COMPLETE)
+PHASE_TEST_TYPES = {
+    "pressure": "PRESSURE",
+    "function": "FUNCTION_TEST",
+    "dual_backlight": "DUAL_BACKLIGHT",
+    "rgbw": "RGBW_BACKLIGHT"
+}
+
+# Dependencies when the SKU does not declare them: backlight tests after the function test
+DEFAULT_PHASE_GRAPH = {
+    "pressure": [],
+    "function": [],
+    "dual_backlight": ["function"],
+    "rgbw": ["function"]
+}
+
+# Called with the phase and an event to set once its TEST: command was accepted
+PhaseRunner = Callable[["Phase", threading.Event], None]
+
+
+@dataclass
+class Phase:
+    """One offroad test phase"""
+    name: str
+    test_type: str
+    depends_on: List[str] = field(default_factory=list)
+
+
+def build_phase_graph(enabled: Iterable[str], phases_config: Optional[Dict[str, Any]] = None) -> List[Phase]:
+    """
+    Order the enabled phases so every phase comes after its dependencies.
+
+    Args:
+        enabled: Phase names to run, in the preferred order
+        phases_config: SKU "phases" section (name -> {"depends_on": [...]})
+
+    Returns:
+        Phases in run order. Dependencies on phases that are not enabled are dropped.
+
+    Raises:
+        ValueError: Unknown phase name or a dependency cycle
+    """
+    phases_config = phases_config or {}
+    enabled = list(enabled)
+    for name in list(enabled) + list(phases_config):
+        if name not in PHASE_TEST_TYPES:
+            raise ValueError(f"Unknown offroad test phase: {name}")
+
+    phases = {}
+    for name in enabled:
+        depends_on = phases_config.get(name, {}).get("depends_on", DEFAULT_PHASE_GRAPH[name])
+        for dependency in depends_on:
+            if dependency not in PHASE_TEST_TYPES:
+                raise ValueError(f"Phase {name} depends on unknown phase {dependency}")
+        phases[name] = Phase(name, PHASE_TEST_TYPES[name], [d for d in depends_on if d in enabled])
+
+    # Stable topological order: the first enabled phase whose dependencies are done
+    ordered: List[Phase] = []
+    done = set()
+    while len(ordered) < len(phases):
+        ready = [p for p in phases.values() if p.name not in done and all(d in done for d in p.depends_on)]
+        if not ready:
+            pending = [name for name in phases if name not in done]
+            raise ValueError(f"Dependency cycle between offroad test phases: {pending}")
+        ordered.append(ready[0])
+        done.add(ready[0].name)
+    return ordered
+
+
+class PhaseScheduler:
+    """Issues the phases of one pod test, overlapping background-capable phases"""
+
+    def __init__(self, phases: List[Phase], background_tests: Iterable[str] = ()):
+        """
+        Args:
+            phases: Phases in run order (build_phase_graph)
+            background_tests: Test types the firmware runs in the background
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.phases = phases
+        self.background_tests = set(background_tests)
+        self.wall_time = 0.0
+
+    def run(self, run_phase: PhaseRunner) -> float:
+        """
+        Run all phases.
+
+        Foreground phases run on the calling thread, one at a time. At most one
+        background phase runs on a worker thread alongside them.
+
+        Returns:
+            Wall time in seconds
+        """
+        start = time.perf_counter()
+        background: Optional[threading.Thread] = None
+        background_phase: Optional[Phase] = None
+
+        for index, phase in enumerate(self.phases):
+            runs_in_background = phase.test_type in self.background_tests and index < len(self.phases) - 1
+            if background and (runs_in_background or background_phase.name in phase.depends_on):
+                self.logger.debug(f"Phase {phase.name} waits for {background_phase.name}")
+                background.join()
+                background = None
+
+            started = threading.Event()
+            if runs_in_background:
+                background_phase = phase
+                background = threading.Thread(target=self._run_phase, args=(run_phase, phase, started),
+                                              daemon=True, name=f"OffroadPhase_{phase.name}")
+                background.start()
+                # The next TEST: command only goes out once the firmware accepted this one
+                started.wait()
+                self.logger.info(f"Phase {phase.name} running in the background")
+            else:
+                self._run_phase(run_phase, phase, started)
+
+        if background:
+            background.join()
+
+        self.wall_time = time.perf_counter() - start
+        return self.wall_time
+
+    def _run_phase(self, run_phase: PhaseRunner, phase: Phase, started: threading.Event):
+        try:
+            run_phase(phase, started)
+        except Exception as e:
+            self.logger.error(f"Phase {phase.name} error: {e}")
+        finally:
+            started.set()
@@ -1,11 +1,76 @@
+import math
 import time
 import logging
-from typing import Dict, Any, List
+import threading
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
 from .base_test import BaseTest, TestResult
+from .offroad_phases import Phase, PhaseScheduler, build_phase_graph
 from src.hardware.offroad_arduino_controller import OffroadArduinoController
 from src.hardware.arduino_controller import SensorConfigurations, TestResult as ArduinoTestResult, RGBWSample
 import json
 
+# Interval of the sleep loops the phases used to poll results with; used to report the latency saved
+POLL_INTERVAL_S = 0.1
+
+# How long a phase waits for TEST_COMPLETE after its data arrived (e.g. pressure exhaust)
+COMPLETE_GRACE_S = 1.0
+
+# Progress messages per phase
+PHASE_LABELS = {
+    "pressure": "Pressure decay test (5 seconds)...",
+    "function": "Function test (mainbeam + backlight)...",
+    "dual_backlight": "Dual backlight test (1.0 seconds)...",
+    "rgbw": "RGBW cycling test (8 cycles)..."
+}
+
+# RGBWSample fields kept as arrays for analysis
+RGBW_FIELDS = ("cycle", "voltage", "current", "lux", "x", "y")
+
+
+def in_color_ellipse(x, y, center_x, center_y, radius_x, radius_y) -> np.ndarray:
+    """
+    Axis-aligned ellipse test, broadcast over samples and targets.
+
+    Pass sample coordinates as column vectors (n, 1) and target parameters as
+    row vectors (m,) to get an (n, m) matrix of sample-in-target results.
+    """
+    normalized_x = (np.asarray(x, dtype=float) - center_x) / radius_x
+    normalized_y = (np.asarray(y, dtype=float) - center_y) / radius_y
+    return normalized_x ** 2 + normalized_y ** 2 <= 1.0
+
+
+class RGBWSampleArrays:
+    """RGBW samples stored column-wise in growable NumPy arrays"""
+
+    def __init__(self, capacity: int = 64):
+        self._data = np.empty((len(RGBW_FIELDS), capacity), dtype=float)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, sample: RGBWSample):
+        if self._count == self._data.shape[1]:
+            grown = np.empty((len(RGBW_FIELDS), 2 * self._data.shape[1]), dtype=float)
+            grown[:, :self._count] = self._data[:, :self._count]
+            self._data = grown
+        self._data[:, self._count] = [getattr(sample, field) for field in RGBW_FIELDS]
+        self._count += 1
+
+    def extend(self, samples: List[RGBWSample]):
+        for sample in samples:
+            self.append(sample)
+
+    def clear(self):
+        self._count = 0
+
+    def column(self, field: str) -> np.ndarray:
+        """View of one field over the stored samples"""
+        return self._data[RGBW_FIELDS.index(field), :self._count]
+
 
 class OffroadTest(BaseTest):
     """Offroad pod testing implementation with FIXED Arduino communication"""
@@ -29,6 +94,8 @@ class OffroadTest(BaseTest):
         # Data collection - now properly aligned with Arduino
         self.test_results: List[ArduinoTestResult] = []
         self.rgbw_samples: List[RGBWSample] = []
+        self.rgbw_cycles = set()
+        self.rgbw_arrays = RGBWSampleArrays()
         self.pressure_readings: List[float] = []
         
         # Test state tracking
@@ -36,6 +103,10 @@ class OffroadTest(BaseTest):
         self.test_start_time = 0
         self.pressure_test_data = {}
         self.function_test_data = {}
+        self.dual_test_data = {}
+        self.phase_timing: Dict[str, Dict[str, float]] = {}
+        self.cycle_timing: Dict[str, float] = {}
+        self.background_tests: List[str] = []
 
     def setup_hardware(self) -> bool:
         """Initialize Arduino and sensors using correct protocol"""
@@ -73,6 +144,12 @@ class OffroadTest(BaseTest):
             self.arduino.rgbw_callback = self._on_rgbw_sample
             self.arduino.reading_callback = self._on_sensor_reading
 
+            # Tests the firmware can overlap with others (none on older firmware)
+            if hasattr(self.arduino, "get_background_tests"):
+                self.background_tests = self.arduino.get_background_tests()
+                if self.background_tests:
+                    self.logger.info(f"Firmware runs in the background: {', '.join(self.background_tests)}")
+
             self.update_progress("Starting sensor monitoring...", 35)
 
             # Start sensor reading
@@ -105,11 +182,15 @@ class OffroadTest(BaseTest):
             self.pressure_test_data = result.measurements
         elif result.test_type in ["FUNCTION_TEST", "POWER"]:
             self.function_test_data = result.measurements
+        elif result.test_type == "DUAL_BACKLIGHT":
+            self.dual_test_data = result.measurements
 
     def _on_rgbw_sample(self, sample: RGBWSample):
         """Handle RGBW sample from Arduino"""
         self.logger.debug(f"Received RGBW sample: Cycle {sample.cycle}")
         self.rgbw_samples.append(sample)
+        self.rgbw_cycles.add(sample.cycle)
+        self.rgbw_arrays.append(sample)
 
     def _on_sensor_reading(self, reading):
         """Handle live sensor reading from Arduino"""
@@ -123,31 +204,43 @@ class OffroadTest(BaseTest):
     def run_test_sequence(self) -> TestResult:
         """Execute corrected offroad test sequence using RESULT parsing"""
         try:
-            current_progress = 50
-            
-            # 1. Optional Pressure Decay Test (5 seconds total, if checkbox selected)
-            if self.pressure_test_enabled:
-                self.update_progress("Pressure decay test (5 seconds)...", current_progress)
-                self._run_pressure_decay_test()
-                current_progress = 60
+            self.phase_timing = {}
 
+            # 1. Optional Pressure Decay Test (5 seconds total, if checkbox selected)
             # 2. Function Test - Quick Sequential
-            self.update_progress("Function test (mainbeam + backlight)...", current_progress)
-            self._run_function_test()
-            current_progress += 10
-
-            # 3. Backlight Test(s) - Based on SKU Configuration  
+            # 3. Backlight Test(s) - Based on SKU Configuration
+            enabled = ["pressure"] if self.pressure_test_enabled else []
+            enabled.append("function")
             backlight_config = self._get_backlight_config(self.sku)
-            
             if backlight_config["type"] == "dual":
-                self.update_progress("Dual backlight test (1.0 seconds)...", current_progress)
-                self._run_dual_backlight_test()
-                current_progress += 15
-                
+                enabled.append("dual_backlight")
             elif backlight_config["type"] == "rgbw_cycling":
-                self.update_progress("RGBW cycling test (8 cycles)...", current_progress)
-                self._run_rgbw_test(backlight_config)
-                current_progress += 20
+                enabled.append("rgbw")
+
+            # Overlap phases per the SKU's phase graph where the firmware allows it
+            phases = build_phase_graph(enabled, self.parameters.get("phases"))
+            scheduler = PhaseScheduler(phases, self.background_tests)
+            progress_step = 35 // len(phases)
+
+            def run_phase(phase: Phase, started: threading.Event):
+                self.update_progress(PHASE_LABELS[phase.name], 50 + progress_step * phases.index(phase))
+                if phase.name == "pressure":
+                    self._run_pressure_decay_test(started)
+                elif phase.name == "function":
+                    self._run_function_test(started)
+                elif phase.name == "dual_backlight":
+                    self._run_dual_backlight_test(started)
+                elif phase.name == "rgbw":
+                    self._run_rgbw_test(backlight_config, started)
+
+            cycle_time = scheduler.run(run_phase)
+            serial_time = sum(timing["total_s"] for timing in self.phase_timing.values())
+            self.cycle_timing = {
+                "cycle_s": cycle_time,
+                "serial_s": serial_time,
+                "overlap_saved_s": max(0.0, serial_time - cycle_time)
+            }
+            self._log_phase_timing()
 
             self.update_progress("Analyzing results...", 90)
             self._analyze_arduino_results()
@@ -159,7 +252,23 @@ class OffroadTest(BaseTest):
             self.result.failures.append(f"Test sequence error: {str(e)}")
             return self.result
 
-    def _run_pressure_decay_test(self):
+    def _send_test_command(self, command: str, test_type: str, timeout: float,
+                           started: Optional[threading.Event] = None):
+        """
+        Send a TEST: command and signal the phase scheduler once it was answered.
+
+        Returns:
+            (response, perf_counter() before sending)
+        """
+        self.arduino.clear_test_completion(test_type)
+        command_start = time.perf_counter()
+        try:
+            return self.arduino.send_command(command, timeout=timeout), command_start
+        finally:
+            if started:
+                started.set()
+
+    def _run_pressure_decay_test(self, started: Optional[threading.Event] = None):
         """Run 5-second pressure decay test using Arduino RESULT parsing"""
         try:
             # Clear previous pressure data
@@ -167,7 +276,7 @@ class OffroadTest(BaseTest):
             self.pressure_readings.clear()
             
             # Send pressure test command to Arduino
-            response = self.arduino.send_command("TEST:PRESSURE", timeout=10.0)
+            response, command_start = self._send_test_command("TEST:PRESSURE", "PRESSURE", 10.0, started)
             
             if response and "ERROR" in response:
                 self.result.failures.append(f"Pressure test failed: {response}")
@@ -176,28 +285,22 @@ class OffroadTest(BaseTest):
             # Wait for test completion and RESULT message
             # Arduino will automatically send RESULT:INITIAL=14.5,DELTA=0.2
             max_wait_time = 15.0  # Give extra time for pressure test
-            start_wait = time.time()
-            
-            while time.time() - start_wait < max_wait_time:
-                if self.pressure_test_data:  # Result received
-                    break
-                time.sleep(0.1)
-            
-            if not self.pressure_test_data:
+            if not self._wait_for_phase("pressure", "PRESSURE", lambda: bool(self.pressure_test_data),
+                                        max_wait_time, command_start):
                 self.result.failures.append("Pressure test: No result data received")
                     
         except Exception as e:
             self.logger.error(f"Pressure test error: {e}")
             self.result.failures.append(f"Pressure test error: {str(e)}")
 
-    def _run_function_test(self):
+    def _run_function_test(self, started: Optional[threading.Event] = None):
         """Run function test using Arduino RESULT parsing"""
         try:
             # Clear previous function test data
             self.function_test_data.clear()
             
             # Send function test command to Arduino
-            response = self.arduino.send_command("TEST:FUNCTION_TEST", timeout=10.0)
+            response, command_start = self._send_test_command("TEST:FUNCTION_TEST", "FUNCTION_TEST", 10.0, started)
             
             if response and "ERROR" in response:
                 self.result.failures.append(f"Function test failed: {response}")
@@ -206,28 +309,22 @@ class OffroadTest(BaseTest):
             # Wait for test completion and RESULT message
             # Arduino will send RESULT:MV_MAIN=12.5,MI_MAIN=1.2,LUX_MAIN=2500,...
             max_wait_time = 10.0
-            start_wait = time.time()
-            
-            while time.time() - start_wait < max_wait_time:
-                if self.function_test_data:  # Result received
-                    break
-                time.sleep(0.1)
-            
-            if not self.function_test_data:
+            if not self._wait_for_phase("function", "FUNCTION_TEST", lambda: bool(self.function_test_data),
+                                        max_wait_time, command_start):
                 self.result.failures.append("Function test: No result data received")
                     
         except Exception as e:
             self.logger.error(f"Function test error: {e}")
             self.result.failures.append(f"Function test error: {str(e)}")
 
-    def _run_dual_backlight_test(self):
+    def _run_dual_backlight_test(self, started: Optional[threading.Event] = None):
         """Run dual backlight test using Arduino RESULT parsing"""
         try:
             # Clear previous test data
-            dual_test_data = {}
+            self.dual_test_data = {}
             
             # Send dual backlight test command to Arduino
-            response = self.arduino.send_command("TEST:DUAL_BACKLIGHT", timeout=10.0)
+            response, command_start = self._send_test_command("TEST:DUAL_BACKLIGHT", "DUAL_BACKLIGHT", 10.0, started)
             
             if response and "ERROR" in response:
                 self.result.failures.append(f"Dual backlight test failed: {response}")
@@ -236,36 +333,31 @@ class OffroadTest(BaseTest):
             # Wait for test completion and RESULT message
             # Arduino will send RESULT:MV_BACK1=12.5,MI_BACK1=1.2,LUX_BACK1=100,...
             max_wait_time = 10.0
-            start_wait = time.time()
             
-            while time.time() - start_wait < max_wait_time:
-                latest_result = self.arduino.get_latest_test_result()
-                if latest_result and latest_result.test_type == "DUAL_BACKLIGHT":
-                    dual_test_data = latest_result.measurements
-                    break
-                time.sleep(0.1)
-            
-            if not dual_test_data:
+            if not self._wait_for_phase("dual_backlight", "DUAL_BACKLIGHT", lambda: bool(self.dual_test_data),
+                                        max_wait_time, command_start):
                 self.result.failures.append("Dual backlight test: No result data received")
             else:
                 # Store dual backlight data for analysis
-                self.function_test_data.update(dual_test_data)
+                self.function_test_data.update(self.dual_test_data)
                     
         except Exception as e:
             self.logger.error(f"Dual backlight test error: {e}")
             self.result.failures.append(f"Dual backlight test error: {str(e)}")
 
-    def _run_rgbw_test(self, config):
+    def _run_rgbw_test(self, config, started: Optional[threading.Event] = None):
         """Run RGBW test using Arduino RGBW_SAMPLE parsing"""
         try:
             self.logger.info("Starting RGBW backlight test with 8 cycles")
             
             # Clear previous RGBW data
             self.rgbw_samples.clear()
+            self.rgbw_cycles.clear()
+            self.rgbw_arrays.clear()
             self.arduino.clear_rgbw_samples()
             
             # Send RGBW test command to Arduino
-            response = self.arduino.send_command("TEST:RGBW_BACKLIGHT", timeout=25.0)
+            response, command_start = self._send_test_command("TEST:RGBW_BACKLIGHT", "RGBW_BACKLIGHT", 25.0, started)
             
             if response and "ERROR" in response:
                 self.result.failures.append(f"RGBW test failed: {response}")
@@ -274,14 +366,10 @@ class OffroadTest(BaseTest):
             # Wait for test completion and collect RGBW_SAMPLE messages
             # Arduino will send multiple RGBW_SAMPLE:CYCLE=1,VOLTAGE=12.5,CURRENT=1.2,...
             max_wait_time = 20.0  # 8 cycles * ~1.4s each + buffer
-            start_wait = time.time()
-            
-            while time.time() - start_wait < max_wait_time:
-                # Check if we have samples from all 8 cycles
-                cycle_numbers = set(sample.cycle for sample in self.rgbw_samples)
-                if len(cycle_numbers) >= 8:  # Got samples from 8 cycles
-                    break
-                time.sleep(0.1)
+            # Check if we have samples from all 8 cycles
+            self._wait_for_phase("rgbw", "RGBW_BACKLIGHT",
+                                 lambda: len(self.rgbw_cycles) >= 8,
+                                 max_wait_time, command_start)
             
             if len(self.rgbw_samples) == 0:
                 self.result.failures.append("RGBW test: No sample data received")
@@ -290,6 +378,60 @@ class OffroadTest(BaseTest):
             self.logger.error(f"RGBW test error: {e}")
             self.result.failures.append(f"RGBW test error: {str(e)}")
 
+    def _wait_for_phase(self, phase: str, test_type: str, received: Callable[[], bool],
+                        max_wait_time: float, command_start: float) -> bool:
+        """
+        Wait for a phase's data, woken by the controller on RESULT, RGBW_SAMPLE and TEST_COMPLETE.
+
+        TEST_COMPLETE for the phase's test ends the wait early, since the firmware
+        sends its RESULT/RGBW_SAMPLE lines before it. Once the data is in, the phase
+        still waits up to COMPLETE_GRACE_S for TEST_COMPLETE, so the next TEST:
+        command does not reach a busy firmware. Records the phase in phase_timing.
+
+        Args:
+            phase: Name for the timing breakdown
+            test_type: Test name the firmware reports in TEST_COMPLETE
+            received: True once the phase's data has arrived
+            max_wait_time: Maximum time to wait in seconds
+            command_start: perf_counter() before the test command was sent
+
+        Returns:
+            True if the data arrived
+        """
+        wait_start = time.perf_counter()
+        self.arduino.wait_for_test_event(
+            lambda: received() or self.arduino.is_test_complete(test_type), max_wait_time)
+        wait_end = time.perf_counter()
+        success = received()
+        if success:
+            self.arduino.wait_for_test_event(lambda: self.arduino.is_test_complete(test_type), COMPLETE_GRACE_S)
+
+        waited = wait_end - wait_start
+        # A 100 ms sleep loop only noticed the data at its next poll
+        polled = math.ceil(waited / POLL_INTERVAL_S) * POLL_INTERVAL_S if success else waited
+        self.phase_timing[phase] = {
+            "command_s": wait_start - command_start,
+            "wait_s": waited,
+            "total_s": time.perf_counter() - command_start,
+            "poll_latency_saved_s": polled - waited
+        }
+        return success
+
+    def _log_phase_timing(self):
+        """Log the per-phase timing breakdown and the pod cycle time"""
+        for phase, timing in self.phase_timing.items():
+            self.logger.info(f"Phase {phase}: command {timing['command_s'] * 1000:.0f} ms, "
+                             f"result wait {timing['wait_s'] * 1000:.0f} ms, "
+                             f"total {timing['total_s'] * 1000:.0f} ms "
+                             f"({timing['poll_latency_saved_s'] * 1000:.0f} ms saved vs polling)")
+        if self.phase_timing:
+            saved = sum(t['poll_latency_saved_s'] for t in self.phase_timing.values())
+            self.logger.info(f"Result waits saved {saved * 1000:.0f} ms vs {POLL_INTERVAL_S * 1000:.0f} ms polling")
+        if self.cycle_timing:
+            self.logger.info(f"Pod cycle {self.cycle_timing['cycle_s'] * 1000:.0f} ms, "
+                             f"phases back to back {self.cycle_timing['serial_s'] * 1000:.0f} ms "
+                             f"({self.cycle_timing['overlap_saved_s'] * 1000:.0f} ms saved by overlapping)")
+
     def _get_backlight_config(self, sku: str) -> Dict[str, Any]:
         """Get backlight configuration from SKU data"""
         try:
@@ -327,15 +469,17 @@ class OffroadTest(BaseTest):
             self.update_progress("Analyzing results...", 85)
             
             # Debug output - show all raw test data collected
-            if self.function_test_data:
-                print("\n📊 Raw Function Test Data:")
+            if self.function_test_data and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Raw function test data:")
                 for key, value in self.function_test_data.items():
-                    print(f"  {key}: {value}")
+                    self.logger.debug(f"  {key}: {value}")
             
             if self.rgbw_samples:
-                print(f"\n📊 RGBW Samples Collected: {len(self.rgbw_samples)}")
-                for i, sample in enumerate(self.rgbw_samples):
-                    print(f"  Sample {i}: Cycle={sample.cycle}, V={sample.voltage:.3f}, I={sample.current:.3f}, X={sample.x:.3f}, Y={sample.y:.3f}")
+                self.logger.info(f"RGBW samples collected: {len(self.rgbw_samples)}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    for i, sample in enumerate(self.rgbw_samples):
+                        self.logger.debug(f"  Sample {i}: Cycle={sample.cycle}, V={sample.voltage:.3f}, "
+                                          f"I={sample.current:.3f}, X={sample.x:.3f}, Y={sample.y:.3f}")
 
             # Get test parameters
             lux_params = self.parameters.get("LUX", {})
@@ -468,19 +612,28 @@ class OffroadTest(BaseTest):
             self.logger.error(f"Analysis error: {e}")
             self.result.failures.append(f"Analysis error: {str(e)}")
 
+    def _rgbw_sample_arrays(self) -> RGBWSampleArrays:
+        """Collected RGBW samples as arrays, filled as they arrive"""
+        if len(self.rgbw_arrays) != len(self.rgbw_samples):
+            # Samples not received through _on_rgbw_sample
+            self.rgbw_arrays.clear()
+            self.rgbw_arrays.extend(self.rgbw_samples)
+        return self.rgbw_arrays
+
     def _analyze_rgbw_samples(self):
         """Analyze RGBW samples for color detection"""
         try:
             backlight_config = self._get_backlight_config(self.sku)
             expected_colors = backlight_config.get("colors_to_test", [])
             
-            # Extract color coordinates from all samples
-            x_values = [sample.x for sample in self.rgbw_samples]
-            y_values = [sample.y for sample in self.rgbw_samples]
+            # Color coordinates of all samples
+            samples = self._rgbw_sample_arrays()
+            x_values = samples.column("x")
+            y_values = samples.column("y")
             
-            if x_values and y_values:
-                x_range = max(x_values) - min(x_values)
-                y_range = max(y_values) - min(y_values)
+            if x_values.size and y_values.size:
+                x_range = float(np.ptp(x_values))
+                y_range = float(np.ptp(y_values))
                 
                 # Check for color variation
                 if x_range > 0.1 or y_range > 0.1:
@@ -500,10 +653,9 @@ class OffroadTest(BaseTest):
                         "CIE_range"
                     )
                     
-                    # Check for specific colors
-                    for expected_color in expected_colors:
-                        color_detected = self._detect_color_in_samples(expected_color)
-                        
+                    # Check for specific colors - all targets against all samples at once
+                    detected = self._detect_colors_in_samples(expected_colors)
+                    for expected_color, color_detected in zip(expected_colors, detected):
                         self.result.add_measurement(
                             f"rgbw_{expected_color['name']}_detected",
                             1.0 if color_detected else 0.0,
@@ -520,24 +672,38 @@ class OffroadTest(BaseTest):
             self.logger.error(f"RGBW analysis error: {e}")
             self.result.failures.append(f"RGBW analysis error: {str(e)}")
 
+    def _detect_colors_in_samples(self, expected_colors: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Check which expected colors were detected in the RGBW samples.
+
+        Each color is an ellipse around (target_x, target_y) with radius_x/radius_y,
+        both defaulting to its tolerance (a circle). The samples x colors matrix
+        is evaluated in one broadcast.
+        """
+        if not expected_colors or not self.rgbw_samples:
+            return [False] * len(expected_colors)
+
+        samples = self._rgbw_sample_arrays()
+        center_x = np.array([color["target_x"] for color in expected_colors], dtype=float)
+        center_y = np.array([color["target_y"] for color in expected_colors], dtype=float)
+        radius_x = np.array([color["radius_x"] if "radius_x" in color else color["tolerance"]
+                             for color in expected_colors], dtype=float)
+        radius_y = np.array([color["radius_y"] if "radius_y" in color else color["tolerance"]
+                             for color in expected_colors], dtype=float)
+
+        inside = in_color_ellipse(samples.column("x")[:, np.newaxis], samples.column("y")[:, np.newaxis],
+                                  center_x, center_y, radius_x, radius_y)
+        return inside.any(axis=0).tolist()
+
     def _detect_color_in_samples(self, expected_color):
         """Check if expected color was detected in RGBW samples"""
-        target_x = expected_color["target_x"]
-        target_y = expected_color["target_y"]
-        tolerance = expected_color["tolerance"]
-        
-        # Check if any sample is close to the expected color
-        for sample in self.rgbw_samples:
-            distance = ((sample.x - target_x)**2 + (sample.y - target_y)**2)**0.5
-            if distance <= tolerance:
-                return True
-        return False
+        return self._detect_colors_in_samples([expected_color])[0]
 
     def _get_power_parameters(self) -> Dict[str, float]:
         """Get power parameters from SKU manager"""
         try:
-            from src.data.sku_manager import create_sku_manager
-            sku_mgr = create_sku_manager()
+            from src.data.sku_manager import get_sku_manager
+            sku_mgr = get_sku_manager()
             return sku_mgr.get_power_draw_params(self.sku) or {}
         except Exception as e:
             self.logger.error(f"Error getting power parameters: {e}")
@@ -550,11 +716,7 @@ class OffroadTest(BaseTest):
         radius_x = color_params.get("radius_x_main", 0.02)
         radius_y = color_params.get("radius_y_main", 0.02)
 
-        # Simple ellipse check
-        normalized_x = (x - center_x) / radius_x
-        normalized_y = (y - center_y) / radius_y
-
-        return (normalized_x ** 2 + normalized_y ** 2) <= 1.0
+        return bool(in_color_ellipse(x, y, center_x, center_y, radius_x, radius_y))
 
     def cleanup_hardware(self):
         """Clean up Arduino connection using STOP command only"""
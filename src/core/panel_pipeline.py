@@ -0,0 +1,175 @@
+"""
+Panel Pipeline Module
+Overlaps board programming with the electrical test (TESTSEQ) on SMT panels
+
+As soon as every programming job for a panel board has finished, that
+board's relays are tested while the remaining boards are still being
+programmed. Fixture constraints come from the SKU's "fixture" section:
+
+    "fixture": {
+        "pipeline": true,
+        "programmed_boards": {"main_controller": 1, "led_driver_1": 2},
+        "isolation_groups": [[1, 2], [3, 4]]
+    }
+
+programmed_boards maps programming board names to panel board numbers.
+Boards in the same isolation group share supply or programming lines: none
+of them is tested while another in the group is being programmed, and no
+programming starts in a group under test. Boards not listed in a group are
+isolated from the rest of the panel.
+"""
+
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+from src.core.programming_scheduler import ProgrammingJob, ProgrammingScheduler
+
+
+class FixtureConstraints:
+    """Interlocks between programming and testing declared by the fixture"""
+
+    def __init__(self, fixture_config: Dict[str, Any]):
+        fixture_config = fixture_config or {}
+        self.pipeline = bool(fixture_config.get("pipeline", False))
+        self.programmed_boards = {
+            name: int(board) for name, board in fixture_config.get("programmed_boards", {}).items()
+        }
+        self._groups: Dict[int, Any] = {}
+        for index, group in enumerate(fixture_config.get("isolation_groups", [])):
+            for board in group:
+                self._groups[int(board)] = index
+
+        self._programming: Counter = Counter()
+        self._testing = set()
+        # Shared with PanelPipeline, which waits on it for finished programming jobs
+        self.condition = threading.Condition()
+
+    def group_of(self, board: int) -> Any:
+        return self._groups.get(board, ("board", board))
+
+    def can_pipeline(self, jobs: List[ProgrammingJob]) -> bool:
+        """Pipelining needs every programmed board mapped to a panel position"""
+        return self.pipeline and bool(jobs) and all(job.board in self.programmed_boards for job in jobs)
+
+    @contextmanager
+    def programming(self, job: ProgrammingJob):
+        """Held while a board is programmed (ProgrammingScheduler job_guard)"""
+        group = self.group_of(self.programmed_boards[job.board])
+        with self.condition:
+            self.condition.wait_for(lambda: group not in self._testing)
+            self._programming[group] += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self._programming[group] -= 1
+                self.condition.notify_all()
+
+    def begin_test(self, boards: List[int]) -> List[int]:
+        """Reserve the groups of the boards that may be tested now and return those boards"""
+        with self.condition:
+            allowed = [board for board in boards if not self._programming[self.group_of(board)]]
+            self._testing.update(self.group_of(board) for board in allowed)
+            return allowed
+
+    def end_test(self, boards: List[int]):
+        with self.condition:
+            for board in boards:
+                self._testing.discard(self.group_of(board))
+            self.condition.notify_all()
+
+    def wait(self, timeout: float):
+        """Wait for a programming job to finish or release a group"""
+        with self.condition:
+            self.condition.wait(timeout)
+
+
+class PanelPipeline:
+    """Tests boards that are already programmed while the rest are still programming"""
+
+    def __init__(self, scheduler: ProgrammingScheduler, constraints: FixtureConstraints,
+                 relay_mapping: Dict[str, Any], run_sequence: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        """
+        Args:
+            scheduler: Programming scheduler for the panel
+            constraints: Fixture interlocks and board mapping
+            relay_mapping: Full SKU relay mapping
+            run_sequence: Runs TESTSEQ for a subset of the relay mapping
+                          (e.g. a bound SMTArduinoController.execute_test_sequence)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.scheduler = scheduler
+        self.constraints = constraints
+        self.relay_mapping = relay_mapping
+        self.run_sequence = run_sequence
+
+        self._pending: Counter = Counter()
+        self.timing: Dict[str, float] = {}
+
+    def _on_programmed(self, result: Dict[str, Any]):
+        board = self.constraints.programmed_boards.get(result["board"])
+        with self.constraints.condition:
+            self._pending[board] -= 1
+            self.constraints.condition.notify_all()
+
+    def relay_mapping_for(self, boards: List[int]) -> Dict[str, Any]:
+        """Subset of the relay mapping driving the given boards"""
+        return {relay: meta for relay, meta in self.relay_mapping.items()
+                if meta and meta.get("board") in boards}
+
+    def run(self, jobs: List[ProgrammingJob]) -> Dict[str, Any]:
+        """
+        Program and test the panel.
+
+        Returns:
+            Merged TESTSEQ result ({"success", "results", "errors"}) for all boards
+        """
+        self._pending = Counter(self.constraints.programmed_boards[job.board] for job in jobs)
+        untested = {meta["board"] for meta in self.relay_mapping.values() if meta and meta.get("board")}
+        merged = {"success": True, "results": {}, "errors": []}
+        testing_time = 0.0
+
+        self.scheduler.job_guard = self.constraints.programming
+        self.scheduler.job_callback = self._on_programmed
+        programming = threading.Thread(target=self.scheduler.run, args=(jobs,), daemon=True,
+                                       name="panel_programming")
+        start = time.perf_counter()
+        programming.start()
+
+        while untested:
+            with self.constraints.condition:
+                programming_done = not programming.is_alive()
+                ready = sorted(b for b in untested if programming_done or self._pending[b] <= 0)
+            batch = self.constraints.begin_test(ready) if ready else []
+            if not batch:
+                self.constraints.wait(0.05)
+                continue
+
+            self.logger.info(f"Testing board(s) {batch} while programming continues")
+            test_start = time.perf_counter()
+            try:
+                result = self.run_sequence(self.relay_mapping_for(batch))
+            finally:
+                self.constraints.end_test(batch)
+            testing_time += time.perf_counter() - test_start
+
+            merged["results"].update(result.get("results", {}))
+            merged["errors"].extend(result.get("errors", []))
+            merged["success"] = merged["success"] and result.get("success", False)
+            untested.difference_update(batch)
+
+        programming.join()
+        wall_time = time.perf_counter() - start
+        serial_time = self.scheduler.wall_time + testing_time
+        self.timing = {
+            "wall_time_s": wall_time,
+            "programming_time_s": self.scheduler.wall_time,
+            "testing_time_s": testing_time
+        }
+        self.logger.info(f"Panel cycle {wall_time:.1f}s vs {serial_time:.1f}s programming then testing "
+                         f"(saved {max(0.0, serial_time - wall_time):.1f}s)")
+        return merged
@@ -5,16 +5,40 @@ SECURITY HARDENED - Prevents command injection attacks
 """
 
 import logging
+import threading
 import subprocess
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from src.utils.security_validators import InputValidator, CommandBuilder, SecurityValidationError
+from src.core.hex_cache import HexFileCache, HexFileError
+from src.core.programmer_session import ProgrammerSession, ProgrammerSessionError
+
+
+# A programmer executable drives one probe, so it programs one board at a time
+# across every test in the process (several fixtures may share it)
+_programmer_locks: Dict[str, threading.Lock] = {}
+_programmer_locks_guard = threading.Lock()
+
+
+def _programmer_lock(programmer_path: str) -> threading.Lock:
+    with _programmer_locks_guard:
+        return _programmer_locks.setdefault(programmer_path, threading.Lock())
 
 
 class ProgrammerController:
     """Controls STM8 and PIC programmers in bed-of-nails fixture - SECURITY HARDENED"""
 
-    def __init__(self, programmer_type: str, programmer_path: str):
+    def __init__(self, programmer_type: str, programmer_path: str, hex_cache: Optional[HexFileCache] = None,
+                 session: Optional[ProgrammerSession] = None):
+        """
+        Args:
+            programmer_type: 'STM8' or 'PIC'
+            programmer_path: Programmer command line executable
+            hex_cache: Stage hex files to validated local copies before programming (None = program in place)
+            session: Warm programmer session to program through (None = one subprocess per board)
+        """
         self.programmer_type = programmer_type.upper()  # 'STM8' or 'PIC'
+        self.hex_cache = hex_cache
+        self.session = session
         self.logger = logging.getLogger(f"{self.__class__.__name__}_{programmer_type}")
         
         # Initialize security validators
@@ -49,23 +73,32 @@ class ProgrammerController:
         try:
             # Validate inputs for security
             validated_board_name = self.validator.validate_board_name(board_name)
-            validated_hex_file = self.validator.validate_file_path(hex_file, {'.hex', '.s19'})
+            if self.hex_cache:
+                # Validated once when staged; the programmer reads the local copy
+                validated_hex_file = self.hex_cache.stage(hex_file)
+            else:
+                validated_hex_file = self.validator.validate_file_path(hex_file, {'.hex', '.s19'})
             
             self.logger.info(f"Starting programming for {validated_board_name}")
             
-            if self.programmer_type == 'STM8':
-                return self._program_stm8(validated_hex_file, validated_board_name, device)
-            elif self.programmer_type == 'PIC':
-                return self._program_pic(validated_hex_file, validated_board_name, device)
-            else:
-                error_msg = f"Unknown programmer type: {self.programmer_type}"
-                self.logger.error(error_msg)
-                return False, error_msg
+            with _programmer_lock(self.programmer_path):
+                if self.programmer_type == 'STM8':
+                    return self._program_stm8(validated_hex_file, validated_board_name, device)
+                elif self.programmer_type == 'PIC':
+                    return self._program_pic(validated_hex_file, validated_board_name, device)
+                else:
+                    error_msg = f"Unknown programmer type: {self.programmer_type}"
+                    self.logger.error(error_msg)
+                    return False, error_msg
 
         except SecurityValidationError as e:
             error_msg = f"Security validation failed for {board_name}: {str(e)}"
             self.logger.error(error_msg)
             return False, error_msg
+        except HexFileError as e:
+            error_msg = f"Hex file validation failed for {board_name}: {str(e)}"
+            self.logger.error(error_msg)
+            return False, error_msg
         except Exception as e:
             error_msg = f"Programming error for {board_name}: {str(e)}"
             self.logger.error(error_msg)
@@ -127,7 +160,12 @@ class ProgrammerController:
                           else arg.split('=')[0] + '=***' if '=' in arg else arg[:3] + '***'
                           for arg in cmd]
             self.logger.info(f"Executing: {' '.join(cmd_display)}")
-            
+
+            if self.session:
+                result = self._execute_in_session(cmd, board_name)
+                if result is not None:
+                    return result
+
             # Execute with security settings
             result = subprocess.run(
                 cmd,
@@ -157,6 +195,29 @@ class ProgrammerController:
             self.logger.error(f"{board_name}: {error_msg}")
             return False, error_msg
 
+    def _execute_in_session(self, cmd: list, board_name: str) -> Optional[Tuple[bool, str]]:
+        """Program through the warm session; None if the session failed before the board was sent"""
+        try:
+            returncode, output = self.session.run(cmd[1:], timeout=60)
+        except ProgrammerSessionError as e:
+            # Don't pay another start-up timeout on every remaining board
+            self.session = None
+            if e.board_sent:
+                # The tool may have been part way through flashing: don't program the board again
+                error_msg = f"Programming failed: {e}"
+                self.logger.error(f"{board_name}: {error_msg}")
+                return False, error_msg
+            self.logger.warning(f"{board_name}: programmer session failed ({e}), falling back to subprocess")
+            return None
+
+        if returncode == 0:
+            success_msg = f"Successfully programmed {board_name}"
+            self.logger.info(success_msg)
+            return True, success_msg
+        error_msg = f"Programming failed: {output}"
+        self.logger.error(f"{board_name}: {error_msg}")
+        return False, error_msg
+
     def verify_connection(self) -> Tuple[bool, str]:
         """Verify programmer connection - SECURITY HARDENED"""
         try:
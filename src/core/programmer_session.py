@@ -0,0 +1,205 @@
+"""
+Programmer Session Module
+Keeps a programmer tool running between boards instead of spawning it per board
+
+STVP_CmdLine and ipecmd pay tool start-up and USB enumeration on every
+invocation. Where a programmer has a batch/script front end, configure it
+as "session_command" in the programmer config; the session starts it once
+and sends one board per line:
+
+    tool -> host   READY                         (once, when the probe is open)
+    host -> tool   ["-Device=STM8S003F3", ...]   (JSON array of the per-board CLI arguments)
+    tool -> host   <any output lines>
+    tool -> host   DONE <returncode>
+
+Sessions are shared per command line through the ProgrammerSessionManager
+so they stay warm across tests. ProgrammerController falls back to a fresh
+subprocess when no session is configured or the session fails before a
+board's arguments were sent (start-up or write). A session that fails after
+that fails the board: the tool may have been part way through flashing it.
+The manager stops handing out a failed session for RETRY_AFTER_S.
+"""
+
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.security_validators import InputValidator
+
+
+class ProgrammerSessionError(Exception):
+    """Raised when a programmer session cannot start or stops responding"""
+
+    def __init__(self, message: str, board_sent: bool = False):
+        """
+        Args:
+            message: What failed
+            board_sent: The board's arguments had been sent (the board may be partly programmed)
+        """
+        super().__init__(message)
+        self.board_sent = board_sent
+
+
+class ProgrammerSession:
+    """One long-lived programmer process driven over stdin/stdout"""
+
+    def __init__(self, command: List[str], startup_timeout: float = 15.0):
+        """
+        Args:
+            command: Session executable and its arguments
+            startup_timeout: Seconds to wait for the READY line
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.command = list(command)
+        self.command[0] = InputValidator().validate_programmer_path(self.command[0])
+        self.startup_timeout = startup_timeout
+
+        self._process: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.boards_programmed = 0
+        self.failed_at: Optional[float] = None  # time.monotonic() of the last failure
+
+    def start(self):
+        """Start the tool and wait until it reports READY"""
+        self._lines = queue.Queue()
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                shell=False,  # SECURITY: Never use shell=True
+                cwd=None,
+                env=None
+            )
+        except OSError as e:
+            raise self._failed(f"Could not start programmer session: {e}")
+        threading.Thread(target=self._read_output, args=(self._process, self._lines),
+                         daemon=True, name="programmer_session").start()
+
+        output = self._read_until(lambda line: line == "READY", self.startup_timeout)
+        self.failed_at = None
+        self.logger.info(f"Programmer session ready: {self.command[0]} ({len(output)} start-up line(s))")
+
+    @staticmethod
+    def _read_output(process: subprocess.Popen, lines: "queue.Queue[Optional[str]]"):
+        for line in process.stdout:
+            lines.put(line.rstrip("\r\n"))
+        lines.put(None)  # EOF
+
+    def _failed(self, message: str, board_sent: bool = False) -> ProgrammerSessionError:
+        """Stop the tool and record the failure"""
+        self.close()
+        self.failed_at = time.monotonic()
+        return ProgrammerSessionError(message, board_sent)
+
+    def _read_until(self, is_last, timeout: float, board_sent: bool = False) -> List[str]:
+        """Read lines until is_last(line); timeout caps the whole reply, not each line"""
+        output = []
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise self._failed(f"No response from programmer session after {timeout:.0f}s", board_sent)
+            if line is None:
+                raise self._failed("Programmer session exited", board_sent)
+            output.append(line)
+            if is_last(line):
+                return output
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def run(self, args: List[str], timeout: float = 60.0) -> Tuple[int, str]:
+        """
+        Program one board.
+
+        Args:
+            args: Per-board CLI arguments (everything after the executable)
+            timeout: Seconds to wait for the DONE line
+
+        Returns:
+            (returncode, tool output)
+        """
+        with self._lock:
+            if not self.is_alive():
+                self.start()
+            try:
+                self._process.stdin.write(json.dumps(args) + "\n")
+                self._process.stdin.flush()
+            except OSError as e:
+                raise self._failed(f"Programmer session write failed: {e}")
+
+            output = self._read_until(lambda line: line.startswith("DONE"), timeout, board_sent=True)
+            try:
+                returncode = int(output[-1].split()[1])
+            except (IndexError, ValueError):
+                raise self._failed(f"Malformed session reply: {output[-1]}", board_sent=True)
+            self.boards_programmed += 1
+            return returncode, "\n".join(output[:-1])
+
+    def close(self):
+        """Stop the tool"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except Exception:
+            process.kill()
+
+
+class ProgrammerSessionManager:
+    """Shares warm programmer sessions between controllers and tests"""
+
+    RETRY_AFTER_S = 300.0  # a failed session is not handed out again for this long
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._sessions: Dict[Tuple[str, ...], ProgrammerSession] = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, command: List[str]) -> Optional[ProgrammerSession]:
+        """Get the session for a command line, creating it on first use (started lazily)
+
+        Returns:
+            The session, or None while it is backing off after a failure (use subprocesses)
+        """
+        key = tuple(command)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = ProgrammerSession(command)
+                self._sessions[key] = session
+            elif session.failed_at is not None and time.monotonic() - session.failed_at < self.RETRY_AFTER_S:
+                return None
+            return session
+
+    def close_all(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Global instance
+_session_manager = None
+
+
+def get_session_manager() -> ProgrammerSessionManager:
+    """Get global ProgrammerSessionManager instance"""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = ProgrammerSessionManager()
+        atexit.register(_session_manager.close_all)
+    return _session_manager
@@ -0,0 +1,206 @@
+"""
+Programming Scheduler Module
+Runs board programming jobs concurrently across independent programmers
+
+Each programmer is a lane; boards on the same programmer are programmed one
+after another. A programmer config may assign boards to separate channels
+(e.g. a gang programmer); each channel becomes its own lane only if the
+programmer object addresses channels (supports_channels = True and a
+channel argument to program_board). ProgrammerController does not, so
+"channels" are ignored for it and its boards stay in one lane. Lanes run in
+parallel on a thread pool - the programmer CLIs are subprocesses, so
+threads only wait on them.
+
+Every configured board gets a result: boards of a programmer that is not
+available (missing, or failed verify_connection) are reported as failed,
+where the sequential loop used to skip them with a warning.
+"""
+
+import time
+import logging
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+# (completed, total, board_name, status) - matches SMTWorker.programming_progress
+ProgressCallback = Callable[[int, int, str, str], None]
+# Context manager factory wrapped around each programmer call (fixture interlocks)
+JobGuard = Callable[["ProgrammingJob"], ContextManager]
+
+
+@dataclass
+class ProgrammingJob:
+    """One board to program"""
+    board: str
+    programmer: str
+    hex_file: Optional[str]
+    device: Optional[str] = None
+    channel: Optional[str] = None
+
+
+class ProgrammingScheduler:
+    """Programs boards in parallel where the fixture allows it"""
+
+    def __init__(self, programmers: Dict[str, Any], programming_config: Dict[str, Any],
+                 progress_callback: Optional[ProgressCallback] = None,
+                 job_guard: Optional[JobGuard] = None,
+                 job_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Args:
+            programmers: Connected programmers by name (ProgrammerController or compatible)
+            programming_config: Programming section of the SKU configuration
+            progress_callback: Called with (completed, total, board_name, status)
+            job_guard: Returns a context manager held while a board is being programmed
+            job_callback: Called with each board's result as soon as it finishes
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.programmers = programmers
+        self.config = programming_config or {}
+        self.progress_callback = progress_callback
+        self.job_guard = job_guard
+        self.job_callback = job_callback
+
+        self.results: List[Dict[str, Any]] = []
+        self.wall_time = 0.0
+        self._completed = 0
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def build_jobs(self) -> List[ProgrammingJob]:
+        """Expand the programmer/board configuration into jobs"""
+        hex_files = self.config.get("hex_files", {})
+        device_map = self.config.get("device_types", {})
+        jobs = []
+        for prog_name, prog_config in self.config.get("programmers", {}).items():
+            channels = prog_config.get("channels", {})
+            for board_name in prog_config.get("boards", []):
+                channel = channels.get(board_name)
+                jobs.append(ProgrammingJob(
+                    board=board_name,
+                    programmer=prog_name,
+                    hex_file=hex_files.get(board_name),
+                    device=device_map.get(board_name),
+                    channel=str(channel) if channel is not None else None
+                ))
+        return jobs
+
+    def lane(self, job: ProgrammingJob) -> Tuple[str, Optional[str]]:
+        """Jobs sharing a lane must not run at the same time"""
+        if job.channel is not None and self._supports_channels(job.programmer):
+            return job.programmer, job.channel
+        return job.programmer, None
+
+    def _supports_channels(self, programmer_name: str) -> bool:
+        return getattr(self.programmers.get(programmer_name), "supports_channels", False)
+
+    def group_lanes(self, jobs: List[ProgrammingJob]) -> Dict[Tuple[str, Optional[str]], List[ProgrammingJob]]:
+        """Group jobs into lanes, keeping configuration order within each lane"""
+        lanes: Dict[Tuple[str, Optional[str]], List[ProgrammingJob]] = {}
+        for job in jobs:
+            lanes.setdefault(self.lane(job), []).append(job)
+        return lanes
+
+    def run(self, jobs: Optional[List[ProgrammingJob]] = None) -> List[Dict[str, Any]]:
+        """
+        Program all boards, running independent lanes concurrently.
+
+        Returns:
+            One result dict per board (board, programmer, hex_file, success, message, duration)
+        """
+        jobs = self.build_jobs() if jobs is None else jobs
+        self.results = []
+        self._completed = 0
+        self._total = len(jobs)
+        if not jobs:
+            return self.results
+
+        lanes = self.group_lanes(jobs)
+        max_workers = self.config.get("max_parallel") or len(lanes)
+        self.logger.info(f"Programming {len(jobs)} boards on {len(lanes)} lane(s), {max_workers} at a time")
+        self._report(0, "", "STARTING")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="programmer") as pool:
+            futures = [pool.submit(self._run_lane, lane_jobs) for lane_jobs in lanes.values()]
+            for future in futures:
+                future.result()
+        self.wall_time = time.perf_counter() - start
+
+        # Report in configuration order regardless of completion order
+        order = {(job.programmer, job.board): index for index, job in enumerate(jobs)}
+        self.results.sort(key=lambda r: order[(r["programmer"], r["board"])])
+
+        sequential = self.sequential_time
+        self.logger.info(f"Programming wall time {self.wall_time:.1f}s vs {sequential:.1f}s sequential "
+                         f"(saved {max(0.0, sequential - self.wall_time):.1f}s)")
+        return self.results
+
+    @property
+    def sequential_time(self) -> float:
+        """Sum of per-board durations - what a one-at-a-time run would have taken"""
+        return sum(r.get("duration", 0.0) for r in self.results)
+
+    def _run_lane(self, jobs: List[ProgrammingJob]):
+        for job in jobs:
+            self._run_job(job)
+
+    def _run_job(self, job: ProgrammingJob):
+        start = time.perf_counter()
+        success, message = self._program(job)
+        result = {
+            "board": job.board,
+            "programmer": job.programmer,
+            "hex_file": job.hex_file,
+            "success": success,
+            "message": message,
+            "duration": time.perf_counter() - start
+        }
+        with self._lock:
+            self.results.append(result)
+            self._completed += 1
+            completed = self._completed
+
+        if success:
+            self.logger.info(f"Successfully programmed {job.board}")
+        else:
+            self.logger.error(f"Failed to program {job.board}: {message}")
+        self._report(completed, job.board, "PASS" if success else f"FAIL: {message}")
+        if self.job_callback:
+            try:
+                self.job_callback(result)
+            except Exception as e:
+                self.logger.error(f"Programming job callback error: {e}")
+
+    def _program(self, job: ProgrammingJob) -> Tuple[bool, str]:
+        programmer = self.programmers.get(job.programmer)
+        if programmer is None:
+            # Not connected or failed verification: the board fails instead of being skipped
+            return False, f"Programmer {job.programmer} not available"
+        if not job.hex_file:
+            return False, f"No hex file specified for board {job.board}"
+        # Programmers with a hex cache stat the source themselves - skip the extra share round trip
+        if getattr(programmer, "hex_cache", None) is None and not Path(job.hex_file).exists():
+            return False, f"Hex file not found: {job.hex_file}"
+
+        with self._lock:
+            completed = self._completed
+        self._report(completed, job.board, "PROGRAMMING")
+        try:
+            with self.job_guard(job) if self.job_guard else nullcontext():
+                if self.lane(job)[1] is not None:
+                    return programmer.program_board(str(Path(job.hex_file)), job.board, device=job.device,
+                                                    channel=job.channel)
+                return programmer.program_board(str(Path(job.hex_file)), job.board, device=job.device)
+        except Exception as e:
+            return False, f"Programming exception: {e}"
+
+    def _report(self, completed: int, board: str, status: str):
+        if not self.progress_callback:
+            return
+        try:
+            self.progress_callback(completed, self._total, board, status)
+        except Exception as e:
+            self.logger.error(f"Programming progress callback error: {e}")
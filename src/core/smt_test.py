@@ -1,10 +1,16 @@
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 from pathlib import Path
 from src.core.base_test import BaseTest, TestResult
 from src.core.programmer_controller import ProgrammerController
+from src.core.hex_cache import get_hex_cache
+from src.core.test_plan import TestPlan, get_test_plan_cache
+from src.core.programmer_session import get_session_manager
+from src.core.programming_scheduler import ProgrammingScheduler, ProgrammingJob
+from src.core.panel_pipeline import FixtureConstraints, PanelPipeline
 from src.core.smt_controller import SMTController
 from src.hardware.smt_arduino_controller import SMTArduinoController
+from src.utils.security_validators import SecurityValidationError
 
 class SMTTest(BaseTest):
     """SMT panel testing with programming and power validation using dedicated SMT Arduino"""
@@ -24,15 +30,22 @@ class SMTTest(BaseTest):
             
         self.smt_controller = SMTController(self.arduino)
         self.relay_mapping = {}
+        self.test_plan: Optional[TestPlan] = None
 
         # Programming control
         self.programmers: Dict[str, ProgrammerController] = {}
         self.programming_enabled = False
         self.programming_results: List[Dict[str, Any]] = []
+        self.programming_timing: Dict[str, float] = {}
+        self.programming_progress_callback: Optional[Callable[[int, int, str, str], None]] = None
 
         # Initialize programmers if configured
         self._initialize_programmers()
 
+    def set_programming_progress_callback(self, callback: Callable[[int, int, str, str], None]):
+        """Set callback for per-board programming progress (completed, total, board_name, status)"""
+        self.programming_progress_callback = callback
+
     def _handle_arduino_error(self, error_type: str, message: str):
         """Handle errors reported by Arduino"""
         self.logger.error(f"Arduino error - {error_type}: {message}")
@@ -55,11 +68,28 @@ class SMTTest(BaseTest):
             if self.programming_enabled:
                 programmers_config = self.programming_config.get("programmers", {})
 
+                # Validate and copy hex images to local disk before the first board
+                hex_cache = get_hex_cache()
+                if hex_cache:
+                    staged = hex_cache.stage_all(self.programming_config.get("hex_files", {}))
+                    self.logger.info(f"Staged {len(staged)} hex file(s) in {hex_cache.cache_dir}")
+
                 for prog_name, prog_config in programmers_config.items():
                     try:
+                        # Optional batch front end kept running between boards and tests
+                        session = None
+                        if prog_config.get("session_command"):
+                            try:
+                                session = get_session_manager().get_session(prog_config["session_command"])
+                            except SecurityValidationError as e:
+                                self.logger.error(f"Invalid session_command for {prog_name} programmer, "
+                                                  f"programming through subprocesses: {e}")
+
                         programmer = ProgrammerController(
                             programmer_type=prog_config["type"],
-                            programmer_path=prog_config["path"]
+                            programmer_path=prog_config["path"],
+                            hex_cache=hex_cache,
+                            session=session
                         )
 
                         # Verify programmer connection
@@ -68,6 +98,7 @@ class SMTTest(BaseTest):
                             self.programmers[prog_name] = programmer
                             self.logger.info(f"Initialized {prog_name} programmer: {msg}")
                         else:
+                            # Its boards are reported as failed when programming runs
                             self.logger.warning(f"Failed to initialize {prog_name} programmer: {msg}")
 
                     except Exception as e:
@@ -106,6 +137,11 @@ class SMTTest(BaseTest):
                 self.logger.error("No relay_mapping found in SKU configuration")
                 return False
 
+            # Compiled once per SKU: TESTSEQ command, relay lookups, limits
+            self.test_plan = get_test_plan_cache().get(
+                self.sku, self.relay_mapping, smt_config.get("test_sequence", []))
+            self.relay_mapping = self.test_plan.relay_mapping
+
             # Configure SMT controller
             self.smt_controller.set_configuration(smt_config)
 
@@ -124,29 +160,40 @@ class SMTTest(BaseTest):
     def run_test_sequence(self) -> TestResult:
         """Execute test sequence from configuration only"""
         try:
-            # Programming phase if enabled
-            if self.programming_enabled and self.programmers:
-                self.update_progress("Programming boards...", 0)
-                success = self._execute_programming_phase(30.0, 45)
-                if not success:
-                    self.result.failures.append("Programming phase failed")
+            plan = self._test_plan()
+            test_sequence = plan.test_sequence
+            use_testseq = hasattr(self.arduino, 'execute_test_sequence')
+            pipelined_result = None
+
+            # Programming phase if enabled - overlapped with TESTSEQ when the fixture allows it
+            if self.programming_enabled:  # unavailable programmers fail their boards, not skip them
+                scheduler = ProgrammingScheduler(self.programmers, self.programming_config,
+                                                 progress_callback=self.programming_progress_callback)
+                jobs = scheduler.build_jobs()
+                constraints = FixtureConstraints(self.parameters.get("fixture", {}))
+
+                if use_testseq and test_sequence and constraints.can_pipeline(jobs):
+                    self.update_progress("Programming and testing boards...", 0)
+                    pipelined_result = self._execute_pipelined_phase(scheduler, constraints, jobs, test_sequence)
+                else:
+                    self.update_progress("Programming boards...", 0)
+                    success = self._execute_programming_phase(30.0, 45)
+                    if not success:
+                        self.result.failures.append("Programming phase failed")
             
             
             # Execute test sequence using new TESTSEQ protocol
             self.update_progress("Executing test sequence...", 0)
             
             # Get test sequence from configuration
-            test_sequence = self.parameters.get("test_sequence", [])
             if not test_sequence:
                 raise ValueError("No test_sequence defined in SKU configuration")
             
-            # Check if we should use new TESTSEQ protocol
-            use_testseq = hasattr(self.arduino, 'execute_test_sequence')
-            
             if use_testseq:
                 # Use new TESTSEQ protocol for simultaneous relay activation
                 self.logger.info("Using TESTSEQ protocol for simultaneous relay activation")
-                result = self.arduino.execute_test_sequence(self.relay_mapping, test_sequence)
+                result = pipelined_result or self.arduino.execute_test_sequence(
+                    self.relay_mapping, test_sequence, plan=plan.sequence)
                 
                 if not result["success"]:
                     self.logger.error(f"Test sequence failed: {result['errors']}")
@@ -167,20 +214,10 @@ class SMTTest(BaseTest):
                 # Fall back to legacy test_panel method
                 self.logger.info("Using legacy test_panel method (upgrade firmware for TESTSEQ support)")
                 
-                # Get list of all configured relays from relay_mapping
-                configured_relays = []
-                for relay_str, mapping in self.relay_mapping.items():
-                    if mapping:
-                        # Handle both single relays and comma-separated groups
-                        if ',' in relay_str:
-                            relays = [int(r.strip()) for r in relay_str.split(',')]
-                            configured_relays.extend(relays)
-                        else:
-                            configured_relays.append(int(relay_str))
-                
+                configured_relays = plan.configured_relays
                 if configured_relays:
-                    self.logger.info(f"Testing configured relays: {sorted(set(configured_relays))}")
-                    panel_measurements = self.arduino.test_panel(relay_list=sorted(set(configured_relays)))
+                    self.logger.info(f"Testing configured relays: {configured_relays}")
+                    panel_measurements = self.arduino.test_panel(relay_list=configured_relays)
                 else:
                     # No relay mapping, test all
                     self.logger.info("No relay mapping configured, testing all relays")
@@ -224,110 +261,72 @@ class SMTTest(BaseTest):
 
 
     def _execute_programming_phase(self, duration: float, base_progress: int) -> bool:
-        """Execute board programming phase"""
+        """Execute board programming phase, running independent programmers in parallel"""
         try:
             self.logger.info("Starting board programming phase")
 
-            hex_files = self.programming_config.get("hex_files", {})
-            programmers_config = self.programming_config.get("programmers", {})
-            device_map = self.programming_config.get("device_types", {})
-
-            programming_success = True
-            total_boards = 0
-            successful_boards = 0
-
-            # Count total boards to program
-            for prog_name, prog_config in programmers_config.items():
-                total_boards += len(prog_config.get("boards", []))
-
-            board_index = 0
-
-            # Program each board
-            for prog_name, prog_config in programmers_config.items():
-                if prog_name not in self.programmers:
-                    self.logger.warning(f"Programmer {prog_name} not available")
-                    continue
-
-                programmer = self.programmers[prog_name]
-                boards = prog_config.get("boards", [])
-
-                for board_name in boards:
-                    board_index += 1
-
-                    # Update progress
-                    board_progress = base_progress + (board_index * 25 // total_boards)
-                    self.update_progress(f"Programming {board_name}...", 0)
-
-                    # Get hex file for this board
-                    hex_file = hex_files.get(board_name)
-                    if not hex_file:
-                        error_msg = f"No hex file specified for board {board_name}"
-                        self.logger.error(error_msg)
-                        self.programming_results.append({
-                            "board": board_name,
-                            "success": False,
-                            "message": error_msg
-                        })
-                        programming_success = False
-                        continue
-
-                    # Check if hex file exists
-                    hex_path = Path(hex_file)
-                    if not hex_path.exists():
-                        error_msg = f"Hex file not found: {hex_file}"
-                        self.logger.error(error_msg)
-                        self.programming_results.append({
-                            "board": board_name,
-                            "success": False,
-                            "message": error_msg
-                        })
-                        programming_success = False
-                        continue
-
-                    # Note: Batch-only Arduino doesn't support programming control
-                    # Programming must be done with external hardware
-                    self.logger.info(f"Programming {board_name} - Arduino board selection not available in batch mode")
-
-                    # Get device type for this board, None triggers default in programmer
-                    device = device_map.get(board_name, None)
-                    
-                    # Program the board with device parameter
-                    prog_success, prog_message = programmer.program_board(str(hex_path), board_name, device=device)
-
-                    self.programming_results.append({
-                        "board": board_name,
-                        "success": prog_success,
-                        "message": prog_message
-                    })
-
-                    if prog_success:
-                        successful_boards += 1
-                        self.logger.info(f"Successfully programmed {board_name}")
-                    else:
-                        programming_success = False
-                        self.logger.error(f"Failed to program {board_name}: {prog_message}")
-
-            # Note: Batch-only Arduino doesn't have programming control methods
-            self.logger.info("Programming cleanup - Arduino programming control not available in batch mode")
-
-            # Record programming results
-            if total_boards > 0:
-                programming_yield = (successful_boards / total_boards) * 100
-                self.result.add_measurement(
-                    "programming_yield",
-                    programming_yield,
-                    100.0,  # Expect 100% yield
-                    100.0,
-                    "%"
-                )
-
-            self.logger.info(f"Programming phase complete: {successful_boards}/{total_boards} boards successful")
-            return programming_success
+            scheduler = ProgrammingScheduler(self.programmers, self.programming_config,
+                                             progress_callback=self.programming_progress_callback)
+            results = scheduler.run()
+            self.programming_timing = {
+                "wall_time_s": scheduler.wall_time,
+                "sequential_time_s": scheduler.sequential_time
+            }
+            return self._record_programming_results(results)
 
         except Exception as e:
             self.logger.error(f"Programming phase error: {e}")
             return False
 
+    def _execute_pipelined_phase(self, scheduler: ProgrammingScheduler, constraints: FixtureConstraints,
+                                 jobs: List[ProgrammingJob], test_sequence: List[Dict]) -> Dict[str, Any]:
+        """Program boards and run TESTSEQ on each board as soon as it is programmed
+
+        Returns:
+            Merged execute_test_sequence result for the whole panel
+        """
+        self.logger.info("Starting pipelined programming and test phase")
+
+        plan = self._test_plan()
+
+        def run_sequence(relay_mapping: Dict[str, Any]) -> Dict[str, Any]:
+            boards = {meta["board"] for meta in relay_mapping.values()}
+            return self.arduino.execute_test_sequence(relay_mapping, test_sequence, plan=plan.for_boards(boards))
+
+        pipeline = PanelPipeline(scheduler, constraints, self.relay_mapping, run_sequence)
+        result = pipeline.run(jobs)
+        self.programming_timing = {
+            "wall_time_s": scheduler.wall_time,
+            "sequential_time_s": scheduler.sequential_time,
+            "panel_cycle_s": pipeline.timing.get("wall_time_s", 0.0),
+            "testing_time_s": pipeline.timing.get("testing_time_s", 0.0)
+        }
+
+        if not self._record_programming_results(scheduler.results):
+            self.result.failures.append("Programming phase failed")
+        return result
+
+    def _record_programming_results(self, results: List[Dict[str, Any]]) -> bool:
+        """Store programming results and the yield measurement; True if every board programmed"""
+        self.programming_results.extend(results)
+
+        total_boards = len(results)
+        successful_boards = sum(1 for r in results if r["success"])
+
+        # Record programming results
+        if total_boards > 0:
+            programming_yield = (successful_boards / total_boards) * 100
+            self.result.add_measurement(
+                "programming_yield",
+                programming_yield,
+                100.0,  # Expect 100% yield
+                100.0,
+                "%"
+            )
+
+        self.logger.info(f"Programming phase complete: {successful_boards}/{total_boards} boards successful")
+        return successful_boards == total_boards
+
     def _distribute_panel_results(self, panel_measurements: Dict[int, Dict], relay_mapping: Dict) -> Dict[str, Dict[int, Dict]]:
         """
         Distribute panel measurements by function based on relay mapping
@@ -400,22 +399,13 @@ class SMTTest(BaseTest):
             Formatted results {Board_X: {relay, voltage, current, power}}
         """
         formatted = {}
-        
+        limit_table = self._test_plan().limits
+
         for board_num, measurements in board_measurements.items():
             board_key = f"Board {board_num}"
             
-            # Find relay number(s) for this board/function combination
-            relay_info = None
-            for relay_str, mapping in self.relay_mapping.items():
-                if (mapping and 
-                    mapping.get("board") == board_num and 
-                    mapping.get("function") == function):
-                    # Keep the original string format (might be comma-separated)
-                    relay_info = relay_str
-                    break
-            
             formatted[board_key] = {
-                "relay": relay_info,  # Can be "1" or "1,2,3" format
+                "relay": limit_table.relay_for(board_num, function),  # Can be "1" or "1,2,3" format
                 "voltage": measurements.get("voltage", 0),
                 "current": measurements.get("current", 0),
                 "power": measurements.get("power", 0)
@@ -424,70 +414,35 @@ class SMTTest(BaseTest):
         return formatted
 
 
+    def _test_plan(self) -> TestPlan:
+        """Compiled plan for this SKU (normally fetched in setup_hardware)"""
+        if self.test_plan is None:
+            self.test_plan = get_test_plan_cache().get(
+                self.sku, self.relay_mapping, self.parameters.get("test_sequence", []))
+        return self.test_plan
+
     def _analyze_results(self):
         """Analyze results based on configuration limits"""
         try:
             self.update_progress("Analyzing results...", 0)
-            
-            # Create a list of keys to avoid dictionary modification during iteration
-            measurement_keys = list(self.result.measurements.keys())
-            
-            # Analyze each function's results
-            for function_name in measurement_keys:
-                if not function_name.endswith("_readings"):
-                    continue
-                    
-                data = self.result.measurements.get(function_name)
-                if not data:
-                    continue
-                    
-                function = function_name.replace("_readings", "")
-                board_results = data.get("board_results", {})
-                limits = data.get("limits", {})
-                
-                # Check each board against limits (pass/fail per board)
-                for board_name, measurements in board_results.items():
-                    self._check_limits(board_name, function, measurements, limits)
-            
+
+            # Gather every function's board results and check them against the limits in one pass
+            readings = {}
+            for name, data in self.result.measurements.items():
+                if name.endswith("_readings") and data:
+                    readings[name[:-len("_readings")]] = data.get("board_results", {})
+
+            failed = self._test_plan().limits.apply(self.result, readings)
+            if failed:
+                self.logger.info(f"{failed} measurement(s) out of limits")
+
             # Check programming results
             self._check_programming_results()
             
         except Exception as e:
             self.logger.error(f"Analysis error: {e}")
             self.result.failures.append(f"Analysis error: {str(e)}")
-    
-    def _check_limits(self, board_name: str, function: str, measurements: Dict, limits: Dict):
-        """Check measurements against limits"""
-        # Debug logging
-        self.logger.debug(f"_check_limits called for {board_name} {function}")
-        self.logger.debug(f"  measurements: {measurements}")
-        self.logger.debug(f"  limits: {limits}")
-        
-        # Extract board number from "Board X" format
-        board_num = board_name.split()[-1] if board_name.startswith("Board") else board_name
-        
-        # Check current
-        if "current" in measurements and "current_a" in limits:
-            current = measurements["current"]
-            min_val = limits["current_a"]["min"]
-            max_val = limits["current_a"]["max"]
-            
-            self.result.add_measurement(
-                f"{function}_board_{board_num}_current",
-                current, min_val, max_val, "A"
-            )
-        
-        # Check voltage
-        if "voltage" in measurements and "voltage_v" in limits:
-            voltage = measurements["voltage"]
-            min_val = limits["voltage_v"]["min"]
-            max_val = limits["voltage_v"]["max"]
-            
-            self.result.add_measurement(
-                f"{function}_board_{board_num}_voltage",
-                voltage, min_val, max_val, "V"
-            )
-    
+
     def _check_programming_results(self):
         """Check programming results if applicable"""
         if self.programming_results:
@@ -535,7 +490,12 @@ if __name__ == "__main__":
             "stm8": {
                 "type": "STM8",
                 "path": "C:/Program Files/STMicroelectronics/st_toolset/stvp/STVP_CmdLine.exe",
-                "boards": ["main_controller", "led_driver_1"]
+                "boards": ["main_controller", "led_driver_1"],
+                # Gang programmer channels: boards on different channels program in parallel only with
+                # a programmer that addresses channels; ProgrammerController programs them one at a time
+                "channels": {"main_controller": 1, "led_driver_1": 2}
+                # Optional batch front end kept running between boards (see programmer_session.py):
+                # "session_command": ["C:/Tools/stvp_batch.exe", "--session"]
             },
             "pic": {
                 "type": "PIC",
@@ -552,6 +512,12 @@ if __name__ == "__main__":
 
     # Example test parameters - configuration-driven
     parameters = {
+        # Optional: test each board as soon as it is programmed
+        "fixture": {
+            "pipeline": True,
+            "programmed_boards": {"main_controller": 1, "led_driver_1": 1, "power_board": 2},
+            "isolation_groups": [[1, 2]]
+        },
         "timing": {
             "power_stabilization_s": 0.5,
             "default_test_duration_s": 1.5,
@@ -0,0 +1,122 @@
+"""
+Test Plan Module
+Compiled per-SKU SMT test plans, built once and reused for every panel
+
+A TestPlan holds everything about a SKU's SMT test that does not change
+from panel to panel: the TESTSEQ command with its relay group lookup,
+validation errors and timeout, the relays for the legacy test_panel path,
+and the limit table. Plans are cached per SKU, compiled from the SKU
+manager's data, and dropped when the manager reports the SKU changed.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.limit_table import LimitTable
+from src.hardware.smt_arduino_controller import SequencePlan, compile_sequence_plan
+
+
+class TestPlan:
+    """Panel-independent part of a SKU's SMT test"""
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, sku: str, relay_mapping: Dict[str, Any], test_sequence: List[Dict[str, Any]]):
+        """
+        Args:
+            sku: SKU identifier
+            relay_mapping: SKU relay_mapping
+            test_sequence: SKU test_sequence
+        """
+        self.sku = sku
+        self.relay_mapping = relay_mapping
+        self.test_sequence = test_sequence
+
+        self.sequence: SequencePlan = compile_sequence_plan(relay_mapping, test_sequence)
+        self.limits = LimitTable(test_sequence, relay_mapping)
+
+        # Individual relays for the legacy test_panel path
+        relays = set()
+        for relay_str, mapping in relay_mapping.items():
+            if mapping:
+                relays.update(int(r.strip()) for r in relay_str.split(','))
+        self.configured_relays: List[int] = sorted(relays)
+
+        self._subsets: Dict[Tuple[int, ...], SequencePlan] = {}
+        self._lock = threading.Lock()
+
+    def for_boards(self, boards) -> SequencePlan:
+        """Sequence plan for a subset of the panel's boards (pipelined testing), compiled once per subset"""
+        key = tuple(sorted(boards))
+        with self._lock:
+            plan = self._subsets.get(key)
+            if plan is None:
+                subset = {relay: meta for relay, meta in self.relay_mapping.items()
+                          if meta and meta.get("board") in key}
+                plan = compile_sequence_plan(subset, self.test_sequence)
+                self._subsets[key] = plan
+            return plan
+
+
+class TestPlanCache:
+    """Compiled TestPlans by SKU with invalidation on reload"""
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # sku -> (plan, (relay_mapping, test_sequence) as given)
+        self._plans: Dict[str, Tuple[TestPlan, Tuple[Any, Any]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "compiles": 0}
+
+    def get(self, sku: str, relay_mapping: Dict[str, Any], test_sequence: List[Dict[str, Any]]) -> TestPlan:
+        """
+        Get the compiled plan for a SKU, compiling it on first use or after a reload.
+
+        The configuration is compared by identity: SKUManager hands out the same
+        relay_mapping/test_sequence objects until it reloads the SKU, so a plan
+        is always compiled from the manager's current data.
+        """
+        with self._lock:
+            entry = self._plans.get(sku)
+            if entry:
+                plan, (plan_mapping, plan_sequence) = entry
+                if plan_mapping is relay_mapping and plan_sequence is test_sequence:
+                    self.stats["hits"] += 1
+                    return plan
+
+            plan = TestPlan(sku, relay_mapping, test_sequence)
+            self._plans[sku] = (plan, (relay_mapping, test_sequence))
+            self.stats["compiles"] += 1
+            self.logger.info(f"Compiled test plan for {sku}: {plan.sequence.command}")
+            return plan
+
+    def watch(self, sku_manager):
+        """Drop the plans of SKUs a SKUManager reports as changed (no-op if already watching it)"""
+        sku_manager.add_change_callback(self._on_skus_changed)
+
+    def _on_skus_changed(self, changes):
+        for sku in changes.skus:
+            self.invalidate(sku)
+
+    def invalidate(self, sku: Optional[str] = None):
+        """Drop one SKU's plan, or all plans"""
+        with self._lock:
+            if sku is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(sku, None)
+
+
+# Global instance
+_test_plan_cache = None
+
+
+def get_test_plan_cache() -> TestPlanCache:
+    """Get global TestPlanCache instance"""
+    global _test_plan_cache
+    if _test_plan_cache is None:
+        _test_plan_cache = TestPlanCache()
+    return _test_plan_cache
@@ -0,0 +1,247 @@
+"""
+Write-ahead journal for test results
+Results are appended as checksummed lines at result time and moved into the
+results store on the next startup, so a crash or power loss does not lose them.
+
+Several tester instances (one per fixture) may share the journal. Each holds a
+shared lock on it while open, and replay only moves the journal when it can
+take an exclusive lock, so a running instance never appends to a journal file
+that was already replayed and deleted. On Windows an open file cannot be
+deleted, which gives the same guarantee without a lock.
+"""
+import os
+import json
+import time
+import uuid
+import zlib
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from config.settings import RESULT_JOURNAL
+from src.utils.path_manager import get_path_manager
+
+
+class ResultJournal:
+    """Append-only result journal with tunable fsync cadence"""
+
+    def __init__(self, journal_path: Optional[Path] = None,
+                 fsync_every: Optional[int] = None,
+                 fsync_interval_s: Optional[float] = None):
+        """
+        Args:
+            journal_path: Journal file (default: local data dir / RESULT_JOURNAL['filename'])
+            fsync_every: fsync after this many appends, 0 disables count-based fsync
+            fsync_interval_s: fsync when this many seconds passed since the last sync, 0 disables
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if journal_path is None:
+            journal_path = get_path_manager().get_local_data_dir() / RESULT_JOURNAL['filename']
+        self.journal_path = Path(journal_path)
+        self.fsync_every = RESULT_JOURNAL['fsync_every'] if fsync_every is None else fsync_every
+        self.fsync_interval_s = (RESULT_JOURNAL['fsync_interval_s']
+                                 if fsync_interval_s is None else fsync_interval_s)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        """Encode a record as '<crc32> <json>\\n'"""
+        payload = json.dumps(record, separators=(',', ':'), default=str).encode('utf-8')
+        return b"%08x " % zlib.crc32(payload) + payload + b"\n"
+
+    @staticmethod
+    def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+        """Decode a journal line, returning None for torn or corrupt lines"""
+        line = line.rstrip(b"\r\n")
+        if len(line) < 10 or line[8:9] != b" ":
+            return None
+        payload = line[9:]
+        try:
+            if int(line[:8], 16) != zlib.crc32(payload):
+                return None
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    def _open(self):
+        while self._file is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.journal_path, 'ab')
+            if fcntl is None:
+                return
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH)
+            # Another instance may have replayed and deleted the file before the lock was granted
+            try:
+                if os.stat(self.journal_path).st_ino == os.fstat(self._file.fileno()).st_ino:
+                    return
+            except FileNotFoundError:
+                pass
+            self._file.close()
+            self._file = None
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, record: Dict[str, Any]) -> str:
+        """
+        Append a record to the journal.
+
+        The line is always handed to the OS; fsync follows the configured cadence.
+
+        Returns:
+            The record id (assigned if missing)
+        """
+        record.setdefault('id', uuid.uuid4().hex)
+        data = self._encode(record)
+
+        with self._lock:
+            self._open()
+            self._file.write(data)
+            self._file.flush()
+            self._unsynced += 1
+
+            if ((self.fsync_every and self._unsynced >= self.fsync_every) or
+                    (self.fsync_interval_s and
+                     time.monotonic() - self._last_sync >= self.fsync_interval_s)):
+                self._sync()
+
+        return record['id']
+
+    def flush(self):
+        """Force pending records to disk"""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._sync()
+
+    def close(self):
+        """Sync and close the journal file"""
+        with self._lock:
+            if self._file is not None:
+                try:
+                    if self._unsynced:
+                        self._sync()
+                finally:
+                    self._file.close()
+                    self._file = None
+
+    def read_records(self) -> List[Dict[str, Any]]:
+        """Read all intact records from the journal"""
+        if not self.journal_path.exists():
+            return []
+
+        records = []
+        skipped = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                record = self._decode(line)
+                if record is None:
+                    skipped += 1
+                else:
+                    records.append(record)
+
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} torn/corrupt journal line(s)")
+        return records
+
+    def replay(self, results_logger=None) -> int:
+        """
+        Move journaled records into the results store and clear the journal.
+
+        Records already present in the store (same id) are skipped, so an
+        interrupted replay can safely run again. While another instance has the
+        journal open, the replay is deferred to a later startup.
+
+        Returns:
+            Number of records written to the store
+        """
+        if results_logger is None:
+            from src.data.results_logger import ResultsLogger
+            results_logger = ResultsLogger()
+
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+            try:
+                guard = open(self.journal_path, 'rb')
+            except FileNotFoundError:
+                return 0
+            with guard:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(guard.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        self.logger.info("Result journal is open in another instance, replay deferred")
+                        return 0
+
+                records = self.read_records()
+                written = results_logger.write_records(records) if records else 0
+
+                try:
+                    self.journal_path.unlink()
+                except PermissionError:
+                    # Windows: still open in another instance; its records stay for the next replay
+                    self.logger.info("Result journal is open in another instance, kept")
+
+        if records:
+            self.logger.info(f"Replayed {len(records)} journaled result(s), {written} new")
+        return written
+
+
+# Global instance
+_result_journal = None
+
+
+def get_result_journal() -> ResultJournal:
+    """Get global ResultJournal instance"""
+    global _result_journal
+    if _result_journal is None:
+        _result_journal = ResultJournal()
+        atexit.register(_result_journal.close)
+    return _result_journal
+
+
+def replay_result_journal() -> int:
+    """Replay any results left in the journal by a previous run"""
+    try:
+        return get_result_journal().replay()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Result journal replay failed: {e}")
+        return 0
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from src.data.results_logger import ResultsLogger
+
+        for every in (1, 0):
+            journal = ResultJournal(Path(tmp) / f"bench_{every}.journal", fsync_every=every)
+            start = time.perf_counter()
+            for i in range(200):
+                journal.append({'sku': 'DD5000', 'result': {'passed': True, 'index': i}})
+            journal.close()
+            per_test_ms = (time.perf_counter() - start) / 200 * 1000
+            print(f"fsync_every={every}: {per_test_ms:.3f} ms per append")
+
+        journal = ResultJournal(Path(tmp) / "bench_1.journal")
+        print(f"Replayed {journal.replay(ResultsLogger(Path(tmp) / 'results'))} record(s)")
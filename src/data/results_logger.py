@@ -0,0 +1,111 @@
+"""
+Results store for completed tests
+Appends one JSON line per result to a daily file in the local results directory
+"""
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set
+
+from src.utils.path_manager import get_results_dir
+
+
+class ResultsLogger:
+    """Append-only daily JSONL results store"""
+
+    FILE_PREFIX = "results_"
+    FILE_SUFFIX = ".jsonl"
+
+    def __init__(self, results_dir: Optional[Path] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.results_dir = Path(results_dir) if results_dir else get_results_dir()
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def get_results_file(self, date_key: str) -> Path:
+        """Get results file for a YYYYMMDD date key"""
+        return self.results_dir / f"{self.FILE_PREFIX}{date_key}{self.FILE_SUFFIX}"
+
+    @staticmethod
+    def date_key_for(record: Dict[str, Any]) -> str:
+        """Derive the YYYYMMDD date key from a record timestamp"""
+        timestamp = record.get('result', {}).get('timestamp') or record.get('timestamp', '')
+        digits = timestamp[:10].replace('-', '')
+        return digits if len(digits) == 8 and digits.isdigit() else "undated"
+
+    def get_recorded_ids(self, date_key: str) -> Set[str]:
+        """Get ids of records already stored for a date"""
+        ids = set()
+        results_file = self.get_results_file(date_key)
+        if not results_file.exists():
+            return ids
+
+        with open(results_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record_id = json.loads(line).get('id')
+                except json.JSONDecodeError:
+                    continue
+                if record_id:
+                    ids.add(record_id)
+        return ids
+
+    def write_records(self, records: List[Dict[str, Any]], skip_existing: bool = True) -> int:
+        """
+        Append records to their daily files and fsync them.
+
+        Args:
+            records: Result records (dicts with at least 'id' and 'result')
+            skip_existing: Skip records whose id is already stored
+
+        Returns:
+            Number of records written
+        """
+        by_date: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_date.setdefault(self.date_key_for(record), []).append(record)
+
+        written = 0
+        with self._lock:
+            for date_key, date_records in by_date.items():
+                existing = self.get_recorded_ids(date_key) if skip_existing else set()
+                lines = [json.dumps(r, separators=(',', ':')) + "\n"
+                         for r in date_records if r.get('id') not in existing]
+                if not lines:
+                    continue
+
+                with open(self.get_results_file(date_key), 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                written += len(lines)
+
+        if written:
+            self.logger.info(f"Stored {written} result(s) in {self.results_dir}")
+        return written
+
+    def log_result(self, record: Dict[str, Any]) -> bool:
+        """Store a single result record"""
+        try:
+            self.write_records([record], skip_existing=False)
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to store result: {e}")
+            return False
+
+    def load_results(self, date_key: str) -> List[Dict[str, Any]]:
+        """Load all stored records for a YYYYMMDD date key"""
+        results_file = self.get_results_file(date_key)
+        if not results_file.exists():
+            return []
+
+        records = []
+        with open(results_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Skipping malformed line in {results_file.name}")
+        return records
@@ -0,0 +1,242 @@
+"""
+SKU Cache Module
+Compiled binary cache of the SKU JSON files for fast cold starts
+
+A build step validates every SKU file against src/data/sku_schema.py and
+writes the valid configurations into one file, sku_cache.bin, next to the
+skus/ directory. SKUManager reads the file into memory at startup and
+unmarshals each configuration on first access instead of opening and
+parsing its JSON file. The file is not kept open, so the config mirror can
+replace it while the tester runs (Windows refuses to replace a mapped file).
+
+Every entry carries the (mtime_ns, size) of the JSON file it was built from,
+and the header a hash over all of them. A configuration whose file changed
+since the build, or a cache built by another format, schema or Python
+version, is read from JSON as before.
+
+Entries are stored with marshal: the configurations are plain JSON types and
+marshal loads them faster than json or pickle. marshal is not secure against
+malformed or malicious data, so the cache is only as trusted as the shared
+config directory it is built into (the same as the SKU files themselves).
+
+Usage:
+    python -m src.data.sku_cache build [--config-dir config] [--output config/sku_cache.bin]
+    python -m src.data.sku_cache validate [--config-dir config]
+"""
+
+import os
+import json
+import struct
+import marshal
+import hashlib
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.data.sku_schema import SCHEMA_VERSION, validate_sku
+
+CACHE_FILE_NAME = "sku_cache.bin"
+FORMAT_VERSION = 1
+
+# magic, format version, schema version, marshal version, manifest sha256, index length
+_HEADER = struct.Struct("<8sHHI32sQ")
+_MAGIC = b"SKUCACHE"
+
+
+def manifest_hash(stamps: Dict[str, Tuple[int, int]]) -> bytes:
+    """SHA-256 over the "mode:sku" -> (mtime_ns, size) stamps of the SKU files"""
+    digest = hashlib.sha256()
+    for key in sorted(stamps):
+        mtime_ns, size = stamps[key]
+        digest.update(f"{key}\0{mtime_ns}\0{size}\n".encode('utf-8'))
+    return digest.digest()
+
+
+class SKUBinaryCache:
+    """Read-only, in-memory copy of a sku_cache.bin file"""
+
+    def __init__(self, path: Path):
+        """
+        Read a cache file and its index.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a cache of this format, schema and Python version
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._data: Optional[memoryview] = memoryview(f.read())
+        try:
+            if len(self._data) < _HEADER.size:
+                raise ValueError("truncated header")
+            magic, format_version, schema_version, marshal_version, digest, index_length = \
+                _HEADER.unpack_from(self._data)
+            if magic != _MAGIC:
+                raise ValueError("not a SKU cache file")
+            if (format_version, schema_version, marshal_version) != (FORMAT_VERSION, SCHEMA_VERSION,
+                                                                     marshal.version):
+                raise ValueError(f"built for format {format_version}, schema {schema_version}, "
+                                 f"marshal {marshal_version}")
+            self.manifest_hash = digest
+            self._data_start = _HEADER.size + index_length
+            self._index: Dict[str, Tuple[int, int, int, int]] = marshal.loads(
+                self._data[_HEADER.size:self._data_start])
+        except Exception:
+            self._data = None
+            raise
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def load(self, key: str, stamp: Optional[Tuple[int, int]]) -> Optional[Dict[str, Any]]:
+        """
+        Read a "mode:sku" configuration.
+
+        Args:
+            key: "mode:sku"
+            stamp: Current (mtime_ns, size) of the SKU's JSON file
+
+        Returns:
+            The configuration, or None if it is not cached or its file changed since the build
+
+        Raises:
+            ValueError: If the cache was closed
+        """
+        data = self._data
+        if data is None:
+            raise ValueError("SKU cache is closed")
+        entry = self._index.get(key)
+        if entry is None or stamp is None or entry[2:] != tuple(stamp):
+            return None
+        offset, length = entry[0] + self._data_start, entry[1]
+        return marshal.loads(data[offset:offset + length])
+
+    def close(self):
+        """Drop the cached bytes"""
+        self._data = None
+
+
+def open_cache(path: Path) -> Optional[SKUBinaryCache]:
+    """Open a cache file, None if it is missing or unusable"""
+    if not Path(path).is_file():
+        return None
+    try:
+        return SKUBinaryCache(path)
+    except (OSError, ValueError, EOFError, TypeError) as e:
+        logging.getLogger(__name__).warning(f"Ignoring SKU cache {path}: {e}")
+        return None
+
+
+def _read_sku_files(config_dir: Path) -> Tuple[Dict[str, Tuple[Dict[str, Any], Tuple[int, int]]],
+                                                Dict[str, List[str]]]:
+    """Parse and validate the SKU JSON files of a config directory"""
+    from src.data.sku_manager import SKUManager
+    manager = SKUManager(str(config_dir))
+
+    valid, errors = {}, {}
+    for key, json_file in sorted(manager.sku_files.items()):
+        mode = key.split(':', 1)[0]
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            errors[key] = [f"{json_file.name}: {e}"]
+            continue
+        problems = validate_sku(data, mode)
+        if problems:
+            errors[key] = problems
+        else:
+            valid[key] = (data, manager._file_stats[key])
+    return valid, errors
+
+
+def validate_sku_files(config_dir: Path) -> Dict[str, List[str]]:
+    """
+    Validate every SKU file of a config directory.
+
+    Returns:
+        "mode:sku" -> error messages, for the invalid files only
+    """
+    return _read_sku_files(Path(config_dir))[1]
+
+
+def build_sku_cache(config_dir: Path, output: Optional[Path] = None) -> Tuple[int, Dict[str, List[str]]]:
+    """
+    Validate the SKU files of a config directory and write the valid ones to a cache file.
+
+    Invalid files are left out of the cache, so the tester reads (and reports) them from JSON.
+
+    Args:
+        config_dir: Config directory holding skus/
+        output: Cache file (default: <config_dir>/sku_cache.bin)
+
+    Returns:
+        (configurations cached, "mode:sku" -> error messages for the invalid files)
+    """
+    config_dir = Path(config_dir)
+    output = Path(output) if output else config_dir / CACHE_FILE_NAME
+    valid, errors = _read_sku_files(config_dir)
+
+    index, blobs, offset = {}, [], 0
+    for key, (data, stamp) in valid.items():
+        blob = marshal.dumps(data)
+        index[key] = (offset, len(blob), stamp[0], stamp[1])
+        blobs.append(blob)
+        offset += len(blob)
+    index_blob = marshal.dumps(index)
+    digest = manifest_hash({key: stamp for key, (_, stamp) in valid.items()})
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, SCHEMA_VERSION, marshal.version, digest, len(index_blob))
+
+    # Replace atomically: a tester never reads a partly written file
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=output.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(index_blob)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp, output)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+    logging.getLogger(__name__).info(f"Built SKU cache {output}: {len(index)} configurations, "
+                                     f"{len(errors)} invalid")
+    return len(index), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the SKU files and build the binary SKU cache")
+    parser.add_argument("command", choices=["build", "validate"])
+    parser.add_argument("--config-dir", help="Config directory holding skus/ (default: shared config directory)")
+    parser.add_argument("--output", help=f"Cache file (default: <config-dir>/{CACHE_FILE_NAME})")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.config_dir:
+        config_dir = Path(args.config_dir)
+    else:
+        from src.utils.path_manager import get_path_manager
+        config_dir = get_path_manager().get_shared_config_dir()
+
+    if args.command == "build":
+        count, errors = build_sku_cache(config_dir, Path(args.output) if args.output else None)
+        print(f"build: {count} SKU configurations cached")
+    else:
+        errors = validate_sku_files(config_dir)
+    for key, problems in sorted(errors.items()):
+        for problem in problems:
+            print(f"{key}: {problem}")
+    if errors:
+        print(f"{len(errors)} invalid SKU configurations")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+SKU Database Module
+SQLite store for SKU configurations, an alternative backend for SKUManager
+
+Each SKU/mode configuration is stored as its JSON document, with the SKU code,
+mode and description in indexed columns (schema after
+sku-database-migration-plan.md, phase 1). The shared database uses SQLite's
+rollback journal: WAL needs shared memory between the connections, which
+network filesystems (the SMB share) do not provide. A local replica, only
+opened by its own tester, runs in WAL mode.
+
+Testers can read a local replica of the shared-drive database: the replica is
+refreshed with SQLite's online backup API whenever the shared database
+changed, and keeps working from the last copy when the share is unreachable.
+
+Usage:
+    python -m src.data.sku_database import config/skus.db [--skus-dir config/skus]
+    python -m src.data.sku_database export config/skus.db [--skus-dir exported_skus]
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS skus (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sku_code TEXT UNIQUE NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS sku_modes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sku_id INTEGER NOT NULL REFERENCES skus(id) ON DELETE CASCADE,
+    mode TEXT NOT NULL,
+    config TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 1,
+    UNIQUE(sku_id, mode)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sku_modes_mode ON sku_modes(mode, sku_id);
+CREATE INDEX IF NOT EXISTS idx_skus_description ON skus(description COLLATE NOCASE);
+"""
+
+# Statements are module constants so sqlite3's statement cache prepares each once per connection
+_SCAN = """
+    SELECT m.mode, s.sku_code, m.revision, length(m.config)
+    FROM sku_modes m JOIN skus s ON s.id = m.sku_id
+"""
+_GET_CONFIG = """
+    SELECT m.config FROM sku_modes m JOIN skus s ON s.id = m.sku_id
+    WHERE s.sku_code = ? AND m.mode = ?
+"""
+_UPSERT_SKU = """
+    INSERT INTO skus (sku_code, description) VALUES (?, ?)
+    ON CONFLICT(sku_code) DO UPDATE SET description = excluded.description, updated_at = CURRENT_TIMESTAMP
+"""
+_UPSERT_MODE = """
+    INSERT INTO sku_modes (sku_id, mode, config) VALUES ((SELECT id FROM skus WHERE sku_code = ?), ?, ?)
+    ON CONFLICT(sku_id, mode) DO UPDATE SET config = excluded.config, revision = sku_modes.revision + 1
+    WHERE sku_modes.config != excluded.config
+"""
+_DELETE_MODE = """
+    DELETE FROM sku_modes WHERE mode = ? AND sku_id = (SELECT id FROM skus WHERE sku_code = ?)
+"""
+_DELETE_UNUSED_SKUS = """
+    DELETE FROM skus WHERE NOT EXISTS (SELECT 1 FROM sku_modes m WHERE m.sku_id = skus.id)
+"""
+_FIND_BY_DESCRIPTION = """
+    SELECT sku_code FROM skus WHERE description LIKE ? ESCAPE '\\' ORDER BY sku_code
+"""
+_FIND_BY_DESCRIPTION_AND_MODE = """
+    SELECT s.sku_code FROM skus s JOIN sku_modes m ON m.sku_id = s.id
+    WHERE s.description LIKE ? ESCAPE '\\' AND m.mode = ? ORDER BY s.sku_code
+"""
+
+# Mode subdirectories used for JSON import/export (root files are offroad, as in SKUManager)
+JSON_MODES = ['offroad', 'smt', 'weight']
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a database file and its WAL, None if missing"""
+    stamps = []
+    for file in (path, path.with_name(path.name + "-wal")):
+        try:
+            stat = file.stat()
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append(None)
+    if stamps[0] is None:
+        return None
+    return max(s[0] for s in stamps if s), sum(s[1] for s in stamps if s)
+
+
+class SKUDatabase:
+    """SQLite store of SKU configurations ("mode:sku" -> JSON document)"""
+
+    def __init__(self, path: Path, shared_path: Optional[Path] = None, wal: Optional[bool] = None):
+        """
+        Open (and create if needed) a SKU database.
+
+        Args:
+            path: Database file to read and write
+            shared_path: Shared database that `path` is a local replica of
+            wal: Use WAL mode, only for a database on a local disk (default: only for a local replica)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = Path(path)
+        self.shared_path = Path(shared_path) if shared_path else None
+        self._shared_stamp: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False,
+                                     cached_statements=64)
+        wal = self.shared_path is not None if wal is None else wal
+        self._conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._create_schema()
+
+        if self.shared_path:
+            self.refresh_replica()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO schema_version (version) VALUES (?)", (SCHEMA_VERSION,))
+
+    # Replica
+
+    def refresh_replica(self) -> bool:
+        """
+        Copy the shared database into the local replica if it changed.
+
+        Returns:
+            True if the replica was updated
+        """
+        if not self.shared_path:
+            return False
+        stamp = _file_stamp(self.shared_path)
+        if stamp is None:
+            self.logger.warning(f"Shared SKU database {self.shared_path} unreachable, using local replica")
+            return False
+        if stamp == self._shared_stamp:
+            return False
+
+        try:
+            source = sqlite3.connect(f"file:{self.shared_path.as_posix()}?mode=ro", uri=True, timeout=10)
+            try:
+                with self._lock:
+                    source.backup(self._conn)
+            finally:
+                source.close()
+        except sqlite3.Error as e:
+            self.logger.error(f"Could not refresh SKU database replica from {self.shared_path}: {e}")
+            return False
+
+        self._shared_stamp = stamp
+        self.logger.info(f"SKU database replica refreshed from {self.shared_path}")
+        return True
+
+    # Queries
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """
+        List the stored configurations.
+
+        Returns:
+            "mode:sku" -> (revision, size), changing whenever a configuration changes
+        """
+        with self._lock:
+            rows = self._conn.execute(_SCAN).fetchall()
+        return {f"{mode}:{sku}": (revision, size) for mode, sku, revision, size in rows}
+
+    def get_config(self, sku: str, mode: str) -> Optional[Dict[str, Any]]:
+        """Get a SKU's configuration for an internal mode ("smt", "offroad", "weight")"""
+        with self._lock:
+            row = self._conn.execute(_GET_CONFIG, (sku, mode)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_description(self, prefix: str, mode: Optional[str] = None) -> List[str]:
+        """SKUs whose description starts with prefix (case-insensitive, uses the description index)"""
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            if mode:
+                rows = self._conn.execute(_FIND_BY_DESCRIPTION_AND_MODE, (pattern, mode)).fetchall()
+            else:
+                rows = self._conn.execute(_FIND_BY_DESCRIPTION, (pattern,)).fetchall()
+        return [row[0] for row in rows]
+
+    # Changes
+
+    def put_config(self, sku: str, mode: str, config: Dict[str, Any]):
+        """Insert or update a SKU's configuration for a mode"""
+        self.put_configs([(sku, mode, config)])
+
+    def put_configs(self, configs: List[Tuple[str, str, Dict[str, Any]]]):
+        """Insert or update several configurations in one transaction"""
+        with self._lock, self._conn:
+            for sku, mode, config in configs:
+                document = {k: v for k, v in config.items() if k != 'mode'}
+                self._conn.execute(_UPSERT_SKU, (sku, document.get('description')))
+                self._conn.execute(_UPSERT_MODE, (sku, mode, json.dumps(document, sort_keys=True)))
+
+    def delete_config(self, sku: str, mode: str):
+        """Delete a SKU's configuration for a mode (and the SKU once it has none left)"""
+        with self._lock, self._conn:
+            self._conn.execute(_DELETE_MODE, (mode, sku))
+            self._conn.execute(_DELETE_UNUSED_SKUS)
+
+    # JSON import/export
+
+    def import_json_dir(self, skus_dir: Path) -> int:
+        """
+        Import the SKU JSON files of a config/skus directory.
+
+        Returns:
+            Number of configurations imported
+        """
+        skus_dir = Path(skus_dir)
+        files = [(mode, f) for mode in JSON_MODES for f in sorted((skus_dir / mode).glob("*.json"))]
+        files += [('offroad', f) for f in sorted(skus_dir.glob("*.json"))]
+
+        configs = []
+        for mode, json_file in files:
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    configs.append((json_file.stem, mode, json.load(f)))
+            except Exception as e:
+                self.logger.error(f"Failed to import SKU file {json_file}: {e}")
+        self.put_configs(configs)
+        self.logger.info(f"Imported {len(configs)} SKU configurations from {skus_dir}")
+        return len(configs)
+
+    def export_json_dir(self, skus_dir: Path) -> int:
+        """
+        Write every configuration to <skus_dir>/<mode>/<sku>.json.
+
+        Returns:
+            Number of configurations exported
+        """
+        skus_dir = Path(skus_dir)
+        count = 0
+        for key in sorted(self.scan()):
+            mode, sku = key.split(':', 1)
+            config = self.get_config(sku, mode)
+            (skus_dir / mode).mkdir(parents=True, exist_ok=True)
+            with open(skus_dir / mode / f"{sku}.json", 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2)
+            count += 1
+        self.logger.info(f"Exported {count} SKU configurations to {skus_dir}")
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_configured_database() -> Optional[SKUDatabase]:
+    """Open the database configured in SKU_DATABASE, None if disabled or unavailable"""
+    from config.settings import SKU_DATABASE
+    if not SKU_DATABASE.get('enabled', False):
+        return None
+
+    logger = logging.getLogger(__name__)
+    try:
+        path = SKU_DATABASE.get('path')
+        if not path:
+            # On the share itself: the config mirror only copies JSON files
+            from src.utils.path_manager import get_path_manager
+            path = get_path_manager().get_shared_config_dir() / "skus.db"
+        replica = SKU_DATABASE.get('local_replica')
+        if replica:
+            return SKUDatabase(Path(os.path.expandvars(replica)), shared_path=Path(path))
+        return SKUDatabase(Path(path))
+    except Exception as e:
+        logger.error(f"Could not open SKU database, using SKU JSON files: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import/export the SKU configuration database")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("database", help="SQLite database file")
+    parser.add_argument("--skus-dir", default=str(Path("config") / "skus"),
+                        help="SKU JSON directory to import from / export to")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    database = SKUDatabase(Path(args.database))
+    try:
+        if args.command == "import":
+            count = database.import_json_dir(Path(args.skus_dir))
+        else:
+            count = database.export_json_dir(Path(args.skus_dir))
+    finally:
+        database.close()
+    print(f"{args.command}: {count} SKU configurations")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,108 @@ SKU Manager for individual SKU JSON files
 Loads SKUs from config/skus/ directory
 """
 
+import os
 import json
+import time
+import bisect
 import threading
 import logging
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+# Mode subdirectories of config/skus, in lookup order
+SKU_MODES = ['offroad', 'smt', 'weight']
+
+# Files read concurrently by bulk loads (opening a file on a network share is latency-bound).
+# Local files parse in well under a millisecond, where threads only add GIL contention:
+# the pool is used when the first reads of a bulk load average more than SLOW_READ_S.
+MAX_LOAD_WORKERS = 8
+SLOW_READ_S = 0.001
+
+# Internal mode -> mode name used by the UI
+UI_MODE_NAMES = {
+    'offroad': 'Offroad',
+    'smt': 'SMT',
+    'weight': 'WeightChecking'
+}
+_INTERNAL_MODES = {ui_mode: mode for mode, ui_mode in UI_MODE_NAMES.items()}
+
+
+def _internal_mode(mode: str) -> str:
+    """Convert a UI mode name ("SMT") to the internal one ("smt")"""
+    return _INTERNAL_MODES.get(mode, mode.lower())
+
+
+@dataclass
+class SKUChangeSet:
+    """SKU configurations ("mode:sku" keys) changed on disk since the last scan"""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    @property
+    def skus(self) -> List[str]:
+        """SKU names affected by the change"""
+        return sorted({key.split(':', 1)[1] for key in self.added + self.modified + self.removed})
+
 
 class SKUManager:
     """
-    SKU Manager that loads individual SKU JSON files from config/skus/ directory
+    SKU Manager that loads individual SKU JSON files from config/skus/ directory,
+    or SKU configurations from a SKUDatabase
     """
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, database=None):
+        """
+        Args:
+            config_path: Config directory holding skus/ and programming_config.json
+            database: SKUDatabase to read SKU configurations from instead of the JSON files
+        """
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.database = database
+        
+        # Set up configuration paths: an explicit config directory, else PathManager
+        if config_path:
+            self.skus_dir = Path(config_path) / "skus"
+            self.programming_config_path = Path(config_path) / "programming_config.json"
+        else:
+            self._set_default_paths()
+        
+        # Thread-safe data storage. sku_files indexes every SKU file by
+        # "mode:sku" (the database file when using a database); skus_data
+        # holds the configurations parsed so far.
+        self._lock = threading.RLock()
+        self.skus_data: Dict[str, Dict[str, Any]] = {}
+        self.sku_files: Dict[str, Path] = {}
+        self.programming_config: Optional[Dict[str, Any]] = None
+        self._loaded = False
+        
+        # (mtime_ns, size) per indexed file - (revision, size) from a database - for incremental reloads
+        self._file_stats: Dict[str, Tuple[int, int]] = {}
+        self._programming_config_stat: Optional[Tuple[int, int]] = None
+        self._change_callbacks: List[Callable[[SKUChangeSet], None]] = []
+        
+        # Lookup indexes over sku_files, kept up to date on load and reload
+        self._sku_modes: Dict[str, List[str]] = {}  # sku -> internal modes, in SKU_MODES order
+        self._mode_skus: Dict[str, List[str]] = {mode: [] for mode in SKU_MODES}  # mode -> sorted skus
+        self._all_skus: List[str] = []  # sorted
+        
+        # Compiled SKU cache (src/data/sku_cache.py), JSON files only
+        self.cache_path = self._configured_cache_path()
+        self._binary_cache = None
+        self._cache_stat: Optional[Tuple[int, int]] = None
+        self._cache_loads = 0
         
-        # Set up configuration paths using PathManager
+        # Index SKU files (parsed on first access)
+        self._load_all_skus()
+    
+    def _set_default_paths(self):
+        """Use the configured SKU directory (PathManager)"""
         try:
             from src.utils.path_manager import get_skus_dir, get_config_dir
             self.skus_dir = get_skus_dir()
@@ -28,111 +114,363 @@ class SKUManager:
             project_root = Path(__file__).parent.parent.parent
             self.skus_dir = project_root / "config" / "skus"
             self.programming_config_path = project_root / "config" / "programming_config.json"
+    
+    def _configured_cache_path(self) -> Optional[Path]:
+        """sku_cache.bin next to the skus directory, None if disabled or using a database"""
+        if self.database is not None:
+            return None
+        try:
+            from config.settings import SKU_CACHE
+        except ImportError:
+            return None
+        if not SKU_CACHE.get('enabled', True):
+            return None
+        from src.data.sku_cache import CACHE_FILE_NAME
+        return Path(SKU_CACHE['path']) if SKU_CACHE.get('path') else self.skus_dir.parent / CACHE_FILE_NAME
+    
+    def _open_binary_cache(self):
+        """(Re)read the SKU cache file if it appeared or was rebuilt since it was last opened"""
+        if self.cache_path is None:
+            return
+        try:
+            stat = self.cache_path.stat()
+            cache_stat = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_stat = None
+        if cache_stat == self._cache_stat:
+            return
         
-        # Thread-safe data storage
-        self._lock = threading.RLock()
-        self.skus_data: Dict[str, Dict[str, Any]] = {}
-        self.programming_config: Optional[Dict[str, Any]] = None
-        self._loaded = False
-        
-        # Load all SKUs
-        self._load_all_skus()
+        from src.data.sku_cache import open_cache, manifest_hash
+        if self._binary_cache is not None:
+            self._binary_cache.close()
+        self._binary_cache = open_cache(self.cache_path) if cache_stat else None
+        self._cache_stat = cache_stat
+        if self._binary_cache is None:
+            return
+        if self._binary_cache.manifest_hash == manifest_hash(self._file_stats):
+            self.logger.info(f"SKU cache {self.cache_path.name} is current ({len(self._binary_cache)} configurations)")
+        else:
+            self.logger.info(f"SKU cache {self.cache_path.name} is out of date, changed SKU files are read from JSON")
     
     def _load_all_skus(self) -> bool:
-        """Load all SKU files from the skus directory"""
+        """Index all SKU files in the skus directory; files are parsed on first access.
+        
+        The directory is scanned without holding the lock and the new index is
+        swapped in at once, so readers are not blocked while a share is slow.
+        """
+        try:
+            if self.database is None and not self.skus_dir.exists():
+                self.logger.error(f"SKUs directory not found: {self.skus_dir}")
+                return False
+            found = self._scan_sku_files()
+            programming = self._read_programming_config()
+        except Exception as e:
+            self.logger.error(f"Failed to load SKUs: {e}")
+            self._loaded = False
+            return False
+        
         with self._lock:
+            self.skus_data = {}
+            self.sku_files = {key: json_file for key, (json_file, _) in found.items()}
+            self._file_stats = {key: stat for key, (_, stat) in found.items()}
+            self._rebuild_indexes()
+            self.programming_config, self._programming_config_stat = programming
+            self._cache_stat = None
+            self._open_binary_cache()
+            self._loaded = len(self.sku_files) > 0
+        
+        if not self._loaded:
+            self.logger.warning(f"No SKU files found in {self.database.path if self.database else self.skus_dir}")
+            return False
+        self.logger.info(f"Indexed {len(self._all_skus)} unique SKUs ({len(found)} total configurations)")
+        return True
+    
+    def _scan_sku_files(self) -> Dict[str, Tuple[Path, Tuple[int, int]]]:
+        """Find the SKU files and stat them (no parsing).
+
+        Returns:
+            "mode:sku" -> (file, (mtime_ns, size))
+        """
+        if self.database is not None:
+            return {key: (self.database.path, stamp) for key, stamp in self.database.scan().items()}
+        
+        directories = [(mode, self.skus_dir / mode) for mode in SKU_MODES]
+        # Also check root directory for backward compatibility (assumed offroad)
+        directories.append(('offroad', self.skus_dir))
+        
+        found = {}
+        for mode, directory in directories:
             try:
-                if not self.skus_dir.exists():
-                    self.logger.error(f"SKUs directory not found: {self.skus_dir}")
-                    return False
-                
-                # Clear existing data
-                self.skus_data.clear()
-                
-                # Load JSON files from subdirectories
-                json_files = []
-                # Check for mode-specific subdirectories
-                for subdir in ['offroad', 'smt', 'weight']:
-                    subdir_path = self.skus_dir / subdir
-                    if subdir_path.exists():
-                        json_files.extend(list(subdir_path.glob("*.json")))
-                
-                # Also check root directory for backward compatibility
-                json_files.extend(list(self.skus_dir.glob("*.json")))
-                
-                if not json_files:
-                    self.logger.warning(f"No SKU files found in {self.skus_dir} or its subdirectories")
-                    return False
-                
-                for json_file in json_files:
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            sku_data = json.load(f)
-                        
-                        # Get SKU identifier from the filename (without .json extension)
-                        sku = json_file.stem
-                        
-                        # Determine mode based on directory
-                        if 'offroad' in json_file.parts:
-                            sku_data['mode'] = 'offroad'
-                        elif 'smt' in json_file.parts:
-                            sku_data['mode'] = 'smt'
-                        elif 'weight' in json_file.parts:
-                            sku_data['mode'] = 'weight'
-                        else:
-                            # For backward compatibility, files in root are assumed to be offroad
-                            sku_data['mode'] = 'offroad'
-                        
-                        mode = sku_data.get('mode', 'unknown')
-                        self.skus_data[f"{mode}:{sku}"] = sku_data
-                        self.logger.info(f"Loaded SKU: {sku} from {json_file.name} (mode: {mode})")
-                        
-                    except Exception as e:
-                        self.logger.error(f"Failed to load SKU file {json_file}: {e}")
-                
-                # Load programming configuration if it exists
-                if self.programming_config_path.exists():
-                    try:
-                        with open(self.programming_config_path, 'r', encoding='utf-8') as f:
-                            self.programming_config = json.load(f)
-                    except Exception as e:
-                        self.logger.error(f"Failed to load programming config: {e}")
-                        self.programming_config = {}
-                else:
-                    self.programming_config = {}
-                
-                self._loaded = len(self.skus_data) > 0
-                unique_sku_count = len(self.get_all_skus())
-                self.logger.info(f"Loaded {unique_sku_count} unique SKUs ({len(self.skus_data)} total configurations)")
-                return self._loaded
-                
-            except Exception as e:
-                self.logger.error(f"Failed to load SKUs: {e}")
-                self._loaded = False
-                return False
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith('.json') or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        found[f"{mode}:{entry.name[:-5]}"] = (Path(entry.path), (stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                continue
+        return found
+    
+    def _read_programming_config(self) -> Tuple[Dict[str, Any], Optional[Tuple[int, int]]]:
+        """Read the separate programming configuration file: (config, (mtime_ns, size)), ({}, None) if missing"""
+        try:
+            stat = self.programming_config_path.stat()
+        except OSError:
+            return {}, None
+        try:
+            with open(self.programming_config_path, 'r', encoding='utf-8') as f:
+                return json.load(f), (stat.st_mtime_ns, stat.st_size)
+        except Exception as e:
+            self.logger.error(f"Failed to load programming config: {e}")
+            return {}, (stat.st_mtime_ns, stat.st_size)
+    
+    def _load_programming_config(self):
+        """Load the separate programming configuration file if it exists"""
+        self.programming_config, self._programming_config_stat = self._read_programming_config()
     
-    def reload_if_changed(self) -> bool:
-        """Reload all SKUs (for compatibility)"""
+    def _rebuild_indexes(self):
+        """Build the sku -> modes and mode -> skus indexes from sku_files"""
+        sku_modes: Dict[str, List[str]] = {}
+        mode_skus: Dict[str, List[str]] = {mode: [] for mode in SKU_MODES}
+        for key in self.sku_files:
+            mode, sku = key.split(':', 1)
+            sku_modes.setdefault(sku, []).append(mode)
+            mode_skus.setdefault(mode, []).append(sku)
+        for modes in sku_modes.values():
+            modes.sort(key=SKU_MODES.index)
+        for skus in mode_skus.values():
+            skus.sort()
+        self._sku_modes = sku_modes
+        self._mode_skus = mode_skus
+        self._all_skus = sorted(sku_modes)
+    
+    def _index(self, key: str):
+        """Add a new "mode:sku" key to the indexes"""
+        mode, sku = key.split(':', 1)
+        modes = self._sku_modes.get(sku)
+        if modes is None:
+            modes = self._sku_modes[sku] = []
+            bisect.insort(self._all_skus, sku)
+        if mode not in modes:
+            modes.append(mode)
+            modes.sort(key=SKU_MODES.index)
+            bisect.insort(self._mode_skus.setdefault(mode, []), sku)
+    
+    def _unindex(self, key: str):
+        """Remove a "mode:sku" key from the indexes"""
+        mode, sku = key.split(':', 1)
+        modes = self._sku_modes.get(sku, [])
+        if mode not in modes:
+            return
+        modes.remove(mode)
+        skus = self._mode_skus[mode]
+        del skus[bisect.bisect_left(skus, sku)]
+        if not modes:
+            del self._sku_modes[sku]
+            del self._all_skus[bisect.bisect_left(self._all_skus, sku)]
+    
+    def _read_cached(self, key: str, stamp: Optional[Tuple[int, int]], cache) -> Optional[Dict[str, Any]]:
+        """Read a configuration from the SKU cache, None if not cached or out of date"""
+        if cache is None:
+            return None
+        try:
+            return cache.load(key, stamp)
+        except ValueError:  # closed by cleanup() meanwhile
+            return None
+    
+    def _read_sku_file(self, key: str, json_file: Path) -> Optional[Dict[str, Any]]:
+        """Read and parse a configuration from its JSON file or the database (without the lock)"""
+        try:
+            if self.database is not None:
+                mode, sku = key.split(':', 1)
+                return self.database.get_config(sku, mode)
+            with open(json_file, 'r', encoding='utf-8') as f:
+                sku_data = json.load(f)
+            self.logger.debug(f"Loaded SKU: {key} from {json_file.name}")
+            return sku_data
+        except Exception as e:
+            self.logger.error(f"Failed to load SKU file {json_file}: {e}")
+            return None
+    
+    def _store_sku_data(self, key: str, stamp: Optional[Tuple[int, int]], sku_data: Dict[str, Any],
+                        from_cache: bool) -> Dict[str, Any]:
+        """Keep parsed data unless another reader got there first or the file changed meanwhile (lock held)"""
+        existing = self.skus_data.get(key)
+        if existing is not None:
+            return existing
+        sku_data['mode'] = key.split(':', 1)[0]
+        if key in self.sku_files and self._file_stats.get(key) == stamp:
+            self.skus_data[key] = sku_data
+            self._cache_loads += from_cache
+        return sku_data
+    
+    def _get_sku_data(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the parsed data of a "mode:sku" configuration, parsing its file on first access"""
+        with self._lock:
+            sku_data = self.skus_data.get(key)
+            if sku_data is not None:
+                return sku_data
+            json_file = self.sku_files.get(key)
+            if json_file is None:
+                return None
+            stamp, cache = self._file_stats.get(key), self._binary_cache
+        
+        sku_data = self._read_cached(key, stamp, cache)
+        from_cache = sku_data is not None
+        if sku_data is None:
+            sku_data = self._read_sku_file(key, json_file)
+            if sku_data is None:
+                return None
+        with self._lock:
+            return self._store_sku_data(key, stamp, sku_data, from_cache)
+    
+    def _load_sku_data(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse many configurations at once.
+        
+        Files not in the SKU cache are read without holding the lock, by a
+        bounded thread pool when reads are slow (a network share); the results
+        are added to skus_data in one step.
+        
+        Returns:
+            "mode:sku" -> data for the keys that could be loaded
+        """
+        with self._lock:
+            loaded = {key: self.skus_data[key] for key in keys if key in self.skus_data}
+            pending = [(key, self.sku_files[key], self._file_stats.get(key)) for key in keys
+                       if key not in loaded and key in self.sku_files]
+            cache = self._binary_cache
+        
+        parsed = []
+        from_files = []
+        for key, json_file, stamp in pending:
+            sku_data = self._read_cached(key, stamp, cache)
+            if sku_data is None:
+                from_files.append((key, json_file, stamp))
+            else:
+                parsed.append((key, stamp, sku_data, True))
+        
+        # Time the first reads to decide; the database connection is serialized anyway
+        sample = from_files[:MAX_LOAD_WORKERS]
+        start = time.perf_counter()
+        results = [self._read_sku_file(key, json_file) for key, json_file, _ in sample]
+        per_file = (time.perf_counter() - start) / max(len(sample), 1)
+        rest = from_files[len(sample):]
+        if rest and self.database is None and MAX_LOAD_WORKERS > 1 and per_file > SLOW_READ_S:
+            with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(rest)),
+                                    thread_name_prefix="SKULoad") as pool:
+                results += pool.map(lambda item: self._read_sku_file(item[0], item[1]), rest)
+        else:
+            results += [self._read_sku_file(key, json_file) for key, json_file, _ in rest]
+        parsed += [(key, stamp, sku_data, False)
+                   for (key, _, stamp), sku_data in zip(from_files, results) if sku_data is not None]
+        
+        with self._lock:
+            for key, stamp, sku_data, from_cache in parsed:
+                loaded[key] = self._store_sku_data(key, stamp, sku_data, from_cache)
+        return loaded
+    
+    def reload(self) -> bool:
+        """Re-index all SKU files; parsed data is dropped and re-read on next access"""
         return self._load_all_skus()
     
+    def reload_if_changed(self) -> SKUChangeSet:
+        """
+        Pick up SKU files added, modified or removed since the last scan.
+        
+        Files are compared by modification time and size; only changed files
+        lose their parsed data (they are parsed again on next access). Change
+        callbacks are called with the change set if anything changed.
+        
+        Returns:
+            The changes (falsy if nothing changed)
+        """
+        if not self._loaded:
+            self._load_all_skus()
+            changes = SKUChangeSet(added=sorted(self.sku_files))
+        else:
+            if self.database is not None:
+                self.database.refresh_replica()
+            found = self._scan_sku_files()
+            with self._lock:
+                changes = SKUChangeSet(
+                    added=sorted(key for key in found if key not in self.sku_files),
+                    modified=sorted(key for key, (_, stat) in found.items()
+                                    if key in self._file_stats and self._file_stats[key] != stat),
+                    removed=sorted(key for key in self.sku_files if key not in found)
+                )
+                for key in changes.modified + changes.removed:
+                    self.skus_data.pop(key, None)
+                for key in changes.removed:
+                    self.sku_files.pop(key, None)
+                    self._file_stats.pop(key, None)
+                    self._unindex(key)
+                for key in changes.added + changes.modified:
+                    self.sku_files[key], self._file_stats[key] = found[key]
+                for key in changes.added:
+                    self._index(key)
+                self._loaded = len(self.sku_files) > 0
+                
+                # The separate programming config is small: reload it when it changed
+                try:
+                    stat = self.programming_config_path.stat()
+                    programming_stat = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    programming_stat = None
+                if programming_stat != self._programming_config_stat:
+                    self._load_programming_config()
+                self._open_binary_cache()
+        
+        if changes:
+            self.logger.info(f"SKU files changed: {len(changes.added)} added, "
+                             f"{len(changes.modified)} modified, {len(changes.removed)} removed")
+            for callback in list(self._change_callbacks):
+                try:
+                    callback(changes)
+                except Exception as e:
+                    self.logger.error(f"SKU change callback error: {e}")
+        return changes
+    
+    def add_change_callback(self, callback: Callable[[SKUChangeSet], None]):
+        """Call callback(changes) whenever reload_if_changed finds changed SKU files"""
+        with self._lock:
+            if callback not in self._change_callbacks:
+                self._change_callbacks.append(callback)
+    
+    def remove_change_callback(self, callback: Callable[[SKUChangeSet], None]):
+        with self._lock:
+            if callback in self._change_callbacks:
+                self._change_callbacks.remove(callback)
+    
+    def get_watch_paths(self) -> List[str]:
+        """SKU directories and files (for filesystem watchers; none for a database, poll it instead)"""
+        if self.database is not None:
+            return []
+        directories = [self.skus_dir] + [self.skus_dir / mode for mode in SKU_MODES]
+        with self._lock:
+            files = [str(path) for path in self.sku_files.values()]
+        return [str(d) for d in directories if d.is_dir()] + files
+    
     def get_all_skus(self) -> List[str]:
-        """Get list of all available SKUs"""
+        """Get sorted list of all available SKUs"""
         with self._lock:
-            # Extract unique SKU names from composite keys
-            unique_skus = set()
-            for key in self.skus_data.keys():
-                _, sku = key.split(':', 1)
-                unique_skus.add(sku)
-            return sorted(list(unique_skus))
+            return list(self._all_skus)
+    
+    def get_skus_for_mode(self, mode: str) -> List[str]:
+        """Get sorted list of the SKUs that support a test mode ("SMT", "Offroad", ...)"""
+        with self._lock:
+            return list(self._mode_skus.get(_internal_mode(mode), []))
     
     def get_sku(self, sku: str) -> Optional[Dict[str, Any]]:
         """Get complete SKU data"""
+        # First mode that has the SKU
         with self._lock:
-            # Look for any mode:sku combination (return first found)
-            for key in self.skus_data:
-                if key.endswith(f":{sku}"):
-                    return self.skus_data[key]
-            return None
+            modes = list(self._sku_modes.get(sku, []))
+        for mode in modes:
+            sku_data = self._get_sku_data(f"{mode}:{sku}")
+            if sku_data is not None:
+                return sku_data
+        return None
     
     def get_sku_info(self, sku: str) -> Optional[Dict[str, Any]]:
         """Get complete SKU information (alias for get_sku)"""
@@ -141,43 +479,27 @@ class SKUManager:
     def get_available_modes(self, sku: str) -> List[str]:
         """Get available test modes for a SKU"""
         with self._lock:
-            available_modes = []
-            
-            # Check all keys for this SKU
-            for key in self.skus_data:
-                if key.endswith(f":{sku}"):
-                    mode, _ = key.split(':', 1)
-                    # Convert to UI format
-                    mode_map = {
-                        'offroad': 'Offroad',
-                        'smt': 'SMT',
-                        'weight': 'WeightChecking'
-                    }
-                    available_modes.append(mode_map.get(mode, mode))
-            
-            return available_modes
+            # Convert to UI format
+            return [UI_MODE_NAMES.get(mode, mode) for mode in self._sku_modes.get(sku, [])]
     
     def get_test_parameters(self, sku: str, mode: str) -> Optional[Dict[str, Any]]:
         """Get test parameters for a specific SKU and mode"""
-        with self._lock:
-            # Convert UI mode to internal format
-            mode_map = {
-                "Offroad": "offroad",
-                "SMT": "smt",
-                "WeightChecking": "weight"
-            }
-            internal_mode = mode_map.get(mode, mode.lower())
-            
-            # Direct composite key lookup
-            composite_key = f"{internal_mode}:{sku}"
-            if composite_key in self.skus_data:
-                sku_data = self.skus_data[composite_key]
-                params = sku_data.copy()
-                params['sku'] = sku
-                return params
-            
-            return None
+        # _get_sku_data takes the lock itself, and not across the first file read
+        sku_data = self._get_sku_data(f"{_internal_mode(mode)}:{sku}")
+        if sku_data is not None:
+            params = sku_data.copy()
+            params['sku'] = sku
+            return params
+
+        return None
     
+    def get_sku_file(self, sku: str, mode: str) -> Optional[Path]:
+        """Get the JSON file a SKU/mode configuration was loaded from (None with a database)"""
+        if self.database is not None:
+            return None
+        with self._lock:
+            return self.sku_files.get(f"{_internal_mode(mode)}:{sku}")
+
     def get_programming_config(self, sku: str) -> Optional[Dict[str, Any]]:
         """Get programming configuration for a specific SKU"""
         # First check if SKU has inline programming config
@@ -200,29 +522,44 @@ class SKUManager:
     
     def validate_sku_mode_combination(self, sku: str, mode: str) -> bool:
         """Check if a SKU supports a specific test mode"""
-        available_modes = self.get_available_modes(sku)
-        return mode in available_modes
+        with self._lock:
+            return mode in _INTERNAL_MODES and _INTERNAL_MODES[mode] in self._sku_modes.get(sku, ())
     
     def preload_sku(self, sku: str) -> bool:
-        """Preload a specific SKU's data (compatibility method)"""
-        return self.get_sku(sku) is not None
+        """Parse a specific SKU's files ahead of first use"""
+        with self._lock:
+            keys = [f"{mode}:{sku}" for mode in self._sku_modes.get(sku, [])]
+        if not keys:
+            return False
+        return len(self._load_sku_data(keys)) == len(keys)
     
     def preload_all_skus(self) -> Dict[str, bool]:
-        """Preload all available SKUs (compatibility method)"""
+        """Parse all SKU files ahead of first use (concurrently)"""
+        with self._lock:
+            keys = list(self.sku_files)
+        loaded = self._load_sku_data(keys)
         results = {}
-        for sku in self.get_all_skus():
-            results[sku] = True
+        for key in keys:
+            sku = key.split(':', 1)[1]
+            results[sku] = results.get(sku, True) and key in loaded
         return results
     
+    def get_all_sku_data(self) -> Dict[str, Dict[str, Any]]:
+        """Get the data of every "mode:sku" configuration (parses all files concurrently)"""
+        with self._lock:
+            keys = list(self.sku_files)
+        loaded = self._load_sku_data(keys)
+        return {key: loaded[key] for key in keys if key in loaded}
+    
     def get_cache_stats(self) -> Dict[str, int]:
-        """Get cache statistics (compatibility method)"""
+        """Get cache statistics"""
         with self._lock:
-            sku_count = len(self.skus_data)
             return {
-                "cached_skus": sku_count,
-                "successful_loads": sku_count,
+                "cached_skus": len(self.skus_data),
+                "successful_loads": len(self.skus_data),
+                "binary_cache_loads": self._cache_loads,
                 "failed_loads": 0,
-                "available_skus": sku_count
+                "available_skus": len(self.sku_files)
             }
     
     def is_loaded(self) -> bool:
@@ -232,15 +569,13 @@ class SKUManager:
     def get_load_status(self) -> Dict[str, Any]:
         """Get loading status information"""
         with self._lock:
-            sku_count = len(self.skus_data)
-            
             return {
                 "status": "ready" if self._loaded else "not_loaded",
                 "loaded": self._loaded,
-                "sku_count": sku_count,
-                "loaded_skus": sku_count,
+                "sku_count": len(self.sku_files),
+                "loaded_skus": len(self.skus_data),
                 "failed_skus": 0,
-                "lazy_loading": False
+                "lazy_loading": True
             }
     
     def get_status(self) -> Dict[str, Any]:
@@ -248,17 +583,21 @@ class SKUManager:
         return {
             "loaded": self._loaded,
             "skus_dir": str(self.skus_dir),
-            "sku_count": len(self.skus_data),
+            "database": str(self.database.path) if self.database else None,
+            "binary_cache": str(self.cache_path) if self._binary_cache is not None else None,
+            "sku_count": len(self.sku_files),
             "has_programming_config": self.programming_config is not None
         }
     
     def cleanup(self):
-        """Clean up resources"""
+        """Drop parsed SKU data and the SKU cache; the index stays, so the shared manager remains usable"""
         self.logger.info("Cleaning up SKUManager")
         with self._lock:
             self.skus_data.clear()
-            self.programming_config = None
-            self._loaded = False
+            if self._binary_cache is not None:
+                self._binary_cache.close()
+                self._binary_cache = None
+                self._cache_stat = None  # read again on the next reload
     
     # Power draw compatibility methods
     def get_power_draw_params(self, sku: str) -> Optional[Dict[str, float]]:
@@ -271,16 +610,33 @@ class SKUManager:
         return {}
 
 
+# Global instance shared by the GUI, the preloader and the tests
+_sku_manager = None
+_sku_manager_lock = threading.Lock()
+
+
+def get_sku_manager() -> SKUManager:
+    """Get global SKUManager instance"""
+    global _sku_manager
+    with _sku_manager_lock:
+        if _sku_manager is None:
+            from src.data.sku_database import open_configured_database
+            _sku_manager = SKUManager(database=open_configured_database())
+        return _sku_manager
+
+
 # Factory functions for compatibility
 def create_sku_manager(config_path: Optional[str] = None) -> SKUManager:
-    """Create a SKU manager instance"""
-    return SKUManager(config_path)
+    """Get the shared SKU manager, or a separate one for another config directory"""
+    if config_path:
+        return SKUManager(config_path)
+    return get_sku_manager()
 
 
 def load_test_parameters(sku: str, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Load test parameters for a SKU, trying all modes if none specified"""
     try:
-        manager = create_sku_manager()
+        manager = get_sku_manager()
         
         if not manager.is_loaded():
             logger = logging.getLogger(__name__)
@@ -314,7 +670,7 @@ if __name__ == "__main__":
     )
     
     print("Testing SKU Manager...")
-    manager = create_sku_manager()
+    manager = get_sku_manager()
     
     print(f"Manager status: {manager.get_status()}")
     print(f"Available SKUs: {manager.get_all_skus()}")
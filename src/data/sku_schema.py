@@ -0,0 +1,139 @@
+"""
+SKU Schema Module
+Structural validation of SKU configurations per test mode
+
+Checks the fields the tests rely on (types, relay lists, limit ranges, SMT
+test sequence functions) and returns readable error messages instead of
+raising, so a build can report every problem at once.
+"""
+
+import re
+from typing import Any, Dict, List
+
+# Bump when the rules change, so caches built against older rules are rebuilt
+SCHEMA_VERSION = 1
+
+_RELAY_LIST = re.compile(r"^\d+(,\d+)*$")
+_NUMBER = (int, float)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, _NUMBER) and not isinstance(value, bool)
+
+
+def _check_limits(limits: Any, where: str, errors: List[str]):
+    """Limits are {name: {min, max}} or {name: {target, tolerance}}"""
+    if not isinstance(limits, dict):
+        errors.append(f"{where}: must be an object")
+        return
+    for name, limit in limits.items():
+        if not isinstance(limit, dict):
+            errors.append(f"{where}.{name}: must be an object")
+            continue
+        if "target" in limit:
+            if not _is_number(limit["target"]) or not _is_number(limit.get("tolerance")):
+                errors.append(f"{where}.{name}: target and tolerance must be numbers")
+            continue
+        low, high = limit.get("min"), limit.get("max")
+        if low is not None and not _is_number(low) or high is not None and not _is_number(high):
+            errors.append(f"{where}.{name}: min/max must be numbers")
+        elif low is not None and high is not None and low > high:
+            errors.append(f"{where}.{name}: min {low} is above max {high}")
+
+
+def _check_smt(data: Dict[str, Any], errors: List[str]):
+    relay_mapping = data.get("relay_mapping")
+    functions = set()
+    if not isinstance(relay_mapping, dict):
+        errors.append("relay_mapping: required object")
+    else:
+        for relays, meta in relay_mapping.items():
+            if not _RELAY_LIST.match(relays.replace(" ", "")):
+                errors.append(f"relay_mapping['{relays}']: not a relay number or comma-separated relay list")
+            if meta is None:
+                continue
+            if not isinstance(meta, dict) or not isinstance(meta.get("function"), str):
+                errors.append(f"relay_mapping['{relays}']: needs a function name")
+                continue
+            if "board" in meta and not isinstance(meta["board"], int):
+                errors.append(f"relay_mapping['{relays}'].board: must be an integer")
+            functions.add(meta["function"])
+
+    test_sequence = data.get("test_sequence")
+    if not isinstance(test_sequence, list):
+        errors.append("test_sequence: required list")
+        return
+    for index, step in enumerate(test_sequence):
+        where = f"test_sequence[{index}]"
+        if not isinstance(step, dict) or not isinstance(step.get("function"), str):
+            errors.append(f"{where}: needs a function name")
+            continue
+        if functions and step["function"] not in functions:
+            errors.append(f"{where}: function '{step['function']}' has no relays in relay_mapping")
+        for key in ("duration_ms", "delay_after_ms"):
+            if key in step and (not _is_number(step[key]) or step[key] < 0):
+                errors.append(f"{where}.{key}: must be a non-negative number")
+        if "limits" in step:
+            _check_limits(step["limits"], f"{where}.limits", errors)
+
+    panel_layout = data.get("panel_layout")
+    if panel_layout is not None:
+        if not isinstance(panel_layout, dict) or not all(
+                isinstance(panel_layout.get(key, 0), int) for key in ("rows", "columns")):
+            errors.append("panel_layout: rows and columns must be integers")
+
+
+def _check_offroad(data: Dict[str, Any], errors: List[str]):
+    tests = data.get("tests")
+    if tests is not None and (not isinstance(tests, dict)
+                              or not all(isinstance(v, bool) for v in tests.values())):
+        errors.append("tests: must map test names to true/false")
+    if "limits" in data:
+        _check_limits(data["limits"], "limits", errors)
+    phases = data.get("phases")
+    if phases is not None:
+        if not isinstance(phases, dict):
+            errors.append("phases: must be an object")
+        else:
+            for name, phase in phases.items():
+                if not isinstance(phase, dict) or not isinstance(phase.get("depends_on", []), list):
+                    errors.append(f"phases.{name}.depends_on: must be a list")
+
+
+def _check_weight(data: Dict[str, Any], errors: List[str]):
+    limits = data.get("limits")
+    if not isinstance(limits, dict) or not isinstance(limits.get("weight_g"), dict):
+        errors.append("limits.weight_g: required")
+    else:
+        _check_limits(limits, "limits", errors)
+    if "tare_g" in data and not _is_number(data["tare_g"]):
+        errors.append("tare_g: must be a number")
+
+
+_MODE_CHECKS = {
+    "smt": _check_smt,
+    "offroad": _check_offroad,
+    "weight": _check_weight
+}
+
+
+def validate_sku(data: Any, mode: str) -> List[str]:
+    """
+    Validate a SKU configuration.
+
+    Args:
+        data: Parsed SKU JSON
+        mode: Internal mode ("smt", "offroad", "weight")
+
+    Returns:
+        Error messages, empty if the configuration is valid
+    """
+    if not isinstance(data, dict):
+        return ["SKU configuration must be a JSON object"]
+    errors: List[str] = []
+    if not isinstance(data.get("description", ""), str):
+        errors.append("description: must be a string")
+    check = _MODE_CHECKS.get(mode)
+    if check:
+        check(data, errors)
+    return errors
@@ -18,7 +18,7 @@ from .parameter_editor import ParameterEditor
 from .program_config import ProgramConfigEditor
 
 # Import from the src package
-from src.data.sku_manager import create_sku_manager
+from src.data.sku_manager import get_sku_manager
 
 
 class ConfigurationEditor(QDialog):
@@ -268,7 +268,7 @@ class ConfigurationEditor(QDialog):
         try:
             # Only create SKU manager if not provided
             if self.sku_manager is None:
-                self.sku_manager = create_sku_manager()
+                self.sku_manager = get_sku_manager()
             
             # Load programming config
             project_root = Path(__file__).parent.parent.parent.parent.parent
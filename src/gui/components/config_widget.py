@@ -17,7 +17,8 @@ from .config.parameter_editor import ParameterEditor
 from .config.program_config import ProgramConfigEditor
 
 # Import from the src package
-from src.data.sku_manager import create_sku_manager
+from src.data.sku_manager import get_sku_manager
+from src.utils.path_manager import get_path_manager
 
 
 class ConfigWidget(QWidget):
@@ -168,7 +169,7 @@ class ConfigWidget(QWidget):
         try:
             # Only create SKU manager if not provided
             if self.sku_manager is None:
-                self.sku_manager = create_sku_manager()
+                self.sku_manager = get_sku_manager()
             
             # Load programming config
             project_root = Path(__file__).parent.parent.parent.parent.parent
@@ -284,7 +285,7 @@ class ConfigWidget(QWidget):
                 with open(file_path, 'w') as f:
                     # Export in old format for compatibility
                     export_data = {
-                        "sku_definitions": list(self.sku_manager.skus_data.values()),
+                        "sku_definitions": list(self.sku_manager.get_all_sku_data().values()),
                         "global_parameters": {}
                     }
                     json.dump(export_data, f, indent=2)
@@ -311,11 +312,17 @@ class ConfigWidget(QWidget):
                     if prog_config:
                         self.programming_config[self.current_sku] = prog_config
             
-            # Save each SKU individually back to its file
-            for sku_id, sku_data in self.sku_manager.skus_data.items():
-                sku_file = self.sku_manager.skus_dir / f"{sku_id}.json"
+            # Save each SKU individually back to its file - on the share when read from the local mirror
+            path_manager = get_path_manager()
+            for key, sku_data in self.sku_manager.skus_data.items():
+                mode, sku_id = key.split(':', 1)
+                source = self.sku_manager.get_sku_file(sku_id, mode)
+                if source is None:
+                    continue  # database backend
+                sku_file = path_manager.get_writable_config_path(source)
                 with open(sku_file, 'w') as f:
                     json.dump(sku_data, f, indent=2)
+            path_manager.sync_config_mirror()
             
             # Save programming configuration
             project_root = Path(__file__).parent.parent.parent.parent
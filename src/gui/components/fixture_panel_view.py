@@ -0,0 +1,139 @@
+# gui/components/fixture_panel_view.py
+"""Combined view of all fixtures driven by one station (FixtureManager)."""
+
+import logging
+from typing import Callable, Dict, Optional
+
+from PySide6.QtWidgets import (QDialog, QWidget, QGridLayout, QVBoxLayout, QHBoxLayout, QLabel,
+                               QProgressBar, QFrame, QPushButton)
+from PySide6.QtCore import Qt
+
+from src.services.fixture_manager import (FixtureManager, STATUS_DISCONNECTED, STATUS_IDLE,
+                                          STATUS_TESTING, STATUS_PASSED, STATUS_FAILED)
+
+logger = logging.getLogger(__name__)
+
+STATUS_COLORS = {
+    STATUS_DISCONNECTED: "#555555",
+    STATUS_IDLE: "#3a3a3a",
+    STATUS_TESTING: "#1f4e79",
+    STATUS_PASSED: "#2e7d32",
+    STATUS_FAILED: "#c62828"
+}
+
+
+class FixtureTile(QFrame):
+    """Status, progress and last result of one fixture"""
+
+    def __init__(self, fixture_id: str, port: str, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.fixture_id = fixture_id
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setMinimumSize(220, 140)
+
+        layout = QVBoxLayout(self)
+        self.title_label = QLabel(f"{fixture_id} ({port})")
+        self.title_label.setStyleSheet("font-size: 14pt; font-weight: bold; color: white;")
+        self.status_label = QLabel(STATUS_DISCONNECTED.upper())
+        self.status_label.setStyleSheet("font-size: 18pt; font-weight: bold; color: white;")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.message_label = QLabel("")
+        self.message_label.setStyleSheet("color: #dddddd;")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.counts_label = QLabel("0 / 0 passed")
+        self.counts_label.setStyleSheet("color: #dddddd;")
+
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.message_label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.counts_label)
+        self.set_status(STATUS_DISCONNECTED)
+
+    def set_status(self, status: str):
+        self.status_label.setText(status.upper())
+        self.setStyleSheet(f"FixtureTile {{ background-color: {STATUS_COLORS.get(status, '#3a3a3a')}; "
+                           f"border-radius: 6px; }}")
+        if status == STATUS_TESTING:
+            self.progress_bar.setValue(0)
+
+    def set_progress(self, message: str, percentage: int):
+        self.message_label.setText(message)
+        if percentage:
+            self.progress_bar.setValue(percentage)
+
+    def set_counts(self, tests_run: int, tests_passed: int):
+        self.counts_label.setText(f"{tests_passed} / {tests_run} passed")
+
+
+class FixturePanelView(QWidget):
+    """Grid of FixtureTiles fed by the FixtureManager's signals"""
+
+    def __init__(self, manager: FixtureManager, columns: int = 2, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.manager = manager
+        self.columns = max(1, columns)
+        self.tiles: Dict[str, FixtureTile] = {}
+
+        self.grid = QGridLayout(self)
+        for fixture in manager.fixtures:
+            self._add_tile(fixture.fixture_id, fixture.port, fixture.status)
+
+        manager.fixture_connection_changed.connect(self._on_connection_changed)
+        manager.fixture_status_changed.connect(self._on_status_changed)
+        manager.fixture_progress.connect(self._on_progress)
+        manager.fixture_test_completed.connect(self._on_test_completed)
+
+    def _add_tile(self, fixture_id: str, port: str, status: str) -> FixtureTile:
+        tile = FixtureTile(fixture_id, port, self)
+        tile.set_status(status)
+        index = len(self.tiles)
+        self.grid.addWidget(tile, index // self.columns, index % self.columns)
+        self.tiles[fixture_id] = tile
+        return tile
+
+    def _on_connection_changed(self, fixture_id: str, connected: bool, port: str):
+        tile = self.tiles.get(fixture_id)
+        if tile is None and connected:
+            tile = self._add_tile(fixture_id, port, STATUS_IDLE)
+        if tile and not connected:
+            tile.set_status(STATUS_DISCONNECTED)
+
+    def _on_status_changed(self, fixture_id: str, status: str):
+        tile = self.tiles.get(fixture_id)
+        if tile:
+            tile.set_status(status)
+
+    def _on_progress(self, fixture_id: str, message: str, percentage: int):
+        tile = self.tiles.get(fixture_id)
+        if tile:
+            tile.set_progress(message, percentage)
+
+    def _on_test_completed(self, fixture_id: str, result):
+        tile = self.tiles.get(fixture_id)
+        fixture = self.manager.get_fixture(fixture_id)
+        if tile and fixture:
+            tile.set_counts(fixture.tests_run, fixture.tests_passed)
+            tile.set_progress("; ".join(result.failures[:2]) if result.failures else "All measurements in range", 100)
+
+
+class FixturePanelDialog(QDialog):
+    """Operator window for several nests: combined panel view plus Start All"""
+
+    def __init__(self, manager: FixtureManager, start_all: Callable[[], None], parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setWindowTitle("Fixtures")
+        self.setMinimumSize(600, 400)
+        self.setStyleSheet("QDialog { background-color: #2b2b2b; } QLabel { color: white; }")
+
+        layout = QVBoxLayout(self)
+        self.panel_view = FixturePanelView(manager, parent=self)
+        layout.addWidget(self.panel_view)
+
+        buttons = QHBoxLayout()
+        self.start_all_button = QPushButton("Start All")
+        self.start_all_button.clicked.connect(start_all)
+        buttons.addStretch()
+        buttons.addWidget(self.start_all_button)
+        layout.addLayout(buttons)
@@ -16,6 +16,7 @@ class TestMenuBar(QMenuBar):
     # Signals
     mode_changed = Signal(str)
     show_connections_requested = Signal()
+    show_fixtures_requested = Signal()
     refresh_ports_requested = Signal() # Added
     
     def __init__(self, parent=None):
@@ -96,6 +97,11 @@ class TestMenuBar(QMenuBar):
             connections_action.triggered.connect(self.show_connections_requested.emit)
             menu.addAction(connections_action)
             
+            # Several SMT fixtures driven by this station
+            fixtures_action = QAction("Fixtures...", self)
+            fixtures_action.triggered.connect(self.show_fixtures_requested.emit)
+            menu.addAction(fixtures_action)
+            
             menu.addSeparator()
             
             # Refresh connections
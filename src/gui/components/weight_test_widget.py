@@ -419,7 +419,7 @@ class WeightTestWidget(QWidget, ThreadCleanupMixin):
     def _get_main_window(self):
         """Get reference to main window."""
         main_window = self.parent()
-        while main_window and not hasattr(main_window, 'connection_dialog'):
+        while main_window and not hasattr(main_window, 'connection_service'):
             main_window = main_window.parent()
         return main_window
     
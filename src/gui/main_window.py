@@ -1,21 +1,18 @@
 # gui/main_window.py - Refactored core window
 import sys
+import time
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QStatusBar, QLabel, QPushButton, QDialog, QMessageBox
 from PySide6.QtCore import QTimer, QTime
 from PySide6.QtGui import QFont
 
 # Import our modules
-from src.data.sku_manager import create_sku_manager
+from src.data.sku_manager import get_sku_manager
 from src.gui.components.menu_bar import TestMenuBar
 from src.gui.components.top_controls import TopControlsWidget
 from src.gui.components.test_area import TestAreaWidget
-from src.gui.components.connection_dialog import ConnectionDialog
 from src.gui.workers.test_worker import TestWorker
-from src.gui.handlers.offroad_handler import OffroadHandler
-from src.gui.handlers.smt_handler import SMTHandler
-from src.gui.handlers.weight_handler import WeightHandler
 from src.gui.handlers.connection_handler import ConnectionHandler
 from src.core.base_test import TestResult
 from src.utils.thread_cleanup import GlobalCleanupManager # Added import
@@ -28,6 +25,7 @@ class MainWindow(QMainWindow):
     """Main application window - refactored for maintainability"""
 
     def __init__(self, preloaded_components=None):
+        construct_start = time.perf_counter()
         super().__init__()
         # Set window title with version
         app = QApplication.instance()
@@ -42,24 +40,24 @@ class MainWindow(QMainWindow):
             self.logger = logging.getLogger(self.__class__.__name__)
             self.logger.info(f"Using preloaded SKU manager with {len(self.sku_manager.get_all_skus())} SKUs")
         else:
-            self.sku_manager = create_sku_manager()
+            self.sku_manager = get_sku_manager()
             self.logger = logging.getLogger(self.__class__.__name__)
             
         self.preloaded_components = preloaded_components
+        self.sku_watcher = None
         self.config_loading_dialog = None
         self.config_load_completed = True  # Mark as completed if using preloaded
         
         # Initialize connection service
         self.connection_service = ConnectionService()
 
-        # Preload all handlers to avoid lag on mode switch
-        self._offroad_handler = OffroadHandler(self)
-        self._smt_handler = SMTHandler(self)
-        self._weight_handler = WeightHandler(self)
+        # Mode handlers and the connection dialog are created on first use: an
+        # operator usually stays in one mode, and the dialog scans ports when built
+        self._offroad_handler = None
+        self._smt_handler = None
+        self._weight_handler = None
         self.connection_handler = ConnectionHandler(self)  # Keep this one immediate
-
-        # UI Components - connection dialog now uses connection service
-        self._connection_dialog = ConnectionDialog(self, self.connection_service)
+        self._connection_dialog = None
         
         # Handle preloaded Arduino connection
         if preloaded_components and preloaded_components.arduino_controller:
@@ -112,6 +110,10 @@ class MainWindow(QMainWindow):
         
         self.test_worker: Optional[TestWorker] = None
 
+        # Multi-fixture station, created when the fixtures window is first opened
+        self.fixture_manager = None
+        self._fixture_dialog = None
+
         # Current state
         self.current_mode = None  # Will be set by launcher
         self.previous_mode = "Offroad"  # Track previous mode for configuration
@@ -157,25 +159,39 @@ class MainWindow(QMainWindow):
         
         # Check for updates after window is shown
         QTimer.singleShot(2000, self.check_for_updates)
+        
+        self.logger.info(f"MainWindow constructed in {(time.perf_counter() - construct_start) * 1000:.0f} ms")
 
     @property
     def offroad_handler(self):
-        """Get preloaded offroad handler"""
+        """Get offroad handler (created on first use)"""
+        if self._offroad_handler is None:
+            from src.gui.handlers.offroad_handler import OffroadHandler
+            self._offroad_handler = OffroadHandler(self)
         return self._offroad_handler
     
     @property
     def smt_handler(self):
-        """Get preloaded SMT handler"""
+        """Get SMT handler (created on first use)"""
+        if self._smt_handler is None:
+            from src.gui.handlers.smt_handler import SMTHandler
+            self._smt_handler = SMTHandler(self)
         return self._smt_handler
     
     @property
     def weight_handler(self):
-        """Get preloaded weight handler"""
+        """Get weight handler (created on first use)"""
+        if self._weight_handler is None:
+            from src.gui.handlers.weight_handler import WeightHandler
+            self._weight_handler = WeightHandler(self)
         return self._weight_handler
     
     @property
     def connection_dialog(self):
-        """Get preloaded connection dialog"""
+        """Get connection dialog (created on first use, with the current connection state)"""
+        if self._connection_dialog is None:
+            from src.gui.components.connection_dialog import ConnectionDialog
+            self._connection_dialog = ConnectionDialog(self, self.connection_service)
         return self._connection_dialog
 
     def setup_logging(self):
@@ -334,6 +350,7 @@ class MainWindow(QMainWindow):
         # Menu bar connections
         self.menu_bar.mode_changed.connect(self.set_mode)
         self.menu_bar.show_connections_requested.connect(self.show_connection_dialog)
+        self.menu_bar.show_fixtures_requested.connect(self.show_fixture_panel)
 
         # Top controls connections
         self.top_controls.sku_changed.connect(self.on_sku_changed)
@@ -565,10 +582,37 @@ class MainWindow(QMainWindow):
             # Directly refresh the UI since manager is loaded
             self.refresh_data()
             self.statusBar().showMessage(f"Ready - {len(self.sku_manager.get_all_skus())} SKUs loaded")
+            self.start_sku_watcher()
         else:
             self.logger.error("SKU manager failed to load")
             self.on_config_load_completed(False)
     
+    def start_sku_watcher(self):
+        """Pick up edited, added and removed SKU files while running"""
+        from config.settings import SKU_WATCH
+        if self.sku_watcher is not None or not SKU_WATCH.get('enabled', True):
+            return
+        try:
+            from src.services.sku_watcher import SKUFileWatcher
+            self.sku_watcher = SKUFileWatcher(self.sku_manager, parent=self)
+            self.sku_watcher.skus_changed.connect(self.on_sku_files_changed)
+            self.sku_watcher.start()
+        except Exception as e:
+            self.logger.error(f"Could not start SKU file watcher: {e}")
+            self.sku_watcher = None
+
+    def on_sku_files_changed(self, changes):
+        """Update the SKU list and the selected SKU after SKU files changed on disk"""
+        self.logger.info(f"SKU files changed: {', '.join(changes.skus)}")
+        self._sku_filter_cache.clear()
+        self.filter_skus_by_mode()
+
+        current_sku = self.top_controls.get_current_sku()
+        if current_sku in changes.skus and self.sku_manager.get_sku(current_sku) is not None:
+            # Re-apply the SKU's configuration (panel layout, test plan)
+            self.on_sku_changed(current_sku)
+        self.statusBar().showMessage(f"SKU configuration updated: {', '.join(changes.skus)}", 5000)
+
     def start_config_loading(self):
         """Start configuration loading - unified manager loads immediately"""
         # No need to call setup_sku_manager again since it's already called in __init__
@@ -632,13 +676,10 @@ class MainWindow(QMainWindow):
             valid_skus = self._sku_filter_cache[self.current_mode]
             self.logger.debug(f"Using cached SKU filter for mode {self.current_mode}: {len(valid_skus)} SKUs")
         else:
-            # Get all SKUs that support the selected mode
+            # Get all SKUs that support the selected mode (sorted, from the manager's index)
             valid_skus = []
             try:
-                all_skus = self.sku_manager.get_all_skus()
-                for sku in all_skus:
-                    if self.sku_manager.validate_sku_mode_combination(sku, self.current_mode):
-                        valid_skus.append(sku)
+                valid_skus = self.sku_manager.get_skus_for_mode(self.current_mode)
                 
                 # Cache the results
                 self._sku_filter_cache[self.current_mode] = valid_skus
@@ -674,6 +715,9 @@ class MainWindow(QMainWindow):
                 try:
                     params = self.sku_manager.get_test_parameters(sku, "SMT")
                     if params:
+                        # Compile the SKU's test plan now rather than on the first panel
+                        self._prepare_test_plan(sku, params)
+
                         # Update panel layout
                         if "panel_layout" in params:
                             panel_layout = params["panel_layout"]
@@ -712,6 +756,16 @@ class MainWindow(QMainWindow):
             if self.current_mode == "SMT":
                 self.top_controls.update_programming_checkbox(False)
 
+    def _prepare_test_plan(self, sku: str, params: Dict[str, Any]):
+        """Compile and cache the SMT test plan for the selected SKU"""
+        try:
+            from src.core.test_plan import get_test_plan_cache
+            cache = get_test_plan_cache()
+            cache.watch(self.sku_manager)
+            cache.get(sku, params.get("relay_mapping", {}), params.get("test_sequence", []))
+        except Exception as e:
+            self.logger.warning(f"Could not compile test plan for {sku}: {e}")
+
     def start_test(self):
         """Start the selected test"""
         sku = self.top_controls.get_current_sku()
@@ -731,6 +785,55 @@ class MainWindow(QMainWindow):
         self.connection_dialog.exec()
         self.update_connection_status()
     
+    def show_fixture_panel(self):
+        """Show the combined view of the fixtures configured in FIXTURES"""
+        try:
+            if self.fixture_manager is None:
+                from src.services.fixture_manager import FixtureManager
+                self.fixture_manager = FixtureManager()
+                connected = self.fixture_manager.add_configured_fixtures()
+                self.logger.info(f"Connected {connected} fixture(s)")
+                self.fixture_manager.fixture_button_pressed.connect(self.start_fixture_test)
+
+            if not self.fixture_manager.fixtures:
+                QMessageBox.information(self, "Fixtures",
+                                        "No fixtures configured. Add them to FIXTURES in config/settings.py")
+                return
+
+            if self._fixture_dialog is None:
+                from src.gui.components.fixture_panel_view import FixturePanelDialog
+                self._fixture_dialog = FixturePanelDialog(self.fixture_manager, self.start_all_fixture_tests, self)
+            self._fixture_dialog.show()
+            self._fixture_dialog.raise_()
+        except Exception as e:
+            self.logger.error(f"Error opening fixtures view: {e}", exc_info=True)
+            QMessageBox.critical(self, "Error", f"Could not open fixtures view: {e}")
+
+    def _fixture_test_config(self):
+        """(sku, params, programming_config) for fixture tests, None if no SMT SKU is selected"""
+        sku = self.top_controls.get_current_sku()
+        params = self.sku_manager.get_test_parameters(sku, "SMT") if sku else None
+        if not params:
+            QMessageBox.warning(self, "Warning", "Please select a SKU that supports SMT mode")
+            return None
+        programming_config = None
+        if "PROGRAMMING" in self.top_controls.get_enabled_tests():
+            programming_config = self.sku_manager.get_programming_config(sku)
+        return sku, params, programming_config
+
+    def start_fixture_test(self, fixture_id: str):
+        """Start the selected SKU on one fixture (its button was pressed)"""
+        config = self._fixture_test_config()
+        if config:
+            self.fixture_manager.start_test(fixture_id, *config)
+
+    def start_all_fixture_tests(self):
+        """Start the selected SKU on every idle fixture"""
+        config = self._fixture_test_config()
+        if config:
+            started = self.fixture_manager.start_all(*config)
+            self.logger.info(f"Started {config[0]} on fixtures: {', '.join(started) or 'none'}")
+
     def get_previous_mode(self) -> str:
         """Get the previous test mode (for configuration exit)"""
         return self.previous_mode
@@ -933,6 +1036,12 @@ class MainWindow(QMainWindow):
             # Quick cleanup of remaining components
             self.test_area.cleanup()
             
+            if self.fixture_manager is not None:
+                self.fixture_manager.cleanup()
+            
+            if self.sku_watcher is not None:
+                self.sku_watcher.stop()
+            
             if hasattr(self, 'sku_manager'):
                 self.sku_manager.cleanup()
             
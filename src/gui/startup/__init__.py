@@ -1,7 +1,22 @@
 """Startup components for professional application launch"""
-from .splash_screen import SplashScreen
-from .mode_selection_dialog import ModeSelectionDialog
-from .unified_splash_screen import UnifiedSplashScreen
-from .preloader import PreloaderThread, PreloadedComponents
+import importlib
 
-__all__ = ['SplashScreen', 'ModeSelectionDialog', 'UnifiedSplashScreen', 'PreloaderThread', 'PreloadedComponents']
\ No newline at end of file
+# Exported lazily: the unified splash does not need the classic splash, the
+# mode dialog or the transition manager loaded (PEP 562 module __getattr__)
+_EXPORTS = {
+    'SplashScreen': '.splash_screen',
+    'ModeSelectionDialog': '.mode_selection_dialog',
+    'UnifiedSplashScreen': '.unified_splash_screen',
+    'PreloaderThread': '.preloader',
+    'PreloadedComponents': '.preloader'
+}
+
+__all__ = ['SplashScreen', 'ModeSelectionDialog', 'UnifiedSplashScreen', 'PreloaderThread', 'PreloadedComponents']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
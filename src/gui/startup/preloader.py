@@ -3,9 +3,37 @@ Background preloader for application initialization during splash screen
 """
 import logging
 import time
+import threading
+import importlib
 from pathlib import Path
 from PySide6.QtCore import QThread, Signal, QObject
 from typing import Dict, Any, Optional
+from src.utils.startup_profiler import profile_phase
+
+# Test module of each mode; imported after the main window is shown, not during the splash
+# (the offroad test pulls in numpy, the SMT test the programming stack)
+TEST_MODULES = {
+    'Offroad': 'src.core.offroad_test',
+    'SMT': 'src.core.smt_test',
+    'WeightChecking': 'src.core.weight_test'
+}
+
+
+def warm_up_test_module(mode: str) -> Optional[threading.Thread]:
+    """Import a mode's test module on a background thread so the first test does not wait for it"""
+    module = TEST_MODULES.get(mode)
+    if module is None:
+        return None
+
+    def _import():
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Could not preload {module}: {e}")
+
+    thread = threading.Thread(target=_import, daemon=True, name=f"WarmUp-{mode}")
+    thread.start()
+    return thread
 
 
 class PreloadedComponents:
@@ -46,27 +74,32 @@ class PreloaderThread(QThread):
             
             # Step 1: Import heavy modules
             self.progress.emit("Loading modules...", int(current_step / total_steps * 100))
-            self._preload_imports()
+            with profile_phase("preload.imports"):
+                self._preload_imports()
             current_step += 1
             
             # Step 2: Load SKU Manager and data
             self.progress.emit("Loading SKU configurations...", int(current_step / total_steps * 100))
-            self._preload_sku_manager()
+            with profile_phase("preload.sku_load"):
+                self._preload_sku_manager()
             current_step += 1
             
             # Step 3: Initialize handlers (without MainWindow)
             self.progress.emit("Initializing handlers...", int(current_step / total_steps * 100))
-            self._preload_handlers()
+            with profile_phase("preload.handlers"):
+                self._preload_handlers()
             current_step += 1
             
             # Step 4: Scan serial ports
             self.progress.emit("Scanning hardware ports...", int(current_step / total_steps * 100))
-            self._scan_serial_ports()
+            with profile_phase("preload.port_scan"):
+                self._scan_serial_ports()
             current_step += 1
             
             # Step 5: Cache commonly used resources
             self.progress.emit("Caching resources...", int(current_step / total_steps * 100))
-            self._cache_resources()
+            with profile_phase("preload.cache_resources"):
+                self._cache_resources()
             current_step += 1
             
             self.progress.emit("Ready", 100)
@@ -100,9 +133,8 @@ class PreloaderThread(QThread):
             
             import src.hardware.arduino_controller
             import src.hardware.serial_manager
-            import src.core.offroad_test
-            import src.core.smt_test
             import src.data.sku_manager
+            # Test modules are imported once a mode is chosen (warm_up_test_module)
             
             self.components.imports_loaded = True
             self.logger.info("Imports preloaded successfully")
@@ -117,11 +149,11 @@ class PreloaderThread(QThread):
             self.logger.info("Loading SKU manager...")
             self.progress.emit("Loading SKU configurations...", 50)
             
-            from src.data.sku_manager import SKUManager
+            from src.data.sku_manager import get_sku_manager
             
-            # Create and load SKU manager
+            # Index the shared SKU manager (SKU files are parsed on first use)
             start_time = time.time()
-            self.components.sku_manager = SKUManager()
+            self.components.sku_manager = get_sku_manager()
             load_time = (time.time() - start_time) * 1000
             
             sku_count = len(self.components.sku_manager.get_all_skus())
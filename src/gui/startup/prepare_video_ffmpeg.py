@@ -1,6 +1,9 @@
 """
 Alternative video preparation script using ffmpeg directly
 More reliable than moviepy for simple operations
+
+Also pre-transcodes the video into the splash frame caches
+(src/gui/startup/splash_frames.py), so the splash screens never decode it.
 """
 import sys
 import subprocess
@@ -97,6 +100,23 @@ def trim_video_ffmpeg(ffmpeg_path, input_path, output_path, duration=3):
         raise
 
 
+def build_splash_frames(ffmpeg_path, video_path):
+    """Pre-transcode the video into the splash frame caches"""
+    # Run as a script: make the project root importable
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+    from src.gui.startup.splash_frames import build_frame_caches
+    
+    print("Building splash frame caches...")
+    try:
+        built = build_frame_caches(video_path, ffmpeg=ffmpeg_path)
+        for path in built:
+            print(f"  {path} ({path.stat().st_size / 1024 / 1024:.1f} MB)")
+        print(f"{len(built)} frame caches built" if built else "Frame caches are up to date")
+    except Exception as e:
+        print(f"Could not build splash frame caches: {e}")
+        print("The splash will decode the video at launch until they are built.")
+
+
 def prepare_video():
     """Main function to prepare the startup video"""
     print("Startup Video Preparation (using ffmpeg directly)")
@@ -120,7 +140,8 @@ def prepare_video():
     if final_video_path.exists():
         response = input(f"\nVideo already exists at {final_video_path}\nOverwrite? (y/n): ")
         if response.lower() != 'y':
-            print("Keeping existing video. Exiting.")
+            print("Keeping existing video.")
+            build_splash_frames(ffmpeg_path, final_video_path)
             return
     
     # Create temporary directory for processing
@@ -138,6 +159,7 @@ def prepare_video():
             
             print(f"\n✅ Success! Startup video saved to:\n{final_video_path}")
             print(f"File size: {final_video_path.stat().st_size / 1024 / 1024:.2f} MB")
+            build_splash_frames(ffmpeg_path, final_video_path)
             
         except Exception as e:
             print(f"\n❌ Error preparing video: {e}")
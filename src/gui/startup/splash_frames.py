@@ -0,0 +1,420 @@
+"""
+Splash Frame Cache Module
+Pre-transcoded startup video frames, so the splash screens never decode video
+
+The startup video is transcoded once with ffmpeg into raw RGB frames at the
+size each splash shows it (SPLASH_VIDEO['sizes']) and the cache fps. The
+cache file is named after the SHA-256 of the source video, so replacing the
+video simply leaves the old cache unused. The hash is kept in sources.json
+next to the caches with the video's (mtime_ns, size), so a launch only
+stats the video and re-hashes it after it changed. At launch the splash memory-maps
+the file and hands each frame to Qt as a QImage over the mapped bytes:
+no demuxer, no codec, no scaling, and identical consecutive frames (holds,
+fades to a still) are stored and painted once.
+
+Caches are built by prepare_video_ffmpeg.py, or in the background once the
+main window is shown when ffmpeg is available and a cache is missing. Until
+then SplashScreen plays the video with QMediaPlayer as before. The unified
+splash shows its static logo unless SPLASH_VIDEO['unified_video'] is set;
+the background build only makes caches for splashes that play the video at
+launch, and does nothing when none does.
+
+Usage:
+    python -m src.gui.startup.splash_frames build [--video resources/startup_video.mp4]
+"""
+
+import os
+import re
+import json
+import mmap
+import array
+import shutil
+import struct
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QTimer, Signal
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QLabel
+
+from config.settings import SPLASH_VIDEO
+
+STARTUP_VIDEO = Path(__file__).parent.parent.parent.parent / "resources" / "startup_video.mp4"
+FORMAT_VERSION = 1
+
+# magic, format version, width, height, fps, frame count, slot count, index offset
+_HEADER = struct.Struct("<8sHHHHIIQ")
+_MAGIC = b"SPLASHFR"
+_SOURCES_FILE = "sources.json"
+_DATA_START = 64
+_VIDEO_SIZE = re.compile(r"Video:.*?\b(\d{2,5})x(\d{2,5})\b")
+
+
+def source_hash(video_path: Path) -> str:
+    """SHA-256 of the source video"""
+    digest = hashlib.sha256()
+    with open(video_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(video_path: Path, directory: Path) -> str:
+    """
+    SHA-256 of a source video, from the cache directory's sources.json while the video is unchanged.
+
+    The video is hashed only when its (mtime_ns, size) differs from the recorded one.
+    """
+    video_path, index_path = Path(video_path), Path(directory) / _SOURCES_FILE
+    stat = video_path.stat()
+    key = str(video_path.resolve())
+    sources = {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            sources = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if not isinstance(sources, dict):
+        sources = {}
+    entry = sources.get(key)
+    if (isinstance(entry, dict) and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size and entry.get("sha256")):
+        return entry["sha256"]
+
+    digest = source_hash(video_path)
+    sources[key] = {"sha256": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(sources, f, indent=2)
+            os.replace(tmp, index_path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Could not record splash video hash: {e}")
+    return digest
+
+
+def cache_dir() -> Path:
+    """Frame cache directory (SPLASH_VIDEO['directory'] or local data dir / 'splash_cache')"""
+    if SPLASH_VIDEO.get('directory'):
+        return Path(SPLASH_VIDEO['directory'])
+    from src.utils.path_manager import get_path_manager
+    return get_path_manager().get_local_data_dir() / "splash_cache"
+
+
+def frame_cache_path(digest: str, size: Tuple[int, int], fps: int, directory: Path) -> Path:
+    """Cache file for one source video, frame box and frame rate"""
+    return Path(directory) / f"{digest[:16]}_{size[0]}x{size[1]}_{fps}fps.frames"
+
+
+def fit_size(source: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """Largest even frame size with the source's aspect ratio that fits the box"""
+    scale = min(box[0] / source[0], box[1] / source[1])
+    return max(2, int(source[0] * scale) // 2 * 2), max(2, int(source[1] * scale) // 2 * 2)
+
+
+class SplashFrames:
+    """Read-only, memory-mapped view of a .frames file"""
+
+    def __init__(self, path: Path):
+        """
+        Map a frame cache and read its index.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a complete frame cache of this format
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _DATA_START:
+                raise ValueError("truncated header")
+            magic, version, self.width, self.height, self.fps, frame_count, slot_count, index_offset = \
+                _HEADER.unpack_from(self._map)
+            if magic != _MAGIC or version != FORMAT_VERSION:
+                raise ValueError("not a splash frame cache of this format")
+            self.frame_size = self.width * self.height * 3
+            if (not self.fps or index_offset != _DATA_START + slot_count * self.frame_size
+                    or len(self._map) != index_offset + frame_count * 4):
+                raise ValueError("truncated or inconsistent frame data")
+            self._slots = array.array('I')
+            self._slots.frombytes(self._map[index_offset:])
+            if any(slot >= slot_count for slot in self._slots):
+                raise ValueError("frame index out of range")
+            self.slot_count = slot_count
+        except Exception:
+            self._map.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def slot(self, index: int) -> int:
+        """Stored frame shown at position index (equal for repeated frames)"""
+        return self._slots[index]
+
+    def frame(self, index: int) -> bytes:
+        """RGB888 bytes of a frame"""
+        offset = _DATA_START + self._slots[index] * self.frame_size
+        return self._map[offset:offset + self.frame_size]
+
+    def pixmap(self, index: int) -> QPixmap:
+        """A frame as a pixmap, converted straight from the mapped bytes"""
+        offset = _DATA_START + self._slots[index] * self.frame_size
+        with memoryview(self._map)[offset:offset + self.frame_size] as view:
+            image = QImage(view, self.width, self.height, self.width * 3, QImage.Format_RGB888)
+            pixmap = QPixmap.fromImage(image)  # copies, so the view can be released
+            del image
+        return pixmap
+
+    def close(self):
+        """Unmap the file"""
+        self._map.close()
+
+
+def open_frames(path: Path) -> Optional[SplashFrames]:
+    """Open a frame cache, None if it is missing or unusable"""
+    if not Path(path).is_file():
+        return None
+    try:
+        return SplashFrames(path)
+    except (OSError, ValueError) as e:
+        logging.getLogger(__name__).warning(f"Ignoring splash frame cache {path}: {e}")
+        return None
+
+
+def find_frame_cache(video_path: Path, size_key: str, directory: Optional[Path] = None) -> Optional[SplashFrames]:
+    """
+    Open the frame cache of a video for one splash, if it was built.
+
+    Args:
+        video_path: Source video
+        size_key: Splash in SPLASH_VIDEO['sizes'] ("unified", "classic")
+        directory: Cache directory (default: cache_dir())
+
+    Returns:
+        The mapped frames, or None (cache disabled, not built yet, or unusable)
+    """
+    if not SPLASH_VIDEO.get('frame_cache', True) or not Path(video_path).is_file():
+        return None
+    try:
+        directory = Path(directory or cache_dir())
+        path = frame_cache_path(source_digest(video_path, directory), SPLASH_VIDEO['sizes'][size_key],
+                                SPLASH_VIDEO['fps'], directory)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Could not look up splash frame cache: {e}")
+        return None
+    return open_frames(path)
+
+
+def write_frame_cache(path: Path, width: int, height: int, fps: int, frames: Iterable[bytes]) -> int:
+    """
+    Write RGB888 frames to a cache file, storing repeated frames once.
+
+    Returns:
+        Number of frames written
+    """
+    frame_size = width * height * 3
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    slots, previous, slot_count = array.array('I'), None, 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b"\0" * _DATA_START)
+            for frame in frames:
+                if len(frame) != frame_size:
+                    raise ValueError(f"frame {len(slots)} is {len(frame)} bytes, expected {frame_size}")
+                if frame != previous:
+                    f.write(frame)
+                    previous, slot_count = frame, slot_count + 1
+                slots.append(slot_count - 1)
+            if not slots:
+                raise ValueError("no frames")
+            f.write(slots.tobytes())
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, width, height, fps, len(slots), slot_count,
+                                 _DATA_START + slot_count * frame_size))
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+    return len(slots)
+
+
+def find_ffmpeg() -> Optional[str]:
+    """ffmpeg from imageio_ffmpeg or the PATH, None if neither is installed"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        return shutil.which("ffmpeg")
+
+
+def _probe_size(ffmpeg: str, video_path: Path) -> Tuple[int, int]:
+    result = subprocess.run([ffmpeg, "-hide_banner", "-i", str(video_path)], capture_output=True, text=True)
+    match = _VIDEO_SIZE.search(result.stderr)
+    if not match:
+        raise ValueError(f"could not read the video size of {video_path}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def _decode_frames(ffmpeg: str, video_path: Path, width: int, height: int, fps: int) -> Iterable[bytes]:
+    """Decode, resample and scale the video with ffmpeg, yielding RGB888 frames"""
+    command = [ffmpeg, "-v", "error", "-i", str(video_path), "-an", "-threads", "1",
+               "-vf", f"fps={fps},scale={width}:{height}:flags=lanczos",
+               "-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+    frame_size = width * height * 3
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+        while True:
+            frame = process.stdout.read(frame_size)
+            if len(frame) < frame_size:
+                break
+            yield frame
+        stderr = process.stderr.read().decode(errors='replace')
+    if process.returncode:
+        raise RuntimeError(f"ffmpeg failed: {stderr.strip()}")
+
+
+def video_splashes() -> List[str]:
+    """Splashes (SPLASH_VIDEO['sizes'] keys) that play the startup video at launch"""
+    return ['unified'] if SPLASH_VIDEO.get('unified_video', False) else []
+
+
+def build_frame_caches(video_path: Path = STARTUP_VIDEO, ffmpeg: Optional[str] = None,
+                       directory: Optional[Path] = None, size_keys: Optional[List[str]] = None) -> List[Path]:
+    """
+    Transcode a video into a frame cache for every splash size that has none yet.
+
+    Args:
+        video_path: Source video
+        ffmpeg: ffmpeg executable (default: find_ffmpeg())
+        directory: Cache directory (default: cache_dir())
+        size_keys: Splashes to build for (default: all of SPLASH_VIDEO['sizes'])
+
+    Returns:
+        The cache files built
+
+    Raises:
+        RuntimeError: If ffmpeg is not available or fails
+    """
+    logger = logging.getLogger(__name__)
+    ffmpeg = ffmpeg or find_ffmpeg()
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg not found (pip install imageio_ffmpeg)")
+    directory = Path(directory or cache_dir())
+    digest, fps = source_digest(video_path, directory), SPLASH_VIDEO['fps']
+
+    built, source_size = [], None
+    for key, box in SPLASH_VIDEO['sizes'].items():
+        if size_keys is not None and key not in size_keys:
+            continue
+        path = frame_cache_path(digest, box, fps, directory)
+        if path.exists():
+            continue
+        source_size = source_size or _probe_size(ffmpeg, video_path)
+        width, height = fit_size(source_size, box)
+        count = write_frame_cache(path, width, height, fps, _decode_frames(ffmpeg, video_path, width, height, fps))
+        logger.info(f"Built splash frame cache {path}: {count} frames at {width}x{height}, "
+                    f"{path.stat().st_size / 1024 / 1024:.1f} MB")
+        built.append(path)
+
+    # Caches of replaced videos are never read again
+    keep = {frame_cache_path(digest, box, fps, directory) for box in SPLASH_VIDEO['sizes'].values()}
+    for stale in directory.glob("*.frames"):
+        if stale not in keep:
+            try:
+                stale.unlink()
+            except OSError:
+                pass  # still mapped by a running splash (Windows)
+    return built
+
+
+def build_frame_caches_async(video_path: Path = STARTUP_VIDEO) -> Optional[threading.Thread]:
+    """
+    Build the missing frame caches of the splashes that play the video (video_splashes()) in the background.
+
+    Returns:
+        The thread, or None if the cache is disabled, no splash plays the video, there is no video or no ffmpeg
+    """
+    size_keys = video_splashes()
+    if (not SPLASH_VIDEO.get('frame_cache', True) or not size_keys or not Path(video_path).is_file()
+            or not find_ffmpeg()):
+        return None
+
+    def build():
+        try:
+            build_frame_caches(video_path, size_keys=size_keys)
+        except (OSError, ValueError, RuntimeError) as e:
+            logging.getLogger(__name__).warning(f"Could not build splash frame cache: {e}")
+
+    thread = threading.Thread(target=build, name="SplashFrameCache", daemon=True)
+    thread.start()
+    return thread
+
+
+class FramePlayer(QLabel):
+    """Plays a SplashFrames cache once, then holds the last frame"""
+
+    finished = Signal()
+
+    def __init__(self, frames: SplashFrames, parent=None):
+        super().__init__(parent)
+        self.frames = frames
+        self._index = 0
+        self._shown_slot = None
+        self.setFixedSize(frames.width, frames.height)
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, round(1000 / frames.fps)))
+        self._timer.timeout.connect(self._next_frame)
+
+    def start(self):
+        """Show the first frame and play"""
+        self._index = 0
+        self._shown_slot = None
+        self._show(0)
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _show(self, index: int):
+        slot = self.frames.slot(index)
+        if slot != self._shown_slot:  # repeated frames are not repainted
+            self.setPixmap(self.frames.pixmap(index))
+            self._shown_slot = slot
+
+    def _next_frame(self):
+        self._index += 1
+        if self._index >= len(self.frames):
+            self._timer.stop()
+            self.finished.emit()
+            return
+        self._show(self._index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-transcode the startup video into splash frame caches")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--video", default=str(STARTUP_VIDEO), help="Source video (default: %(default)s)")
+    parser.add_argument("--output-dir", help="Cache directory (default: local data dir / splash_cache)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    built = build_frame_caches(Path(args.video), directory=Path(args.output_dir) if args.output_dir else None)
+    print(f"build: {len(built)} splash frame caches written")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,6 @@ from pathlib import Path
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QApplication, QGraphicsDropShadowEffect, QProgressBar
 from PySide6.QtCore import Qt, QTimer, Signal, QThread, QUrl, QPropertyAnimation, QEasingCurve
 from PySide6.QtGui import QPixmap, QGuiApplication, QIcon, QLinearGradient, QPalette, QBrush
-from PySide6.QtMultimedia import QMediaPlayer
-from PySide6.QtMultimediaWidgets import QVideoWidget
 from .transition_manager import transition_manager
 from .preloader import PreloaderThread, PreloadedComponents
 
@@ -88,15 +86,46 @@ class SplashScreen(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        # Try to setup video player, fallback to static image
+        # Play pre-transcoded frames if cached, else the video, fallback to static image
         if self.video_path and Path(self.video_path).exists():
-            self.setup_video_player(layout)
+            from .splash_frames import find_frame_cache
+            frames = find_frame_cache(Path(self.video_path), 'classic')
+            if frames:
+                self.setup_frame_player(layout, frames)
+            else:
+                self.setup_video_player(layout)
         else:
             self.setup_fallback_splash(layout)
             
+    def setup_frame_player(self, layout, frames):
+        """Play the splash video from its memory-mapped frame cache (no decoding)"""
+        from .splash_frames import FramePlayer
+        video_container = QWidget()
+        video_container.setStyleSheet("background-color: #1a1a1a;")  # Match splash background
+        container_layout = QVBoxLayout(video_container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        container_layout.setAlignment(Qt.AlignCenter)
+
+        self.video_widget = FramePlayer(frames)
+        self.video_widget.finished.connect(self.on_frames_finished)
+        container_layout.addWidget(self.video_widget)
+        layout.addWidget(video_container)
+
+        self.video_widget.start()
+        QTimer.singleShot(self.duration_ms, self.on_video_ready)
+
+    def on_frames_finished(self):
+        """Cached frames played to the end"""
+        self.video_ended = True
+        self.on_video_ready()
+
     def setup_video_player(self, layout):
         """Setup video player for splash video with optimizations and safety timeout"""
         try:
+            # QtMultimedia (and its codec backend) is only loaded when no frame cache exists
+            from PySide6.QtMultimedia import QMediaPlayer
+            from PySide6.QtMultimediaWidgets import QVideoWidget
+
             # Create container for video with rounded corners
             video_container = QWidget()
             video_container.setStyleSheet("""
@@ -297,6 +326,7 @@ class SplashScreen(QWidget):
         
     def on_media_status_changed(self, status):
         """Handle media status changes"""
+        from PySide6.QtMultimedia import QMediaPlayer
         print(f"Media status changed: {status}")
         if status == QMediaPlayer.LoadedMedia:
             # Video loaded successfully, stop timeout
@@ -469,6 +499,10 @@ class SplashScreen(QWidget):
             except:
                 pass
         
+        # Stop cached frame playback
+        if hasattr(self, 'video_widget') and hasattr(self.video_widget, 'frames'):
+            self.video_widget.stop()
+
         # Stop any running timers
         if hasattr(self, 'video_timeout'):
             self.video_timeout.stop()
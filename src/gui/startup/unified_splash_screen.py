@@ -11,8 +11,6 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PySide6.QtCore import (Qt, QTimer, Signal, QThread, QUrl, QPropertyAnimation, 
                            QEasingCurve, QParallelAnimationGroup, QPoint)
 from PySide6.QtGui import QPixmap, QGuiApplication, QIcon, QColor, QFont
-from PySide6.QtMultimedia import QMediaPlayer
-from PySide6.QtMultimediaWidgets import QVideoWidget
 from .preloader import PreloaderThread, PreloadedComponents
 
 
@@ -95,10 +93,12 @@ class UnifiedSplashScreen(QWidget):
     WINDOW_WIDTH = 1000
     WINDOW_HEIGHT = 600
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, play_video: bool = True):
         super().__init__(parent)
         self.logger = logging.getLogger(__name__)
         self.setObjectName("UnifiedSplashScreen")  # For QSS
+        self.play_video = play_video
+        self.frame_player = None
         
         self.preloaded_components = None
         self.preloader_thread = None
@@ -420,6 +420,30 @@ class UnifiedSplashScreen(QWidget):
             self.progress_animation.start()
         
         self.logger.debug(f"Window shown, visible: {self.isVisible()}, state: {self.windowState()}")
+
+        # The startup video plays from its frame cache once the first paint is done (opt-in)
+        from config.settings import SPLASH_VIDEO
+        if self.play_video and SPLASH_VIDEO.get('unified_video', False):
+            QTimer.singleShot(0, self.start_splash_video)
+
+    def start_splash_video(self):
+        """Play the pre-transcoded startup video in place of the logo, if its frame cache was built"""
+        from .splash_frames import STARTUP_VIDEO, FramePlayer, find_frame_cache
+        if self.is_closing or not STARTUP_VIDEO.exists():
+            return
+        frames = find_frame_cache(STARTUP_VIDEO, 'unified')
+        if not frames:
+            return
+        self.frame_player = FramePlayer(frames)
+        self.frame_player.finished.connect(self.on_splash_video_finished)
+        self.logo_label.parentWidget().layout().addWidget(self.frame_player, 0, Qt.AlignCenter)
+        self.logo_label.hide()
+        self.frame_player.start()
+
+    def on_splash_video_finished(self):
+        """Return to the logo after the video"""
+        self.frame_player.hide()
+        self.logo_label.show()
     
     def get_preloaded_components(self):
         """Get preloaded components"""
@@ -433,6 +457,8 @@ class UnifiedSplashScreen(QWidget):
         self.is_closing = True
         
         # Cleanup
+        if self.frame_player:
+            self.frame_player.stop()
         if self.preloader_thread and self.preloader_thread.isRunning():
             self.preloader_thread.quit()
             self.preloader_thread.wait(1000)
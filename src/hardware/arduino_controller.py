@@ -18,6 +18,15 @@ from src.utils.thread_cleanup import ThreadCleanupMixin
 from queue import Queue, Empty
 
 
+# RESULT keys that identify the reporting test when several tests are running
+RESULT_KEY_TESTS = {
+    "INITIAL": "PRESSURE",
+    "DELTA": "PRESSURE",
+    "MV_BACK1": "DUAL_BACKLIGHT",
+    "MV_BACK2": "DUAL_BACKLIGHT"
+}
+
+
 @dataclass
 class SensorReading:
     """Container for sensor reading data"""
@@ -65,7 +74,7 @@ class ArduinoController(ThreadCleanupMixin):
 
     def __init__(self, baud_rate: int = 115200):
         super().__init__()  # Initialize ResourceMixin
-        self.serial = SerialManager(baud_rate=baud_rate)
+        self.serial = SerialManager(baud_rate=baud_rate, capture_label="offroad")
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # Sensor management
@@ -89,6 +98,11 @@ class ArduinoController(ThreadCleanupMixin):
         # Current test tracking
         self.current_test_type: Optional[str] = None
         self.latest_test_result: Optional[TestResult] = None
+        self.running_tests: List[str] = []  # Started and not yet complete, oldest first
+        self.completed_tests = set()  # Tests with TEST_COMPLETE since their last TEST_STARTED
+
+        # Signalled on RESULT, RGBW_SAMPLE and TEST_COMPLETE so tests can wait without polling
+        self.test_event = threading.Condition()
         
         # Command queue for sending commands during reading loop
         self.command_queue: Queue = Queue()
@@ -305,6 +319,8 @@ class ArduinoController(ThreadCleanupMixin):
             return resp.startswith("OK:SENSOR") or resp.startswith("ERROR:SENSOR")
         elif cmd == "TEST":
             return resp.startswith("OK:TEST") or resp.startswith("ERROR:TEST")
+        elif cmd == "CAPS":
+            return resp.startswith("CAPS:") or resp.startswith("ERROR:")
         else:
             # Generic OK/ERROR responses
             return resp.startswith("OK:") or resp.startswith("ERROR:")
@@ -332,8 +348,13 @@ class ArduinoController(ThreadCleanupMixin):
             # Handle TEST_COMPLETE messages
             elif line.startswith("TEST_COMPLETE:"):
                 test_type = line[14:].strip()
-                self.current_test_type = None
+                with self.test_event:
+                    if test_type in self.running_tests:
+                        self.running_tests.remove(test_type)
+                    self.completed_tests.add(test_type)
+                self.current_test_type = self.running_tests[-1] if self.running_tests else None
                 self.logger.info(f"Test completed: {test_type}")
+                self._notify_test_event()
 
             # Handle RESULT messages
             elif line.startswith("RESULT:"):
@@ -348,6 +369,7 @@ class ArduinoController(ThreadCleanupMixin):
                             self.result_callback(result)
                         except Exception as e:
                             self.logger.error(f"Result callback error: {e}")
+                    self._notify_test_event()
 
             # Handle RGBW_SAMPLE messages
             elif line.startswith("RGBW_SAMPLE:"):
@@ -361,11 +383,17 @@ class ArduinoController(ThreadCleanupMixin):
                             self.rgbw_callback(sample)
                         except Exception as e:
                             self.logger.error(f"RGBW callback error: {e}")
+                    self._notify_test_event()
 
             # Handle TEST_STARTED messages
             elif line.startswith("TEST_STARTED:"):
                 test_type = line[13:].strip()
                 self.current_test_type = test_type
+                with self.test_event:
+                    if test_type in self.running_tests:
+                        self.running_tests.remove(test_type)
+                    self.running_tests.append(test_type)
+                    self.completed_tests.discard(test_type)
                 self.logger.info(f"Test started: {test_type}")
 
             # Handle STATUS messages
@@ -470,6 +498,12 @@ class ArduinoController(ThreadCleanupMixin):
 
             # Determine test type from current state or measurements
             test_type = self.current_test_type or "UNKNOWN"
+            running = list(self.running_tests)
+            if len(running) > 1:
+                # Overlapping tests (e.g. a function test during the pressure hold)
+                owners = [RESULT_KEY_TESTS[key] for key in measurements if RESULT_KEY_TESTS.get(key) in running]
+                test_type = owners[0] if owners else next(
+                    (t for t in reversed(running) if t not in RESULT_KEY_TESTS.values()), running[-1])
 
             return TestResult(
                 timestamp=timestamp,
@@ -593,6 +627,37 @@ class ArduinoController(ThreadCleanupMixin):
         values = [reading.value for reading in readings]
         return sum(values) / len(values)
 
+    def _notify_test_event(self):
+        """Wake threads waiting in wait_for_test_event (called after the callbacks ran)"""
+        with self.test_event:
+            self.test_event.notify_all()
+
+    def wait_for_test_event(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        """
+        Block until predicate() is true, re-checking on every RESULT, RGBW_SAMPLE and TEST_COMPLETE.
+
+        Args:
+            predicate: Condition on the received test data
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            The final value of predicate() - False on timeout
+        """
+        with self.test_event:
+            return bool(self.test_event.wait_for(predicate, timeout))
+
+    def clear_test_completion(self, test_type: Optional[str] = None):
+        """Forget an earlier TEST_COMPLETE (of one test type, or all) before running the test again"""
+        with self.test_event:
+            if test_type is None:
+                self.completed_tests.clear()
+            else:
+                self.completed_tests.discard(test_type)
+
+    def is_test_complete(self, test_type: str) -> bool:
+        """True once TEST_COMPLETE was received for test_type"""
+        return test_type in self.completed_tests
+
     def get_latest_test_result(self) -> Optional[TestResult]:
         """Get the most recent test result"""
         with self.reading_lock:
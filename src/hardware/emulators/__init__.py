@@ -0,0 +1 @@
+# Pseudo-terminal hardware emulators for benchmarks and CI (Linux only)
@@ -0,0 +1,492 @@
+"""
+Offroad tester firmware emulator
+Python model of the offroad fixture on a pseudo-terminal, so ArduinoController
+and OffroadTest can be exercised end to end without hardware.
+
+Speaks the message stream ArduinoController parses: TEST:* commands are
+acknowledged with OK:TEST:*, followed by TEST_STARTED, RESULT:KEY=value (or
+RGBW_SAMPLE) lines and TEST_COMPLETE. LIVE lines stream at a configurable
+interval (down to 10 ms) while monitoring is on and during the pressure test.
+
+With background_pressure the emulator models firmware that answers CAPS with
+CAPS:BACKGROUND=PRESSURE and accepts electrical tests while the pressure test
+holds; otherwise CAPS is an unknown command, as on current firmware.
+
+Note: firmware/arduino/offroad_tester.ino still reports results as framed
+TESTF:/PRESSURE:/DUAL: lines; this emulator follows the host side.
+
+Usage:
+    python -m src.hardware.emulators.offroad_emulator [--interval-ms 10] [--stream] [--time-scale 0.1]
+"""
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.hardware.emulators.pty_device import PtyDevice
+
+# Timing constants from offroad_tester.ino (ms)
+RELAY_STAB_MS = 50
+MAX_SAMPLES = 10
+SAMPLE_DELAY_MS = 25
+PT_FILL_MS = 1500
+PT_WAIT_MS = 2500
+PT_EXH_MS = 500
+RGBW_CYCLES = 8
+RGBW_STAB_MS = 150
+RGBW_SAMPLE_DELAYS_MS = (50, 150, 150)
+RGBW_PAUSE_MS = 100
+
+# Red, green, blue, white - repeated for the 8 cycles
+DEFAULT_RGBW_XY = [(0.690, 0.305), (0.170, 0.700), (0.140, 0.060), (0.313, 0.329)] * 2
+
+
+@dataclass
+class OffroadEmulatorFaults:
+    """Fault injection settings"""
+    drop_line_rate: float = 0.0         # Fraction of output lines lost
+    pressure_sensor_missing: bool = False
+    color_sensor_missing: bool = False
+
+
+@dataclass
+class OffroadEmulatorConfig:
+    """Electrical, optical, pneumatic and timing model of the fixture"""
+    supply_voltage: float = 13.2
+    voltage_droop_per_amp: float = 0.05
+    mainbeam_current_a: float = 2.1
+    backlight_current_a: Tuple[float, float] = (0.15, 0.15)   # B1, B2
+    mainbeam_lux: float = 3300.0
+    backlight_lux: float = 150.0
+    ambient_lux: float = 0.5
+    mainbeam_xy: Tuple[float, float] = (0.440, 0.405)
+    backlight_xy: Tuple[float, float] = (0.580, 0.390)
+    rgbw_cycle_xy: List[Tuple[float, float]] = field(default_factory=lambda: list(DEFAULT_RGBW_XY))
+    ambient_psi: float = 14.7
+    fill_psi: float = 15.5
+    leak_rate_psi_s: float = 0.02
+    relative_noise: float = 0.005       # Gaussian noise as a fraction of the value
+    xy_noise: float = 0.001
+    stream_interval_ms: float = 100.0   # LIVE line interval (firmware STREAM_INTERVAL_MS)
+    stream_on_start: bool = False       # Stream LIVE lines without waiting for M:1 / STREAM:ON
+    stream_during_tests: bool = False   # Firmware only streams while idle; True for stress tests
+    time_scale: float = 1.0             # 0.1 runs test timings 10x faster
+    background_pressure: bool = False   # Other tests may run during the pressure test (CAPS:BACKGROUND=PRESSURE)
+    seed: Optional[int] = None
+    faults: OffroadEmulatorFaults = field(default_factory=OffroadEmulatorFaults)
+
+
+class OffroadFirmwareEmulator(PtyDevice):
+    """Emulates the offroad tester Arduino (INA260, VEML7700, OPT4048, MPRLS)"""
+
+    FIRMWARE_ID = "ID:DIODE_DYNAMICS_OFFROAD_TESTER_V1.0"
+    BANNER = "=== Offroad Tester V5 Simplified ==="
+
+    def __init__(self, config: Optional[OffroadEmulatorConfig] = None):
+        super().__init__(baud_rate=115200)
+        self.config = config or OffroadEmulatorConfig()
+        self._random = random.Random(self.config.seed)
+
+        self._state_lock = threading.Lock()
+        self.active_tests: List[str] = []
+        self.last_test = "FUNCTION_TEST"
+        self.streaming = self.config.stream_on_start
+        self.active_relay: Optional[str] = None     # 'MAIN', 'B1', 'B2'
+        self.rgbw_xy: Optional[Tuple[float, float]] = None
+        self.button_pressed = False
+
+        # Pressure state machine (updatePressureTest)
+        self._pressure_phase = "IDLE"
+        self._pressure_phase_start = 0.0
+        self._pressure_initial = 0.0
+        self._pressure = self.config.ambient_psi
+        self._pressure_updated = time.monotonic()
+
+        self._loop_thread: Optional[threading.Thread] = None
+        self._last_stream = 0.0
+
+        self.commands_handled = 0
+        self.lines_sent = 0
+        self.messages_sent: Counter = Counter()
+        self.faults_injected = {'dropped_line': 0}
+        self.overlapped_tests: List[str] = []      # Tests accepted while the pressure test was running
+
+    @property
+    def current_test(self) -> str:
+        """Most recently started test still running, "" when idle"""
+        return self.active_tests[-1] if self.active_tests else ""
+
+    @property
+    def faults(self) -> OffroadEmulatorFaults:
+        return self.config.faults
+
+    # Output
+    def _send_line(self, line: str):
+        if self.faults.drop_line_rate and self._random.random() < self.faults.drop_line_rate:
+            self.faults_injected['dropped_line'] += 1
+            return
+        self.write_line(line)
+        self.lines_sent += 1
+        self.messages_sent[line.split(":", 1)[0]] += 1
+
+    def _delay(self, duration_ms: float) -> bool:
+        return self.sleep_ms(duration_ms * self.config.time_scale)
+
+    # Sensor model
+    def _noisy(self, value: float) -> float:
+        return value + self._random.gauss(0, abs(value) * self.config.relative_noise)
+
+    def read_sensors(self) -> Dict[str, float]:
+        """One reading of every present sensor for the current relay state"""
+        cfg = self.config
+        with self._state_lock:
+            relay = self.active_relay
+            rgbw_xy = self.rgbw_xy
+
+        if relay == "MAIN":
+            current, lux, xy = cfg.mainbeam_current_a, cfg.mainbeam_lux, cfg.mainbeam_xy
+        elif relay in ("B1", "B2"):
+            current = cfg.backlight_current_a[0 if relay == "B1" else 1]
+            lux, xy = cfg.backlight_lux, rgbw_xy or cfg.backlight_xy
+        else:
+            current, lux, xy = 0.0, cfg.ambient_lux, (0.0, 0.0)
+
+        reading = {
+            'V': self._noisy(cfg.supply_voltage - current * cfg.voltage_droop_per_amp),
+            'I': max(0.0, self._noisy(current)),
+            'LUX': max(0.0, self._noisy(lux)),
+        }
+        if not self.faults.color_sensor_missing:
+            reading['X'] = xy[0] + self._random.gauss(0, cfg.xy_noise) if xy[0] else 0.0
+            reading['Y'] = xy[1] + self._random.gauss(0, cfg.xy_noise) if xy[1] else 0.0
+        if not self.faults.pressure_sensor_missing:
+            reading['PSI'] = self._read_psi()
+        return reading
+
+    def _read_psi(self) -> float:
+        """Advance the pneumatic model and return the current pressure"""
+        cfg = self.config
+        with self._state_lock:
+            now = time.monotonic()
+            elapsed = (now - self._pressure_updated) / max(cfg.time_scale, 1e-6)
+            self._pressure_updated = now
+            if self._pressure_phase == "FILL":
+                self._pressure = cfg.fill_psi
+            elif self._pressure_phase == "WAIT":
+                self._pressure -= cfg.leak_rate_psi_s * elapsed
+            else:
+                self._pressure = cfg.ambient_psi
+            pressure = self._pressure
+        return pressure + self._random.gauss(0, 0.002)
+
+    @staticmethod
+    def format_live(reading: Dict[str, float]) -> str:
+        parts = []
+        if 'V' in reading:
+            parts.append(f"V={reading['V']:.3f},I={reading['I']:.3f}")
+        if 'LUX' in reading:
+            parts.append(f"LUX={reading['LUX']:.2f}")
+        if 'X' in reading:
+            parts.append(f"X={reading['X']:.3f},Y={reading['Y']:.3f}")
+        if 'PSI' in reading:
+            parts.append(f"PSI={reading['PSI']:.3f}")
+        return "LIVE:" + ",".join(parts)
+
+    def collect_samples(self, relay: str) -> Dict[str, float]:
+        """Relay on, stabilise, average MAX_SAMPLES readings, relay off (collectSamples)"""
+        with self._state_lock:
+            self.active_relay = relay
+        self._delay(RELAY_STAB_MS)
+
+        samples = []
+        for i in range(MAX_SAMPLES):
+            samples.append(self.read_sensors())
+            if i < MAX_SAMPLES - 1:
+                self._delay(SAMPLE_DELAY_MS)
+
+        with self._state_lock:
+            self.active_relay = None
+        return {key: sum(s.get(key, 0.0) for s in samples) / len(samples) for key in ('V', 'I', 'LUX', 'X', 'Y')}
+
+    # Tests
+    def _begin_test(self, test_type: str) -> bool:
+        with self._state_lock:
+            overlap = (self.config.background_pressure and self.active_tests == ["PRESSURE"]
+                       and test_type != "PRESSURE")
+            if self.active_tests and not overlap:
+                busy = True
+            else:
+                busy = False
+                if overlap:
+                    self.overlapped_tests.append(test_type)
+                self.active_tests.append(test_type)
+                self.last_test = test_type
+        if busy:
+            self._send_line("ERROR:TEST_IN_PROGRESS")
+            return False
+        self._send_line(f"OK:TEST:{test_type}")
+        self._send_line(f"TEST_STARTED:{test_type}")
+        return True
+
+    def _end_test(self, test_type: str):
+        self._send_line(f"TEST_COMPLETE:{test_type}")
+        with self._state_lock:
+            if test_type in self.active_tests:
+                self.active_tests.remove(test_type)
+
+    def run_function_test(self, test_type: str = "FUNCTION_TEST"):
+        if not self._begin_test(test_type):
+            return
+        main = self.collect_samples("MAIN")
+        self._delay(10)
+        back = self.collect_samples("B1")
+
+        if test_type == "POWER":
+            fields = {'MV_MAIN': main['V'], 'MI_MAIN': main['I'], 'MV_BACK': back['V'], 'MI_BACK': back['I']}
+        elif test_type == "POWER_LUX":
+            fields = {'LUX_MAIN': main['LUX'], 'LUX_BACK': back['LUX']}
+        elif test_type == "POWER_COLOR":
+            fields = {'X_MAIN': main['X'], 'Y_MAIN': main['Y'], 'X_BACK': back['X'], 'Y_BACK': back['Y']}
+        else:
+            fields = {}
+            for suffix, sample in (("MAIN", main), ("BACK", back)):
+                fields.update({f"MV_{suffix}": sample['V'], f"MI_{suffix}": sample['I'],
+                               f"LUX_{suffix}": sample['LUX'], f"X_{suffix}": sample['X'],
+                               f"Y_{suffix}": sample['Y']})
+        self._send_result(fields)
+        self._end_test(test_type)
+
+    def run_dual_backlight_test(self):
+        if not self._begin_test("DUAL_BACKLIGHT"):
+            return
+        b1 = self.collect_samples("B1")
+        self._delay(10)
+        b2 = self.collect_samples("B2")
+
+        fields = {}
+        for suffix, sample in (("BACK1", b1), ("BACK2", b2)):
+            fields.update({f"MV_{suffix}": sample['V'], f"MI_{suffix}": sample['I'],
+                           f"LUX_{suffix}": sample['LUX'], f"X_{suffix}": sample['X'],
+                           f"Y_{suffix}": sample['Y']})
+        self._send_result(fields)
+        self._end_test("DUAL_BACKLIGHT")
+
+    def run_rgbw_test(self):
+        if not self._begin_test("RGBW_BACKLIGHT"):
+            return
+        colors = self.config.rgbw_cycle_xy
+        for cycle in range(RGBW_CYCLES):
+            with self._state_lock:
+                self.active_relay = "B1"
+                self.rgbw_xy = colors[cycle % len(colors)]
+            if not self._delay(RGBW_STAB_MS):
+                return
+            for delay_ms in RGBW_SAMPLE_DELAYS_MS:
+                if not self._delay(delay_ms):
+                    return
+                r = self.read_sensors()
+                self._send_line(f"RGBW_SAMPLE:CYCLE={cycle + 1},VOLTAGE={r['V']:.3f},CURRENT={r['I']:.3f},"
+                                f"LUX={r['LUX']:.2f},X={r.get('X', 0.0):.3f},Y={r.get('Y', 0.0):.3f}")
+            with self._state_lock:
+                self.active_relay = None
+                self.rgbw_xy = None
+            if not self._delay(RGBW_PAUSE_MS):
+                return
+        self._end_test("RGBW_BACKLIGHT")
+
+    def begin_pressure_test(self):
+        if self.faults.pressure_sensor_missing:
+            self._send_line("ERROR:SENSOR_MISSING:MPRLS")
+            return
+        if not self._begin_test("PRESSURE"):
+            return
+        with self._state_lock:
+            self._pressure_phase = "FILL"
+            self._pressure_phase_start = time.monotonic()
+
+    def _update_pressure_test(self, now: float):
+        """Non-blocking pressure state machine, ticked from the emulator loop"""
+        with self._state_lock:
+            phase = self._pressure_phase
+            elapsed_ms = (now - self._pressure_phase_start) * 1000.0 / max(self.config.time_scale, 1e-6)
+        if phase == "IDLE":
+            return
+
+        if phase == "FILL" and elapsed_ms >= PT_FILL_MS:
+            # Valve closes at the fill pressure; the leak starts from here
+            self._pressure_initial = self._read_psi()
+            with self._state_lock:
+                self._pressure_phase = "WAIT"
+                self._pressure_phase_start = now
+        elif phase == "WAIT" and elapsed_ms >= PT_WAIT_MS:
+            delta = self._pressure_initial - self._read_psi()
+            with self._state_lock:
+                self._pressure_phase = "EXHAUST"
+                self._pressure_phase_start = now
+            self._send_result({'INITIAL': self._pressure_initial, 'DELTA': delta})
+        elif phase == "EXHAUST" and elapsed_ms >= PT_EXH_MS:
+            with self._state_lock:
+                self._pressure_phase = "IDLE"
+            self._end_test("PRESSURE")
+
+    def _send_result(self, fields: Dict[str, float]):
+        self._send_line("RESULT:" + ",".join(f"{key}={value:.3f}" for key, value in fields.items()))
+
+    def run_test(self, test_type: str):
+        """Run a test by name (as TEST:<name> or a button press would)"""
+        if test_type == "PRESSURE":
+            self.begin_pressure_test()
+        elif test_type == "RGBW_BACKLIGHT":
+            self.run_rgbw_test()
+        elif test_type == "DUAL_BACKLIGHT":
+            self.run_dual_backlight_test()
+        else:
+            self.run_function_test(test_type)
+
+    # Button
+    def press_button(self):
+        """Simulate pressing the fixture button; starts the last test if idle"""
+        if self.button_pressed:
+            return
+        self.button_pressed = True
+        self._send_line("DATA:BUTTON:PRESSED")
+        if not self.current_test:
+            threading.Thread(target=self.run_test, args=(self.last_test,), daemon=True,
+                             name="OffroadEmulator_button_test").start()
+
+    def release_button(self):
+        """Simulate releasing the fixture button"""
+        if self.button_pressed:
+            self.button_pressed = False
+            self._send_line("DATA:BUTTON:RELEASED")
+
+    # Device loop
+    def on_start(self):
+        self._send_line(self.BANNER)
+        self._loop_thread = threading.Thread(target=self._device_loop, daemon=True,
+                                             name="OffroadEmulator_loop")
+        self._loop_thread.start()
+
+    def on_stop(self):
+        if self._loop_thread and self._loop_thread.is_alive():
+            self._loop_thread.join(timeout=2.0)
+
+    def _device_loop(self):
+        """Pressure state machine and LIVE streaming (the firmware's loop())"""
+        tick = min(self.config.stream_interval_ms / 1000.0, 0.01) / 2
+        while self.is_running:
+            now = time.monotonic()
+            self._update_pressure_test(now)
+
+            with self._state_lock:
+                in_test = bool(self.active_tests)
+                pressure_wait = self._pressure_phase == "WAIT"
+            may_stream = not in_test or pressure_wait or self.config.stream_during_tests
+            if self.streaming and may_stream and (now - self._last_stream) * 1000.0 >= self.config.stream_interval_ms:
+                self._last_stream = now
+                if pressure_wait:
+                    self._send_line(f"LIVE:PSI={self._read_psi():.3f}")
+                else:
+                    self._send_line(self.format_live(self.read_sensors()))
+            time.sleep(tick)
+
+    # Command handling (mirrors handleCommand)
+    def handle_line(self, line: str):
+        command = line.split(":SEQ=", 1)[0]
+        self.commands_handled += 1
+
+        if command in ("I", "ID"):
+            self._send_line(self.FIRMWARE_ID)
+        elif command == "PING":
+            self._send_line("PONG")
+        elif command == "V":
+            self._send_line(f"VOLTAGE:{self.read_sensors()['V']:.3f}")
+        elif command == "B":
+            self._send_line(f"BUTTON:{'PRESSED' if self.button_pressed else 'RELEASED'}")
+        elif command in ("X", "STOP"):
+            with self._state_lock:
+                self.active_relay = None
+                self._pressure_phase = "IDLE"
+                self.active_tests.clear()
+            self.streaming = False
+            self._send_line("OK:ALL_OFF" if command == "X" else "OK:STOPPED")
+        elif command in ("S", "SENSOR_CHECK"):
+            self._send_line("OK:SENSOR_CHECK")
+        elif command == "STATUS":
+            self._send_line(self._status_line())
+        elif command in ("M:1", "STREAM:ON"):
+            self.streaming = True
+            self._send_line("OK:MONITORING_ON")
+        elif command in ("M:0", "STREAM:OFF"):
+            self.streaming = False
+            self._send_line("OK:MONITORING_OFF")
+        elif command in ("TF", "TEST:FUNCTION_TEST"):
+            self.run_function_test("FUNCTION_TEST")
+        elif command in ("TP", "TEST:PRESSURE"):
+            self.begin_pressure_test()
+        elif command in ("TR", "TEST:RGBW_BACKLIGHT"):
+            self.run_rgbw_test()
+        elif command in ("TD", "TEST:DUAL_BACKLIGHT"):
+            self.run_dual_backlight_test()
+        elif command in ("TEST:POWER", "TEST:POWER_LUX", "TEST:POWER_COLOR"):
+            self.run_function_test(command[5:])
+        elif command == "CAPS" and self.config.background_pressure:
+            self._send_line("CAPS:BACKGROUND=PRESSURE")
+        elif command == "RESET_SEQ":
+            self._send_line("OK:SEQ_RESET")
+        else:
+            self._send_line(f"ERROR:UNKNOWN_CMD:{command}")
+
+    def _status_line(self) -> str:
+        color = "MISSING" if self.faults.color_sensor_missing else "OK"
+        pressure = "MISSING" if self.faults.pressure_sensor_missing else "OK"
+        return (f"STATUS:TEST={self.current_test or 'IDLE'},STREAM={int(self.streaming)},"
+                f"INA260=OK,VEML7700=OK,OPT4048={color},MPRLS={pressure}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description="Offroad tester firmware emulator on a pty")
+    parser.add_argument("--interval-ms", type=float, default=100.0, help="LIVE stream interval (ms)")
+    parser.add_argument("--stream", action="store_true", help="Stream LIVE lines from startup")
+    parser.add_argument("--stream-during-tests", action="store_true", help="Keep streaming while tests run")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Test timing multiplier (0.1 = 10x faster)")
+    parser.add_argument("--background-pressure", action="store_true",
+                        help="Accept other tests during the pressure test (CAPS:BACKGROUND=PRESSURE)")
+    parser.add_argument("--leak-rate", type=float, default=0.02, help="Pressure leak rate (PSI/s)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of lines dropped")
+    parser.add_argument("--button-interval", type=float, default=0.0, help="Press the button every N seconds")
+    parser.add_argument("--seed", type=int, help="Random seed for noise and faults")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    emulator = OffroadFirmwareEmulator(OffroadEmulatorConfig(
+        stream_interval_ms=args.interval_ms,
+        stream_on_start=args.stream,
+        stream_during_tests=args.stream_during_tests,
+        time_scale=args.time_scale,
+        leak_rate_psi_s=args.leak_rate,
+        background_pressure=args.background_pressure,
+        seed=args.seed,
+        faults=OffroadEmulatorFaults(drop_line_rate=args.drop_rate)
+    ))
+    print(f"Offroad emulator on {emulator.start()} - Ctrl+C to stop")
+    try:
+        while True:
+            if args.button_interval > 0:
+                time.sleep(args.button_interval)
+                emulator.press_button()
+                time.sleep(0.2)
+                emulator.release_button()
+            else:
+                time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Handled {emulator.commands_handled} commands, sent {emulator.lines_sent} lines: "
+              f"{dict(emulator.messages_sent)}")
+        emulator.stop()
@@ -0,0 +1,183 @@
+"""
+Base class for hardware emulators exposed on a pseudo-terminal
+The emulator owns the master side of a pty; controllers connect to the slave
+path exactly as they would to a real serial port. Linux/macOS only.
+"""
+import os
+import time
+import select
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+try:
+    import tty
+    import termios
+except ImportError:  # Windows - emulators are unavailable
+    tty = None
+    termios = None
+
+
+class PtyDevice(ABC):
+    """Line-oriented serial device emulated on a pty"""
+
+    def __init__(self, baud_rate: int = 115200, pace_output: bool = False):
+        """
+        Args:
+            baud_rate: Baud rate the emulated device talks at
+            pace_output: Throttle writes to the byte rate of baud_rate
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.baud_rate = baud_rate
+        self.pace_output = pace_output
+
+        self._master_fd: Optional[int] = None
+        self._slave_fd: Optional[int] = None
+        self.port: Optional[str] = None
+
+        self._running = threading.Event()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+        self._rx_buffer = bytearray()
+
+        self.lines_received = 0
+        self.bytes_sent = 0
+
+    def start(self) -> str:
+        """Create the pty, start the device and return the port path"""
+        if tty is None:
+            raise RuntimeError("Pty emulators require a POSIX system")
+        if self._running.is_set():
+            return self.port
+
+        self._master_fd, self._slave_fd = os.openpty()
+        # Raw mode: no echo, no line editing, no CR/LF translation
+        tty.setraw(self._slave_fd)
+        os.set_blocking(self._master_fd, False)
+        self.port = os.ttyname(self._slave_fd)
+
+        self._running.set()
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True,
+                                               name=f"{self.__class__.__name__}_reader")
+        self._reader_thread.start()
+        self.on_start()
+        self.logger.info(f"{self.__class__.__name__} listening on {self.port}")
+        return self.port
+
+    def stop(self):
+        """Stop the device and close the pty"""
+        if not self._running.is_set():
+            return
+        self._running.clear()
+        self.on_stop()
+        if self._reader_thread and self._reader_thread is not threading.current_thread():
+            self._reader_thread.join(timeout=2.0)
+        for fd in (self._master_fd, self._slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._master_fd = self._slave_fd = None
+        self.logger.info(f"{self.__class__.__name__} stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return self._running.is_set()
+
+    def client_baud_rate(self) -> Optional[int]:
+        """Baud rate the connected client configured on the pty, if it set one"""
+        try:
+            speed = termios.tcgetattr(self._slave_fd)[5]
+        except (termios.error, TypeError):
+            return None
+        for name in dir(termios):
+            if name.startswith('B') and name[1:].isdigit() and getattr(termios, name) == speed:
+                return int(name[1:])
+        return None
+
+    def write_bytes(self, data: bytes):
+        """Write raw bytes to the client"""
+        if self._master_fd is None:
+            return
+        with self._write_lock:
+            if self.pace_output and self.baud_rate:
+                # 10 bit times per byte (start + 8 data + stop)
+                time.sleep(len(data) * 10 / self.baud_rate)
+            # Non-blocking master: if nobody drains the port for a while the
+            # data is dropped, like a UART overflowing with no host attached
+            deadline = time.monotonic() + 1.0
+            while data and time.monotonic() < deadline:
+                try:
+                    written = os.write(self._master_fd, data)
+                    self.bytes_sent += written
+                    data = data[written:]
+                except BlockingIOError:
+                    select.select([], [self._master_fd], [], 0.05)
+                except OSError as e:
+                    self.logger.debug(f"Write failed: {e}")
+                    return
+
+    def write_line(self, text: str):
+        """Write a CRLF-terminated line, as Serial.println does"""
+        self.write_bytes(text.encode('utf-8') + b"\r\n")
+
+    def sleep_ms(self, duration_ms: float) -> bool:
+        """Sleep while running; returns False if the device was stopped"""
+        deadline = time.monotonic() + duration_ms / 1000.0
+        while self._running.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.05))
+        return False
+
+    def _reader_loop(self):
+        """Read client bytes and dispatch complete lines"""
+        while self._running.is_set():
+            try:
+                ready, _, _ = select.select([self._master_fd], [], [], 0.05)
+                if ready:
+                    data = os.read(self._master_fd, 4096)
+                    if data:
+                        self._rx_buffer.extend(data)
+                        self._dispatch_lines()
+                self.on_idle()
+            except OSError:
+                # Client side closed; keep serving until stopped
+                time.sleep(0.05)
+            except Exception as e:
+                self.logger.error(f"Emulator error: {e}")
+
+    def _dispatch_lines(self):
+        while True:
+            end = self._rx_buffer.find(b"\n")
+            if end == -1:
+                return
+            raw = bytes(self._rx_buffer[:end])
+            del self._rx_buffer[:end + 1]
+            line = raw.decode('utf-8', errors='ignore').strip()
+            if line:
+                self.lines_received += 1
+                self.handle_line(line)
+
+    # Hooks for subclasses
+    def on_start(self):
+        """Called once the pty exists (e.g. to print a startup banner)"""
+
+    def on_stop(self):
+        """Called when the device is stopping"""
+
+    def on_idle(self):
+        """Called from the reader loop roughly every 50 ms"""
+
+    @abstractmethod
+    def handle_line(self, line: str):
+        """Handle one command line from the client"""
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,189 @@
+"""
+Scale emulator
+Streams weight lines on a pseudo-terminal in the formats ScaleController
+parses (ST,GS / US,GS and plain 'g'), with settling, noise, outliers, partial
+lines, baud-rate mismatch and part-on/part-off scenarios.
+
+Usage:
+    python -m src.hardware.emulators.scale_emulator [--rate 20] [--part 125.0] [--cycle 3.0]
+"""
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.hardware.emulators.pty_device import PtyDevice
+
+
+@dataclass
+class ScaleEmulatorConfig:
+    """Stream and physical model of the scale"""
+    rate_hz: float = 10.0
+    output_format: str = "st_us"        # 'st_us' (ST,GS / US,GS) or 'plain' ('123.45 g')
+    baud_rate: int = 9600
+    pace_output: bool = True            # Limit output to what the baud rate can carry
+    noise_g: float = 0.02
+    settle_time_constant_s: float = 0.3
+    stable_band_g: float = 0.05         # Lines are ST inside this band, US outside
+    outlier_rate: float = 0.0
+    outlier_magnitude_g: float = 200.0
+    partial_line_rate: float = 0.0      # Fraction of lines split across two writes
+    truncated_line_rate: float = 0.0    # Fraction of lines cut off before the newline
+    seed: Optional[int] = None
+
+
+class ScaleEmulator(PtyDevice):
+    """Emulates a continuously streaming lab scale"""
+
+    def __init__(self, config: Optional[ScaleEmulatorConfig] = None):
+        self.config = config or ScaleEmulatorConfig()
+        super().__init__(baud_rate=self.config.baud_rate, pace_output=self.config.pace_output)
+        self._random = random.Random(self.config.seed)
+
+        self._target_weight = 0.0
+        self._actual_weight = 0.0
+        self._last_update = time.monotonic()
+        self._state_lock = threading.Lock()
+
+        self._stream_thread: Optional[threading.Thread] = None
+        self.lines_sent = 0
+
+    # Scenario control
+    def place_part(self, weight_g: float):
+        """Put a part of the given weight on the scale"""
+        with self._state_lock:
+            self._advance()
+            self._target_weight = weight_g
+
+    def remove_part(self):
+        """Take the part off the scale"""
+        self.place_part(0.0)
+
+    def set_rate(self, rate_hz: float):
+        """Change the output rate while streaming"""
+        self.config.rate_hz = rate_hz
+
+    @property
+    def target_weight(self) -> float:
+        return self._target_weight
+
+    def _advance(self) -> float:
+        """Move the pan weight towards the target with a first-order settling curve"""
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        tau = self.config.settle_time_constant_s
+        if tau <= 0:
+            self._actual_weight = self._target_weight
+        else:
+            self._actual_weight += (self._target_weight - self._actual_weight) * (1 - math.exp(-elapsed / tau))
+        return self._actual_weight
+
+    def format_line(self, weight: float, stable: bool) -> str:
+        """Format a reading the way the scale prints it"""
+        if self.config.output_format == "plain":
+            return f"{weight:8.2f} g"
+        return f"{'ST' if stable else 'US'},GS, {weight:8.2f}, g"
+
+    def next_line(self) -> str:
+        """Produce the next output line from the current physical state"""
+        with self._state_lock:
+            actual = self._advance()
+            stable = abs(actual - self._target_weight) <= self.config.stable_band_g
+
+        weight = actual + self._random.gauss(0, self.config.noise_g)
+        if self.config.outlier_rate and self._random.random() < self.config.outlier_rate:
+            weight += self._random.choice((-1, 1)) * self.config.outlier_magnitude_g
+            stable = False
+        return self.format_line(weight, stable)
+
+    # Output
+    def _baud_mismatch(self) -> bool:
+        client_baud = self.client_baud_rate()
+        return client_baud is not None and client_baud != self.config.baud_rate
+
+    def _emit(self, line: str):
+        data = line.encode('ascii') + b"\r\n"
+
+        if self._baud_mismatch():
+            # Wrong baud rate reads as framing garbage on the host side
+            data = bytes(0x80 | self._random.getrandbits(7) for _ in data)
+        elif self.config.truncated_line_rate and self._random.random() < self.config.truncated_line_rate:
+            data = data[:self._random.randint(1, len(data) - 2)]
+        elif self.config.partial_line_rate and self._random.random() < self.config.partial_line_rate:
+            split = self._random.randint(1, len(data) - 1)
+            self.write_bytes(data[:split])
+            time.sleep(0.5 / max(self.config.rate_hz, 1.0))
+            data = data[split:]
+
+        self.write_bytes(data)
+        self.lines_sent += 1
+
+    def _stream_loop(self):
+        next_due = time.monotonic()
+        while self.is_running:
+            self._emit(self.next_line())
+            next_due += 1.0 / max(self.config.rate_hz, 0.1)
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Falling behind (e.g. baud-limited); don't try to catch up
+                next_due = time.monotonic()
+
+    def on_start(self):
+        self._last_update = time.monotonic()
+        self._stream_thread = threading.Thread(target=self._stream_loop, daemon=True,
+                                               name="ScaleEmulator_stream")
+        self._stream_thread.start()
+
+    def on_stop(self):
+        if self._stream_thread and self._stream_thread.is_alive():
+            self._stream_thread.join(timeout=2.0)
+
+    def handle_line(self, line: str):
+        # The scale streams continuously and ignores host input
+        self.logger.debug(f"Ignoring host input: {line}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description="Streaming scale emulator on a pty")
+    parser.add_argument("--rate", type=float, default=10.0, help="Lines per second")
+    parser.add_argument("--format", choices=["st_us", "plain"], default="st_us")
+    parser.add_argument("--baud", type=int, default=9600, help="Baud rate the scale talks at")
+    parser.add_argument("--noise", type=float, default=0.02, help="Gaussian noise (g)")
+    parser.add_argument("--outlier-rate", type=float, default=0.0)
+    parser.add_argument("--partial-rate", type=float, default=0.0)
+    parser.add_argument("--part", type=float, default=0.0, help="Part weight for on/off cycling (g)")
+    parser.add_argument("--cycle", type=float, default=0.0, help="Seconds on, then off, repeating")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    emulator = ScaleEmulator(ScaleEmulatorConfig(
+        rate_hz=args.rate,
+        output_format=args.format,
+        baud_rate=args.baud,
+        noise_g=args.noise,
+        outlier_rate=args.outlier_rate,
+        partial_line_rate=args.partial_rate
+    ))
+    print(f"Scale emulator on {emulator.start()} - Ctrl+C to stop")
+    try:
+        if args.part and not args.cycle:
+            emulator.place_part(args.part)
+        while True:
+            if args.part and args.cycle:
+                emulator.place_part(args.part)
+                time.sleep(args.cycle)
+                emulator.remove_part()
+            time.sleep(args.cycle or 1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Sent {emulator.lines_sent} lines")
+        emulator.stop()
@@ -0,0 +1,386 @@
+"""
+SMT tester firmware emulator
+Python model of firmware/arduino/smt_tester.ino on a pseudo-terminal, so
+SMTArduinoController can be exercised end to end without the fixture.
+
+Supports I/ID, V, B, X, TX, TESTSEQ, RELAY, RESET_SEQ, I2C_STATUS and
+GET_BOARD_TYPE with SEQ/CHK framing, EVENT:BUTTON_* events, configurable
+relay currents, timing and noise, and fault injection.
+
+Usage:
+    python -m src.hardware.emulators.smt_emulator [--time-scale 0.1] [--corrupt-rate 0.05]
+"""
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.hardware.emulators.pty_device import PtyDevice
+
+MAX_RELAYS = 14
+MAX_SIMULTANEOUS_RELAYS = 8
+MAX_SEQUENCE_STEPS = 50
+MIN_DURATION_MS = 100
+STABILIZATION_MS = 50
+MEASUREMENT_MS = 2
+SEQUENCE_TIMEOUT_MS = 30000
+
+
+@dataclass
+class SMTEmulatorFaults:
+    """Fault injection settings (rates are per response line, 0.0-1.0)"""
+    corrupt_checksum_rate: float = 0.0
+    drop_line_rate: float = 0.0
+    ina260_fail: bool = False
+    pcf8575_fail: bool = False
+
+
+@dataclass
+class SMTEmulatorConfig:
+    """Electrical and timing model of the fixture"""
+    supply_voltage: float = 13.2
+    relay_current_a: Dict[int, float] = field(default_factory=dict)  # Per relay, default below
+    default_relay_current_a: float = 0.85
+    voltage_droop_per_amp: float = 0.05
+    voltage_noise: float = 0.01
+    current_noise: float = 0.005
+    time_scale: float = 1.0  # 0.1 runs relay timings 10x faster
+    seed: Optional[int] = None
+    faults: SMTEmulatorFaults = field(default_factory=SMTEmulatorFaults)
+
+
+class SMTFirmwareEmulator(PtyDevice):
+    """Emulates the SMT tester Arduino (firmware v2.0, 14 relays, PCF8575 + INA260)"""
+
+    FIRMWARE_ID = "ID:SMT_TESTER_V2.0_14RELAY_PCF8575"
+
+    def __init__(self, config: Optional[SMTEmulatorConfig] = None):
+        super().__init__(baud_rate=115200)
+        self.config = config or SMTEmulatorConfig()
+        self._random = random.Random(self.config.seed)
+
+        self.relay_mask = 0
+        self.button_pressed = False
+        self._global_sequence = 0
+
+        self.commands_handled = 0
+        self.faults_injected = {'corrupt_checksum': 0, 'dropped_line': 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def faults(self) -> SMTEmulatorFaults:
+        return self.config.faults
+
+    # Framing (mirrors calculateChecksum / sendReliableResponse in the firmware)
+    @staticmethod
+    def calculate_checksum(data: str) -> int:
+        checksum = 0
+        for char in data:
+            checksum ^= ord(char)
+        return checksum
+
+    def send_response(self, data: str, seq: int = 0):
+        """Send a framed response; seq 0 uses the auto-incrementing event sequence"""
+        if seq > 0:
+            response = f"{data}:SEQ={seq}:CMDSEQ={seq}"
+        else:
+            self._global_sequence = (self._global_sequence + 1) % 65536
+            response = f"{data}:SEQ={self._global_sequence}"
+
+        checksum = self.calculate_checksum(response)
+        if self.faults.corrupt_checksum_rate and self._random.random() < self.faults.corrupt_checksum_rate:
+            checksum ^= 0x5A
+            self._count_fault('corrupt_checksum')
+
+        self._send_line(f"{response}:CHK={checksum:02X}:END")
+
+    def _send_line(self, line: str):
+        if self.faults.drop_line_rate and self._random.random() < self.faults.drop_line_rate:
+            self._count_fault('dropped_line')
+            return
+        self.write_line(line)
+
+    def _count_fault(self, name: str):
+        with self._stats_lock:
+            self.faults_injected[name] += 1
+
+    @staticmethod
+    def parse_command(line: str) -> Tuple[str, int, bool]:
+        """
+        Parse CMD:SEQ=n:CHK=XX framing.
+
+        Returns:
+            (command, sequence, checksum_ok); command is '' when the checksum fails
+        """
+        seq_pos = line.find(":SEQ=")
+        chk_pos = line.find(":CHK=")
+        if seq_pos <= 0 or chk_pos <= seq_pos:
+            return line, 0, True
+
+        command = line[:seq_pos]
+        try:
+            sequence = int(line[seq_pos + 5:chk_pos])
+            received = int(line[chk_pos + 5:].split(":")[0], 16)
+        except ValueError:
+            return "", 0, False
+
+        if SMTFirmwareEmulator.calculate_checksum(line[:chk_pos]) != received:
+            return "", 0, False
+        return command, sequence, True
+
+    # Device model
+    def on_start(self):
+        pcf = "FAIL" if self.faults.pcf8575_fail else "OK"
+        ina = "FAIL" if self.faults.ina260_fail else "OK"
+        self._send_line("I2C:INIT:START")
+        self._send_line(f"I2C:PCF8575:{pcf}:0x20")
+        self._send_line(f"I2C:INA260:{ina}:0x40")
+        self._send_line(f"I2C:INIT:COMPLETE:PCF8575_{pcf},INA260_{ina}")
+        if self.faults.pcf8575_fail:
+            self._send_line("SMT_TESTER_V2_ERROR:NO_RELAY_CONTROL")
+        else:
+            self._send_line("SMT_TESTER_V2_READY")
+
+    def reset(self):
+        """Simulate a board reset: relays off, sequences cleared, startup banner re-sent"""
+        self.relay_mask = 0
+        self._global_sequence = 0
+        self.on_start()
+
+    def press_button(self):
+        """Simulate pressing the fixture button"""
+        if not self.button_pressed:
+            self.button_pressed = True
+            self._send_line("EVENT:BUTTON_PRESSED")
+
+    def release_button(self):
+        """Simulate releasing the fixture button"""
+        if self.button_pressed:
+            self.button_pressed = False
+            self._send_line("EVENT:BUTTON_RELEASED")
+
+    def _relay_current(self, relay: int) -> float:
+        return self.config.relay_current_a.get(relay, self.config.default_relay_current_a)
+
+    def measure(self, mask: int) -> Optional[Tuple[float, float]]:
+        """Voltage and current for the given relay mask, None if the INA260 failed"""
+        if self.faults.ina260_fail:
+            return None
+        current = sum(self._relay_current(r) for r in range(1, MAX_RELAYS + 1) if mask & (1 << (r - 1)))
+        voltage = self.config.supply_voltage - current * self.config.voltage_droop_per_amp
+        voltage += self._random.gauss(0, self.config.voltage_noise)
+        if current > 0:
+            current = max(0.0, current + self._random.gauss(0, self.config.current_noise))
+        return max(0.0, voltage), current
+
+    def _delay(self, duration_ms: float) -> bool:
+        return self.sleep_ms(duration_ms * self.config.time_scale)
+
+    @staticmethod
+    def relays_to_mask(relay_list: str) -> int:
+        mask = 0
+        for token in relay_list.split(","):
+            try:
+                relay = int(token)
+            except ValueError:
+                continue
+            if 1 <= relay <= MAX_RELAYS:
+                mask |= 1 << (relay - 1)
+        return mask
+
+    @staticmethod
+    def mask_to_relays(mask: int) -> str:
+        return ",".join(str(r) for r in range(1, MAX_RELAYS + 1) if mask & (1 << (r - 1)))
+
+    # Command handling (mirrors processCommand)
+    def handle_line(self, line: str):
+        command, seq, checksum_ok = self.parse_command(line)
+        if not checksum_ok:
+            self.send_response("ERROR:BAD_CHECKSUM", 0)
+            return
+
+        self.commands_handled += 1
+
+        if command.startswith("TESTSEQ:"):
+            if self.faults.pcf8575_fail:
+                self.send_response("ERROR:I2C_FAIL", seq)
+            else:
+                self._execute_test_sequence(command[8:], seq)
+        elif command.startswith("TX:"):
+            self._test_panel(command[3:], seq)
+        elif command == "X":
+            self.relay_mask = 0
+            self.send_response("OK:ALL_OFF", seq)
+        elif command == "GET_BOARD_TYPE":
+            self.send_response("BOARD_TYPE:SMT_TESTER", seq)
+        elif command in ("I", "ID"):
+            self.send_response(self.FIRMWARE_ID, seq)
+        elif command == "B":
+            self.send_response(f"BUTTON:{'PRESSED' if self.button_pressed else 'RELEASED'}", seq)
+        elif command == "V":
+            reading = self.measure(0)
+            self.send_response(f"VOLTAGE:{reading[0] if reading else 0.0:.3f}", seq)
+        elif command == "RESET_SEQ":
+            self._global_sequence = 0
+            self.send_response("OK:SEQ_RESET", seq)
+        elif command == "I2C_STATUS":
+            pcf = "FAIL" if self.faults.pcf8575_fail else "OK"
+            ina = "FAIL" if self.faults.ina260_fail else "OK"
+            self.send_response(f"I2C_STATUS:PCF8575@0x20={pcf},INA260@0x40={ina}", seq)
+        elif command.startswith("RELAY:"):
+            self._manual_relay(command[6:], seq)
+        else:
+            self.send_response("ERROR:UNKNOWN_COMMAND", seq)
+
+    def _manual_relay(self, params: str, seq: int):
+        parts = params.split(":")
+        if len(parts) != 2:
+            self.send_response("ERROR:INVALID_FORMAT", seq)
+            return
+        try:
+            relay = int(parts[0])
+        except ValueError:
+            relay = 0
+        if not 1 <= relay <= MAX_RELAYS:
+            self.send_response("ERROR:INVALID_RELAY", seq)
+        elif parts[1] == "ON":
+            self.relay_mask = 1 << (relay - 1)
+            self.send_response(f"OK:RELAY_{relay}_ON", seq)
+        elif parts[1] == "OFF":
+            self.relay_mask = 0
+            self.send_response(f"OK:RELAY_{relay}_OFF", seq)
+        else:
+            self.send_response("ERROR:INVALID_STATE", seq)
+
+    def _test_panel(self, relay_list: str, seq: int):
+        """TX:ALL or TX:1,2,3 - measure each relay individually"""
+        if self.faults.ina260_fail:
+            self.send_response("ERROR:INA260_FAIL", seq)
+            return
+
+        if relay_list == "ALL":
+            relays = list(range(1, MAX_RELAYS + 1))
+        else:
+            relays = [r for r in range(1, MAX_RELAYS + 1) if self.relays_to_mask(relay_list) & (1 << (r - 1))]
+
+        parts = []
+        for relay in relays:
+            self._delay(STABILIZATION_MS + MEASUREMENT_MS)
+            voltage, current = self.measure(1 << (relay - 1))
+            parts.append(f"{relay}={voltage:.3f},{current:.3f}")
+        self.send_response("PANELX:" + ";".join(parts), seq)
+
+    def parse_test_sequence(self, sequence: str) -> List[Tuple[int, int, bool]]:
+        """Parse '1,2:500;OFF:100;...' into (mask, duration_ms, is_off) steps; [] if invalid"""
+        steps = []
+        for token in sequence.split(";"):
+            if not token or len(steps) >= MAX_SEQUENCE_STEPS:
+                break
+            if ":" not in token:
+                return []
+            relay_part, duration_part = token.split(":", 1)
+            try:
+                duration = int(duration_part)
+            except ValueError:
+                duration = 0
+
+            if relay_part == "OFF":
+                steps.append((0, duration, True))
+                continue
+            if duration < MIN_DURATION_MS:
+                return []
+            mask = self.relays_to_mask(relay_part)
+            if mask == 0:
+                return []
+            steps.append((mask, duration, False))
+        return steps
+
+    def _execute_test_sequence(self, sequence: str, seq: int):
+        steps = self.parse_test_sequence(sequence)
+        if not steps:
+            self.send_response("ERROR:INVALID_SEQUENCE", seq)
+            return
+
+        self.send_response("ACK", seq)
+
+        results = []
+        elapsed_ms = 0
+        for mask, duration, is_off in steps:
+            if elapsed_ms > SEQUENCE_TIMEOUT_MS:
+                self.relay_mask = 0
+                self.send_response("ERROR:SEQUENCE_TIMEOUT", seq)
+                return
+
+            if is_off:
+                self.relay_mask = 0
+                if not self._delay(duration):
+                    return
+                elapsed_ms += duration
+                continue
+
+            if bin(mask).count("1") > MAX_SIMULTANEOUS_RELAYS:
+                self.relay_mask = 0
+                self.send_response("ERROR:TOO_MANY_RELAYS", seq)
+                return
+
+            self.relay_mask = mask
+            if not self._delay(STABILIZATION_MS):
+                return
+            reading = self.measure(mask)
+            if reading is None:
+                self.relay_mask = 0
+                self.send_response("ERROR:MEASUREMENT_FAIL", seq)
+                return
+            results.append(f"{self.mask_to_relays(mask)}:{reading[0]:.3f}V,{reading[1]:.3f}A;")
+
+            if not self._delay(max(0, duration - STABILIZATION_MS - MEASUREMENT_MS)):
+                return
+            self.relay_mask = 0
+            elapsed_ms += duration
+
+        self.send_response("TESTRESULTS:" + "".join(results) + "END", seq)
+
+
+if __name__ == "__main__":
+    import argparse
+    import logging
+    import time
+
+    parser = argparse.ArgumentParser(description="SMT tester firmware emulator on a pty")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Relay timing multiplier (0.1 = 10x faster)")
+    parser.add_argument("--voltage", type=float, default=13.2, help="Supply voltage")
+    parser.add_argument("--current", type=float, default=0.85, help="Current per relay (A)")
+    parser.add_argument("--corrupt-rate", type=float, default=0.0, help="Fraction of responses with a bad checksum")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of lines dropped")
+    parser.add_argument("--ina260-fail", action="store_true", help="Simulate INA260 failure")
+    parser.add_argument("--button-interval", type=float, default=0.0, help="Press the button every N seconds")
+    parser.add_argument("--seed", type=int, help="Random seed for noise and faults")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    emulator = SMTFirmwareEmulator(SMTEmulatorConfig(
+        supply_voltage=args.voltage,
+        default_relay_current_a=args.current,
+        time_scale=args.time_scale,
+        seed=args.seed,
+        faults=SMTEmulatorFaults(
+            corrupt_checksum_rate=args.corrupt_rate,
+            drop_line_rate=args.drop_rate,
+            ina260_fail=args.ina260_fail
+        )
+    ))
+    print(f"SMT emulator on {emulator.start()} - Ctrl+C to stop")
+    try:
+        while True:
+            if args.button_interval > 0:
+                time.sleep(args.button_interval)
+                emulator.press_button()
+                time.sleep(0.2)
+                emulator.release_button()
+            else:
+                time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Handled {emulator.commands_handled} commands, faults injected: {emulator.faults_injected}")
+        emulator.stop()
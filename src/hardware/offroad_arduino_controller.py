@@ -2,6 +2,8 @@
 For Offroad testing with sensor configurations and test results
 """
 
+from typing import Dict, List
+
 from .arduino_controller import ArduinoController
 
 class OffroadArduinoController(ArduinoController):
@@ -21,8 +23,47 @@ class OffroadArduinoController(ArduinoController):
         """
         super().__init__(baud_rate)
         
-        # Can add Offroad-specific initialization here if needed in the future
-        # For now, all functionality is inherited from the base class
+        # Firmware capability flags, queried once per connection
+        self._capabilities = None
+
+    def connect(self, port: str) -> bool:
+        """Connect to Arduino and forget the previous firmware's capabilities"""
+        self._capabilities = None
+        return super().connect(port)
+
+    def get_capabilities(self) -> Dict[str, List[str]]:
+        """Get firmware capability flags (CAPS command)
+        
+        Firmware that supports it answers e.g. CAPS:BACKGROUND=PRESSURE, listing
+        the tests that run in the background and accept another TEST: command
+        while they are in progress. Older firmware rejects CAPS, which means no
+        capabilities - every test runs on its own.
+        
+        Returns:
+            Dict[str, List[str]]: Capability name -> values
+        """
+        if self._capabilities is not None:
+            return self._capabilities
+        
+        capabilities = {}
+        try:
+            response = self.send_command("CAPS", timeout=1.0)
+            if response and response.startswith("CAPS:"):
+                for pair in response[5:].split(","):
+                    if "=" in pair:
+                        key, value = pair.split("=", 1)
+                        capabilities[key.strip().upper()] = [v.strip() for v in value.split("|") if v.strip()]
+            else:
+                self.logger.debug(f"Firmware reports no capabilities: {response}")
+        except Exception as e:
+            self.logger.debug(f"CAPS query failed: {e}")
+        
+        self._capabilities = capabilities
+        return capabilities
+    
+    def get_background_tests(self) -> List[str]:
+        """Tests the firmware can run while another test is in progress"""
+        return self.get_capabilities().get("BACKGROUND", [])
     
     def get_firmware_type(self) -> str:
         """Get firmware type - override to check for Offroad firmware
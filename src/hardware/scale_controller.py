@@ -38,7 +38,7 @@ class ScaleController(ThreadCleanupMixin):
         
         # Use settings from config
         baud_rate = baud_rate or SCALE_SETTINGS['baud_rate']
-        self.serial = SerialManager(baud_rate=baud_rate)
+        self.serial = SerialManager(baud_rate=baud_rate, capture_label="scale")
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # Compile regex patterns once
@@ -76,6 +76,7 @@ class ScaleController(ThreadCleanupMixin):
         # Add weight stability filtering
         self.weight_history = []
         self.max_weight_history = 10  # Keep last 10 readings for smoothing
+        self._discarded_weights = []  # Consecutive readings rejected as outliers
         self.weight_filter_enabled = True
 
     def _compile_regex_patterns(self):
@@ -332,15 +333,30 @@ class ScaleController(ThreadCleanupMixin):
                 
                 # If the drop is extreme (more than 50%), discard it completely
                 if abs(raw_weight - median_weight) > abs(median_weight) * 0.5:
-                    self.logger.warning(f"Discarding extreme outlier: {raw_weight}g")
                     # Remove the outlier from history
                     self.weight_history.pop()
+                    self._discarded_weights.append(raw_weight)
+
+                    # Several consecutive "outliers" that agree are a real level change
+                    # (e.g. part removed), not noise - accept them instead of latching
+                    recent_discards = self._discarded_weights[-3:]
+                    if (len(recent_discards) == 3 and
+                            max(recent_discards) - min(recent_discards) <= outlier_threshold):
+                        self.logger.info(f"Weight level changed: {median_weight}g -> {raw_weight}g")
+                        self.weight_history = list(recent_discards)
+                        self._discarded_weights.clear()
+                        return raw_weight
+
+                    self.logger.warning(f"Discarding extreme outlier: {raw_weight}g")
                     # Return the median instead
                     return median_weight
                 
                 # Otherwise, use a weighted average favoring the median
+                self._discarded_weights.clear()
                 return (median_weight * 0.8) + (raw_weight * 0.2)
         
+        self._discarded_weights.clear()
+
         # Apply simple moving average to smooth readings
         if len(self.weight_history) >= 3:
             # Use weighted average with more weight on recent readings
@@ -630,6 +646,7 @@ class ScaleController(ThreadCleanupMixin):
     def clear_weight_history(self):
         """Clear weight history to reset filtering"""
         self.weight_history.clear()
+        self._discarded_weights.clear()
         self.logger.debug("Weight history cleared")
 
     def is_connected(self) -> bool:
@@ -0,0 +1,282 @@
+"""
+Raw serial capture and playback
+Records every byte read from or written to a serial port with monotonic
+timestamps in a compact binary file, and plays captures back as a serial-like
+object so the real controller parsing code can be exercised without hardware.
+
+File format:
+    MAGIC, uint32 metadata length, metadata JSON, then records of
+    uint8 direction, uint64 nanoseconds since capture start, uint16 length, data
+"""
+import os
+import json
+import time
+import struct
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import SERIAL_CAPTURE
+
+MAGIC = b"DDSCAP1\n"
+DIRECTION_RX = 0
+DIRECTION_TX = 1
+
+_HEADER = struct.Struct("<I")
+_RECORD = struct.Struct("<BQH")
+_MAX_CHUNK = 0xFFFF
+
+CaptureRecord = Tuple[int, int, bytes]  # (t_ns, direction, data)
+
+
+class SerialCaptureWriter:
+    """Thread-safe writer for capture files"""
+
+    def __init__(self, path: Path, metadata: Optional[Dict[str, Any]] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._start_ns = time.monotonic_ns()
+
+        metadata = dict(metadata or {})
+        metadata.setdefault('started', datetime.now().isoformat())
+        header = json.dumps(metadata).encode('utf-8')
+
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC + _HEADER.pack(len(header)) + header)
+        self.bytes_captured = 0
+        self.logger.info(f"Capturing serial traffic to {self.path}")
+
+    def record(self, direction: int, data: bytes):
+        """Record a chunk of traffic"""
+        if not data:
+            return
+        t_ns = time.monotonic_ns() - self._start_ns
+        with self._lock:
+            if self._file is None:
+                return
+            for offset in range(0, len(data), _MAX_CHUNK):
+                chunk = data[offset:offset + _MAX_CHUNK]
+                self._file.write(_RECORD.pack(direction, t_ns, len(chunk)) + chunk)
+            self.bytes_captured += len(data)
+
+    def close(self):
+        """Flush and close the capture file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self.logger.info(f"Capture closed: {self.bytes_captured} bytes in {self.path.name}")
+
+
+class CapturingSerial:
+    """Transparent proxy around a serial.Serial that records all traffic"""
+
+    _OWN_ATTRS = ('_connection', '_writer')
+
+    def __init__(self, connection, writer: SerialCaptureWriter):
+        object.__setattr__(self, '_connection', connection)
+        object.__setattr__(self, '_writer', writer)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        if name in self._OWN_ATTRS:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._connection, name, value)
+
+    @property
+    def capture_writer(self) -> SerialCaptureWriter:
+        return self._writer
+
+    def read(self, size: int = 1) -> bytes:
+        data = self._connection.read(size)
+        self._writer.record(DIRECTION_RX, data)
+        return data
+
+    def readline(self, *args, **kwargs) -> bytes:
+        data = self._connection.readline(*args, **kwargs)
+        self._writer.record(DIRECTION_RX, data)
+        return data
+
+    def read_until(self, *args, **kwargs) -> bytes:
+        data = self._connection.read_until(*args, **kwargs)
+        self._writer.record(DIRECTION_RX, data)
+        return data
+
+    def write(self, data: bytes) -> Optional[int]:
+        self._writer.record(DIRECTION_TX, bytes(data))
+        return self._connection.write(data)
+
+    def close(self):
+        try:
+            self._connection.close()
+        finally:
+            self._writer.close()
+
+
+def is_capture_enabled() -> bool:
+    """Check whether raw serial capture is switched on"""
+    return bool(SERIAL_CAPTURE.get('enabled')) or os.environ.get('DIODE_TESTER_SERIAL_CAPTURE') == '1'
+
+
+def get_capture_dir() -> Path:
+    """Get directory for capture files"""
+    if SERIAL_CAPTURE.get('directory'):
+        return Path(SERIAL_CAPTURE['directory'])
+    from src.utils.path_manager import get_logs_dir
+    return get_logs_dir() / "captures"
+
+
+def maybe_capture(connection, device: str, port: str, baud_rate: int):
+    """Wrap a connection in a CapturingSerial if capture is enabled"""
+    if connection is None or not is_capture_enabled():
+        return connection
+    try:
+        safe_port = str(port).replace('/', '_').replace('\\', '_')
+        filename = f"{device}_{safe_port}_{datetime.now():%Y%m%d_%H%M%S}.sercap"
+        writer = SerialCaptureWriter(get_capture_dir() / filename, {
+            'device': device,
+            'port': str(port),
+            'baud_rate': baud_rate
+        })
+        return CapturingSerial(connection, writer)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Could not start serial capture: {e}")
+        return connection
+
+
+def read_capture(path: Path) -> Tuple[Dict[str, Any], List[CaptureRecord]]:
+    """
+    Read a capture file.
+
+    Returns:
+        (metadata, records) where records are (t_ns, direction, data) tuples.
+        A truncated final record (e.g. after a crash) is dropped.
+    """
+    with open(path, 'rb') as f:
+        blob = f.read()
+
+    if not blob.startswith(MAGIC):
+        raise ValueError(f"Not a serial capture file: {path}")
+
+    offset = len(MAGIC)
+    (header_len,) = _HEADER.unpack_from(blob, offset)
+    offset += _HEADER.size
+    metadata = json.loads(blob[offset:offset + header_len])
+    offset += header_len
+
+    records = []
+    while offset + _RECORD.size <= len(blob):
+        direction, t_ns, length = _RECORD.unpack_from(blob, offset)
+        offset += _RECORD.size
+        if offset + length > len(blob):
+            break
+        records.append((t_ns, direction, blob[offset:offset + length]))
+        offset += length
+
+    return metadata, records
+
+
+class ReplaySerial:
+    """
+    Serial-like object that plays back the RX side of a capture.
+
+    Args:
+        records: Capture records from read_capture()
+        speed: 1.0 replays at the captured pace, 0 replays as fast as possible
+        on_tx: Called with the data of each TX record as playback passes it
+    """
+
+    def __init__(self, records: List[CaptureRecord], speed: float = 0.0,
+                 on_tx: Optional[Callable[[bytes], None]] = None):
+        self._records = records
+        self._index = 0
+        self._buffer = bytearray()
+        self.speed = speed
+        self.on_tx = on_tx
+        self.timeout = 0.05
+        self.is_open = True
+        self.port = "replay"
+        self._start = time.monotonic()
+
+    @property
+    def exhausted(self) -> bool:
+        """True once every record has been delivered and consumed"""
+        return self._index >= len(self._records) and not self._buffer
+
+    def _deliver_next(self, block: bool) -> bool:
+        """Move the next record into the buffer, honouring replay pacing"""
+        if self._index >= len(self._records):
+            return False
+
+        t_ns, direction, data = self._records[self._index]
+        if self.speed > 0:
+            delay = self._start + t_ns / 1e9 / self.speed - time.monotonic()
+            if delay > 0:
+                if not block:
+                    return False
+                time.sleep(delay)
+
+        self._index += 1
+        if direction == DIRECTION_TX:
+            if self.on_tx:
+                self.on_tx(data)
+        else:
+            self._buffer.extend(data)
+        return True
+
+    @property
+    def in_waiting(self) -> int:
+        if self.speed > 0:
+            while self._deliver_next(block=False):
+                pass
+        else:
+            # Max speed: hand over the next RX chunk as soon as the buffer is empty
+            while not self._buffer and self._deliver_next(block=True):
+                pass
+        return len(self._buffer)
+
+    def read(self, size: int = 1) -> bytes:
+        while len(self._buffer) < size and self._deliver_next(block=True):
+            pass
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def readline(self, *args, **kwargs) -> bytes:
+        while b"\n" not in self._buffer and self._deliver_next(block=True):
+            pass
+        end = self._buffer.find(b"\n")
+        end = len(self._buffer) if end == -1 else end + 1
+        data = bytes(self._buffer[:end])
+        del self._buffer[:end]
+        return data
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield decoded RX lines until the capture is exhausted"""
+        while not self.exhausted:
+            line = self.readline().decode('utf-8', errors='ignore').strip()
+            if line:
+                yield line
+
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        # Captured bytes are the point of a replay, never discard them
+        pass
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
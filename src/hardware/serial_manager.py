@@ -8,13 +8,19 @@ import os
 import platform
 from src.utils.thread_cleanup import ThreadCleanupMixin
 from src.services.port_registry import port_registry
+from src.hardware.serial_capture import maybe_capture
 
 
 class SerialManager(ThreadCleanupMixin):
     """Manages serial communication with devices"""
 
-    def __init__(self, baud_rate: int = 9600, timeout: float = 5.0, write_timeout: float = 5.0):
+    # Unsolicited lines a device streams on its own; never taken as a query reply
+    STREAM_PREFIXES = ("LIVE:",)
+
+    def __init__(self, baud_rate: int = 9600, timeout: float = 5.0, write_timeout: float = 5.0,
+                 capture_label: str = "serial"):
         self.baud_rate = baud_rate
+        self.capture_label = capture_label  # Device name used for opt-in raw captures
         self.timeout = timeout
         self.write_timeout = write_timeout
         self.connection: Optional[serial.Serial] = None
@@ -147,6 +153,9 @@ class SerialManager(ThreadCleanupMixin):
                         port_registry.release_port(port)
                         raise
 
+                # Opt-in raw capture of all traffic (see SERIAL_CAPTURE settings)
+                self.connection = maybe_capture(self.connection, self.capture_label, port, self.baud_rate)
+
                 # Reduce or remove sleep after connection
                 # time.sleep(0.05)  # Remove or reduce to 0.01
                 
@@ -295,7 +304,14 @@ class SerialManager(ThreadCleanupMixin):
         # Small delay to ensure command is processed
         time.sleep(0.05)
 
-        return self.read_line(timeout=response_timeout)
+        # Skip streamed lines that arrive before the reply
+        deadline = time.time() + response_timeout
+        while True:
+            line = self.read_line(timeout=max(0.0, deadline - time.time()))
+            if line is None or not line.startswith(self.STREAM_PREFIXES):
+                return line
+            if time.time() >= deadline:
+                return None
 
     def flush_buffers(self):
         """Clear input and output buffers"""
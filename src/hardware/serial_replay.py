@@ -0,0 +1,156 @@
+"""
+Deterministic replay of raw serial captures
+Feeds a capture from serial_capture back through the real controller parsing
+and routing code, either at the captured pace or as fast as possible. The
+reported line rate doubles as a throughput benchmark of the parsing stack.
+
+Usage:
+    python -m src.hardware.serial_replay capture.sercap [--device smt|offroad|scale] [--speed 0]
+"""
+import re
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.hardware.serial_capture import read_capture, ReplaySerial
+
+_SEQ_RE = re.compile(rb":SEQ=(\d+)")
+
+
+class _WarningCounter(logging.Handler):
+    """Counts controller warnings during a replay"""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.counts: Dict[str, int] = {}
+
+    def emit(self, record: logging.LogRecord):
+        message = record.getMessage()
+        for key in ("Checksum mismatch", "Sequence mismatch", "Invalid response format"):
+            if message.startswith(key):
+                self.counts[key] = self.counts.get(key, 0) + 1
+                return
+        self.counts['other'] = self.counts.get('other', 0) + 1
+
+
+def _replay_smt(replay: ReplaySerial) -> int:
+    """Route SMT lines through SMTArduinoController and validate responses"""
+    from src.hardware.smt_arduino_controller import SMTArduinoController
+
+    controller = SMTArduinoController()
+    controller.connection = replay
+
+    def on_tx(data: bytes):
+        # Each captured command opens a response window, as _send_command does
+        match = _SEQ_RE.search(data)
+        if match:
+            controller._sequence_number = int(match.group(1))
+        controller._expecting_response = True
+
+    replay.on_tx = on_tx
+    lines = 0
+    for line in replay.iter_lines():
+        lines += 1
+        controller._route_message(line)
+        while not controller._response_queue.empty():
+            is_valid, _, seq_num = controller._validate_response(controller._response_queue.get_nowait())
+            if is_valid:
+                controller._check_sequence(seq_num)
+            controller._expecting_response = False
+    return lines
+
+
+def _replay_offroad(replay: ReplaySerial) -> int:
+    """Process offroad lines through ArduinoController._process_arduino_message"""
+    from src.hardware.arduino_controller import ArduinoController
+
+    controller = ArduinoController()
+    lines = 0
+    for line in replay.iter_lines():
+        lines += 1
+        controller._process_arduino_message(line)
+    return lines
+
+
+def _replay_scale(replay: ReplaySerial) -> int:
+    """Parse and filter scale data through ScaleController"""
+    from src.hardware.scale_controller import ScaleController
+
+    controller = ScaleController()
+    controller.serial.connection = replay
+    weights = 0
+    while not replay.exhausted:
+        raw_weight = controller._get_raw_weight_fast()
+        if raw_weight is not None:
+            weights += 1
+            controller.current_weight = controller._apply_weight_filter(raw_weight)
+        elif replay.speed > 0:
+            time.sleep(0.001)
+    return weights
+
+
+# device -> (replay function, controller logger name)
+_REPLAYERS = {
+    'smt': (_replay_smt, "SMTArduinoController"),
+    'offroad': (_replay_offroad, "ArduinoController"),
+    'scale': (_replay_scale, "ScaleController"),
+}
+
+
+def replay_capture(path: Path, device: Optional[str] = None, speed: float = 0.0) -> Dict[str, Any]:
+    """
+    Replay a capture through the matching controller.
+
+    Args:
+        path: Capture file
+        device: 'smt', 'offroad' or 'scale' (default: from capture metadata)
+        speed: 1.0 for captured pace, 0 for maximum speed
+
+    Returns:
+        Statistics: lines/weights processed, rx bytes, elapsed seconds, rate and warning counts
+    """
+    metadata, records = read_capture(path)
+    device = device or metadata.get('device')
+    if device not in _REPLAYERS:
+        raise ValueError(f"Unknown capture device '{device}', expected one of {sorted(_REPLAYERS)}")
+
+    replay = ReplaySerial(records, speed=speed)
+    rx_bytes = sum(len(data) for _, direction, data in records if direction == 0)
+
+    replayer, logger_name = _REPLAYERS[device]
+    counter = _WarningCounter()
+    controller_logger = logging.getLogger(logger_name)
+    controller_logger.addHandler(counter)
+    try:
+        start = time.perf_counter()
+        processed = replayer(replay)
+        elapsed = time.perf_counter() - start
+    finally:
+        controller_logger.removeHandler(counter)
+
+    return {
+        'device': device,
+        'records': len(records),
+        'rx_bytes': rx_bytes,
+        'processed': processed,
+        'elapsed_s': elapsed,
+        'lines_per_s': processed / elapsed if elapsed > 0 else 0.0,
+        'warnings': counter.counts,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Replay a raw serial capture through the controller parsers")
+    parser.add_argument("capture", type=Path, help="Capture file (.sercap)")
+    parser.add_argument("--device", choices=sorted(_REPLAYERS), help="Override device type from capture metadata")
+    parser.add_argument("--speed", type=float, default=0.0, help="1.0 = captured pace, 0 = as fast as possible")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the capture N times (benchmark)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    for _ in range(args.repeat):
+        print(json.dumps(replay_capture(args.capture, args.device, args.speed), indent=2))
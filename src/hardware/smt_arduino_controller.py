@@ -18,8 +18,31 @@ import logging
 import serial
 import threading
 import queue
+from dataclasses import dataclass, field
 from typing import Dict, Optional, Callable, List, Any
 from src.services.port_registry import port_registry
+from src.hardware.serial_capture import maybe_capture
+
+
+@dataclass
+class SequencePlan:
+    """TESTSEQ command and lookups for one relay mapping / test sequence, reusable across panels"""
+    relay_groups: Dict[str, Dict]
+    command: str
+    errors: List[str] = field(default_factory=list)
+    timeout: float = 2.0
+
+
+def compile_sequence_plan(relay_mapping: Dict, test_sequence: List[Dict]) -> SequencePlan:
+    """Parse, build, validate and time a TESTSEQ once so it can be sent for every panel"""
+    relay_groups = SMTArduinoController._parse_relay_mapping(relay_mapping)
+    return SequencePlan(
+        relay_groups=relay_groups,
+        command=SMTArduinoController._build_testseq_command(relay_groups, test_sequence),
+        errors=SMTArduinoController._validate_testseq_command(relay_groups, test_sequence),
+        timeout=SMTArduinoController._calculate_sequence_timeout(test_sequence)
+    )
+
 
 class SMTArduinoController:
     """Simplified Arduino controller for SMT panel testing - batch only"""
@@ -85,6 +108,7 @@ class SMTArduinoController:
                     rtscts=False,
                     dsrdtr=False
                 )
+                self.connection = maybe_capture(self.connection, "smt", port, self.baud_rate)
                 self.port = port
                 self.logger.info(f"Connected to {port}")
             except Exception as e:
@@ -374,6 +398,22 @@ class SMTArduinoController:
             self.logger.error(f"Error validating response: {e}")
             return (False, response, 0)
 
+    def _check_sequence(self, seq_num: int) -> bool:
+        """Check a response sequence number against the last command sent"""
+        if not self._enable_checksums or seq_num == self._sequence_number:
+            return True
+
+        # TEMPORARY: Accept Arduino's seq or seq+1 due to firmware counting behavior
+        # TODO: Remove this workaround after Arduino firmware v1.1.0 is deployed
+        expected_plus_one = (self._sequence_number + 1) % 65536
+        if seq_num != expected_plus_one:
+            self.logger.warning(f"Sequence mismatch: expected {self._sequence_number} or {expected_plus_one}, got {seq_num}")
+            return False
+
+        # Log at debug level when we get the expected+1 pattern
+        self.logger.debug(f"Sequence offset detected: expected {self._sequence_number}, got {seq_num} (firmware v1.0.x behavior)")
+        return True
+
     def get_firmware_type(self) -> str:
         """Get the firmware type of connected Arduino"""
         try:
@@ -432,17 +472,8 @@ class SMTArduinoController:
                         is_valid, clean_response, seq_num = self._validate_response(raw_response)
                         
                         if is_valid:
-                            # Check sequence number matches if checksums enabled
-                            if self._enable_checksums and seq_num != self._sequence_number:
-                                # TEMPORARY: Accept Arduino's seq or seq+1 due to firmware counting behavior
-                                # TODO: Remove this workaround after Arduino firmware v1.1.0 is deployed
-                                expected_plus_one = (self._sequence_number + 1) % 65536
-                                if seq_num != expected_plus_one:
-                                    self.logger.warning(f"Sequence mismatch: expected {self._sequence_number} or {expected_plus_one}, got {seq_num}")
-                                else:
-                                    # Log at debug level when we get the expected+1 pattern
-                                    self.logger.debug(f"Sequence offset detected: expected {self._sequence_number}, got {seq_num} (firmware v1.0.x behavior)")
-                                # Continue anyway - sequence mismatch is less critical than checksum
+                            # Sequence mismatch is less critical than checksum - continue anyway
+                            self._check_sequence(seq_num)
                             
                             self.logger.debug(f"Valid response: {clean_response}")
                             return clean_response
@@ -741,37 +772,7 @@ class SMTArduinoController:
                         if data:
                             message = data.decode('utf-8', errors='ignore').strip()
                             if message:
-                                # Route the message appropriately
-                                if message.startswith("EVENT:"):
-                                    # Handle events - these don't have checksums
-                                    event_type = message[6:]
-                                    if event_type.startswith("BUTTON_") and self.button_callback:
-                                        self.logger.info(f"Button event: {event_type}")
-                                        # Extract just the state (PRESSED/RELEASED)
-                                        state = event_type.replace("BUTTON_", "")
-                                        self.button_callback(state)
-                                elif self._expecting_response:
-                                    # This is a response to a command - put raw message with checksum
-                                    self._response_queue.put(message)
-                                else:
-                                    # Unexpected message - could be a delayed response
-                                    # For messages with checksums, validate before ignoring
-                                    if ":CHK=" in message and self._enable_checksums:
-                                        is_valid, clean_msg, _ = self._validate_response(message)
-                                        if is_valid:
-                                            # Common responses we can safely ignore
-                                            if clean_msg in ["OK:ALL_OFF", "PANEL_COMPLETE"] or clean_msg.startswith(("VOLTAGE:", "RELAY:", "PANEL:", "PANELX:", "ID:")):
-                                                self.logger.debug(f"Ignoring delayed response: {clean_msg}")
-                                            else:
-                                                self.logger.debug(f"Unexpected message: {clean_msg}")
-                                        else:
-                                            self.logger.debug(f"Ignoring corrupted message")
-                                    else:
-                                        # Legacy format or checksums disabled
-                                        if message in ["OK:ALL_OFF", "PANEL_COMPLETE"] or message.startswith(("VOLTAGE:", "RELAY:", "PANEL:", "ID:")):
-                                            self.logger.debug(f"Ignoring delayed response: {message}")
-                                        else:
-                                            self.logger.debug(f"Unexpected message: {message}")
+                                self._route_message(message)
                     finally:
                         self.connection.timeout = old_timeout
             except Exception as e:
@@ -780,6 +781,39 @@ class SMTArduinoController:
                 
             time.sleep(0.01)
 
+    def _route_message(self, message: str):
+        """Route one received line to button callback, response queue or log"""
+        if message.startswith("EVENT:"):
+            # Handle events - these don't have checksums
+            event_type = message[6:]
+            if event_type.startswith("BUTTON_") and self.button_callback:
+                self.logger.info(f"Button event: {event_type}")
+                # Extract just the state (PRESSED/RELEASED)
+                state = event_type.replace("BUTTON_", "")
+                self.button_callback(state)
+        elif self._expecting_response:
+            # This is a response to a command - put raw message with checksum
+            self._response_queue.put(message)
+        else:
+            # Unexpected message - could be a delayed response
+            # For messages with checksums, validate before ignoring
+            if ":CHK=" in message and self._enable_checksums:
+                is_valid, clean_msg, _ = self._validate_response(message)
+                if is_valid:
+                    # Common responses we can safely ignore
+                    if clean_msg in ["OK:ALL_OFF", "PANEL_COMPLETE"] or clean_msg.startswith(("VOLTAGE:", "RELAY:", "PANEL:", "PANELX:", "ID:")):
+                        self.logger.debug(f"Ignoring delayed response: {clean_msg}")
+                    else:
+                        self.logger.debug(f"Unexpected message: {clean_msg}")
+                else:
+                    self.logger.debug(f"Ignoring corrupted message")
+            else:
+                # Legacy format or checksums disabled
+                if message in ["OK:ALL_OFF", "PANEL_COMPLETE"] or message.startswith(("VOLTAGE:", "RELAY:", "PANEL:", "ID:")):
+                    self.logger.debug(f"Ignoring delayed response: {message}")
+                else:
+                    self.logger.debug(f"Unexpected message: {message}")
+
     # Compatibility methods for existing code
     def configure_sensors(self, sensor_configs) -> bool:
         """SMT Arduino has fixed sensors - no configuration needed"""
@@ -826,7 +860,8 @@ class SMTArduinoController:
         self.error_callback = callback
     
     # New TESTSEQ protocol methods
-    def execute_test_sequence(self, relay_mapping: Dict, test_sequence: List[Dict]) -> Dict[str, Any]:
+    def execute_test_sequence(self, relay_mapping: Dict, test_sequence: List[Dict],
+                              plan: Optional[SequencePlan] = None) -> Dict[str, Any]:
         """Execute complete test sequence based on SKU configuration
         
         Args:
@@ -834,6 +869,7 @@ class SMTArduinoController:
                           e.g., {"1,2,3": {"board": 1, "function": "mainbeam"}}
             test_sequence: List of test configurations by function
                           e.g., [{"function": "mainbeam", "duration_ms": 500, "delay_after_ms": 100}]
+            plan: Precompiled plan for this mapping/sequence (compiled here if None)
         
         Returns:
             Complete test results with board/function context:
@@ -852,22 +888,20 @@ class SMTArduinoController:
             return {"success": False, "results": {}, "errors": ["Not connected"]}
         
         try:
-            # Parse relay mapping to extract groups
-            relay_groups = self._parse_relay_mapping(relay_mapping)
-            
-            # Build TESTSEQ command
-            command = self._build_testseq_command(relay_groups, test_sequence)
-            
+            if plan is None:
+                plan = compile_sequence_plan(relay_mapping, test_sequence)
+            relay_groups = plan.relay_groups
+            command = plan.command
+
             # Log the exact command being sent for debugging
             self.logger.info(f"Sending TESTSEQ command: {command}")
-            
-            # Validate command before sending
-            validation_errors = self._validate_testseq_command(relay_groups, test_sequence)
-            if validation_errors:
-                return {"success": False, "results": {}, "errors": validation_errors}
-            
+
+            # Validated when the plan was compiled
+            if plan.errors:
+                return {"success": False, "results": {}, "errors": list(plan.errors)}
+
             # Send command with extended timeout for long sequences
-            timeout = self._calculate_sequence_timeout(test_sequence)
+            timeout = plan.timeout
             response = self._send_command(command, timeout=timeout)
             
             if not response:
@@ -914,7 +948,8 @@ class SMTArduinoController:
             self.logger.error(f"Test sequence execution error: {e}")
             return {"success": False, "results": {}, "errors": [str(e)]}
     
-    def _parse_relay_mapping(self, relay_mapping: Dict) -> Dict[str, Dict]:
+    @staticmethod
+    def _parse_relay_mapping(relay_mapping: Dict) -> Dict[str, Dict]:
         """Parse relay mapping, handling comma-separated groups
         
         Returns:
@@ -931,7 +966,8 @@ class SMTArduinoController:
         
         return relay_groups
     
-    def _build_testseq_command(self, relay_groups: Dict, test_sequence: List[Dict]) -> str:
+    @staticmethod
+    def _build_testseq_command(relay_groups: Dict, test_sequence: List[Dict]) -> str:
         """Build TESTSEQ command by walking through relay mapping in order
         
         Example output: "TESTSEQ:1:500;OFF:100;2:500;OFF:100;7,8,9:500"
@@ -1043,7 +1079,8 @@ class SMTArduinoController:
         
         return results
     
-    def _validate_testseq_command(self, relay_groups: Dict, test_sequence: List[Dict]) -> List[str]:
+    @staticmethod
+    def _validate_testseq_command(relay_groups: Dict, test_sequence: List[Dict]) -> List[str]:
         """Validate relay numbers and timing parameters
         
         Returns:
@@ -1081,7 +1118,8 @@ class SMTArduinoController:
         
         return errors
     
-    def _calculate_sequence_timeout(self, test_sequence: List[Dict]) -> float:
+    @staticmethod
+    def _calculate_sequence_timeout(test_sequence: List[Dict]) -> float:
         """Calculate appropriate timeout for test sequence"""
         total_ms = 0
         
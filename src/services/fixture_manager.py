@@ -0,0 +1,317 @@
+"""Multi-fixture management: one station driving several SMT fixtures concurrently.
+
+Each fixture (nest) has its own Arduino controller - with its own reader thread -
+and its own SMTWorker while a test runs, so tests on different fixtures run in
+parallel. Results of all fixtures go to the shared result journal tagged with
+the fixture id, and the manager's signals feed the combined panel view.
+
+Fixtures share the SKU's programmers unless FIXTURES gives a fixture its own
+(e.g. {'id': 'Nest 2', 'port': 'COM4', 'programmers': {'STM8': {'path': ...}}}).
+A programmer executable programs one board at a time, so fixtures sharing one
+take turns (see ProgrammerController).
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, Signal, Qt
+
+from config.settings import FIXTURES
+from src.core.base_test import TestResult
+
+logger = logging.getLogger(__name__)
+
+# Fixture states shown in the panel view
+STATUS_DISCONNECTED = "disconnected"
+STATUS_IDLE = "idle"
+STATUS_TESTING = "testing"
+STATUS_PASSED = "passed"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class Fixture:
+    """One test nest and its hardware"""
+    fixture_id: str
+    port: str
+    controller: Any = None
+    worker: Any = None
+    sku: Optional[str] = None
+    status: str = STATUS_DISCONNECTED
+    last_result: Optional[TestResult] = None
+    tests_run: int = 0
+    tests_passed: int = 0
+    programmers: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # per-fixture programmer overrides
+
+    @property
+    def is_testing(self) -> bool:
+        return self.status == STATUS_TESTING
+
+
+def _create_smt_controller():
+    from src.hardware.controller_factory import ArduinoControllerFactory
+    return ArduinoControllerFactory.create_controller(mode="SMT", baud_rate=115200)
+
+
+def fixture_programming_config(programming_config: Optional[Dict[str, Any]],
+                               overrides: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The SKU's programming config with a fixture's own programmer settings (type, path, ...) applied"""
+    if not programming_config or not overrides:
+        return programming_config
+    programmers = {name: dict(config, **overrides.get(name, {}))
+                   for name, config in programming_config.get("programmers", {}).items()}
+    return dict(programming_config, programmers=programmers)
+
+
+def _create_smt_test(fixture: Fixture, sku: str, params: Dict[str, Any],
+                     programming_config: Optional[Dict[str, Any]]):
+    from src.core.smt_test import SMTTest
+    return SMTTest(sku, params, fixture.port, fixture_programming_config(programming_config, fixture.programmers),
+                   arduino_controller=fixture.controller)
+
+
+class FixtureManager(QObject):
+    """Owns the controllers of several fixtures and runs tests on them concurrently."""
+
+    # Signals (first argument is always the fixture id)
+    fixture_connection_changed = Signal(str, bool, str)  # fixture_id, connected, port
+    fixture_status_changed = Signal(str, str)  # fixture_id, status
+    fixture_progress = Signal(str, str, int)  # fixture_id, message, percentage
+    fixture_test_completed = Signal(str, object)  # fixture_id, TestResult
+    fixture_button_pressed = Signal(str)  # fixture_id
+    all_tests_completed = Signal()
+
+    def __init__(self, controller_factory: Optional[Callable[[], Any]] = None,
+                 test_factory: Optional[Callable[..., Any]] = None,
+                 max_concurrent: Optional[int] = None):
+        """Initialize the fixture manager.
+
+        Args:
+            controller_factory: Creates an unconnected controller for a fixture (default: SMT controller)
+            test_factory: Creates a test for (fixture, sku, params, programming_config) (default: SMTTest)
+            max_concurrent: Tests running at once, 0 = one per fixture (default: FIXTURES['max_concurrent'])
+        """
+        super().__init__()
+        self.controller_factory = controller_factory or _create_smt_controller
+        self.test_factory = test_factory or _create_smt_test
+        self.max_concurrent = FIXTURES.get('max_concurrent', 0) if max_concurrent is None else max_concurrent
+
+        self._fixtures: Dict[str, Fixture] = {}
+        self._fixtures_lock = threading.RLock()
+
+    # Fixtures
+
+    @property
+    def fixtures(self) -> List[Fixture]:
+        """Fixtures in the order they were added"""
+        with self._fixtures_lock:
+            return list(self._fixtures.values())
+
+    def get_fixture(self, fixture_id: str) -> Optional[Fixture]:
+        with self._fixtures_lock:
+            return self._fixtures.get(fixture_id)
+
+    def add_fixture(self, fixture_id: str, port: str,
+                    programmers: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+        """Connect a fixture's controller.
+
+        Args:
+            fixture_id: Name of the nest shown to the operator
+            port: Serial port of the fixture's Arduino
+            programmers: Programmer name -> settings replacing the SKU's for this fixture
+
+        Returns:
+            True if the fixture is connected
+        """
+        with self._fixtures_lock:
+            existing = self._fixtures.get(fixture_id)
+            if existing and existing.is_testing:
+                logger.warning(f"Fixture {fixture_id} is testing, not reconnecting")
+                return False
+        if existing:
+            self.remove_fixture(fixture_id)
+
+        fixture = Fixture(fixture_id, port, programmers=dict(programmers or {}))
+        with self._fixtures_lock:
+            self._fixtures[fixture_id] = fixture
+
+        try:
+            controller = self.controller_factory()
+            if not controller or not controller.connect(port):
+                logger.error(f"Fixture {fixture_id}: could not connect to {port}")
+                self.fixture_connection_changed.emit(fixture_id, False, port)
+                return False
+        except Exception as e:
+            logger.error(f"Fixture {fixture_id}: error connecting to {port}: {e}")
+            self.fixture_connection_changed.emit(fixture_id, False, port)
+            return False
+
+        if hasattr(controller, 'set_button_callback'):
+            controller.set_button_callback(lambda state, fid=fixture_id: self._on_button(fid, state))
+
+        fixture.controller = controller
+        self._set_status(fixture, STATUS_IDLE)
+        self.fixture_connection_changed.emit(fixture_id, True, port)
+        logger.info(f"Fixture {fixture_id} connected on {port}")
+        return True
+
+    def add_configured_fixtures(self) -> int:
+        """Connect the fixtures listed in FIXTURES['fixtures'].
+
+        Returns:
+            Number of fixtures connected
+        """
+        connected = 0
+        for entry in FIXTURES.get('fixtures', []):
+            if self.add_fixture(str(entry['id']), entry['port'], entry.get('programmers')):
+                connected += 1
+        return connected
+
+    def remove_fixture(self, fixture_id: str, timeout_ms: int = -1) -> bool:
+        """Disconnect and forget a fixture (waits up to timeout_ms for its running test, -1 = no limit)."""
+        with self._fixtures_lock:
+            fixture = self._fixtures.pop(fixture_id, None)
+        if not fixture:
+            return False
+
+        if fixture.worker and fixture.worker.isRunning():
+            if timeout_ms < 0:
+                fixture.worker.wait()
+            elif not fixture.worker.wait(timeout_ms):
+                logger.warning(f"Fixture {fixture_id}: test still running after {timeout_ms} ms, disconnecting")
+        if fixture.controller:
+            try:
+                if hasattr(fixture.controller, 'set_button_callback'):
+                    fixture.controller.set_button_callback(None)
+                fixture.controller.disconnect()
+            except Exception as e:
+                logger.error(f"Fixture {fixture_id}: error disconnecting: {e}")
+        self.fixture_connection_changed.emit(fixture_id, False, "")
+        return True
+
+    # Tests
+
+    def is_testing(self) -> bool:
+        return any(fixture.is_testing for fixture in self.fixtures)
+
+    def idle_fixtures(self) -> List[Fixture]:
+        """Connected fixtures not running a test"""
+        return [f for f in self.fixtures if f.controller is not None and not f.is_testing]
+
+    def start_test(self, fixture_id: str, sku: str, params: Dict[str, Any],
+                   programming_config: Optional[Dict[str, Any]] = None) -> bool:
+        """Start a test on one fixture.
+
+        Returns:
+            True if the test was started
+        """
+        from src.gui.workers.smt_worker import SMTWorker
+
+        with self._fixtures_lock:
+            fixture = self._fixtures.get(fixture_id)
+            if not fixture or fixture.controller is None:
+                logger.warning(f"Fixture {fixture_id} is not connected")
+                return False
+            if fixture.is_testing:
+                logger.warning(f"Fixture {fixture_id} is already testing")
+                return False
+            running = sum(1 for f in self._fixtures.values() if f.is_testing)
+            if self.max_concurrent and running >= self.max_concurrent:
+                logger.info(f"Fixture {fixture_id}: {running} tests already running, not starting")
+                return False
+            # Claim the fixture before releasing the lock
+            fixture.status = STATUS_TESTING
+
+        try:
+            test = self.test_factory(fixture, sku, params, programming_config)
+            test.fixture_id = fixture_id
+            worker = SMTWorker(test)
+        except Exception as e:
+            logger.error(f"Fixture {fixture_id}: could not create test: {e}")
+            self._set_status(fixture, STATUS_IDLE)
+            return False
+
+        # Direct connections: handled on the worker thread, the manager's own
+        # signals are then queued to the GUI thread.
+        worker.progress_updated.connect(
+            lambda message, percentage, fid=fixture_id: self.fixture_progress.emit(fid, message, percentage),
+            Qt.DirectConnection)
+        worker.test_completed.connect(
+            lambda result, fid=fixture_id: self._on_test_completed(fid, result), Qt.DirectConnection)
+
+        fixture.worker = worker
+        fixture.sku = sku
+        self.fixture_status_changed.emit(fixture_id, STATUS_TESTING)
+        worker.start()
+        logger.info(f"Fixture {fixture_id}: started {sku} test")
+        return True
+
+    def start_all(self, sku: str, params: Dict[str, Any],
+                  programming_config: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Start the same SKU's test on every idle fixture.
+
+        Returns:
+            Ids of the fixtures that started
+        """
+        return [fixture.fixture_id for fixture in self.idle_fixtures()
+                if self.start_test(fixture.fixture_id, sku, params, programming_config)]
+
+    def wait_for_all(self, timeout_ms: int = -1) -> bool:
+        """Block until every running test finished (for shutdown and scripting)."""
+        for fixture in self.fixtures:
+            if fixture.worker and fixture.worker.isRunning():
+                if timeout_ms < 0:
+                    fixture.worker.wait()
+                elif not fixture.worker.wait(timeout_ms):
+                    return False
+        return True
+
+    def get_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-fixture status and counts for the combined view."""
+        return {
+            f.fixture_id: {
+                'port': f.port,
+                'status': f.status,
+                'sku': f.sku,
+                'tests_run': f.tests_run,
+                'tests_passed': f.tests_passed
+            }
+            for f in self.fixtures
+        }
+
+    # Internal
+
+    def _set_status(self, fixture: Fixture, status: str):
+        with self._fixtures_lock:
+            fixture.status = status
+        self.fixture_status_changed.emit(fixture.fixture_id, status)
+
+    def _on_test_completed(self, fixture_id: str, result: TestResult):
+        fixture = self.get_fixture(fixture_id)
+        if not fixture:
+            return
+        with self._fixtures_lock:
+            fixture.last_result = result
+            fixture.tests_run += 1
+            if result.passed:
+                fixture.tests_passed += 1
+        self._set_status(fixture, STATUS_PASSED if result.passed else STATUS_FAILED)
+        logger.info(f"Fixture {fixture_id}: {fixture.sku} {'PASS' if result.passed else 'FAIL'}")
+        self.fixture_test_completed.emit(fixture_id, result)
+        if not self.is_testing():
+            self.all_tests_completed.emit()
+
+    def _on_button(self, fixture_id: str, state: str):
+        if state == "PRESSED":
+            self.fixture_button_pressed.emit(fixture_id)
+
+    # Cleanup
+
+    def cleanup(self):
+        """Wait (bounded) for running tests and disconnect every fixture."""
+        # A stuck test must not hang shutdown: after the bounded wait, don't wait again per fixture
+        finished = self.wait_for_all(timeout_ms=5000)
+        for fixture in self.fixtures:
+            self.remove_fixture(fixture.fixture_id, timeout_ms=-1 if finished else 0)
@@ -0,0 +1,108 @@
+"""SKU file watching: picks up edited, added and removed SKU files without a full reload."""
+
+import logging
+from typing import Optional
+
+from PySide6.QtCore import QObject, Signal, QTimer, QFileSystemWatcher
+
+from config.settings import SKU_WATCH
+from src.data.sku_manager import SKUManager, SKUChangeSet
+
+logger = logging.getLogger(__name__)
+
+# Rescan interval when SKUs come from a database (nothing to watch on disk)
+DATABASE_POLL_INTERVAL_S = 30
+
+
+class SKUFileWatcher(QObject):
+    """Watches the SKU directories and reloads changed SKU files incrementally."""
+
+    # Signals ("mode:sku" keys)
+    skus_added = Signal(list)
+    skus_modified = Signal(list)
+    skus_removed = Signal(list)
+    skus_changed = Signal(object)  # SKUChangeSet
+
+    def __init__(self, sku_manager: SKUManager, debounce_ms: Optional[int] = None,
+                 poll_interval_s: Optional[float] = None, parent: Optional[QObject] = None):
+        """Initialize the watcher.
+
+        Args:
+            sku_manager: Manager to reload (its change callbacks drive the signals)
+            debounce_ms: Delay after the last file event before rescanning (default: SKU_WATCH)
+            poll_interval_s: Periodic rescan interval, 0 = off (default: SKU_WATCH)
+        """
+        super().__init__(parent)
+        self.sku_manager = sku_manager
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule_check)
+        self._watcher.fileChanged.connect(self._schedule_check)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(SKU_WATCH.get('debounce_ms', 500) if debounce_ms is None else debounce_ms)
+        self._debounce_timer.timeout.connect(self.check_now)
+
+        if poll_interval_s is None:
+            poll_interval_s = SKU_WATCH.get('poll_interval_s', 0)
+            if not poll_interval_s and sku_manager.database is not None:
+                poll_interval_s = DATABASE_POLL_INTERVAL_S
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(int(poll_interval_s * 1000))
+        self._poll_timer.timeout.connect(self.check_now)
+
+        # Watched paths are updated on the watcher's own thread
+        self.skus_changed.connect(self._on_skus_changed)
+
+    def start(self):
+        """Start watching the SKU directories and files."""
+        self.sku_manager.add_change_callback(self._on_changes)
+        self._update_watched_paths()
+        if self._poll_timer.interval() > 0:
+            self._poll_timer.start()
+        logger.info(f"Watching {len(self._watcher.directories())} SKU directories, "
+                    f"{len(self._watcher.files())} files")
+
+    def stop(self):
+        """Stop watching."""
+        self.sku_manager.remove_change_callback(self._on_changes)
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+        paths = self._watcher.directories() + self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def check_now(self) -> SKUChangeSet:
+        """Rescan the SKU files now (signals are emitted through the manager's change callback)."""
+        return self.sku_manager.reload_if_changed()
+
+    def _schedule_check(self, path: str):
+        logger.debug(f"SKU path changed: {path}")
+        self._debounce_timer.start()
+
+    def _update_watched_paths(self):
+        """Watch the SKU directories (added/removed files) and each file (in-place edits)."""
+        wanted = set(self.sku_manager.get_watch_paths())
+        watched = set(self._watcher.directories() + self._watcher.files())
+
+        stale = watched - wanted
+        if stale:
+            self._watcher.removePaths(list(stale))
+        missing = wanted - watched
+        if missing:
+            self._watcher.addPaths(sorted(missing))
+
+    def _on_changes(self, changes: SKUChangeSet):
+        # Called on the thread that reloaded; the signals are queued to the GUI thread if needed
+        if changes.added:
+            self.skus_added.emit(changes.added)
+        if changes.modified:
+            self.skus_modified.emit(changes.modified)
+        if changes.removed:
+            self.skus_removed.emit(changes.removed)
+        self.skus_changed.emit(changes)
+
+    def _on_skus_changed(self, changes: SKUChangeSet):
+        # Also after modifications: editors that save by replacing the file drop its watch
+        self._update_watched_paths()
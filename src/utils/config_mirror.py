@@ -0,0 +1,211 @@
+"""
+Local mirror of the shared-drive config directory
+
+SKU files and programming_config.json live on the shared drive. The mirror
+keeps a local copy under the local data directory so startup and tests read
+local files; a background thread syncs changed files from the share. A file
+is re-hashed only when its mtime or size on the share changed, and copied
+only when its hash differs from the manifest. Files are replaced atomically,
+so readers see either the old or the new version, and keep the share's
+modification time (the SKU cache matches entries to SKU files by mtime).
+When the share (or any directory on it) is unreachable the mirror keeps
+serving the last synced copy. The mirror is read-only: config edits are
+written to the share (PathManager.get_writable_config_path) and synced back.
+"""
+
+import os
+import json
+import fnmatch
+import hashlib
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class MirrorSyncResult:
+    """Outcome of one sync pass (paths relative to the config directory)"""
+    success: bool = True
+    copied: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    error: Optional[str] = None
+
+
+class ConfigMirror:
+    """Read-only local copy of the shared config directory, synced by manifest hashes"""
+
+    MANIFEST = "mirror_manifest.json"
+
+    def __init__(self, shared_dir: Path, mirror_dir: Path, patterns: Optional[List[str]] = None,
+                 sync_interval_s: float = 60.0):
+        """
+        Args:
+            shared_dir: Config directory on the shared drive
+            mirror_dir: Local mirror directory
+            patterns: File name patterns to mirror (default: JSON files)
+            sync_interval_s: Background sync interval
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.shared_dir = Path(shared_dir)
+        self.mirror_dir = Path(mirror_dir)
+        self.patterns = patterns or ["*.json"]
+        self.sync_interval_s = sync_interval_s
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_result: Optional[MirrorSyncResult] = None
+        self._load_manifest()
+
+    def _load_manifest(self):
+        path = self.mirror_dir / self.MANIFEST
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable config mirror manifest: {e}")
+            self._entries = {}
+
+    def _save_manifest(self):
+        fd, tmp = tempfile.mkstemp(dir=self.mirror_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp, self.mirror_dir / self.MANIFEST)
+
+    def is_populated(self) -> bool:
+        """True once a sync has completed (the mirror can serve reads)"""
+        return bool(self._entries) and (self.mirror_dir / self.MANIFEST).exists()
+
+    def _list_shared_files(self) -> Dict[str, os.stat_result]:
+        """Relative path -> stat of every mirrored file on the share (OSError if any directory can't be listed)"""
+        def walk_error(error: OSError):
+            # A partial listing would make sync() remove the unlisted directory's mirrored files
+            raise error
+
+        found = {}
+        for root, _, files in os.walk(self.shared_dir, onerror=walk_error):
+            for name in files:
+                if not any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns):
+                    continue
+                path = Path(root) / name
+                found[path.relative_to(self.shared_dir).as_posix()] = path.stat()
+        return found
+
+    def sync(self) -> MirrorSyncResult:
+        """
+        Bring the mirror up to date with the share.
+
+        Returns:
+            What was copied and removed; success is False if the share was unreachable
+        """
+        with self._lock:
+            result = MirrorSyncResult()
+            try:
+                if not self.shared_dir.is_dir():
+                    raise OSError(f"{self.shared_dir} not accessible")
+                shared = self._list_shared_files()
+            except OSError as e:
+                result.success = False
+                result.error = str(e)
+                self.logger.warning(f"Config mirror sync skipped, share unavailable: {e}")
+                self.last_result = result
+                return result
+
+            self.mirror_dir.mkdir(parents=True, exist_ok=True)
+            for relative, stat in shared.items():
+                entry = self._entries.get(relative)
+                local = self.mirror_dir / relative
+                if (entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+                        and local.exists()):
+                    result.unchanged += 1
+                    continue
+                try:
+                    data = (self.shared_dir / relative).read_bytes()
+                except OSError as e:
+                    self.logger.warning(f"Could not read {relative} from the share: {e}")
+                    continue
+                digest = hashlib.sha256(data).hexdigest()
+                try:
+                    if entry and entry["sha256"] == digest and local.exists():
+                        os.utime(local, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                        result.unchanged += 1
+                    else:
+                        self._write_local(local, data, stat)
+                        result.copied.append(relative)
+                except OSError as e:
+                    # e.g. a file held open by another process on Windows; retried on the next sync
+                    self.logger.warning(f"Could not update mirrored {relative}: {e}")
+                    continue
+                self._entries[relative] = {"sha256": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+            for relative in [r for r in self._entries if r not in shared]:
+                try:
+                    (self.mirror_dir / relative).unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.logger.warning(f"Could not remove mirrored {relative}: {e}")
+                    continue
+                del self._entries[relative]
+                result.removed.append(relative)
+
+            self._save_manifest()
+            if result.copied or result.removed:
+                self.logger.info(f"Config mirror synced: {len(result.copied)} copied, "
+                                 f"{len(result.removed)} removed, {result.unchanged} unchanged")
+            self.last_result = result
+            return result
+
+    def _write_local(self, local: Path, data: bytes, stat: os.stat_result):
+        """Replace a mirrored file atomically, with the share's modification time"""
+        local.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=local.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(tmp, local)
+        except OSError:
+            os.unlink(tmp)
+            raise
+
+    # Background sync
+
+    def start_background_sync(self):
+        """Sync now and every sync_interval_s on a daemon thread (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sync_loop, daemon=True, name="ConfigMirrorSync")
+        self._thread.start()
+
+    def stop_background_sync(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _sync_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                self.logger.error(f"Config mirror sync error: {e}")
+            self._stop.wait(self.sync_interval_s)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Mirror state for path info and diagnostics"""
+        return {
+            "mirror_dir": str(self.mirror_dir),
+            "populated": self.is_populated(),
+            "files": len(self._entries),
+            "syncing": bool(self._thread and self._thread.is_alive()),
+            "last_sync_ok": self.last_result.success if self.last_result else None
+        }
@@ -27,6 +27,7 @@ class PathManager:
         
         self._settings_loaded = False
         self._paths_cache = {}
+        self._config_mirror = None
         
         # Check for command-line override of shared drive path (second priority)
         self._check_command_line_args()
@@ -107,8 +108,20 @@ class PathManager:
             return self._paths_cache[cache_key]
         
         if prefer_shared:
-            shared_config = self._shared_drive_path / "config"
+            # A populated local mirror keeps the share off the startup path; it syncs in the background
+            mirror = self.get_config_mirror()
+            if mirror is not None and mirror.is_populated():
+                mirror.start_background_sync()
+                self._paths_cache[cache_key] = mirror.mirror_dir
+                return mirror.mirror_dir
+            
+            shared_config = self.get_shared_config_dir()
             if shared_config.exists():
+                # First run: populate the mirror once, then serve it
+                if mirror is not None and mirror.sync().success:
+                    mirror.start_background_sync()
+                    self._paths_cache[cache_key] = mirror.mirror_dir
+                    return mirror.mirror_dir
                 self._paths_cache[cache_key] = shared_config
                 return shared_config
             else:
@@ -128,6 +141,50 @@ class PathManager:
         self._paths_cache[cache_key] = local_config
         return local_config
     
+    def get_shared_config_dir(self) -> Path:
+        """Get the configuration directory on the shared drive (may be unreachable)"""
+        return self._shared_drive_path / "config"
+    
+    def get_config_mirror(self):
+        """Get the local mirror of the shared config directory (None if disabled)"""
+        if self._config_mirror is None:
+            from config.settings import CONFIG_MIRROR
+            if not CONFIG_MIRROR.get('enabled', True):
+                return None
+            from src.utils.config_mirror import ConfigMirror
+            mirror_dir = CONFIG_MIRROR.get('directory') or self.get_local_data_dir() / "config_mirror"
+            self._config_mirror = ConfigMirror(self.get_shared_config_dir(), Path(mirror_dir),
+                                               patterns=CONFIG_MIRROR.get('patterns'),
+                                               sync_interval_s=CONFIG_MIRROR.get('sync_interval_s', 60))
+        return self._config_mirror
+    
+    def get_writable_config_path(self, path: Path) -> Path:
+        """Where an edit to a config file must be written.
+
+        Files served from the local mirror are written to the share instead: the
+        mirror is read-only and the next sync would overwrite a local edit.
+
+        Raises:
+            OSError: If the file is served from the mirror and the share is not accessible
+        """
+        path = Path(path)
+        mirror = self._config_mirror
+        if mirror is None:
+            return path
+        try:
+            relative = path.relative_to(mirror.mirror_dir)
+        except ValueError:
+            return path
+        shared_config = self.get_shared_config_dir()
+        if not shared_config.is_dir():
+            raise OSError(f"Shared config not accessible ({shared_config}); the local mirror is read-only")
+        return shared_config / relative
+
+    def sync_config_mirror(self):
+        """Bring the local mirror up to date now, e.g. after writing config files to the share"""
+        if self._config_mirror is not None:
+            self._config_mirror.sync()
+
     def get_skus_dir(self) -> Path:
         """Get SKUs configuration directory"""
         return self.get_config_dir() / "skus"
@@ -174,6 +231,7 @@ class PathManager:
             "shared_drive_available": self.is_shared_drive_available(),
             "local_data_dir": str(self.get_local_data_dir()),
             "config_dir": str(self.get_config_dir()),
+            "config_mirror": self._config_mirror.get_status() if self._config_mirror else None,
             "is_frozen": self.is_frozen,
             "app_dir": str(self.app_dir)
         }
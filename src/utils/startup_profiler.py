@@ -0,0 +1,244 @@
+"""
+Startup profiler (main.py --profile-startup)
+
+Records how long each module import and each startup phase (splash, preload,
+SKU load, port scan, MainWindow construction, ...) takes and writes them to
+a JSON trace in the Chrome trace event format, so it can be opened in
+chrome://tracing or https://ui.perfetto.dev. The trace also holds a summary
+with the phase totals and the slowest imports.
+
+Profiling is opt-in: profile_phase() and mark_startup() cost nothing unless
+start_startup_profiling() was called.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class _TimedLoader:
+    """Loader proxy that times create_module + exec_module of one module"""
+
+    def __init__(self, loader, finder: "_ImportTimer", name: str):
+        self._loader = loader
+        self._finder = finder
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        self._finder.begin(self._name)
+        create_module = getattr(self._loader, 'create_module', None)
+        try:
+            return create_module(spec) if create_module else None
+        except BaseException:
+            self._finder.end(self._name)
+            raise
+
+    def exec_module(self, module):
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._finder.end(self._name)
+
+
+class _ImportTimer:
+    """sys.meta_path finder that wraps the loaders found by the other finders"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def begin(self, name: str):
+        """Start timing a module (nested imports are subtracted from its self time)"""
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def end(self, name: str):
+        stack = self._local.__dict__.get('stack')
+        if not stack or stack[-1][0] != name:
+            return
+        _, start, nested = stack.pop()
+        duration = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += duration
+        self.profiler.record(name, "import", start, duration, self_s=duration - nested)
+
+
+class StartupProfiler:
+    """Collects import and phase timings as trace events"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._origin = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._import_timer: Optional[_ImportTimer] = None
+
+    def install_import_hook(self):
+        """Time every module imported from now on"""
+        if self._import_timer is None:
+            self._import_timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def remove_import_hook(self):
+        if self._import_timer is not None:
+            sys.meta_path.remove(self._import_timer)
+            self._import_timer = None
+
+    def record(self, name: str, category: str, start: float, duration: float, **args):
+        """Add a complete event (start/duration in perf_counter seconds)"""
+        thread = threading.current_thread()
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+            "ts": round((start - self._origin) * 1e6, 1), "dur": round(duration * 1e6, 1)
+        }
+        if args:
+            # Seconds arguments ("self_s") are written in milliseconds ("self_ms")
+            event["args"] = {(key[:-2] + "_ms" if key.endswith("_s") else key):
+                             (round(value * 1000, 3) if key.endswith("_s") else value)
+                             for key, value in args.items()}
+        with self._lock:
+            self._events.append(event)
+            self._threads[thread.ident] = thread.name
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, "phase", start, time.perf_counter() - start)
+
+    def mark(self, name: str):
+        """Record an instant event (e.g. "interactive")"""
+        thread = threading.current_thread()
+        with self._lock:
+            self._events.append({"name": name, "cat": "mark", "ph": "i", "s": "g", "pid": os.getpid(),
+                                 "tid": thread.ident, "ts": round((time.perf_counter() - self._origin) * 1e6, 1)})
+            self._threads[thread.ident] = thread.name
+
+    def summary(self, top: int = 25) -> Dict[str, Any]:
+        """Phase totals and the slowest imports by self time, in milliseconds"""
+        with self._lock:
+            events = list(self._events)
+        phases: Dict[str, float] = {}
+        for event in events:
+            if event["cat"] == "phase":
+                phases[event["name"]] = round(phases.get(event["name"], 0.0) + event["dur"] / 1000, 3)
+        imports = sorted((e for e in events if e["cat"] == "import"),
+                         key=lambda e: e["args"]["self_ms"], reverse=True)
+        marks = {e["name"]: round(e["ts"] / 1000, 3) for e in events if e["cat"] == "mark"}
+        return {
+            "elapsed_ms": round((time.perf_counter() - self._origin) * 1000, 3),
+            "marks_ms": marks,
+            "phases_ms": phases,
+            "imports": len(imports),
+            "import_total_self_ms": round(sum(e["args"]["self_ms"] for e in imports), 3),
+            "slowest_imports": [{"module": e["name"], "self_ms": e["args"]["self_ms"],
+                                 "total_ms": round(e["dur"] / 1000, 3)} for e in imports[:top]]
+        }
+
+    def write(self, path: Path) -> Path:
+        """Write the trace and summary as JSON"""
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                    for tid, name in threads.items()]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms",
+                       "summary": self.summary()}, f, indent=1)
+        return path
+
+
+# Global profiler, set by start_startup_profiling()
+_startup_profiler: Optional[StartupProfiler] = None
+_trace_path: Optional[Path] = None
+
+
+def start_startup_profiling(path: Optional[Path] = None) -> StartupProfiler:
+    """
+    Start profiling startup, timing imports from now on.
+
+    Args:
+        path: Trace file (default: logs/startup_profile_<timestamp>.json)
+    """
+    global _startup_profiler, _trace_path
+    if _startup_profiler is None:
+        _startup_profiler = StartupProfiler()
+        _startup_profiler.install_import_hook()
+        _trace_path = Path(path) if path else Path("logs") / f"startup_profile_{datetime.now():%Y%m%d_%H%M%S}.json"
+        atexit.register(finish_startup_profiling)
+    return _startup_profiler
+
+
+def get_startup_profiler() -> Optional[StartupProfiler]:
+    """Get global startup profiler instance (None unless profiling)"""
+    return _startup_profiler
+
+
+@contextmanager
+def profile_phase(name: str):
+    """Time a startup phase when profiling, otherwise do nothing"""
+    if _startup_profiler is None:
+        yield
+    else:
+        with _startup_profiler.phase(name):
+            yield
+
+
+def mark_startup(name: str):
+    """Record a startup milestone when profiling"""
+    if _startup_profiler is not None:
+        _startup_profiler.mark(name)
+
+
+def finish_startup_profiling() -> Optional[Path]:
+    """Stop timing imports and write the trace (once); returns its path"""
+    global _startup_profiler
+    profiler, _startup_profiler = _startup_profiler, None
+    if profiler is None:
+        return None
+    profiler.remove_import_hook()
+    try:
+        path = profiler.write(_trace_path)
+    except OSError as e:
+        profiler.logger.error(f"Could not write startup profile: {e}")
+        return None
+    summary = profiler.summary(top=5)
+    profiler.logger.info(f"Startup profile written to {path} ({summary['elapsed_ms']:.0f} ms, "
+                         f"{summary['imports']} imports, {summary['import_total_self_ms']:.0f} ms importing)")
+    return path
@@ -44,7 +44,25 @@ class ThreadCleanupMixin:
         
         self.logger.debug(f"Registered QThread: {thread_id}")
         return thread_id
-    
+
+    def register_thread(self, thread: threading.Thread, name: str) -> str:
+        """
+        Register a regular thread for tracking.
+
+        Args:
+            thread: The thread to track
+            name: Base name for the thread
+
+        Returns:
+            Unique thread ID
+        """
+        with self._lock:
+            thread_id = f"{name}_{id(thread)}"
+            self._threads[thread_id] = thread
+
+        self.logger.debug(f"Registered thread: {thread_id}")
+        return thread_id
+
     def register_resource(self, resource: Any, name: str, cleanup_callback: Optional[callable] = None):
         """
         Register a resource for tracking and cleanup.
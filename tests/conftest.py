@@ -0,0 +1,27 @@
+"""
+Shared test fixtures
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_results(tmp_path, monkeypatch):
+    """Send journaled and logged test results to tmp_path instead of the tester's local data dir"""
+    from src.data import result_journal, results_logger
+
+    journal = result_journal.ResultJournal(tmp_path / "results.journal")
+    monkeypatch.setattr(result_journal, "_result_journal", journal)
+    monkeypatch.setattr(results_logger, "get_results_dir", lambda: tmp_path / "results")
+    yield journal
+    journal.close()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip timing benchmarks unless they are selected with -m benchmark"""
+    if "benchmark" in config.getoption("markexpr"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="timing benchmark, run with -m benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
@@ -0,0 +1,143 @@
+"""
+FixtureManager driving several SMT fixture emulators from one host
+No hardware required; skipped on platforms without pseudo-terminals.
+"""
+
+import json
+import os
+import time
+import pytest
+from pathlib import Path
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="pty emulator requires POSIX")
+
+if os.name == "posix":
+    from PySide6.QtCore import QCoreApplication
+    from src.hardware.emulators.smt_emulator import SMTFirmwareEmulator, SMTEmulatorConfig
+    from src.services.fixture_manager import (FixtureManager, Fixture, STATUS_PASSED, STATUS_FAILED,
+                                              STATUS_TESTING, fixture_programming_config)
+
+SKU_FILE = Path(__file__).parent.parent.parent / "config" / "skus" / "smt" / "DD5001.json"
+
+
+@pytest.fixture
+def fixtures():
+    """Factory: n emulated fixtures connected to a FixtureManager"""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    created = []
+
+    def factory(count, time_scale=0.2):
+        emulators = []
+        for index in range(count):
+            emulator = SMTFirmwareEmulator(SMTEmulatorConfig(time_scale=time_scale, seed=index))
+            emulator.start()
+            emulators.append(emulator)
+        manager = FixtureManager()
+        created.append((manager, emulators))
+        for index, emulator in enumerate(emulators):
+            assert manager.add_fixture(f"Nest {index + 1}", emulator.port)
+        return manager
+
+    yield factory
+    for manager, emulators in created:
+        manager.cleanup()
+        for emulator in emulators:
+            emulator.stop()
+    app.processEvents()
+
+
+def _run_all(manager, params, rounds=1):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        started = manager.start_all("DD5001", params)
+        assert len(started) == len(manager.fixtures)
+        assert manager.wait_for_all(timeout_ms=30000)
+    return time.perf_counter() - start
+
+
+@pytest.mark.integration
+def test_tests_run_on_every_fixture(fixtures):
+    """Each fixture runs its own test; results are tagged with the fixture"""
+    manager = fixtures(2)
+    params = json.loads(SKU_FILE.read_text())
+    completed = []
+    manager.fixture_test_completed.connect(lambda fixture_id, result: completed.append(fixture_id))
+
+    started = manager.start_all("DD5001", params)
+    assert started == ["Nest 1", "Nest 2"]
+    assert manager.get_fixture("Nest 1").status == STATUS_TESTING
+    assert not manager.start_test("Nest 1", "DD5001", params)  # already testing
+    assert manager.wait_for_all(timeout_ms=30000)
+    QCoreApplication.processEvents()  # completion signals are queued to this thread
+
+    assert sorted(completed) == ["Nest 1", "Nest 2"]
+    summary = manager.get_summary()
+    for fixture in manager.fixtures:
+        # The emulator's default electrical model does not match every DD5001 limit;
+        # what matters here is that each fixture got its own measured result
+        assert fixture.last_result.measurements
+        assert fixture.status == (STATUS_PASSED if fixture.last_result.passed else STATUS_FAILED)
+        assert summary[fixture.fixture_id]["tests_run"] == 1
+        assert summary[fixture.fixture_id]["tests_passed"] == int(fixture.last_result.passed)
+
+
+@pytest.mark.benchmark
+def test_multi_fixture_throughput_benchmark(fixtures):
+    """Panels per minute with one fixture vs four fixtures tested concurrently"""
+    params = json.loads(SKU_FILE.read_text())
+    rounds = 3
+
+    single = _run_all(fixtures(1), params, rounds)
+    quad = _run_all(fixtures(4), params, rounds)
+
+    single_rate = rounds * 60.0 / single
+    quad_rate = 4 * rounds * 60.0 / quad
+    assert quad_rate > 2 * single_rate
+
+
+class _StuckWorker:
+    """SMTWorker stand-in whose test never finishes"""
+
+    def __init__(self):
+        self.waits = []
+
+    def isRunning(self):
+        return True
+
+    def wait(self, timeout_ms=None):
+        if timeout_ms is None:
+            raise AssertionError("unbounded wait on a stuck test")
+        self.waits.append(timeout_ms)
+        return False
+
+
+@pytest.mark.integration
+def test_cleanup_does_not_hang_on_a_stuck_test(monkeypatch):
+    """Shutdown waits once (bounded) for a stuck test, then disconnects without waiting again"""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    manager = FixtureManager()
+    worker = _StuckWorker()
+    manager._fixtures["Nest 1"] = Fixture("Nest 1", "COM_TEST", worker=worker, status=STATUS_TESTING)
+
+    manager.cleanup()
+
+    assert worker.waits == [5000, 0]
+    assert manager.fixtures == []
+    app.processEvents()
+
+
+@pytest.mark.integration
+def test_fixture_programmer_overrides():
+    """A fixture's own programmer settings replace the SKU's for that fixture only"""
+    sku_config = {"enabled": True, "hex_files": {"main_1": "main.hex"},
+                  "programmers": {"STM8": {"type": "STM8", "path": "stvp", "boards": ["main_1"]},
+                                  "PIC": {"type": "PIC", "path": "ipecmd", "boards": ["led_1"]}}}
+
+    config = fixture_programming_config(sku_config, {"STM8": {"path": "stvp_nest_2"}})
+
+    assert config["programmers"]["STM8"] == {"type": "STM8", "path": "stvp_nest_2", "boards": ["main_1"]}
+    assert config["programmers"]["PIC"] == sku_config["programmers"]["PIC"]
+    assert config["hex_files"] == sku_config["hex_files"]
+    assert sku_config["programmers"]["STM8"]["path"] == "stvp"
+    assert fixture_programming_config(sku_config, {}) is sku_config
+    assert fixture_programming_config(None, {"STM8": {"path": "x"}}) is None
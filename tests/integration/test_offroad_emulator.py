@@ -0,0 +1,280 @@
+"""
+End-to-end tests of ArduinoController / OffroadTest against the pty offroad emulator
+No hardware required; skipped on platforms without pseudo-terminals.
+"""
+
+import os
+import time
+import pytest
+from src.hardware.offroad_arduino_controller import OffroadArduinoController
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="pty emulator requires POSIX")
+
+if os.name == "posix":
+    from src.hardware.emulators.offroad_emulator import OffroadFirmwareEmulator, OffroadEmulatorConfig
+
+PARAMETERS = {
+    "LUX": {"min_mainbeam_lux": 3000, "max_mainbeam_lux": 3600,
+            "min_backlight_lux": 120, "max_backlight_lux": 180},
+    "COLOR": {"center_x_main": 0.440, "center_y_main": 0.405, "radius_x_main": 0.013, "radius_y_main": 0.013},
+    "PRESSURE": {"min_initial_psi": 14.0, "max_initial_psi": 16.0, "max_delta_psi": 0.5}
+}
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def offroad():
+    created = []
+
+    def factory(**kwargs):
+        kwargs.setdefault('seed', 3)
+        kwargs.setdefault('time_scale', 0.05)
+        emulator = OffroadFirmwareEmulator(OffroadEmulatorConfig(**kwargs))
+        emulator.start()
+        controller = OffroadArduinoController()
+        created.append((emulator, controller))
+        assert controller.connect(emulator.port)
+        return emulator, controller
+
+    yield factory
+    for emulator, controller in created:
+        controller.disconnect()
+        emulator.stop()
+
+
+@pytest.mark.integration
+def test_identification(offroad):
+    """Connection handshake and firmware type detection"""
+    emulator, controller = offroad()
+
+    assert controller.get_firmware_type() == "OFFROAD"
+    assert controller.configure_sensors([])
+
+
+@pytest.mark.integration
+def test_identification_while_streaming(offroad):
+    """LIVE lines streamed during the handshake are not taken as query replies"""
+    emulator, controller = offroad(stream_interval_ms=10, stream_on_start=True)
+
+    assert controller.get_firmware_type() == "OFFROAD"
+    assert controller.serial.query("PING", response_timeout=1.0) == "PONG"
+
+
+@pytest.mark.integration
+def test_live_stream_at_10ms(offroad):
+    """LIVE lines at a 10 ms interval are parsed into sensor readings"""
+    emulator, controller = offroad(stream_interval_ms=10, stream_on_start=True)
+    controller.start_reading()
+
+    time.sleep(1.0)
+
+    voltages = [r for r in controller.readings if r.sensor_id == "VOLTAGE"]
+    assert len(voltages) >= 50
+    assert voltages[-1].value == pytest.approx(emulator.config.supply_voltage, abs=0.2)
+    assert controller.get_latest_reading("PSI").value == pytest.approx(emulator.config.ambient_psi, abs=0.1)
+
+
+@pytest.mark.integration
+def test_stored_readings_are_capped(offroad):
+    """A fast LIVE stream keeps at most max_readings, dropping the oldest"""
+    emulator, controller = offroad(stream_interval_ms=10, stream_on_start=True)
+    controller.max_readings = 50
+    started = time.time()
+    controller.start_reading()
+
+    time.sleep(0.5)
+
+    assert len(controller.readings) == controller.max_readings
+    assert controller.readings[0].timestamp > started + 0.2
+
+
+@pytest.mark.integration
+def test_function_test_result(offroad):
+    """TEST:FUNCTION_TEST is acknowledged and its RESULT attributed to the test"""
+    emulator, controller = offroad()
+    controller.start_reading()
+
+    response = controller.send_command("TEST:FUNCTION_TEST", timeout=2.0)
+
+    assert response == "OK:TEST:FUNCTION_TEST"
+    assert _wait_for(lambda: controller.current_test_type is None
+                     and controller.get_latest_test_result() is not None)
+    result = controller.get_latest_test_result()
+    assert result.test_type == "FUNCTION_TEST"
+    assert result.measurements["MI_MAIN"] == pytest.approx(emulator.config.mainbeam_current_a, rel=0.05)
+    assert result.measurements["LUX_BACK"] == pytest.approx(emulator.config.backlight_lux, rel=0.05)
+
+
+@pytest.mark.integration
+def test_rgbw_samples(offroad):
+    """RGBW test produces three samples for each of the eight cycles"""
+    emulator, controller = offroad()
+    controller.start_reading()
+
+    controller.send_command("TEST:RGBW_BACKLIGHT", timeout=2.0)
+
+    assert _wait_for(lambda: len(controller.get_all_rgbw_samples()) == 24)
+    assert {s.cycle for s in controller.get_all_rgbw_samples()} == set(range(1, 9))
+    red = controller.get_rgbw_samples_for_cycle(1)[0]
+    assert red.x == pytest.approx(emulator.config.rgbw_cycle_xy[0][0], abs=0.01)
+
+
+@pytest.mark.integration
+def test_pressure_decay(offroad):
+    """Pressure test streams LIVE PSI while holding and reports INITIAL/DELTA"""
+    emulator, controller = offroad(stream_interval_ms=10, stream_on_start=True, leak_rate_psi_s=0.1,
+                                   time_scale=0.2)
+    controller.start_reading()
+
+    controller.send_command("TEST:PRESSURE", timeout=2.0)
+
+    assert _wait_for(lambda: controller.get_latest_test_result() is not None, timeout=5.0)
+    result = controller.get_latest_test_result()
+    assert result.test_type == "PRESSURE"
+    assert result.measurements["INITIAL"] == pytest.approx(emulator.config.fill_psi, abs=0.05)
+    # 2.5 s hold at 0.1 PSI/s
+    assert result.measurements["DELTA"] == pytest.approx(0.25, abs=0.05)
+    psi = [r.value for r in controller.readings if r.sensor_id == "PSI"]
+    assert max(psi) > emulator.config.ambient_psi + 0.5
+
+
+@pytest.mark.integration
+def test_offroad_test_sequence(offroad):
+    """OffroadTest setup, function test and analysis against the emulator"""
+    from src.core.offroad_test import OffroadTest
+
+    emulator, controller = offroad()
+    test = OffroadTest("DD5003", PARAMETERS, emulator.port, arduino_controller=controller)
+
+    assert test.setup_hardware()
+    try:
+        result = test.run_test_sequence()
+    finally:
+        test.cleanup_hardware()
+
+    assert result.failures == []
+    for name in ("mainbeam_lux", "color_x", "color_y", "backlight_lux"):
+        assert result.measurements[name]["passed"], name
+    timing = test.phase_timing["function"]
+    assert 0.0 <= timing["wait_s"] <= timing["total_s"] < 2.0
+
+
+@pytest.mark.integration
+def test_wait_ends_on_test_complete(offroad):
+    """TEST_COMPLETE wakes a waiter whose data never arrives instead of running into the timeout"""
+    emulator, controller = offroad()
+    controller.start_reading()
+
+    controller.send_command("TEST:FUNCTION_TEST", timeout=2.0)
+    start = time.perf_counter()
+    assert controller.wait_for_test_event(lambda: controller.is_test_complete("FUNCTION_TEST"), 5.0)
+    assert time.perf_counter() - start < 2.0
+    assert not controller.wait_for_test_event(lambda: False, 0.05)
+
+
+@pytest.mark.benchmark
+def test_result_wait_latency_benchmark(offroad):
+    """Delay between a RESULT being parsed and the waiting phase noticing it, polling vs events"""
+    emulator, controller = offroad()
+    controller.start_reading()
+    runs = 5
+
+    def run(wait):
+        delays = []
+        for _ in range(runs):
+            controller.clear_test_completion()
+            before = controller.get_latest_test_result()
+            controller.send_command("TEST:FUNCTION_TEST", timeout=2.0)
+            received = lambda: controller.get_latest_test_result() is not before
+            assert wait(received)
+            delays.append(time.time() - controller.get_latest_test_result().timestamp)
+            assert controller.wait_for_test_event(lambda: controller.is_test_complete("FUNCTION_TEST"), 2.0)
+        return sum(delays) / len(delays)
+
+    def poll(received, max_wait_time=5.0):
+        start_wait = time.time()
+        while time.time() - start_wait < max_wait_time:
+            if received():
+                return True
+            time.sleep(0.1)
+        return False
+
+    polled = run(poll)
+    evented = run(lambda received: controller.wait_for_test_event(received, 5.0))
+
+    assert evented < polled
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("interval_ms", [100, 20, 10])
+def test_live_stream_throughput_benchmark(offroad, interval_ms):
+    """Reading loop throughput and stored-reading growth at different stream intervals"""
+    emulator, controller = offroad(stream_interval_ms=interval_ms, stream_on_start=True)
+    controller.max_readings = 1000
+    controller.start_reading()
+    time.sleep(0.2)
+
+    start_lines = emulator.messages_sent["LIVE"]
+    start = time.perf_counter()
+    time.sleep(2.0)
+    elapsed = time.perf_counter() - start
+    sent = emulator.messages_sent["LIVE"] - start_lines
+
+    assert len(controller.readings) <= controller.max_readings
+    assert sent / elapsed >= 0.5 * 1000.0 / interval_ms
+
+
+@pytest.mark.integration
+def test_capabilities(offroad):
+    """CAPS lists background tests; firmware without CAPS reports none"""
+    emulator, controller = offroad(background_pressure=True)
+    assert controller.get_background_tests() == ["PRESSURE"]
+
+    emulator, controller = offroad()
+    assert controller.get_capabilities() == {}
+
+
+def _run_pod(offroad, background_pressure):
+    from src.core.offroad_test import OffroadTest
+
+    emulator, controller = offroad(background_pressure=background_pressure, time_scale=0.2)
+    test = OffroadTest("DD5003", PARAMETERS, emulator.port, pressure_test_enabled=True,
+                       arduino_controller=controller)
+    assert test.setup_hardware()
+    try:
+        result = test.run_test_sequence()
+    finally:
+        test.cleanup_hardware()
+    return emulator, test, result
+
+
+@pytest.mark.integration
+def test_function_test_overlaps_pressure_hold(offroad):
+    """With CAPS:BACKGROUND=PRESSURE the function test runs during the pressure hold"""
+    emulator, test, result = _run_pod(offroad, background_pressure=True)
+
+    assert result.failures == []
+    assert result.measurements["initial_pressure"]["passed"]
+    assert result.measurements["mainbeam_lux"]["passed"]
+    assert "FUNCTION_TEST" in emulator.overlapped_tests
+    assert set(test.phase_timing) >= {"pressure", "function"}
+
+
+@pytest.mark.benchmark
+def test_pod_cycle_time_benchmark(offroad):
+    """Per-pod cycle time with phases back to back vs overlapped with the pressure hold"""
+    _, serial_test, serial_result = _run_pod(offroad, background_pressure=False)
+    _, overlap_test, overlap_result = _run_pod(offroad, background_pressure=True)
+
+    serial_cycle = serial_test.cycle_timing["cycle_s"]
+    overlap_cycle = overlap_test.cycle_timing["cycle_s"]
+    assert serial_result.failures == [] and overlap_result.failures == []
+    assert overlap_cycle < serial_cycle
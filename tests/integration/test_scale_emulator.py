@@ -0,0 +1,113 @@
+"""
+End-to-end tests of ScaleController against the pty scale emulator
+No hardware required; skipped on platforms without pseudo-terminals.
+"""
+
+import os
+import time
+import pytest
+from src.hardware.scale_controller import ScaleController
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="pty emulator requires POSIX")
+
+if os.name == "posix":
+    from src.hardware.emulators.scale_emulator import ScaleEmulator, ScaleEmulatorConfig
+
+
+def _connected(config):
+    emulator = ScaleEmulator(config)
+    emulator.start()
+    controller = ScaleController()
+    assert controller.connect(emulator.port, skip_comm_test=True)
+    controller.start_reading()
+    return emulator, controller
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def scale():
+    created = []
+
+    def factory(**kwargs):
+        kwargs.setdefault('seed', 7)
+        kwargs.setdefault('settle_time_constant_s', 0.1)
+        emulator, controller = _connected(ScaleEmulatorConfig(**kwargs))
+        created.append((emulator, controller))
+        return emulator, controller
+
+    yield factory
+    for emulator, controller in created:
+        controller.disconnect()
+        emulator.stop()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("output_format", ["st_us", "plain"])
+def test_stable_weight(scale, output_format):
+    """A placed part reads back as a stable weight in either output format"""
+    emulator, controller = scale(rate_hz=20, output_format=output_format)
+    emulator.place_part(125.0)
+
+    weight = controller.get_stable_weight(num_readings=5, tolerance=0.1, timeout=5.0)
+
+    assert weight == pytest.approx(125.0, abs=0.5)
+
+
+@pytest.mark.integration
+def test_part_removed(scale):
+    """Weight returns towards zero after the part is removed"""
+    emulator, controller = scale(rate_hz=20)
+    emulator.place_part(80.0)
+    assert _wait_for(lambda: (controller.current_weight or 0) > 79.0)
+
+    emulator.remove_part()
+
+    assert _wait_for(lambda: abs(controller.current_weight) < 1.0, timeout=5.0)
+
+
+@pytest.mark.integration
+def test_partial_lines_and_outliers(scale):
+    """Split lines and occasional outliers do not corrupt the filtered weight"""
+    emulator, controller = scale(rate_hz=20, partial_line_rate=0.3, outlier_rate=0.05)
+    emulator.place_part(60.0)
+
+    weight = controller.get_stable_weight(num_readings=5, tolerance=0.5, timeout=5.0)
+
+    assert weight == pytest.approx(60.0, abs=2.0)
+
+
+@pytest.mark.integration
+def test_baud_mismatch_yields_no_weight(scale):
+    """A scale set to a different baud rate produces no parseable readings"""
+    emulator, controller = scale(rate_hz=20, baud_rate=4800)
+    emulator.place_part(50.0)
+
+    time.sleep(1.0)
+
+    assert controller.current_weight is None
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("rate_hz", [10, 20, 50])
+def test_time_to_stable_weight_benchmark(scale, rate_hz):
+    """Time from part placement to a stable reading at different stream rates"""
+    emulator, controller = scale(rate_hz=rate_hz)
+    time.sleep(0.3)
+
+    start = time.perf_counter()
+    emulator.place_part(125.0)
+    # Part detection first, as the weight widget's auto-test does
+    assert _wait_for(lambda: (controller.current_weight or 0) > 60.0)
+    weight = controller.get_stable_weight(num_readings=5, tolerance=0.1, timeout=10.0)
+    elapsed = time.perf_counter() - start
+
+    assert weight == pytest.approx(125.0, abs=0.5)
+    assert elapsed < 3.0
@@ -0,0 +1,171 @@
+"""
+End-to-end tests of SMTArduinoController against the pty firmware emulator
+No hardware required; skipped on platforms without pseudo-terminals.
+"""
+
+import json
+import os
+import time
+import pytest
+from pathlib import Path
+from src.hardware.smt_arduino_controller import SMTArduinoController
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="pty emulator requires POSIX")
+
+if os.name == "posix":
+    from src.hardware.emulators.smt_emulator import SMTFirmwareEmulator, SMTEmulatorConfig
+
+SKU_FILE = Path(__file__).parent.parent.parent / "config" / "skus" / "smt" / "DD5001.json"
+
+
+@pytest.fixture(scope="module")
+def emulator():
+    emulator = SMTFirmwareEmulator(SMTEmulatorConfig(time_scale=0.01, seed=42))
+    emulator.start()
+    yield emulator
+    emulator.stop()
+
+
+@pytest.fixture(scope="module")
+def controller(emulator):
+    controller = SMTArduinoController()
+    assert controller.connect(emulator.port)
+    yield controller
+    controller.disconnect()
+
+
+@pytest.fixture(autouse=True)
+def clear_faults(emulator):
+    yield
+    emulator.faults.corrupt_checksum_rate = 0.0
+    emulator.faults.drop_line_rate = 0.0
+    emulator.faults.ina260_fail = False
+
+
+@pytest.mark.integration
+def test_basic_commands(controller, emulator):
+    """Identification, supply voltage and button status"""
+    assert "SMT_TESTER" in controller.get_firmware_info()
+    assert controller.get_supply_voltage() == pytest.approx(emulator.config.supply_voltage, abs=0.1)
+    assert controller.get_button_status() == "RELEASED"
+
+
+@pytest.mark.integration
+def test_button_events(controller, emulator):
+    """EVENT:BUTTON_* lines reach the button callback"""
+    events = []
+    controller.set_button_callback(events.append)
+    emulator.press_button()
+    emulator.release_button()
+
+    deadline = time.time() + 2.0
+    while len(events) < 2 and time.time() < deadline:
+        time.sleep(0.02)
+
+    controller.set_button_callback(None)
+    assert events == ["PRESSED", "RELEASED"]
+
+
+@pytest.mark.integration
+def test_testseq_with_sku(controller):
+    """TESTSEQ built from a real SKU file is executed and parsed"""
+    sku = json.loads(SKU_FILE.read_text())
+
+    result = controller.execute_test_sequence(sku["relay_mapping"], sku["test_sequence"])
+
+    assert result["success"], result["errors"]
+    boards = {meta["board"] for meta in sku["relay_mapping"].values() if meta}
+    assert set(result["results"]) == boards
+
+
+@pytest.mark.integration
+def test_corrupted_checksum_is_retried(controller, emulator):
+    """A corrupted response fails validation; the retry succeeds"""
+    emulator.faults.corrupt_checksum_rate = 1.0
+    assert controller.get_supply_voltage(retry_count=1) is None
+
+    emulator.faults.corrupt_checksum_rate = 0.0
+    assert controller.get_supply_voltage(retry_count=1) is not None
+
+
+@pytest.mark.integration
+def test_ina260_failure(controller, emulator):
+    """INA260 failure surfaces as a TESTSEQ error"""
+    sku = json.loads(SKU_FILE.read_text())
+    emulator.faults.ina260_fail = True
+
+    result = controller.execute_test_sequence(sku["relay_mapping"], sku["test_sequence"])
+
+    assert not result["success"]
+    assert "MEASUREMENT_FAIL" in result["errors"][0]
+
+
+@pytest.mark.benchmark
+def test_command_round_trip_benchmark(controller):
+    """Command round trips per second through the full host stack"""
+    count = 100
+    start = time.perf_counter()
+    for _ in range(count):
+        assert controller.get_button_status() == "RELEASED"
+    elapsed = time.perf_counter() - start
+
+    assert elapsed / count < 0.1
+
+
+class _SlowProgrammer:
+    """Programmer stand-in; the real CLIs are not available here"""
+
+    def program_board(self, hex_file, board_name, device=None):
+        time.sleep(0.3)
+        return True, f"Successfully programmed {board_name}"
+
+
+@pytest.mark.integration
+def test_pipelined_programming_and_testseq(controller, tmp_path):
+    """Boards are tested as they finish programming and all results come back"""
+    from src.core.smt_test import SMTTest
+
+    sku = json.loads(SKU_FILE.read_text())
+    sku["fixture"] = {"pipeline": True, "programmed_boards": {"mcu_1": 1, "mcu_2": 2}}
+    hex_files = {}
+    for board in ("mcu_1", "mcu_2"):
+        hex_files[board] = str(tmp_path / f"{board}.hex")
+        Path(hex_files[board]).write_text(":00000001FF\n")
+    programming_config = {"programmers": {"stm8": {"boards": ["mcu_1", "mcu_2"]}}, "hex_files": hex_files}
+
+    test = SMTTest("DD5001", sku, controller.port, programming_config=programming_config,
+                   arduino_controller=controller)
+    test.programming_enabled = True
+    test.programmers = {"stm8": _SlowProgrammer()}
+    assert test.setup_hardware()
+
+    result = test.run_test_sequence()
+
+    assert result.measurements["programming_yield"]["value"] == 100.0
+    for function in ("mainbeam", "backlight_left", "backlight_right"):
+        assert set(result.measurements[f"{function}_readings"]["board_results"]) == {"Board 1", "Board 2"}
+    assert "panel_cycle_s" in test.programming_timing
+
+
+@pytest.mark.integration
+def test_unavailable_programmers_fail_the_boards(controller, tmp_path):
+    """With every programmer failing verification, the boards fail instead of skipping programming"""
+    from src.core.smt_test import SMTTest
+
+    sku = json.loads(SKU_FILE.read_text())
+    hex_file = tmp_path / "mcu.hex"
+    hex_file.write_text(":00000001FF\n")
+    programming_config = {"programmers": {"stm8": {"boards": ["mcu_1", "mcu_2"]}},
+                          "hex_files": {"mcu_1": str(hex_file), "mcu_2": str(hex_file)}}
+
+    test = SMTTest("DD5001", sku, controller.port, programming_config=programming_config,
+                   arduino_controller=controller)
+    test.programming_enabled = True
+    test.programmers = {}
+    assert test.setup_hardware()
+
+    result = test.run_test_sequence()
+
+    assert result.measurements["programming_yield"]["value"] == 0.0
+    assert "Programming phase failed" in result.failures
+    assert [r["message"] for r in test.programming_results] == ["Programmer stm8 not available"] * 2
@@ -0,0 +1,135 @@
+"""
+Unit tests for the local config mirror
+"""
+
+import os
+import json
+import time
+import pytest
+from src.utils.config_mirror import ConfigMirror
+from src.utils.path_manager import PathManager
+
+
+@pytest.fixture
+def share(tmp_path):
+    """Shared config directory with a programming config and two SKU files"""
+    config = tmp_path / "share" / "config"
+    (config / "skus" / "smt").mkdir(parents=True)
+    (config / "programming_config.json").write_text(json.dumps({"DD5001": {"enabled": False}}))
+    for sku in ("DD5001", "DD5002"):
+        (config / "skus" / "smt" / f"{sku}.json").write_text(json.dumps({"description": sku}))
+    (config / "skus" / "smt" / "notes.txt").write_text("not mirrored")
+    return config
+
+
+class TestConfigMirror:
+    """Test suite for ConfigMirror"""
+
+    @pytest.mark.unit
+    def test_sync_copies_only_changes(self, share, tmp_path):
+        """Unchanged files are skipped by stat, touched files by hash; edits and removals are applied"""
+        mirror = ConfigMirror(share, tmp_path / "mirror")
+        assert not mirror.is_populated()
+
+        first = mirror.sync()
+        assert sorted(first.copied) == ["programming_config.json", "skus/smt/DD5001.json", "skus/smt/DD5002.json"]
+        assert mirror.is_populated()
+        assert not (tmp_path / "mirror" / "skus" / "smt" / "notes.txt").exists()
+
+        sku_file = share / "skus" / "smt" / "DD5001.json"
+        stat = sku_file.stat()
+        os.utime(sku_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # touched, same content
+        (share / "skus" / "smt" / "DD5002.json").write_text(json.dumps({"description": "DD5002 rev B"}))
+        (share / "programming_config.json").unlink()
+        second = mirror.sync()
+
+        assert second.copied == ["skus/smt/DD5002.json"]
+        assert second.removed == ["programming_config.json"]
+        assert second.unchanged == 1
+        local = tmp_path / "mirror" / "skus" / "smt" / "DD5002.json"
+        assert json.loads(local.read_text())["description"] == "DD5002 rev B"
+        assert not (tmp_path / "mirror" / "programming_config.json").exists()
+
+    @pytest.mark.unit
+    def test_unlistable_subdirectory_aborts_sync(self, share, tmp_path, monkeypatch):
+        """A directory that fails to list aborts the pass instead of removing its mirrored files"""
+        mirror = ConfigMirror(share, tmp_path / "mirror")
+        mirror.sync()
+        scandir = os.scandir
+
+        def flaky_scandir(path="."):
+            if os.fspath(path).endswith("smt"):
+                raise PermissionError(13, "Access is denied", os.fspath(path))
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", flaky_scandir)
+        result = mirror.sync()
+
+        assert not result.success and "Access is denied" in result.error
+        assert result.removed == []
+        assert (tmp_path / "mirror" / "skus" / "smt" / "DD5001.json").exists()
+        assert len(mirror._entries) == 3
+
+    @pytest.mark.unit
+    def test_serves_mirror_when_share_unavailable(self, share, tmp_path, monkeypatch):
+        """PathManager reads the populated mirror; a lost share leaves the mirrored files in place"""
+        mirror_dir = tmp_path / "mirror"
+        ConfigMirror(share, mirror_dir).sync()
+        share.rename(tmp_path / "share" / "offline")
+
+        monkeypatch.setenv("DIODE_TESTER_SHARED_DRIVE", str(tmp_path / "share"))
+        monkeypatch.setattr("config.settings.CONFIG_MIRROR", {'enabled': True, 'directory': str(mirror_dir),
+                                                              'sync_interval_s': 60})
+        manager = PathManager()
+        try:
+            assert manager.get_config_dir() == mirror_dir
+            assert (manager.get_skus_dir() / "smt" / "DD5001.json").exists()
+            deadline = time.monotonic() + 5
+            while manager.get_config_mirror().last_result is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert not manager.get_config_mirror().last_result.success
+            assert (mirror_dir / "skus" / "smt" / "DD5002.json").exists()
+        finally:
+            manager.get_config_mirror().stop_background_sync()
+
+    @pytest.mark.unit
+    def test_edits_are_written_to_the_share(self, share, tmp_path, monkeypatch):
+        """Config edits go to the share and reach the mirror; with the share lost the mirror is read-only"""
+        mirror_dir = tmp_path / "mirror"
+        monkeypatch.setenv("DIODE_TESTER_SHARED_DRIVE", str(tmp_path / "share"))
+        monkeypatch.setattr("config.settings.CONFIG_MIRROR", {'enabled': True, 'directory': str(mirror_dir),
+                                                              'sync_interval_s': 60})
+        manager = PathManager()
+        try:
+            mirrored = manager.get_skus_dir() / "smt" / "DD5001.json"
+            assert mirrored == mirror_dir / "skus" / "smt" / "DD5001.json"
+            target = manager.get_writable_config_path(mirrored)
+            assert target == share / "skus" / "smt" / "DD5001.json"
+
+            target.write_text(json.dumps({"description": "DD5001 rev B"}))
+            manager.sync_config_mirror()
+            assert json.loads(mirrored.read_text()) == {"description": "DD5001 rev B"}
+
+            outside = tmp_path / "exported.json"
+            assert manager.get_writable_config_path(outside) == outside
+            share.rename(tmp_path / "share" / "offline")
+            with pytest.raises(OSError):
+                manager.get_writable_config_path(mirrored)
+        finally:
+            manager.get_config_mirror().stop_background_sync()
+
+    @pytest.mark.unit
+    def test_background_sync(self, share, tmp_path):
+        """The background thread picks up a new SKU file from the share"""
+        mirror = ConfigMirror(share, tmp_path / "mirror", sync_interval_s=0.05)
+        mirror.start_background_sync()
+        try:
+            (share / "skus" / "smt" / "DD5003.json").write_text(json.dumps({"description": "DD5003"}))
+            target = tmp_path / "mirror" / "skus" / "smt" / "DD5003.json"
+            deadline = time.monotonic() + 5
+            while not target.exists() and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            mirror.stop_background_sync()
+
+        assert json.loads(target.read_text()) == {"description": "DD5003"}
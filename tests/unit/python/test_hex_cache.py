@@ -0,0 +1,148 @@
+"""
+Unit tests for hex file validation and local staging
+"""
+
+import os
+import time
+import pytest
+from pathlib import Path
+from src.core.hex_cache import HexFileCache, HexFileError, validate_hex_image
+from src.core.programmer_controller import ProgrammerController
+
+HEX = (":10000000000102030405060708090A0B0C0D0E0F78\n"
+       ":00000001FF\n")
+HEX_V2 = (":10000000101112131415161718191A1B1C1D1E1F78\n"
+          ":00000001FF\n")
+
+
+class TestHexFileCache:
+    """Test suite for HexFileCache"""
+
+    @pytest.fixture
+    def share(self, tmp_path):
+        share = tmp_path / "share"
+        share.mkdir()
+        path = share / "main_v1.hex"
+        path.write_text(HEX)
+        return path
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return HexFileCache(tmp_path / "local", revalidate_after_s=0)
+
+    @pytest.mark.unit
+    def test_record_validation(self):
+        """Intel HEX and S-record checksums are verified"""
+        validate_hex_image(HEX.encode())
+        validate_hex_image(b"S00600004844521B\nS9030000FC\n", suffix=".s19")
+
+        with pytest.raises(HexFileError, match="checksum"):
+            validate_hex_image(HEX.replace("78\n", "79\n").encode())
+        with pytest.raises(HexFileError, match="end-of-file"):
+            validate_hex_image(HEX.splitlines()[0].encode())
+        with pytest.raises(HexFileError, match="checksum"):
+            validate_hex_image(b"S00600004844521C\n", suffix=".s19")
+
+    @pytest.mark.unit
+    def test_stage_copies_once(self, cache, share):
+        """First stage copies to local disk; later calls are hits on the same copy"""
+        local = cache.stage(str(share))
+
+        assert Path(local).parent == cache.cache_dir
+        assert Path(local).read_text() == HEX
+        assert cache.stage(str(share)) == local
+        assert cache.stats == {"hits": 1, "rehashed": 0, "staged": 1}
+
+    @pytest.mark.unit
+    def test_invalidation_on_change(self, cache, share):
+        """A touched file is re-hashed; changed content gets a new local copy"""
+        local = cache.stage(str(share))
+
+        stamp = time.time() + 10
+        os.utime(share, (stamp, stamp))
+        assert cache.stage(str(share)) == local
+        assert cache.stats["rehashed"] == 1
+
+        share.write_text(HEX_V2)
+        os.utime(share, (stamp + 10, stamp + 10))
+        updated = cache.stage(str(share))
+        assert updated != local
+        assert Path(updated).read_text() == HEX_V2
+        assert not Path(local).exists()
+
+    @pytest.mark.unit
+    def test_share_is_not_touched_under_the_lock(self, cache, share, monkeypatch):
+        """The source is stat'ed and read without holding the cache lock"""
+        from src.core import hex_cache
+        real_stat, real_read = hex_cache.os.stat, Path.read_bytes
+        calls = []
+
+        def stat(path, *args, **kwargs):
+            if Path(path).parent == share.parent:
+                calls.append(cache._lock.locked())
+            return real_stat(path, *args, **kwargs)
+
+        def read_bytes(path):
+            if path.parent == share.parent:
+                calls.append(cache._lock.locked())
+            return real_read(path)
+
+        monkeypatch.setattr(hex_cache.os, "stat", stat)
+        monkeypatch.setattr(Path, "read_bytes", read_bytes)
+        cache.stage(str(share))
+        cache.stage(str(share))
+
+        assert calls and not any(calls)
+
+    @pytest.mark.unit
+    def test_rejects_corrupt_and_missing(self, cache, share, tmp_path):
+        """Corrupt or missing sources are never staged"""
+        share.write_text(HEX.replace("78\n", "00\n"))
+        with pytest.raises(HexFileError, match="checksum"):
+            cache.stage(str(share))
+        with pytest.raises(HexFileError, match="does not exist"):
+            cache.stage(str(tmp_path / "missing.hex"))
+        assert cache.stage_all({"main": str(share)}) == {}
+
+    @pytest.mark.unit
+    def test_manifest_survives_restart(self, tmp_path, share):
+        """A new cache instance reuses copies staged by a previous run"""
+        first = HexFileCache(tmp_path / "local", revalidate_after_s=0)
+        local = first.stage(str(share))
+
+        second = HexFileCache(tmp_path / "local", revalidate_after_s=0)
+        assert second.stage(str(share)) == local
+        assert second.stats["hits"] == 1
+
+    @pytest.mark.unit
+    def test_programmer_uses_local_copy(self, cache, share, tmp_path, monkeypatch):
+        """ProgrammerController hands the staged copy to the programmer CLI"""
+        exe = tmp_path / ("stvp.exe" if os.name == "nt" else "stvp")
+        exe.write_text("")
+        programmer = ProgrammerController("STM8", str(exe), hex_cache=cache)
+        commands = []
+        monkeypatch.setattr(programmer, "_execute_programming_command",
+                            lambda cmd, board: (commands.append(cmd), (True, "ok"))[1])
+
+        assert programmer.program_board(str(share), "main_1") == (True, "ok")
+        assert f"-FilePath={cache.stage(str(share))}" in commands[0]
+
+    @pytest.mark.benchmark
+    def test_stage_hit_benchmark(self, cache, share):
+        """Per-board cost of a staged hit vs validating the source path"""
+        from src.utils.security_validators import InputValidator
+        validator = InputValidator()
+        cache.stage(str(share))
+        rounds = 2000
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            cache.stage(str(share))
+        hit = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            validator.validate_file_path(str(share), {'.hex', '.s19'})
+        validate = (time.perf_counter() - start) / rounds
+
+        assert cache.stats["hits"] == rounds
@@ -0,0 +1,113 @@
+"""
+Unit tests for the precompiled SMT limit table
+"""
+
+import time
+import logging
+import pytest
+from src.core import base_test
+from src.core.limit_table import LimitTable
+
+logger = logging.getLogger(__name__)
+
+LIMITS = {
+    "mainbeam": {"current_a": {"min": 0.5, "max": 0.9}, "voltage_v": {"min": 11.5, "max": 12.5}},
+    "backlight": {"current_a": {"min": 0.05, "max": 0.15}}
+}
+
+
+def _panel(boards=8):
+    """16-relay panel: a mainbeam and a backlight relay per board"""
+    relay_mapping = {}
+    for board in range(1, boards + 1):
+        relay_mapping[str(2 * board - 1)] = {"board": board, "function": "mainbeam"}
+        relay_mapping[str(2 * board)] = {"board": board, "function": "backlight"}
+    test_sequence = [{"function": f, "limits": limits} for f, limits in LIMITS.items()]
+    return test_sequence, relay_mapping
+
+
+def _readings(boards=8, bad_board=None):
+    readings = {"mainbeam": {}, "backlight": {}}
+    for board in range(1, boards + 1):
+        readings["mainbeam"][f"Board {board}"] = {"voltage": 12.0, "current": 0.7, "power": 8.4}
+        readings["backlight"][f"Board {board}"] = {"voltage": 12.0, "current": 0.1, "power": 1.2}
+    if bad_board:
+        readings["mainbeam"][f"Board {bad_board}"]["current"] = 1.2
+    return readings
+
+
+def _legacy_check(result, relay_mapping, test_sequence, readings):
+    """Per-board evaluation the table replaces: relay scan plus add_measurement per quantity"""
+    limits_by_function = {t["function"]: t["limits"] for t in test_sequence}
+    for function, board_results in readings.items():
+        limits = limits_by_function[function]
+        for board_name, measurements in board_results.items():
+            logger.debug(f"_check_limits called for {board_name} {function}")
+            logger.debug(f"  measurements: {measurements}")
+            logger.debug(f"  limits: {limits}")
+            board_num = board_name.split()[-1]
+            next(r for r, m in relay_mapping.items() if m and str(m["board"]) == board_num and m["function"] == function)
+            if "current" in measurements and "current_a" in limits:
+                result.add_measurement(f"{function}_board_{board_num}_current", measurements["current"],
+                                       limits["current_a"]["min"], limits["current_a"]["max"], "A")
+            if "voltage" in measurements and "voltage_v" in limits:
+                result.add_measurement(f"{function}_board_{board_num}_voltage", measurements["voltage"],
+                                       limits["voltage_v"]["min"], limits["voltage_v"]["max"], "V")
+
+
+class TestLimitTable:
+    """Test suite for LimitTable"""
+
+    @pytest.mark.unit
+    def test_rows_and_relay_index(self):
+        """One row per board/function/quantity with a limit, relays indexed by board and function"""
+        table = LimitTable(*_panel())
+
+        assert len(table) == 8 * 3
+        assert table.names[:3] == ["mainbeam_board_1_current", "mainbeam_board_1_voltage",
+                                   "mainbeam_board_2_current"]
+        assert table.relay_for(3, "backlight") == "6"
+        assert table.relay_for(9, "backlight") is None
+
+    @pytest.mark.unit
+    def test_matches_per_board_evaluation(self):
+        """Measurements and failure messages match add_measurement per quantity"""
+        test_sequence, relay_mapping = _panel()
+        readings = _readings(bad_board=5)
+        del readings["backlight"]["Board 2"]
+        readings["mainbeam"]["Board 6"]["voltage"] = 13  # integer readings are reported as read
+
+        expected = base_test.TestResult()
+        _legacy_check(expected, relay_mapping, test_sequence, readings)
+        actual = base_test.TestResult()
+        failed = LimitTable(test_sequence, relay_mapping).apply(actual, readings)
+
+        assert actual.measurements == expected.measurements
+        assert actual.failures == expected.failures
+        assert failed == 2
+        assert actual.failures == ["mainbeam_board_5_current: 1.2A not in range [0.5-0.9]A",
+                                   "mainbeam_board_6_voltage: 13V not in range [11.5-12.5]V"]
+        assert type(actual.measurements["mainbeam_board_6_voltage"]["value"]) is int
+
+    @pytest.mark.benchmark
+    def test_panel_evaluation_benchmark(self):
+        """16-relay / 8-board panels evaluated at scale, table vs per-board checks"""
+        test_sequence, relay_mapping = _panel()
+        readings = _readings(bad_board=3)
+        panels = 2000
+
+        start = time.perf_counter()
+        compiled = LimitTable(test_sequence, relay_mapping)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(panels):
+            _legacy_check(base_test.TestResult(), relay_mapping, test_sequence, readings)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(panels):
+            compiled.apply(base_test.TestResult(), readings)
+        table = time.perf_counter() - start
+
+        assert table < legacy
@@ -0,0 +1,74 @@
+"""
+Unit tests for the offroad phase graph and scheduler
+"""
+
+import time
+import threading
+import pytest
+from src.core.offroad_phases import PhaseScheduler, build_phase_graph
+
+
+class TestOffroadPhases:
+    """Test suite for build_phase_graph and PhaseScheduler"""
+
+    @pytest.mark.unit
+    def test_default_graph_keeps_serial_order(self):
+        """Without a SKU graph the phases keep the classic pressure/function/backlight order"""
+        phases = build_phase_graph(["pressure", "function", "rgbw"])
+
+        assert [p.name for p in phases] == ["pressure", "function", "rgbw"]
+        assert phases[2].test_type == "RGBW_BACKLIGHT"
+        assert phases[2].depends_on == ["function"]
+
+    @pytest.mark.unit
+    def test_sku_graph_orders_dependencies(self):
+        """Declared dependencies reorder phases; dependencies on disabled phases are dropped"""
+        config = {"function": {"depends_on": ["pressure", "dual_backlight"]}, "dual_backlight": {"depends_on": []}}
+
+        phases = build_phase_graph(["function", "dual_backlight"], config)
+
+        assert [p.name for p in phases] == ["dual_backlight", "function"]
+        assert phases[1].depends_on == ["dual_backlight"]
+
+    @pytest.mark.unit
+    def test_invalid_graphs(self):
+        """Unknown phases and cycles are configuration errors"""
+        with pytest.raises(ValueError, match="Unknown"):
+            build_phase_graph(["function"], {"strobe": {"depends_on": []}})
+        with pytest.raises(ValueError, match="cycle"):
+            build_phase_graph(["function", "dual_backlight"], {"function": {"depends_on": ["dual_backlight"]}})
+
+    @pytest.mark.unit
+    def test_background_phase_overlaps(self):
+        """A background-capable phase keeps running while the next phases are issued"""
+        phases = build_phase_graph(["pressure", "function", "dual_backlight"],
+                                   {"dual_backlight": {"depends_on": ["function", "pressure"]}})
+        events = []
+        lock = threading.Lock()
+
+        def run_phase(phase, started):
+            with lock:
+                events.append(f"start {phase.name}")
+            started.set()
+            time.sleep(0.2 if phase.name == "pressure" else 0.02)
+            with lock:
+                events.append(f"end {phase.name}")
+
+        PhaseScheduler(phases, background_tests=["PRESSURE"]).run(run_phase)
+
+        assert events == ["start pressure", "start function", "end function", "end pressure",
+                          "start dual_backlight", "end dual_backlight"]
+
+    @pytest.mark.unit
+    def test_serial_without_capabilities(self):
+        """Without background tests every phase finishes before the next starts"""
+        phases = build_phase_graph(["pressure", "function"])
+        events = []
+
+        def run_phase(phase, started):
+            events.append(f"start {phase.name}")
+            events.append(f"end {phase.name}")
+
+        PhaseScheduler(phases).run(run_phase)
+
+        assert events == ["start pressure", "end pressure", "start function", "end function"]
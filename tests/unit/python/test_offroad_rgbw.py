@@ -0,0 +1,106 @@
+"""
+Unit tests for the vectorized RGBW sample analysis in OffroadTest
+"""
+
+import time
+import random
+import pytest
+from src.core import offroad_test
+from src.hardware.arduino_controller import RGBWSample
+
+COLORS = [
+    {"name": "red", "target_x": 0.650, "target_y": 0.330, "tolerance": 0.020},
+    {"name": "green", "target_x": 0.300, "target_y": 0.600, "tolerance": 0.020},
+    {"name": "blue", "target_x": 0.150, "target_y": 0.060, "tolerance": 0.020},
+    {"name": "white", "target_x": 0.313, "target_y": 0.329, "tolerance": 0.020}
+]
+
+
+def _samples(per_cycle=3, colors=COLORS, seed=1):
+    """Samples scattered within 0.01 of each color target, one color per cycle"""
+    rng = random.Random(seed)
+    samples = []
+    for cycle, color in enumerate(colors, start=1):
+        for _ in range(per_cycle):
+            samples.append(RGBWSample(time.time(), cycle, 12.0, 0.5, 100.0,
+                                      color["target_x"] + rng.uniform(-0.01, 0.01),
+                                      color["target_y"] + rng.uniform(-0.01, 0.01)))
+    return samples
+
+
+def _legacy_detect(samples, expected_color):
+    """Per-sample loop the broadcast replaces"""
+    for sample in samples:
+        distance = ((sample.x - expected_color["target_x"]) ** 2 + (sample.y - expected_color["target_y"]) ** 2) ** 0.5
+        if distance <= expected_color["tolerance"]:
+            return True
+    return False
+
+
+@pytest.fixture
+def rgbw_test(monkeypatch):
+    test = offroad_test.OffroadTest("DD5003", {"LUX": {}, "COLOR": {}}, "COM_TEST")
+    config = {"type": "rgbw_cycling", "colors_to_test": COLORS}
+    monkeypatch.setattr(test, "_get_backlight_config", lambda sku: config)
+    return test
+
+
+class TestRGBWAnalysis:
+    """Test suite for OffroadTest RGBW analysis"""
+
+    @pytest.mark.unit
+    def test_detects_each_cycle_color(self, rgbw_test):
+        """Every color with samples near its target is detected and recorded"""
+        for sample in _samples()[:9]:  # no white samples
+            rgbw_test._on_rgbw_sample(sample)
+        assert rgbw_test.rgbw_cycles == {1, 2, 3}
+
+        rgbw_test._analyze_rgbw_samples()
+
+        measurements = rgbw_test.result.measurements
+        assert [measurements[f"rgbw_{c['name']}_detected"]["value"] for c in COLORS] == [1.0, 1.0, 1.0, 0.0]
+        assert measurements["rgbw_color_range_x"]["value"] == pytest.approx(
+            max(s.x for s in rgbw_test.rgbw_samples) - min(s.x for s in rgbw_test.rgbw_samples))
+        assert rgbw_test.result.failures == ["rgbw_white_detected: 0.0bool not in range [1.0-1.0]bool"]
+
+    @pytest.mark.unit
+    def test_matches_per_sample_loop(self, rgbw_test):
+        """Circular tolerances give the same answer as the per-sample distance loop"""
+        rgbw_test.rgbw_samples = _samples(per_cycle=50, seed=7)
+        shifted = [dict(c, target_x=c["target_x"] + 0.015) for c in COLORS]
+
+        expected = [_legacy_detect(rgbw_test.rgbw_samples, c) for c in COLORS + shifted]
+        assert rgbw_test._detect_colors_in_samples(COLORS + shifted) == expected
+        assert rgbw_test._detect_color_in_samples(COLORS[0]) is True
+
+    @pytest.mark.unit
+    def test_elliptical_color_targets(self, rgbw_test):
+        """radius_x/radius_y override the tolerance, matching _check_color_coordinates"""
+        rgbw_test.rgbw_samples = [RGBWSample(0.0, 1, 12.0, 0.5, 100.0, 0.680, 0.330)]
+        wide = dict(COLORS[0], radius_x=0.040, radius_y=0.005)
+        tall = dict(COLORS[0], radius_x=0.005, radius_y=0.040)
+
+        assert rgbw_test._detect_colors_in_samples([COLORS[0], wide, tall]) == [False, True, False]
+        radius_only = {"name": "red", "target_x": 0.650, "target_y": 0.330, "radius_x": 0.040, "radius_y": 0.005}
+        assert rgbw_test._detect_colors_in_samples([radius_only]) == [True]
+        params = {"center_x_main": 0.650, "center_y_main": 0.330, "radius_x_main": 0.040, "radius_y_main": 0.005}
+        assert rgbw_test._check_color_coordinates(0.680, 0.330, params)
+
+    @pytest.mark.benchmark
+    def test_rgbw_analysis_benchmark(self, rgbw_test):
+        """Color detection with thousands of samples per cycle, loop vs broadcast"""
+        for sample in _samples(per_cycle=5000, seed=3):
+            rgbw_test._on_rgbw_sample(sample)  # stored into the arrays as they arrive
+        # Targets no sample reaches, so the loop has to scan every sample
+        missing = [dict(c, target_x=c["target_x"] + 0.2) for c in COLORS]
+
+        start = time.perf_counter()
+        expected = [_legacy_detect(rgbw_test.rgbw_samples, c) for c in missing]
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        detected = rgbw_test._detect_colors_in_samples(missing)
+        vectorized = time.perf_counter() - start
+
+        assert detected == expected
+        assert vectorized < legacy
@@ -0,0 +1,118 @@
+"""
+Unit tests for the overlapped programming / TESTSEQ panel pipeline
+"""
+
+import threading
+import time
+import pytest
+from src.core.panel_pipeline import FixtureConstraints, PanelPipeline
+from src.core.programming_scheduler import ProgrammingScheduler
+
+RELAY_MAPPING = {
+    "1": {"board": 1, "function": "mainbeam"},
+    "2": {"board": 2, "function": "mainbeam"},
+    "3": {"board": 3, "function": "mainbeam"},
+    "4": None
+}
+
+
+class FakeProgrammer:
+    """Programmer stand-in that logs when each board is being programmed"""
+
+    def __init__(self, seconds, events):
+        self.seconds = seconds
+        self.events = events
+
+    def program_board(self, hex_file, board_name, device=None):
+        self.events.append(("program_start", board_name, time.perf_counter()))
+        time.sleep(self.seconds)
+        self.events.append(("program_end", board_name, time.perf_counter()))
+        return True, f"Successfully programmed {board_name}"
+
+
+class TestPanelPipeline:
+    """Test suite for FixtureConstraints and PanelPipeline"""
+
+    @pytest.fixture
+    def programming_config(self, tmp_path):
+        hex_files = {}
+        for board in ("mcu_1", "mcu_2", "mcu_3"):
+            path = tmp_path / f"{board}.hex"
+            path.write_text(":00000001FF\n")
+            hex_files[board] = str(path)
+        return {"programmers": {"stm8": {"boards": ["mcu_1", "mcu_2", "mcu_3"]}}, "hex_files": hex_files}
+
+    def _pipeline(self, programming_config, fixture, events, test_seconds=0.1):
+        lock = threading.Lock()
+
+        def run_sequence(relay_mapping):
+            boards = sorted(meta["board"] for meta in relay_mapping.values())
+            with lock:
+                events.append(("test_start", boards, time.perf_counter()))
+                time.sleep(test_seconds)
+                events.append(("test_end", boards, time.perf_counter()))
+            return {"success": True, "errors": [],
+                    "results": {str(b): {"mainbeam": {"voltage": 12.0, "current": 1.0}} for b in boards}}
+
+        scheduler = ProgrammingScheduler({"stm8": FakeProgrammer(0.1, events)}, programming_config)
+        constraints = FixtureConstraints(fixture)
+        return scheduler, constraints, PanelPipeline(scheduler, constraints, RELAY_MAPPING, run_sequence)
+
+    @pytest.mark.unit
+    def test_can_pipeline_requires_opt_in_and_mapping(self, programming_config):
+        """Only SKUs that enable the pipeline and map every programmed board qualify"""
+        jobs = ProgrammingScheduler({}, programming_config).build_jobs()
+        mapping = {"mcu_1": 1, "mcu_2": 2, "mcu_3": 3}
+
+        assert FixtureConstraints({"pipeline": True, "programmed_boards": mapping}).can_pipeline(jobs)
+        assert not FixtureConstraints({"programmed_boards": mapping}).can_pipeline(jobs)
+        assert not FixtureConstraints({"pipeline": True, "programmed_boards": {"mcu_1": 1}}).can_pipeline(jobs)
+
+    @pytest.mark.unit
+    def test_boards_tested_while_others_program(self, programming_config):
+        """Board 1 is tested while board 2 is still being programmed"""
+        events = []
+        fixture = {"pipeline": True, "programmed_boards": {"mcu_1": 1, "mcu_2": 2, "mcu_3": 3}}
+        scheduler, _, pipeline = self._pipeline(programming_config, fixture, events)
+
+        result = pipeline.run(scheduler.build_jobs())
+
+        assert result["success"]
+        assert set(result["results"]) == {"1", "2", "3"}
+        first_test = next(e for e in events if e[0] == "test_start")
+        last_program_end = max(e[2] for e in events if e[0] == "program_end")
+        assert first_test[1] == [1]
+        assert first_test[2] < last_program_end
+
+    @pytest.mark.unit
+    def test_isolation_group_blocks_overlap(self, programming_config):
+        """Boards sharing an isolation group are never tested and programmed at the same time"""
+        events = []
+        fixture = {"pipeline": True, "programmed_boards": {"mcu_1": 1, "mcu_2": 2, "mcu_3": 3},
+                   "isolation_groups": [[1, 2]]}
+        scheduler, _, pipeline = self._pipeline(programming_config, fixture, events)
+
+        pipeline.run(scheduler.build_jobs())
+
+        programming = {}
+        for kind, board, stamp in events:
+            if kind.startswith("program"):
+                programming.setdefault(board, []).append(stamp)
+        for kind, boards, stamp in events:
+            if kind == "test_start" and 1 in boards:
+                end = next(e[2] for e in events if e[0] == "test_end" and e[1] == boards)
+                mcu_2_start, mcu_2_end = programming["mcu_2"]
+                assert end <= mcu_2_start or stamp >= mcu_2_end
+
+    @pytest.mark.benchmark
+    def test_panel_cycle_benchmark(self, programming_config):
+        """Panel cycle time, pipelined vs programming then testing"""
+        events = []
+        fixture = {"pipeline": True, "programmed_boards": {"mcu_1": 1, "mcu_2": 2, "mcu_3": 3}}
+        scheduler, _, pipeline = self._pipeline(programming_config, fixture, events)
+
+        pipeline.run(scheduler.build_jobs())
+
+        timing = pipeline.timing
+        serial = timing["programming_time_s"] + timing["testing_time_s"]
+        assert timing["wall_time_s"] < serial
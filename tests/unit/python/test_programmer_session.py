@@ -0,0 +1,207 @@
+"""
+Unit tests for warm programmer sessions, using a stand-in programmer executable
+"""
+
+import os
+import sys
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src.core.programmer_controller import ProgrammerController
+from src.core.programmer_session import ProgrammerSession, ProgrammerSessionError, ProgrammerSessionManager
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="stand-in programmer is a POSIX script")
+
+# Pays a start-up delay (tool load + USB enumeration) per process, then a short
+# per-board time. One-shot mode programs argv; --session reads JSON lines.
+STAND_IN = '''#!{python}
+import os, sys, json, time
+time.sleep({startup})
+
+def program(args):
+    busy = sys.argv[0] + ".busy"  # the probe: one board at a time
+    try:
+        os.close(os.open(busy, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        print("Error: probe in use")
+        return 1
+    time.sleep({board})
+    os.unlink(busy)
+    if any("fail" in a for a in args):
+        print("Error: verify failed at 0x8000")
+        return 1
+    print("Programming ok")
+    return 0
+
+if sys.argv[1:2] == ["--session"]:
+    print("READY", flush=True)
+    for line in sys.stdin:
+        args = json.loads(line)
+        if "crash" in " ".join(args):
+            sys.exit(3)
+        while "chatty" in " ".join(args):
+            print("Programming... 42%", flush=True)
+            time.sleep(0.05)
+        code = program(args)
+        print(f"DONE {{code}}", flush=True)
+else:
+    sys.exit(program(sys.argv[1:]))
+'''
+
+
+@pytest.fixture
+def stand_in(tmp_path):
+    def factory(startup=0.2, board=0.01, name="stvp_stand_in"):
+        exe = tmp_path / name
+        exe.write_text(STAND_IN.format(python=sys.executable, startup=startup, board=board))
+        exe.chmod(0o755)
+        return str(exe)
+    return factory
+
+
+@pytest.fixture
+def hex_file(tmp_path):
+    def factory(name="main.hex"):
+        path = tmp_path / name
+        path.write_text(":00000001FF\n")
+        return str(path)
+    return factory
+
+
+class TestProgrammerSession:
+    """Test suite for ProgrammerSession and its ProgrammerController integration"""
+
+    @pytest.mark.unit
+    def test_session_programs_and_reports_failures(self, stand_in, hex_file):
+        """Boards go through one warm process; tool errors come back as failures"""
+        exe = stand_in(startup=0.05)
+        session = ProgrammerSession([exe, "--session"])
+        programmer = ProgrammerController("STM8", exe, session=session)
+        try:
+            assert programmer.program_board(hex_file(), "main_1")[0]
+            pid = session._process.pid
+            success, message = programmer.program_board(hex_file("fail.hex"), "main_2")
+            assert not success and "verify failed" in message
+            assert session._process.pid == pid
+            assert session.boards_programmed == 2
+        finally:
+            session.close()
+
+    @pytest.mark.unit
+    def test_falls_back_to_subprocess(self, stand_in, hex_file):
+        """A session that does not start is dropped and the board is programmed by a subprocess"""
+        exe = stand_in(startup=0.05)
+        session = ProgrammerSession([exe])  # exits without READY
+        programmer = ProgrammerController("STM8", exe, session=session)
+        try:
+            success, message = programmer.program_board(hex_file(), "main_1")
+        finally:
+            session.close()
+
+        assert success, message
+        assert programmer.session is None
+
+    @pytest.mark.unit
+    def test_board_is_not_flashed_twice_after_a_session_exit(self, stand_in, hex_file):
+        """A session that dies after the board was sent fails it instead of flashing it a second time"""
+        exe = stand_in(startup=0.05)
+        session = ProgrammerSession([exe, "--session"])
+        programmer = ProgrammerController("STM8", exe, session=session)
+        try:
+            success, message = programmer.program_board(hex_file("crash.hex"), "main_1")
+        finally:
+            session.close()
+
+        assert not success and "session exited" in message
+        assert programmer.session is None
+        assert programmer.program_board(hex_file("crash.hex"), "main_2")[0]  # later boards: subprocess
+
+    @pytest.mark.unit
+    def test_shared_programmer_programs_one_board_at_a_time(self, stand_in, hex_file):
+        """Tests on several fixtures take turns on a shared programmer; separate programmers run together"""
+        shared = stand_in(startup=0, board=0.2)
+        own = stand_in(startup=0, board=0.2, name="stvp_nest_2")
+        programmers = [ProgrammerController("STM8", shared), ProgrammerController("STM8", shared),
+                       ProgrammerController("STM8", own)]
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(lambda p: p.program_board(hex_file(), "main_1"), programmers))
+
+        assert all(success for success, _ in results), results
+
+    @pytest.mark.unit
+    def test_timeout_caps_the_whole_reply(self, stand_in):
+        """A tool that keeps printing progress still times out"""
+        session = ProgrammerSession([stand_in(startup=0.05), "--session"])
+        try:
+            session.start()
+            start = time.perf_counter()
+            with pytest.raises(ProgrammerSessionError, match="No response"):
+                session.run(["chatty.hex"], timeout=0.5)
+            assert time.perf_counter() - start < 5.0  # 0.5 s plus closing the tool
+        finally:
+            session.close()
+
+    @pytest.mark.unit
+    def test_invalid_session_command_keeps_the_programmer(self, stand_in):
+        """A missing session tool leaves the programmer on subprocess mode"""
+        from src.core.smt_test import SMTTest
+        config = {"enabled": True,
+                  "programmers": {"stm8": {"type": "STM8", "path": stand_in(startup=0),
+                                           "session_command": ["/nonexistent/stvp_batch", "--session"],
+                                           "boards": ["main_1"]}}}
+        test = SMTTest("DD5000", {}, "COM_TEST", programming_config=config)
+
+        assert "stm8" in test.programmers
+        assert test.programmers["stm8"].session is None
+
+    @pytest.mark.unit
+    def test_manager_shares_sessions(self, stand_in):
+        """One session per command line, closed together"""
+        exe = stand_in()
+        manager = ProgrammerSessionManager()
+
+        first = manager.get_session([exe, "--session"])
+        assert manager.get_session([exe, "--session"]) is first
+        assert manager.get_session([exe, "--session", "--probe=2"]) is not first
+        manager.close_all()
+        assert not first.is_alive()
+
+    @pytest.mark.unit
+    def test_manager_backs_off_a_failed_session(self, stand_in, monkeypatch):
+        """A session that failed is not handed out again until RETRY_AFTER_S passed"""
+        manager = ProgrammerSessionManager()
+        broken = manager.get_session([stand_in(startup=0)])  # exits without READY
+        with pytest.raises(ProgrammerSessionError):
+            broken.start()
+
+        assert manager.get_session(broken.command) is None
+        monkeypatch.setattr(ProgrammerSessionManager, "RETRY_AFTER_S", 0.0)
+        assert manager.get_session(broken.command) is broken
+        manager.close_all()
+
+    @pytest.mark.benchmark
+    def test_per_board_overhead_benchmark(self, stand_in, hex_file):
+        """Per-board time, one subprocess per board vs a warm session"""
+        exe = stand_in(startup=0.2, board=0.01)
+        boards = 8
+        hex_path = hex_file()
+
+        spawn = ProgrammerController("STM8", exe)
+        start = time.perf_counter()
+        for n in range(boards):
+            assert spawn.program_board(hex_path, f"board_{n}")[0]
+        spawn_per_board = (time.perf_counter() - start) / boards
+
+        session = ProgrammerSession([exe, "--session"])
+        warm = ProgrammerController("STM8", exe, session=session)
+        try:
+            session.start()
+            start = time.perf_counter()
+            for n in range(boards):
+                assert warm.program_board(hex_path, f"board_{n}")[0]
+            session_per_board = (time.perf_counter() - start) / boards
+        finally:
+            session.close()
+
+        assert session_per_board < spawn_per_board / 2
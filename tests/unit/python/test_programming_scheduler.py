@@ -0,0 +1,167 @@
+"""
+Unit tests for the parallel programming scheduler
+"""
+
+import threading
+import time
+import pytest
+from src.core.programming_scheduler import ProgrammingScheduler
+
+
+class FakeProgrammer:
+    """Programmer stand-in that takes a fixed time per board"""
+
+    def __init__(self, seconds=0.2, fail_boards=(), barrier=None):
+        self.seconds = seconds
+        self.fail_boards = set(fail_boards)
+        self.barrier = barrier
+        self.active = 0
+        self.max_active = 0
+        self.order = []
+        self._lock = threading.Lock()
+
+    def program_board(self, hex_file, board_name, device=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.order.append(board_name)
+        if self.barrier:
+            self.barrier.wait()  # only passes while another programmer is busy too
+        time.sleep(self.seconds)
+        with self._lock:
+            self.active -= 1
+        if board_name in self.fail_boards:
+            return False, "Programming failed: verify error"
+        return True, f"Successfully programmed {board_name}"
+
+
+class FakeGangProgrammer(FakeProgrammer):
+    """Programmer stand-in that addresses channels"""
+
+    supports_channels = True
+
+    def __init__(self, seconds=0.2):
+        super().__init__(seconds)
+        self.channels = {}
+
+    def program_board(self, hex_file, board_name, device=None, channel=None):
+        self.channels[board_name] = channel
+        return super().program_board(hex_file, board_name, device=device)
+
+
+class TestProgrammingScheduler:
+    """Test suite for ProgrammingScheduler"""
+
+    @pytest.fixture
+    def hex_files(self, tmp_path):
+        files = {}
+        for board in ("main_1", "main_2", "driver_1", "driver_2"):
+            path = tmp_path / f"{board}.hex"
+            path.write_text(":00000001FF\n")
+            files[board] = str(path)
+        return files
+
+    def _config(self, hex_files, stm8_channels=None):
+        stm8 = {"type": "STM8", "path": "stvp", "boards": ["main_1", "main_2"]}
+        if stm8_channels:
+            stm8["channels"] = stm8_channels
+        return {
+            "enabled": True,
+            "programmers": {
+                "stm8": stm8,
+                "pic": {"type": "PIC", "path": "pk3cmd", "boards": ["driver_1", "driver_2"]}
+            },
+            "hex_files": hex_files
+        }
+
+    @pytest.mark.unit
+    def test_programmers_run_in_parallel(self, hex_files):
+        """Different programmers overlap; boards on one programmer do not"""
+        barrier = threading.Barrier(2, timeout=5.0)
+        stm8, pic = FakeProgrammer(barrier=barrier), FakeProgrammer(barrier=barrier)
+        scheduler = ProgrammingScheduler({"stm8": stm8, "pic": pic}, self._config(hex_files))
+
+        results = scheduler.run()
+
+        assert [r["board"] for r in results] == ["main_1", "main_2", "driver_1", "driver_2"]
+        assert all(r["success"] for r in results)
+        assert stm8.max_active == 1 and pic.max_active == 1
+        assert stm8.order == ["main_1", "main_2"]
+
+    @pytest.mark.unit
+    def test_channels_split_a_programmer(self, hex_files):
+        """Boards on separate channels of a channel-aware programmer run concurrently on their channel"""
+        stm8, pic = FakeGangProgrammer(), FakeProgrammer()
+        config = self._config(hex_files, stm8_channels={"main_1": 1, "main_2": 2})
+        scheduler = ProgrammingScheduler({"stm8": stm8, "pic": pic}, config)
+
+        scheduler.run()
+
+        assert stm8.max_active == 2
+        assert stm8.channels == {"main_1": "1", "main_2": "2"}
+
+    @pytest.mark.unit
+    def test_channels_ignored_without_channel_support(self, hex_files):
+        """A programmer that cannot address channels never runs two boards at once"""
+        stm8 = FakeProgrammer(seconds=0.05)
+        config = self._config(hex_files, stm8_channels={"main_1": 1, "main_2": 2})
+        scheduler = ProgrammingScheduler({"stm8": stm8, "pic": FakeProgrammer(seconds=0.05)}, config)
+
+        assert list(scheduler.group_lanes(scheduler.build_jobs())) == [("stm8", None), ("pic", None)]
+        scheduler.run()
+
+        assert stm8.max_active == 1
+
+    @pytest.mark.unit
+    def test_failures_and_missing_inputs(self, hex_files):
+        """Failed boards, missing hex files and unavailable programmers are reported per board"""
+        hex_files["main_2"] = "missing/main_2.hex"
+        stm8 = FakeProgrammer(seconds=0.01, fail_boards={"main_1"})
+        scheduler = ProgrammingScheduler({"stm8": stm8}, self._config(hex_files))
+
+        results = {r["board"]: r for r in scheduler.run()}
+
+        assert "verify error" in results["main_1"]["message"]
+        assert "not found" in results["main_2"]["message"]
+        assert "not available" in results["driver_1"]["message"]
+        assert not any(r["success"] for r in results.values())
+        assert stm8.order == ["main_1"]
+
+    @pytest.mark.unit
+    def test_progress_reports_every_board(self, hex_files):
+        """Progress goes from 0/total to total/total with one completion per board"""
+        updates = []
+        scheduler = ProgrammingScheduler(
+            {"stm8": FakeProgrammer(seconds=0.01), "pic": FakeProgrammer(seconds=0.01)},
+            self._config(hex_files),
+            progress_callback=lambda *args: updates.append(args)
+        )
+
+        scheduler.run()
+
+        assert updates[0] == (0, 4, "", "STARTING")
+        done = [u for u in updates if u[3] == "PASS"]
+        assert sorted(u[0] for u in done) == [1, 2, 3, 4]
+        assert {u[2] for u in done} == {"main_1", "main_2", "driver_1", "driver_2"}
+
+    @pytest.mark.benchmark
+    def test_panel_programming_benchmark(self, tmp_path):
+        """Wall clock for a 4-up panel with STM8 and PIC boards vs one at a time"""
+        hex_files = {}
+        for board in ("stm8_1", "stm8_2", "stm8_3", "stm8_4", "pic_1", "pic_2", "pic_3", "pic_4"):
+            path = tmp_path / f"{board}.hex"
+            path.write_text(":00000001FF\n")
+            hex_files[board] = str(path)
+        config = {
+            "programmers": {
+                "stm8": {"boards": ["stm8_1", "stm8_2", "stm8_3", "stm8_4"],
+                         "channels": {"stm8_1": 1, "stm8_2": 2, "stm8_3": 3, "stm8_4": 4}},
+                "pic": {"boards": ["pic_1", "pic_2", "pic_3", "pic_4"]}
+            },
+            "hex_files": hex_files
+        }
+        scheduler = ProgrammingScheduler({"stm8": FakeGangProgrammer(0.1), "pic": FakeProgrammer(0.05)}, config)
+
+        scheduler.run()
+
+        assert scheduler.wall_time < scheduler.sequential_time / 2
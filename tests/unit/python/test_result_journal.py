@@ -0,0 +1,134 @@
+"""
+Unit tests for the result write-ahead journal and results store
+"""
+
+import time
+import pytest
+from src.core.base_test import DummyTest
+from src.data.result_journal import ResultJournal
+from src.data.results_logger import ResultsLogger
+
+
+def _record(index):
+    return {
+        'test_type': 'DummyTest',
+        'sku': 'DD5000',
+        'result': {'passed': True, 'index': index, 'timestamp': '2025-01-02T10:00:00'}
+    }
+
+
+class TestResultJournal:
+    """Test suite for ResultJournal"""
+
+    @pytest.fixture
+    def journal(self, tmp_path):
+        journal = ResultJournal(tmp_path / "results.journal", fsync_every=1)
+        yield journal
+        journal.close()
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return ResultsLogger(tmp_path / "results")
+
+    @pytest.mark.unit
+    def test_append_and_read(self, journal):
+        """Appended records read back intact with ids assigned"""
+        ids = [journal.append(_record(i)) for i in range(3)]
+
+        records = journal.read_records()
+
+        assert [r['id'] for r in records] == ids
+        assert [r['result']['index'] for r in records] == [0, 1, 2]
+
+    @pytest.mark.unit
+    def test_torn_tail_is_skipped(self, journal):
+        """A partially written last line is ignored on read"""
+        journal.append(_record(0))
+        journal.close()
+        with open(journal.journal_path, 'ab') as f:
+            f.write(b'0000abcd {"id":"torn"')
+
+        records = journal.read_records()
+
+        assert len(records) == 1
+
+    @pytest.mark.unit
+    def test_replay_moves_records_to_store(self, journal, store):
+        """Replay writes records to the daily store file and clears the journal"""
+        for i in range(3):
+            journal.append(_record(i))
+
+        assert journal.replay(store) == 3
+        assert not journal.journal_path.exists()
+        assert len(store.load_results("20250102")) == 3
+
+    @pytest.mark.unit
+    def test_replay_waits_for_other_instances(self, journal, store):
+        """A journal another instance still appends to is not replayed (and deleted) under it"""
+        starting = ResultJournal(journal.journal_path)
+        journal.append(_record(0))
+
+        assert starting.replay(store) == 0
+        journal.append(_record(1))
+        assert len(journal.read_records()) == 2
+
+        journal.close()
+        assert starting.replay(store) == 2
+        assert not journal.journal_path.exists()
+
+        journal.append(_record(2))  # reopens a new journal file
+        assert [r['result']['index'] for r in journal.read_records()] == [2]
+        journal.close()
+
+    @pytest.mark.unit
+    def test_replay_is_idempotent(self, tmp_path, store):
+        """Records already in the store are not duplicated by a repeated replay"""
+        journal = ResultJournal(tmp_path / "results.journal", fsync_every=0)
+        journal.append(_record(0))
+        journal.close()
+        saved = journal.journal_path.read_bytes()
+
+        journal.replay(store)
+        journal.journal_path.write_bytes(saved)
+
+        assert journal.replay(store) == 0
+        assert len(store.load_results("20250102")) == 1
+
+    @pytest.mark.unit
+    def test_execute_journals_result(self, isolated_results, monkeypatch):
+        """BaseTest.execute appends its result to the journal (the test one from conftest)"""
+        monkeypatch.setattr(time, "sleep", lambda _: None)
+
+        DummyTest("DD5000", {}).execute()
+
+        records = isolated_results.read_records()
+        assert len(records) == 1
+        assert records[0]['sku'] == "DD5000"
+        assert records[0]['result']['passed'] is True
+
+    @pytest.mark.unit
+    def test_hardware_failure_is_journaled(self, isolated_results, monkeypatch):
+        """A test that fails hardware initialization is journaled too"""
+        monkeypatch.setattr(DummyTest, "setup_hardware", lambda self: False)
+
+        DummyTest("DD5000", {}).execute()
+
+        records = isolated_results.read_records()
+        assert len(records) == 1
+        assert records[0]['result']['passed'] is False
+        assert "Hardware initialization failed" in records[0]['result']['failures']
+
+    @pytest.mark.benchmark
+    def test_fsync_cadence_benchmark(self, tmp_path):
+        """Compare per-test append latency at both fsync extremes"""
+        timings = {}
+        for every in (1, 0):
+            journal = ResultJournal(tmp_path / f"bench_{every}.journal", fsync_every=every)
+            start = time.perf_counter()
+            for i in range(200):
+                journal.append(_record(i))
+            journal.close()
+            timings[every] = (time.perf_counter() - start) / 200 * 1000
+
+        assert len(ResultJournal(tmp_path / "bench_1.journal").read_records()) == 200
+        assert timings[0] <= timings[1] * 2
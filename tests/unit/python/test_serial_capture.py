@@ -0,0 +1,106 @@
+"""
+Unit tests for raw serial capture and replay
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import serial
+from src.hardware.serial_capture import (
+    CapturingSerial, SerialCaptureWriter, ReplaySerial, read_capture,
+    DIRECTION_RX, DIRECTION_TX
+)
+from src.hardware.serial_replay import replay_capture
+from src.hardware.smt_arduino_controller import SMTArduinoController
+
+
+def _framed(controller, data, seq):
+    """Build a firmware-style response with SEQ/CHK framing"""
+    body = f"{data}:SEQ={seq}:CMDSEQ={seq}"
+    return f"{body}:CHK={controller._calculate_checksum(body):02X}:END\r\n"
+
+
+class TestSerialCapture:
+    """Test suite for capture files and ReplaySerial"""
+
+    @pytest.fixture
+    def capture_path(self, tmp_path):
+        return tmp_path / "test.sercap"
+
+    @pytest.mark.unit
+    def test_capturing_serial_records_both_directions(self, capture_path):
+        """Reads and writes pass through and are recorded in order"""
+        mock = MagicMock(spec=serial.Serial)
+        mock.readline.return_value = b"ID:SMT_TESTER\r\n"
+        wrapped = CapturingSerial(mock, SerialCaptureWriter(capture_path, {'device': 'smt'}))
+
+        wrapped.write(b"I\n")
+        assert wrapped.readline() == b"ID:SMT_TESTER\r\n"
+        wrapped.timeout = 0.05
+        wrapped.close()
+
+        metadata, records = read_capture(capture_path)
+        assert metadata['device'] == 'smt'
+        assert [(d, data) for _, d, data in records] == [
+            (DIRECTION_TX, b"I\n"), (DIRECTION_RX, b"ID:SMT_TESTER\r\n")
+        ]
+        assert mock.timeout == 0.05
+        mock.close.assert_called_once()
+
+    @pytest.mark.unit
+    def test_truncated_capture_drops_partial_record(self, capture_path):
+        """A capture cut off mid-record still reads back"""
+        writer = SerialCaptureWriter(capture_path)
+        writer.record(DIRECTION_RX, b"LIVE:V=12.5\n")
+        writer.record(DIRECTION_RX, b"LIVE:V=12.6\n")
+        writer.close()
+        capture_path.write_bytes(capture_path.read_bytes()[:-4])
+
+        _, records = read_capture(capture_path)
+
+        assert len(records) == 1
+
+    @pytest.mark.unit
+    def test_replay_serial_reassembles_lines(self):
+        """Lines split across records are joined; TX records reach on_tx"""
+        sent = []
+        replay = ReplaySerial([
+            (0, DIRECTION_TX, b"V\n"),
+            (1, DIRECTION_RX, b"VOLTAGE:1"),
+            (2, DIRECTION_RX, b"3.200\r\nOK\r\n"),
+        ], on_tx=sent.append)
+
+        assert list(replay.iter_lines()) == ["VOLTAGE:13.200", "OK"]
+        assert sent == [b"V\n"]
+        assert replay.exhausted
+
+    @pytest.mark.unit
+    def test_smt_replay_counts_protocol_warnings(self, capture_path):
+        """SMT replay validates checksums and sequence numbers"""
+        helper = SMTArduinoController()
+        good = _framed(helper, "VOLTAGE:13.200", 1)
+        bad = _framed(helper, "OK:ALL_OFF", 2).replace("OK:ALL_OFF", "OK:ALL_OFG")
+        wrong_seq = _framed(helper, "BUTTON:RELEASED", 9)
+
+        writer = SerialCaptureWriter(capture_path, {'device': 'smt'})
+        for seq, cmd, response in ((1, "V", good), (2, "X", bad), (3, "B", wrong_seq)):
+            writer.record(DIRECTION_TX, f"{cmd}:SEQ={seq}:CHK=00\n".encode())
+            writer.record(DIRECTION_RX, response.encode())
+        writer.record(DIRECTION_RX, b"EVENT:BUTTON_PRESSED\r\n")
+        writer.close()
+
+        stats = replay_capture(capture_path)
+
+        assert stats['processed'] == 4
+        assert stats['warnings'] == {'Checksum mismatch': 1, 'Sequence mismatch': 1}
+
+    @pytest.mark.unit
+    def test_scale_replay_parses_weights(self, capture_path):
+        """Scale replay runs the weight parser over captured bytes"""
+        writer = SerialCaptureWriter(capture_path, {'device': 'scale'})
+        for weight in (12.5, 12.6, 12.5):
+            writer.record(DIRECTION_RX, f"ST,GS, {weight:.2f}, g\r\n".encode())
+        writer.close()
+
+        stats = replay_capture(capture_path)
+
+        assert stats['processed'] == 3
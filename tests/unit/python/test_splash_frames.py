@@ -0,0 +1,89 @@
+"""
+Unit tests for the splash video frame cache
+"""
+
+import pytest
+from src.gui.startup.splash_frames import (SplashFrames, write_frame_cache, find_frame_cache, frame_cache_path,
+                                           open_frames, source_hash, fit_size)
+from src.gui.startup import splash_frames
+from config.settings import SPLASH_VIDEO
+
+
+def _frame(value: int, width: int = 4, height: int = 2) -> bytes:
+    return bytes([value]) * (width * height * 3)
+
+
+class TestSplashFrames:
+    """Test suite for writing and memory-mapping splash frame caches"""
+
+    @pytest.mark.unit
+    def test_repeated_frames_are_stored_once(self, tmp_path):
+        """Consecutive identical frames share one stored frame; every frame reads back"""
+        values = [1, 1, 1, 2, 3, 3, 1]
+        path = tmp_path / "clip.frames"
+        assert write_frame_cache(path, 4, 2, 12, (_frame(v) for v in values)) == 7
+
+        frames = SplashFrames(path)
+        try:
+            assert (len(frames), frames.slot_count, frames.width, frames.height, frames.fps) == (7, 4, 4, 2, 12)
+            assert [frames.frame(i) for i in range(7)] == [_frame(v) for v in values]
+            assert frames.slot(0) == frames.slot(2) != frames.slot(3)
+        finally:
+            frames.close()
+
+        with pytest.raises(ValueError):
+            write_frame_cache(tmp_path / "bad.frames", 4, 2, 12, [_frame(1, width=3)])
+        assert list(tmp_path.iterdir()) == [path]
+
+    @pytest.mark.unit
+    def test_cache_is_keyed_by_source_hash(self, tmp_path, monkeypatch):
+        """A cache is found for its video only; a replaced video or a truncated cache is not used"""
+        video = tmp_path / "startup_video.mp4"
+        video.write_bytes(b"video v1")
+        size = SPLASH_VIDEO['sizes']['unified']
+        path = frame_cache_path(source_hash(video), size, SPLASH_VIDEO['fps'], tmp_path)
+        write_frame_cache(path, 4, 2, SPLASH_VIDEO['fps'], [_frame(5)] * 3)
+
+        frames = find_frame_cache(video, 'unified', tmp_path)
+        assert frames is not None and len(frames) == 3
+        frames.close()
+
+        # An unchanged video is only stat'ed, not hashed again
+        hashed = []
+        monkeypatch.setattr(splash_frames, "source_hash", lambda path: hashed.append(path) or source_hash(path))
+        find_frame_cache(video, 'unified', tmp_path).close()
+        assert hashed == []
+
+        video.write_bytes(b"video v2, re-cut")
+        assert find_frame_cache(video, 'unified', tmp_path) is None
+        assert hashed == [video]
+
+        path.write_bytes(path.read_bytes()[:-1])
+        assert open_frames(path) is None
+
+    @pytest.mark.unit
+    def test_background_build_only_for_video_splashes(self, tmp_path, monkeypatch):
+        """Launches build caches only for splashes that play the video, and nothing while none does"""
+        video = tmp_path / "startup_video.mp4"
+        video.write_bytes(b"video v1")
+        monkeypatch.setitem(SPLASH_VIDEO, 'directory', str(tmp_path / "cache"))
+        monkeypatch.setattr(splash_frames, "find_ffmpeg", lambda: "ffmpeg")
+        monkeypatch.setattr(splash_frames, "_probe_size", lambda ffmpeg, path: (1920, 1080))
+        monkeypatch.setattr(splash_frames, "_decode_frames",
+                            lambda ffmpeg, path, width, height, fps: [_frame(1, width, height)] * 2)
+
+        monkeypatch.setitem(SPLASH_VIDEO, 'unified_video', False)
+        assert splash_frames.build_frame_caches_async(video) is None
+
+        monkeypatch.setitem(SPLASH_VIDEO, 'unified_video', True)
+        splash_frames.build_frame_caches_async(video).join(10)
+        unified = frame_cache_path(source_hash(video), SPLASH_VIDEO['sizes']['unified'], SPLASH_VIDEO['fps'],
+                                   tmp_path / "cache")
+        assert sorted((tmp_path / "cache").glob("*.frames")) == [unified]
+
+    @pytest.mark.unit
+    def test_fit_size(self):
+        """Frames keep the video's aspect ratio inside the splash box, with even dimensions"""
+        assert fit_size((1920, 1080), (1000, 400)) == (710, 400)
+        assert fit_size((1920, 1080), (250, 120)) == (212, 120)
+        assert fit_size((1080, 1920), (250, 120)) == (66, 120)
@@ -0,0 +1,74 @@
+"""
+Unit tests for the startup profiler and deferred test module imports
+"""
+
+import sys
+import json
+import pytest
+from src.utils import startup_profiler
+from src.utils.startup_profiler import (start_startup_profiling, profile_phase, mark_startup,
+                                        finish_startup_profiling, get_startup_profiler)
+
+
+@pytest.fixture
+def fake_package(tmp_path, monkeypatch):
+    """An importable package whose module imports a submodule"""
+    package = tmp_path / "profiled_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "outer.py").write_text("import time\ntime.sleep(0.02)\nfrom profiled_pkg import inner\n")
+    (package / "inner.py").write_text("import time\ntime.sleep(0.01)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "profiled_pkg"
+    for name in [name for name in sys.modules if name.startswith("profiled_pkg")]:
+        del sys.modules[name]
+
+
+class TestStartupProfiler:
+    """Test suite for the startup profiler"""
+
+    @pytest.mark.unit
+    def test_trace_records_imports_and_phases(self, tmp_path, fake_package):
+        """Imports get total and self times, phases and marks end up in a Chrome trace"""
+        trace_file = tmp_path / "trace.json"
+        profiler = start_startup_profiling(trace_file)
+        try:
+            with profile_phase("preload.imports"):
+                import profiled_pkg.outer  # noqa: F401
+            mark_startup("interactive")
+        finally:
+            assert finish_startup_profiling() == trace_file
+        assert get_startup_profiler() is None
+        assert profiler._import_timer is None
+
+        trace = json.loads(trace_file.read_text())
+        imports = {e["name"]: e for e in trace["traceEvents"] if e.get("cat") == "import"}
+        outer, inner = imports["profiled_pkg.outer"], imports["profiled_pkg.inner"]
+        assert inner["dur"] >= 10_000
+        assert outer["dur"] >= 30_000
+        assert 20 <= outer["args"]["self_ms"] < outer["dur"] / 1000
+
+        summary = trace["summary"]
+        assert summary["phases_ms"]["preload.imports"] >= 30
+        assert "interactive" in summary["marks_ms"]
+        assert summary["slowest_imports"][0]["module"] == "profiled_pkg.outer"
+        assert any(e["ph"] == "M" for e in trace["traceEvents"])
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self, tmp_path, fake_package):
+        """Without start_startup_profiling() phases, marks and finishing do nothing"""
+        assert get_startup_profiler() is None
+        with profile_phase("splash"):
+            import profiled_pkg.inner  # noqa: F401
+        mark_startup("interactive")
+        assert finish_startup_profiling() is None
+        assert not any(isinstance(finder, startup_profiler._ImportTimer) for finder in sys.meta_path)
+
+    @pytest.mark.unit
+    def test_test_module_warm_up(self):
+        """The selected mode's test module is imported on a background thread"""
+        from src.gui.startup.preloader import warm_up_test_module
+        thread = warm_up_test_module("WeightChecking")
+        thread.join(10)
+        assert "src.core.weight_test" in sys.modules
+        assert warm_up_test_module("Configuration") is None
@@ -0,0 +1,110 @@
+"""
+Unit tests for compiled per-SKU test plans
+"""
+
+import os
+import json
+import time
+import pytest
+from src.core import test_plan
+from src.data.sku_manager import SKUManager
+from src.hardware.smt_arduino_controller import SMTArduinoController
+
+RELAY_MAPPING = {
+    "1,2": {"board": 1, "function": "mainbeam"},
+    "3": {"board": 1, "function": "backlight"},
+    "4,5": {"board": 2, "function": "mainbeam"},
+    "6": {"board": 2, "function": "backlight"},
+    "7": None
+}
+TEST_SEQUENCE = [
+    {"function": "mainbeam", "duration_ms": 500, "delay_after_ms": 100,
+     "limits": {"current_a": {"min": 0.5, "max": 0.9}, "voltage_v": {"min": 11.5, "max": 12.5}}},
+    {"function": "backlight", "duration_ms": 200,
+     "limits": {"current_a": {"min": 0.05, "max": 0.15}}}
+]
+
+
+class TestTestPlan:
+    """Test suite for TestPlan and TestPlanCache"""
+
+    @pytest.mark.unit
+    def test_plan_matches_controller(self):
+        """Compiled command, timeout and relays match what the controller derives per panel"""
+        plan = test_plan.TestPlan("DD5001", RELAY_MAPPING, TEST_SEQUENCE)
+        relay_groups = SMTArduinoController._parse_relay_mapping(RELAY_MAPPING)
+
+        assert plan.sequence.command == SMTArduinoController._build_testseq_command(relay_groups, TEST_SEQUENCE)
+        assert plan.sequence.timeout == SMTArduinoController._calculate_sequence_timeout(TEST_SEQUENCE)
+        assert plan.sequence.errors == []
+        assert plan.configured_relays == [1, 2, 3, 4, 5, 6]
+        assert len(plan.limits) == 6
+
+    @pytest.mark.unit
+    def test_board_subsets(self):
+        """Subset plans only drive the requested boards and are compiled once"""
+        plan = test_plan.TestPlan("DD5001", RELAY_MAPPING, TEST_SEQUENCE)
+
+        subset = plan.for_boards([2])
+        assert subset.command == "TESTSEQ:4,5:500;OFF:100;6:200;OFF:0"
+        assert plan.for_boards({2}) is subset
+
+    @pytest.mark.unit
+    def test_cache_hits_until_reload(self):
+        """Same configuration objects hit; a reloaded configuration recompiles"""
+        cache = test_plan.TestPlanCache()
+        relay_mapping, test_sequence = dict(RELAY_MAPPING), list(TEST_SEQUENCE)
+
+        plan = cache.get("DD5001", relay_mapping, test_sequence)
+        assert cache.get("DD5001", relay_mapping, test_sequence) is plan
+        assert cache.get("DD5001", dict(RELAY_MAPPING), test_sequence) is not plan
+        assert cache.stats == {"hits": 1, "compiles": 2}
+
+    @pytest.mark.unit
+    def test_cache_follows_sku_manager(self, tmp_path):
+        """A SKU the manager reports as changed is dropped and recompiled from the manager's new data"""
+        sku_file = tmp_path / "skus" / "smt" / "DD5001.json"
+        sku_file.parent.mkdir(parents=True)
+        sku_file.write_text(json.dumps({"relay_mapping": RELAY_MAPPING, "test_sequence": TEST_SEQUENCE}))
+        manager = SKUManager(str(tmp_path))
+        cache = test_plan.TestPlanCache()
+        cache.watch(manager)
+        cache.watch(manager)
+
+        params = manager.get_test_parameters("DD5001", "SMT")
+        plan = cache.get("DD5001", params["relay_mapping"], params["test_sequence"])
+        params = manager.get_test_parameters("DD5001", "SMT")
+        assert cache.get("DD5001", params["relay_mapping"], params["test_sequence"]) is plan
+
+        edited = json.loads(sku_file.read_text())
+        edited["test_sequence"][0]["duration_ms"] = 800
+        sku_file.write_text(json.dumps(edited))
+        stamp = time.time() + 10
+        os.utime(sku_file, (stamp, stamp))
+        # The file alone does not change the plan: it follows the manager
+        assert cache.get("DD5001", params["relay_mapping"], params["test_sequence"]) is plan
+
+        manager.reload_if_changed()
+        assert "DD5001" not in cache._plans
+        params = manager.get_test_parameters("DD5001", "SMT")
+        updated = cache.get("DD5001", params["relay_mapping"], params["test_sequence"])
+        assert updated.sequence.command.startswith("TESTSEQ:1,2:800")
+        assert manager._change_callbacks.count(cache._on_skus_changed) == 1
+
+    @pytest.mark.benchmark
+    def test_per_panel_overhead_benchmark(self):
+        """Host-side preparation per panel, recompiling vs cached plan"""
+        cache = test_plan.TestPlanCache()
+        panels = 2000
+
+        start = time.perf_counter()
+        for _ in range(panels):
+            test_plan.TestPlan("DD5001", RELAY_MAPPING, TEST_SEQUENCE)
+        compile_each = (time.perf_counter() - start) / panels
+
+        start = time.perf_counter()
+        for _ in range(panels):
+            cache.get("DD5001", RELAY_MAPPING, TEST_SEQUENCE)
+        cached = (time.perf_counter() - start) / panels
+
+        assert cached < compile_each
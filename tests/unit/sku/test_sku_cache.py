@@ -0,0 +1,153 @@
+"""
+Unit tests for the SKU schema and the compiled SKU cache
+"""
+
+import os
+import json
+import time
+import pytest
+from pathlib import Path
+from src.data import sku_cache
+from src.data.sku_cache import build_sku_cache, open_cache
+from src.data.sku_manager import SKUManager
+from src.data.sku_schema import validate_sku
+
+
+def _smt_sku(index: int) -> dict:
+    return {
+        "description": f"Bar light {index}",
+        "panel_layout": {"rows": 2, "columns": 2},
+        "relay_mapping": {str(r): {"board": 1, "function": f"f{r}"} for r in range(1, 9)},
+        "test_sequence": [{"function": f"f{r}", "duration_ms": 500,
+                           "limits": {"current_a": {"min": 0.5, "max": 1.5}}} for r in range(1, 9)]
+    }
+
+
+def _write_skus(config_dir: Path, count: int):
+    sku_dir = config_dir / "skus" / "smt"
+    sku_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        (sku_dir / f"DD{index:04d}.json").write_text(json.dumps(_smt_sku(index)))
+
+
+class TestSKUSchema:
+    """Test suite for validate_sku"""
+
+    @pytest.mark.unit
+    def test_reports_structural_errors(self):
+        """Valid configurations pass; bad relay lists, ranges and functions are all reported"""
+        assert validate_sku(_smt_sku(1), "smt") == []
+        assert validate_sku({"description": "Pod", "limits": {"weight_g": {"min": 10, "max": 20}}}, "weight") == []
+
+        bad = _smt_sku(1)
+        bad["relay_mapping"]["1,x"] = {"board": 1, "function": "f9"}
+        bad["test_sequence"][0]["limits"]["current_a"] = {"min": 2.0, "max": 1.0}
+        bad["test_sequence"].append({"function": "missing", "duration_ms": -1})
+        errors = validate_sku(bad, "smt")
+
+        assert len(errors) == 4
+        assert any("1,x" in error for error in errors)
+        assert any("above max" in error for error in errors)
+        assert any("'missing'" in error for error in errors)
+        assert validate_sku({"tare_g": "heavy"}, "weight") == ["limits.weight_g: required", "tare_g: must be a number"]
+        assert validate_sku([], "smt") == ["SKU configuration must be a JSON object"]
+
+
+class TestSKUCache:
+    """Test suite for the binary SKU cache and SKUManager reading from it"""
+
+    @pytest.mark.unit
+    def test_manager_reads_from_cache(self, tmp_path):
+        """Configurations come from the cache, identical to the JSON files"""
+        _write_skus(tmp_path, 5)
+        count, errors = build_sku_cache(tmp_path)
+        assert (count, errors) == (5, {})
+
+        manager = SKUManager(str(tmp_path))
+        expected = SKUManager(str(tmp_path))
+        expected.cleanup()  # cache dropped: reads JSON
+        assert manager.get_status()["binary_cache"] == str(tmp_path / "sku_cache.bin")
+        assert manager.get_test_parameters("DD0003", "SMT") == expected.get_test_parameters("DD0003", "SMT")
+        assert manager.get_all_sku_data() == expected.get_all_sku_data()
+        assert manager.get_cache_stats()["binary_cache_loads"] == 5
+        assert expected.get_cache_stats()["binary_cache_loads"] == 0
+        manager.cleanup()
+
+    @pytest.mark.unit
+    def test_changed_and_invalid_files_fall_back_to_json(self, tmp_path):
+        """Files changed after the build and invalid files are read from JSON; the rebuilt cache is picked up"""
+        _write_skus(tmp_path, 3)
+        (tmp_path / "skus" / "smt" / "BAD.json").write_text(json.dumps({"description": "no relays"}))
+        count, errors = build_sku_cache(tmp_path)
+        assert count == 3
+        assert list(errors) == ["smt:BAD"]
+
+        changed = tmp_path / "skus" / "smt" / "DD0001.json"
+        changed.write_text(json.dumps(dict(_smt_sku(1), description="Bar light 1 rev B")))
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        manager = SKUManager(str(tmp_path))
+
+        assert manager.get_sku("DD0001")["description"] == "Bar light 1 rev B"
+        assert manager.get_sku("BAD")["description"] == "no relays"
+        assert manager.get_sku("DD0002")["description"] == "Bar light 2"
+        assert manager.get_cache_stats()["binary_cache_loads"] == 1
+
+        build_sku_cache(tmp_path)
+        manager.reload_if_changed()
+        manager.skus_data.clear()
+        assert manager.get_sku("DD0001")["description"] == "Bar light 1 rev B"
+        assert manager.get_cache_stats()["binary_cache_loads"] == 2
+        manager.cleanup()
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to list open files")
+    def test_cache_file_is_not_held_open(self, tmp_path):
+        """The loaded cache keeps no handle on sku_cache.bin, so the config mirror can replace it"""
+        _write_skus(tmp_path, 2)
+        build_sku_cache(tmp_path)
+        manager = SKUManager(str(tmp_path))
+        cache_file = str(tmp_path / "sku_cache.bin")
+
+        open_files = []
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                open_files.append(os.readlink(f"/proc/self/fd/{fd}"))
+            except OSError:
+                pass
+        assert cache_file not in open_files
+        assert manager.get_sku("DD0001")["description"] == "Bar light 1"
+        assert manager.get_cache_stats()["binary_cache_loads"] == 1
+        manager.cleanup()
+
+    @pytest.mark.unit
+    def test_incompatible_cache_is_ignored(self, tmp_path, monkeypatch):
+        """A corrupt cache or one built for another schema version is not used"""
+        _write_skus(tmp_path, 2)
+        cache_file = tmp_path / "sku_cache.bin"
+        cache_file.write_bytes(b"not a cache")
+        assert open_cache(cache_file) is None
+        assert SKUManager(str(tmp_path)).get_sku("DD0001")["description"] == "Bar light 1"
+
+        build_sku_cache(tmp_path)
+        monkeypatch.setattr(sku_cache, "SCHEMA_VERSION", sku_cache.SCHEMA_VERSION + 1)
+        assert open_cache(cache_file) is None
+
+    @pytest.mark.benchmark
+    def test_cold_start_benchmark(self, tmp_path):
+        """1,000 SKUs: start up and read every configuration, from JSON files vs the cache"""
+        _write_skus(tmp_path, 1000)
+
+        def measure() -> float:
+            start = time.perf_counter()
+            manager = SKUManager(str(tmp_path))
+            assert len(manager.get_all_sku_data()) == 1000
+            elapsed = time.perf_counter() - start
+            manager.cleanup()
+            return elapsed
+
+        json_time = min(measure() for _ in range(3))
+        build_sku_cache(tmp_path)
+        cache_time = min(measure() for _ in range(3))
+
+        assert cache_time < json_time
@@ -0,0 +1,141 @@
+"""
+Unit tests for the SQLite SKU database backend
+"""
+
+import json
+import time
+import pytest
+from pathlib import Path
+from src.data.sku_database import SKUDatabase
+from src.data.sku_manager import SKUManager
+
+
+def _write_skus(config_dir: Path, mode: str, count: int):
+    sku_dir = config_dir / "skus" / mode
+    sku_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        sku = {
+            "description": f"{'Pod' if index % 2 else 'Bar'} light {index}",
+            "relay_mapping": {str(r): {"board": 1, "function": f"f{r}"} for r in range(1, 9)},
+            "test_sequence": [{"function": f"f{r}", "duration_ms": 500} for r in range(1, 9)]
+        }
+        (sku_dir / f"DD{index:04d}.json").write_text(json.dumps(sku))
+
+
+@pytest.fixture
+def database(tmp_path):
+    _write_skus(tmp_path, "smt", 4)
+    _write_skus(tmp_path, "offroad", 2)
+    db = SKUDatabase(tmp_path / "skus.db")
+    db.import_json_dir(tmp_path / "skus")
+    yield db
+    db.close()
+
+
+class TestSKUDatabase:
+    """Test suite for SKUDatabase and SKUManager on a database"""
+
+    @pytest.mark.unit
+    def test_manager_parity_with_json(self, tmp_path, database):
+        """SKUManager answers the same from the database as from the JSON files"""
+        from_json = SKUManager(str(tmp_path))
+        from_db = SKUManager(str(tmp_path), database=database)
+
+        assert from_db.get_all_skus() == from_json.get_all_skus()
+        assert from_db.get_skus_for_mode("Offroad") == ["DD0000", "DD0001"]
+        assert from_db.get_available_modes("DD0001") == ["Offroad", "SMT"]
+        assert from_db.get_test_parameters("DD0003", "SMT") == from_json.get_test_parameters("DD0003", "SMT")
+        assert from_db.get_sku_file("DD0003", "SMT") is None
+
+        exported = tmp_path / "exported"
+        assert database.export_json_dir(exported) == 6
+        assert json.loads((exported / "smt" / "DD0002.json").read_text()) == \
+            json.loads((tmp_path / "skus" / "smt" / "DD0002.json").read_text())
+
+    @pytest.mark.unit
+    def test_description_lookup_uses_index(self, database):
+        """Description prefix search is case-insensitive and served by the description index"""
+        assert database.find_by_description("pod") == ["DD0001", "DD0003"]
+        assert database.find_by_description("Pod", mode="offroad") == ["DD0001"]
+        assert database.find_by_description("100%") == []
+
+        plan = database._conn.execute("EXPLAIN QUERY PLAN SELECT sku_code FROM skus WHERE description LIKE ?",
+                                      ("pod%",)).fetchall()
+        assert "idx_skus_description" in str(plan)
+
+    @pytest.mark.unit
+    def test_reload_sees_database_changes(self, tmp_path, database):
+        """Updated and deleted configurations show up as SKU changes"""
+        manager = SKUManager(str(tmp_path), database=database)
+        config = manager.get_test_parameters("DD0002", "SMT")
+        unchanged = manager.get_sku("DD0000")
+
+        database.put_config("DD0000", "smt", json.loads(json.dumps(unchanged)))  # same content: no new revision
+        database.put_config("DD0002", "smt", dict(config, description="Bar light 2 rev B"))
+        database.delete_config("DD0003", "smt")
+        changes = manager.reload_if_changed()
+
+        assert changes.modified == ["smt:DD0002"]
+        assert changes.removed == ["smt:DD0003"]
+        assert manager.get_sku("DD0000") is unchanged
+        assert manager.get_sku("DD0002")["description"] == "Bar light 2 rev B"
+        assert "DD0003" not in manager.get_all_skus()
+
+    @pytest.mark.unit
+    def test_local_replica(self, tmp_path, database):
+        """A replica follows the shared database and keeps working when the share is gone"""
+        replica = SKUDatabase(tmp_path / "local" / "skus.db", shared_path=database.path)
+        manager = SKUManager(str(tmp_path), database=replica)
+        assert len(manager.get_all_skus()) == 4
+
+        database.put_config("DD0100", "weight", {"description": "Pod light 100"})
+        assert manager.reload_if_changed().added == ["weight:DD0100"]
+
+        database.close()
+        database.path.rename(tmp_path / "moved.db")
+        assert not replica.refresh_replica()
+        assert manager.get_test_parameters("DD0100", "WeightChecking")["description"] == "Pod light 100"
+        replica.close()
+
+    @pytest.mark.unit
+    def test_shared_database_uses_rollback_journal(self, tmp_path, database):
+        """WAL only for a local replica: SQLite's WAL does not work on network filesystems"""
+        mode = "PRAGMA journal_mode"
+        assert database._conn.execute(mode).fetchone()[0] == "delete"
+        replica = SKUDatabase(tmp_path / "local" / "skus.db", shared_path=database.path)
+        assert replica._conn.execute(mode).fetchone()[0] == "wal"
+        assert replica.scan() == database.scan()
+        replica.close()
+
+        database.close()
+        wal_file = SKUDatabase(database.path, wal=True)  # e.g. left in WAL mode by an older version
+        wal_file.close()
+        reopened = SKUDatabase(database.path)
+        assert reopened._conn.execute(mode).fetchone()[0] == "delete"
+        reopened.close()
+
+    @pytest.mark.benchmark
+    def test_cold_start_and_lookup_benchmark(self, tmp_path):
+        """1,000 SKUs: JSON directory scan vs SQLite for a cold start and for uncached lookups"""
+        _write_skus(tmp_path, "smt", 1000)
+        db_path = tmp_path / "skus.db"
+        importer = SKUDatabase(db_path)
+        importer.import_json_dir(tmp_path / "skus")
+        importer.close()
+        skus = [f"DD{index:04d}" for index in range(0, 1000, 10)]
+
+        def measure(make_manager):
+            start = time.perf_counter()
+            manager = make_manager()
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            for sku in skus:
+                assert manager.get_test_parameters(sku, "SMT")
+            return cold, (time.perf_counter() - start) / len(skus)
+
+        json_cold, json_lookup = measure(lambda: SKUManager(str(tmp_path)))
+        database = SKUDatabase(db_path)
+        db_cold, db_lookup = measure(lambda: SKUManager(str(tmp_path), database=database))
+        database.close()
+
+        assert db_cold < json_cold
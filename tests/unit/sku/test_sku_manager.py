@@ -0,0 +1,272 @@
+"""
+Unit tests for SKUManager lazy loading and the shared instance
+"""
+
+import json
+import time
+import threading
+import pytest
+from pathlib import Path
+from src.data import sku_manager as sku_manager_module
+from src.data.sku_manager import SKUManager, get_sku_manager, create_sku_manager, load_test_parameters
+from src.services.sku_watcher import SKUFileWatcher
+
+
+def _modify(path: Path):
+    data = json.loads(path.read_text())
+    data["description"] += " (rev B)"
+    path.write_text(json.dumps(data))
+
+
+def _write_skus(config_dir: Path, mode: str, count: int):
+    sku_dir = config_dir / "skus" / mode
+    sku_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        sku = {
+            "description": f"SKU {index}",
+            "relay_mapping": {str(r): {"board": 1, "function": f"f{r}"} for r in range(1, 9)},
+            "test_sequence": [{"function": f"f{r}", "duration_ms": 500} for r in range(1, 9)]
+        }
+        (sku_dir / f"DD{index:04d}.json").write_text(json.dumps(sku))
+
+
+class TestSKUManager:
+    """Test suite for SKUManager"""
+
+    @pytest.mark.unit
+    def test_files_parsed_on_first_access(self, tmp_path):
+        """Construction only indexes files; each SKU is parsed once, when first used"""
+        _write_skus(tmp_path, "smt", 3)
+        _write_skus(tmp_path, "offroad", 1)
+        manager = SKUManager(str(tmp_path))
+
+        assert manager.get_all_skus() == ["DD0000", "DD0001", "DD0002"]
+        assert manager.get_available_modes("DD0000") == ["Offroad", "SMT"]
+        assert manager.get_cache_stats()["cached_skus"] == 0
+
+        params = manager.get_test_parameters("DD0001", "SMT")
+        assert params["sku"] == "DD0001" and params["mode"] == "smt"
+        assert manager.get_cache_stats()["cached_skus"] == 1
+        # Same parsed configuration objects until the SKU is reloaded
+        assert manager.get_test_parameters("DD0001", "SMT")["relay_mapping"] is params["relay_mapping"]
+        assert manager.get_test_parameters("DD0003", "SMT") is None
+
+    @pytest.mark.unit
+    def test_shared_instance(self, monkeypatch):
+        """Every caller gets the same manager unless it asks for another config directory"""
+        monkeypatch.setattr(sku_manager_module, "_sku_manager", None)
+
+        manager = get_sku_manager()
+        assert get_sku_manager() is manager
+        assert create_sku_manager() is manager
+
+    @pytest.mark.unit
+    def test_reload_only_changed_files(self, tmp_path):
+        """Added, modified and removed files are detected by mtime/size; other SKUs keep their data"""
+        _write_skus(tmp_path, "smt", 3)
+        manager = SKUManager(str(tmp_path))
+        unchanged = manager.get_sku("DD0000")
+        modified = manager.get_sku("DD0001")
+        notified = []
+        manager.add_change_callback(notified.append)
+
+        assert not manager.reload_if_changed()
+
+        smt_dir = tmp_path / "skus" / "smt"
+        _modify(smt_dir / "DD0001.json")
+        (smt_dir / "DD0002.json").unlink()
+        (smt_dir / "DD0001.json").with_name("DD0009.json").write_text((smt_dir / "DD0000.json").read_text())
+        changes = manager.reload_if_changed()
+
+        assert changes.added == ["smt:DD0009"]
+        assert changes.modified == ["smt:DD0001"]
+        assert changes.removed == ["smt:DD0002"]
+        assert changes.skus == ["DD0001", "DD0002", "DD0009"]
+        assert notified == [changes]
+        assert manager.get_all_skus() == ["DD0000", "DD0001", "DD0009"]
+        assert manager.get_sku("DD0000") is unchanged
+        assert manager.get_sku("DD0001") is not modified
+        assert manager.get_sku("DD0001")["description"].endswith("(rev B)")
+
+    @pytest.mark.unit
+    def test_watcher_signals_changes(self, tmp_path):
+        """The file watcher rescans after a file event and emits per-change signals"""
+        from PySide6.QtCore import QCoreApplication
+        app = QCoreApplication.instance() or QCoreApplication([])
+        _write_skus(tmp_path, "smt", 2)
+        manager = SKUManager(str(tmp_path))
+        watcher = SKUFileWatcher(manager, debounce_ms=50, poll_interval_s=0)
+        modified = []
+        watcher.skus_modified.connect(modified.extend)
+        watcher.start()
+        try:
+            _modify(tmp_path / "skus" / "smt" / "DD0001.json")
+            deadline = time.monotonic() + 5
+            while not modified and time.monotonic() < deadline:
+                app.processEvents()
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+
+        assert modified == ["smt:DD0001"]
+
+    @pytest.mark.unit
+    def test_mode_indexes_follow_reloads(self, tmp_path):
+        """sku -> modes and mode -> sorted skus stay in step with added and removed files"""
+        _write_skus(tmp_path, "smt", 3)
+        _write_skus(tmp_path, "offroad", 2)
+        manager = SKUManager(str(tmp_path))
+
+        assert manager.get_skus_for_mode("SMT") == ["DD0000", "DD0001", "DD0002"]
+        assert manager.get_skus_for_mode("Offroad") == ["DD0000", "DD0001"]
+        assert manager.get_skus_for_mode("WeightChecking") == []
+        assert manager.validate_sku_mode_combination("DD0001", "Offroad")
+        assert not manager.validate_sku_mode_combination("DD0002", "Offroad")
+
+        (tmp_path / "skus" / "offroad" / "DD0000.json").unlink()
+        (tmp_path / "skus" / "smt" / "DD0002.json").unlink()
+        _write_skus(tmp_path, "weight", 1)
+        (tmp_path / "skus" / "smt" / "DD0000.json").rename(tmp_path / "skus" / "smt" / "AA0001.json")
+        manager.reload_if_changed()
+
+        assert manager.get_all_skus() == ["AA0001", "DD0000", "DD0001"]
+        assert manager.get_skus_for_mode("SMT") == ["AA0001", "DD0001"]
+        assert manager.get_skus_for_mode("Offroad") == ["DD0001"]
+        assert manager.get_available_modes("DD0000") == ["WeightChecking"]
+        assert manager.get_available_modes("DD0001") == ["Offroad", "SMT"]
+        assert manager.get_available_modes("DD0002") == []
+        assert manager.get_sku("DD0000")["mode"] == "weight"
+
+    @pytest.mark.unit
+    def test_bulk_load_does_not_block_readers(self, tmp_path, monkeypatch):
+        """Files are read off the lock (bulk and single lookups); a file changed during the load is not kept"""
+        _write_skus(tmp_path, "smt", 16)
+        manager = SKUManager(str(tmp_path))
+        read_file = SKUManager._read_sku_file
+        threads, lookups = set(), []
+
+        def slow_read(self, key, json_file):
+            threads.add(threading.current_thread().name)
+            if key == "smt:DD0000":
+                reader = threading.Thread(target=lambda: lookups.append(self.get_skus_for_mode("SMT")))
+                reader.start()
+                reader.join(1)  # times out if the lock is held while reading
+                _modify(json_file)
+                self._file_stats[key] = (0, 0)  # as if a reload saw the change mid-load
+            time.sleep(0.01)
+            return read_file(self, key, json_file)
+
+        monkeypatch.setattr(SKUManager, "_read_sku_file", slow_read)
+        results = manager.preload_all_skus()
+
+        assert all(results.values()) and len(results) == 16
+        assert len(threads) > 1
+        assert len(lookups) == 1 and len(lookups[0]) == 16
+        assert "smt:DD0000" not in manager.skus_data
+        assert len(manager.skus_data) == 15
+
+        # A single lookup's first read doesn't hold the lock either
+        manager, lookups = SKUManager(str(tmp_path)), []
+
+        def first_read(self, key, json_file):
+            reader = threading.Thread(target=lambda: lookups.append(self.get_all_skus()))
+            reader.start()
+            reader.join(1)
+            return read_file(self, key, json_file)
+
+        monkeypatch.setattr(SKUManager, "_read_sku_file", first_read)
+        assert manager.get_test_parameters("DD0001", "SMT")["sku"] == "DD0001"
+        assert len(lookups) == 1
+
+    @pytest.mark.benchmark
+    def test_parallel_bulk_load_benchmark(self, tmp_path, monkeypatch):
+        """300 SKUs on a share with 5 ms per file open: sequential vs thread pool bulk load"""
+        _write_skus(tmp_path, "smt", 300)
+        read_file = SKUManager._read_sku_file
+
+        def share_read(self, key, json_file):
+            time.sleep(0.005)
+            return read_file(self, key, json_file)
+
+        monkeypatch.setattr(SKUManager, "_read_sku_file", share_read)
+
+        def measure() -> float:
+            manager = SKUManager(str(tmp_path))
+            start = time.perf_counter()
+            assert len(manager.get_all_sku_data()) == 300
+            return time.perf_counter() - start
+
+        monkeypatch.setattr(sku_manager_module, "MAX_LOAD_WORKERS", 1)
+        sequential = measure()
+        monkeypatch.setattr(sku_manager_module, "MAX_LOAD_WORKERS", 8)
+        parallel = measure()
+
+        assert parallel < sequential / 3
+
+    @pytest.mark.benchmark
+    def test_mode_filter_benchmark(self, tmp_path):
+        """Filtering 3,000 SKUs by mode: scanning the composite keys vs the mode index"""
+        _write_skus(tmp_path, "smt", 2000)
+        _write_skus(tmp_path, "offroad", 1000)
+        manager = SKUManager(str(tmp_path))
+        rounds = 3
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            # What filter_skus_by_mode used to do: every key split, then a scan per SKU
+            all_skus = sorted({key.split(':', 1)[1] for key in manager.sku_files})
+            scanned = [sku for sku in all_skus
+                       if any(key == f"offroad:{sku}" for key in manager.sku_files if key.endswith(f":{sku}"))]
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            indexed = manager.get_skus_for_mode("Offroad")
+        index = time.perf_counter() - start
+
+        assert indexed == scanned
+        assert index < scan / 100
+
+    @pytest.mark.benchmark
+    def test_reload_benchmark(self, tmp_path):
+        """Reload after one SKU file changed, 1,000 SKU files: full reload vs incremental"""
+        _write_skus(tmp_path, "smt", 1000)
+        manager = SKUManager(str(tmp_path))
+        manager.preload_all_skus()
+
+        # Full reload: every file parsed again
+        start = time.perf_counter()
+        manager.reload()
+        manager.preload_all_skus()
+        full = time.perf_counter() - start
+
+        # Incremental: rescan, then only the changed file is parsed again
+        _modify(tmp_path / "skus" / "smt" / "DD0500.json")
+        start = time.perf_counter()
+        changes = manager.reload_if_changed()
+        assert manager.get_sku("DD0500")
+        incremental = time.perf_counter() - start
+
+        assert changes.modified == ["smt:DD0500"]
+        assert incremental < full / 3
+
+    @pytest.mark.benchmark
+    def test_parameter_lookup_benchmark(self, tmp_path, monkeypatch):
+        """Per-test parameter lookup: shared lazy manager vs a full directory parse each time"""
+        _write_skus(tmp_path, "smt", 300)
+        monkeypatch.setattr(sku_manager_module, "_sku_manager", SKUManager(str(tmp_path)))
+        lookups = 20
+
+        start = time.perf_counter()
+        for _ in range(lookups):
+            manager = SKUManager(str(tmp_path))
+            manager.preload_all_skus()  # what every lookup used to cost
+            manager.get_test_parameters("DD0150", "SMT")
+        full_parse = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(lookups):
+            assert load_test_parameters("DD0150", "SMT")
+        shared = time.perf_counter() - start
+
+        assert shared < full_parse / 10